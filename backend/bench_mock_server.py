@@ -0,0 +1,184 @@
+"""
+MPS Mock API 성능 벤치마크
+실행: python bench_mock_server.py [이름 ...]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Callable, Dict
+
+import mock_server
+from mock_server import TokenStore
+from mock_simulation import Simulator, parse_simulation_config
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {}
+
+
+def benchmark(func: Callable[[], None]) -> Callable[[], None]:
+    """벤치마크 등록"""
+    BENCHMARKS[func.__name__.replace("bench_", "")] = func
+    return func
+
+
+def _report(name: str, count: int, seconds: float, unit: str = "items") -> None:
+    rate = count / seconds if seconds > 0 else float("inf")
+    print(f"{name:<40} {count:>10,} {unit:<6} {seconds * 1000:>10.1f} ms {rate:>15,.0f} {unit}/s")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@benchmark
+def bench_token_store() -> None:
+    """소크 테스트: 초당 로그인 200회, TTL 1시간, 3시간 분량 (시뮬레이션 시계)"""
+    logins = 200 * 3600 * 3
+    step = 1 / 200
+
+    tracemalloc.start()
+    tokens_db = {}
+    start = time.perf_counter()
+    for i in range(logins):
+        # 기존 구현: 만료 검사/정리 없음
+        tokens_db[f"access_user{i}"] = {"user_id": f"user{i}", "expires": "2026-01-01T00:00:00"}
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    _report("dict, no expiry", logins, elapsed, "logins")
+    print(f"{'':<40} {len(tokens_db):,} tokens kept, peak {peak / 1024 / 1024:,.0f} MiB")
+    del tokens_db
+
+    clock = FakeClock()
+    store = TokenStore(ttl=3600, clock=clock)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(logins):
+        clock.now = i * step
+        store.issue(f"user{i}")
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    _report("TokenStore (heap + amortized purge)", logins, elapsed, "logins")
+    print(f"{'':<40} {len(store):,} tokens kept, peak {peak / 1024 / 1024:,.0f} MiB")
+
+    tokens = list(store._tokens)[:1000]
+    n = 1_000_000
+    start = time.perf_counter()
+    for i in range(n):
+        store.validate(tokens[i % len(tokens)])
+    _report("TokenStore.validate", n, time.perf_counter() - start, "calls")
+
+
+@benchmark
+def bench_simulation() -> None:
+    """시뮬레이션 오버헤드, 지연 분포 정확도, 합성 데이터 생성 속도"""
+    simulator = Simulator(parse_simulation_config({
+        "seed": 1,
+        "datasets": {"history_size": 1_000_000, "history_interval_minutes": 1},
+        "rate_limit": {"requests_per_second": 1e9, "burst": 1e9},
+        "routes": {
+            "default": {
+                "latency": {"distribution": "lognormal", "median_ms": 40, "sigma": 0.6},
+                "error_rate": 0.01,
+            },
+        },
+    }))
+    n = 200_000
+    delays = []
+    start = time.perf_counter()
+    for i in range(n):
+        delays.append(simulator.decide("/home/environment", f"client{i % 100}").delay)
+    _report("Simulator.decide", n, time.perf_counter() - start, "calls")
+    delays.sort()
+    stats = simulator.stats["default"]
+    print(f"{'':<40} p50 {delays[n // 2] * 1000:.1f} ms (configured 40.0), "
+          f"p99 {delays[int(n * 0.99)] * 1000:.1f} ms (expected {40 * 2.718281828 ** (0.6 * 2.326):.1f}), "
+          f"errors {stats.injected_errors / n:.2%} (configured 1.00%)")
+
+    datasets = simulator.datasets
+    start = time.perf_counter()
+    count = sum(1 for _ in datasets.history(0, 100_000))
+    _report("history generation (streamed)", count, time.perf_counter() - start, "rows")
+    tracemalloc.start()
+    sum(1 for _ in datasets.history(0, 100_000))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{'':<40} peak {peak / 1024:,.0f} KiB for a 1,000,000 row dataset")
+
+    start = time.perf_counter()
+    tail = list(datasets.history(999_000, 1_000_000))
+    _report("history slice at offset 999,000", len(tail), time.perf_counter() - start, "rows")
+
+
+@benchmark
+def bench_paging() -> None:
+    """전체 조회 (기존 동작) vs 페이지/화면 크기 다운샘플링: 응답 크기와 지연"""
+    from fastapi.testclient import TestClient
+
+    mock_server.simulator = Simulator(parse_simulation_config({
+        "datasets": {
+            "history_size": 10000,
+            "history_interval_minutes": 60,
+            "trend_points": 10000,
+            "trend_interval_minutes": 1,
+        },
+    }))
+    cases = [
+        ("history: all 10,000 (before)", "/measurement/history", {"limit": 10000}),
+        ("history: first page of 100", "/measurement/history", {}),
+        ("trends: all 10,000 (before)", "/data-hub/trends", {"measurement_type": "health", "limit": 10000}),
+        ("trends: lttb 400 points", "/data-hub/trends", {"measurement_type": "health", "points": 400}),
+        ("trends: minmax 400 buckets", "/data-hub/trends",
+         {"measurement_type": "health", "points": 400, "downsample": "minmax"}),
+        ("trends: last 24h, lttb 400", "/data-hub/trends", {
+            "measurement_type": "health",
+            "from": (mock_server.simulator.datasets.anchor - timedelta(days=1)).isoformat(),
+            "points": 400,
+        }),
+    ]
+    with TestClient(mock_server.app) as client:
+        token = client.post("/auth/login", json={"email": "user@example.com", "password": "password123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for name, path, params in cases:
+            n = 20
+            start = time.perf_counter()
+            for _ in range(n):
+                response = client.get(path, params=params, headers=headers)
+            elapsed = time.perf_counter() - start
+            _report(name, n, elapsed, "reqs")
+            print(f"{'':<40} {len(response.content) / 1024:,.1f} KiB, {elapsed / n * 1000:.1f} ms/req")
+
+        # 원본 100만 점: MAX_DOWNSAMPLE_SOURCE 로 솎아서 계산 (스레드에서 실행)
+        mock_server.simulator = Simulator(parse_simulation_config({
+            "datasets": {"trend_points": 1_000_000, "trend_interval_minutes": 1},
+        }))
+        n = 3
+        start = time.perf_counter()
+        for _ in range(n):
+            response = client.get(
+                "/data-hub/trends", params={"measurement_type": "health", "points": 400}, headers=headers
+            )
+        elapsed = time.perf_counter() - start
+        _report("trends: 1,000,000 source, lttb 400", n, elapsed, "reqs")
+        print(f"{'':<40} stride {response.json()['source_stride']}, {elapsed / n * 1000:.1f} ms/req")
+
+
+def main(argv) -> int:
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            return 1
+        print(f"\n== {name} ==")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,145 @@
+"""
+MPS Mock API - 시계열 페이지네이션 / 다운샘플링
+/measurement/history, /data-hub/trends 공용
+
+- 커서: 다음 레코드 인덱스를 담은 불투명 문자열
+- 시간 범위: 일정 간격 최신순 시계열이므로 from/to 를 인덱스 구간으로 바로 변환
+- 다운샘플링: LTTB (모양 보존 점 선택), 구간별 min/max/avg
+    원본은 IndexedSeries 로 필요한 구간만 계산 (전체 목록을 만들지 않음)
+"""
+
+import base64
+import math
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+_CURSOR_PREFIX = "i:"
+
+
+def encode_cursor(index: int) -> str:
+    return base64.urlsafe_b64encode(f"{_CURSOR_PREFIX}{index}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """커서 -> 인덱스 (없으면 0, 잘못된 커서는 ValueError)"""
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if raw.startswith(_CURSOR_PREFIX):
+            index = int(raw[len(_CURSOR_PREFIX):])
+            if index >= 0:
+                return index
+    except (ValueError, UnicodeDecodeError):
+        pass
+    raise ValueError("Invalid cursor")
+
+
+def _naive(value: datetime) -> datetime:
+    # 시간대가 있으면 서버 로컬 시각으로 변환 (데이터셋 기준 시각은 naive 로컬 시각)
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def index_range(
+    anchor: datetime,
+    interval: timedelta,
+    size: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[int, int]:
+    """
+    최신순 시계열 (레코드 i 시각 = anchor - i * interval) 에서
+    start <= 시각 <= end 인 인덱스 구간 [lo, hi)
+    """
+    lo, hi = 0, size
+    if end is not None:
+        lo = max(lo, math.ceil((anchor - _naive(end)) / interval))
+    if start is not None:
+        hi = min(hi, math.floor((anchor - _naive(start)) / interval) + 1)
+    return lo, max(lo, hi)
+
+
+def page(lo: int, hi: int, cursor: Optional[str], limit: int) -> Tuple[int, int, Optional[str]]:
+    """[lo, hi) 안에서 커서 위치부터 limit 개 -> (시작, 끝, 다음 커서)"""
+    first = max(lo, decode_cursor(cursor))
+    last = min(hi, first + limit)
+    return first, last, encode_cursor(last) if last < hi else None
+
+
+class IndexedSeries(Sequence):
+    """
+    value(lo + i * stride) 를 필요할 때 계산하는 읽기 전용 시퀀스
+
+    stride > 1 이면 원본을 균등 간격으로 솎아낸 것 (다운샘플링 비용 상한용)
+    """
+
+    def __init__(self, value: Callable[[int], float], lo: int, hi: int, stride: int = 1):
+        self.value = value
+        self.lo = lo
+        self.stride = stride
+        self._len = max(0, -(-(hi - lo) // stride))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def source_index(self, i: float) -> float:
+        return self.lo + i * self.stride
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            return [self.value(self.lo + j * self.stride) for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        return self.value(self.lo + i * self.stride)
+
+
+def lttb(values: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets: 선택된 점의 인덱스 (양 끝 포함, 오름차순)
+
+    x 는 등간격 (인덱스) 으로 본다.
+    """
+    n = len(values)
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:threshold]
+
+    selected = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 구간 평균 (삼각형의 세 번째 꼭짓점)
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = a, values[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def minmax_buckets(values: Sequence[float], buckets: int) -> List[Tuple[int, int, float, float, float]]:
+    """균등 구간별 (시작, 끝, min, max, avg); 끝은 포함하지 않음"""
+    n = len(values)
+    buckets = min(buckets, n)
+    result = []
+    for b in range(buckets):
+        start, end = b * n // buckets, (b + 1) * n // buckets
+        chunk = values[start:end]
+        result.append((start, end, min(chunk), max(chunk), sum(chunk) / len(chunk)))
+    return result
@@ -3,12 +3,23 @@ MPS 생태계 - Mock 백엔드 API 서버
 FastAPI를 사용한 간단한 Mock 서버 구현
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from datetime import datetime, timedelta
-from typing import List, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import heapq
 import json
+import math
+import os
+import secrets
+import time
+
+from mock_series import DOWNSAMPLE_METHODS, IndexedSeries, lttb, minmax_buckets, page
+from mock_simulation import Simulator, load_simulation_config
 
 app = FastAPI(title="MPS Mock API", version="1.0.0")
 
@@ -90,7 +101,189 @@ measurements_db = {
     ]
 }
 
-tokens_db = {}
+# ============ Token Store ============
+
+TOKEN_TTL_SECONDS = int(os.getenv("MOCK_TOKEN_TTL_SECONDS", 3600))
+TOKEN_PURGE_INTERVAL_SECONDS = float(os.getenv("MOCK_TOKEN_PURGE_INTERVAL_SECONDS", 60))
+
+
+class TokenStore:
+    """
+    액세스 토큰 저장소
+
+    - 토큰 -> (user_id, 만료 시각) dict 로 검증 O(1) (만료 토큰은 조회 시 제거)
+    - (만료 시각, 토큰) 최소 힙이 만료 순서를 유지
+    - 정리는 발급할 때마다 purge_batch 개씩 (분할 상환) + 주기적 백그라운드 작업
+    재발급/폐기된 토큰의 힙 항목은 지연 삭제하고, 힙이 활성 토큰보다 너무 커지면 다시 만든다.
+    """
+
+    def __init__(self, ttl: float = 3600, purge_batch: int = 64, clock=time.monotonic):
+        self.ttl = ttl
+        self.purge_batch = purge_batch
+        self.clock = clock
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self.issued = 0
+        self.expired = 0
+        self.revoked = 0
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def issue(self, user_id: str, token: Optional[str] = None) -> str:
+        """토큰 발급 (token 을 주면 해당 토큰을 새 만료 시각으로 재등록)"""
+        self.purge(self.purge_batch)
+        token = token or f"access_{user_id}_{secrets.token_urlsafe(16)}"
+        expires_at = self.clock() + self.ttl
+        self._tokens[token] = (user_id, expires_at)
+        heapq.heappush(self._expiry, (expires_at, token))
+        self.issued += 1
+        if len(self._expiry) > 2 * len(self._tokens) + 1024:
+            self._compact()
+        return token
+
+    def validate(self, token: str) -> Optional[str]:
+        """유효한 토큰이면 user_id, 아니면 None"""
+        entry = self._tokens.get(token)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            del self._tokens[token]
+            self.expired += 1
+            return None
+        return entry[0]
+
+    def revoke(self, token: str) -> bool:
+        if self._tokens.pop(token, None) is None:
+            return False
+        self.revoked += 1
+        return True
+
+    def purge(self, limit: Optional[int] = None) -> int:
+        """만료된 토큰 제거 (limit 개까지); 제거한 수 반환"""
+        now = self.clock()
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now and (limit is None or removed < limit):
+            expires_at, token = heapq.heappop(self._expiry)
+            entry = self._tokens.get(token)
+            # 재발급되었거나 이미 지워진 토큰의 오래된 힙 항목은 건너뜀
+            if entry is not None and entry[1] == expires_at:
+                del self._tokens[token]
+                self.expired += 1
+                removed += 1
+        return removed
+
+    def _compact(self) -> None:
+        self._expiry = [(expires_at, token) for token, (_, expires_at) in self._tokens.items()]
+        heapq.heapify(self._expiry)
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "active": len(self._tokens),
+            "expiry_index": len(self._expiry),
+            "issued": self.issued,
+            "expired": self.expired,
+            "revoked": self.revoked,
+        }
+
+
+token_store = TokenStore(ttl=TOKEN_TTL_SECONDS)
+
+
+async def _purge_tokens_periodically():
+    while True:
+        await asyncio.sleep(TOKEN_PURGE_INTERVAL_SECONDS)
+        token_store.purge()
+
+
+@app.on_event("startup")
+async def start_token_purge():
+    if TOKEN_PURGE_INTERVAL_SECONDS > 0:
+        app.state.token_purge_task = asyncio.create_task(_purge_tokens_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_token_purge():
+    task = getattr(app.state, "token_purge_task", None)
+    if task is not None:
+        task.cancel()
+
+
+def bearer_token(
+    authorization: Optional[str] = Header(None),
+    authorization_query: Optional[str] = Query(None, alias="authorization"),
+) -> str:
+    """Authorization 헤더 (이전 클라이언트 호환: ?authorization= 쿼리) 의 토큰"""
+    value = authorization or authorization_query
+    if not value:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return value[len("Bearer "):] if value.startswith("Bearer ") else value
+
+
+def current_user_id(token: str = Depends(bearer_token)) -> str:
+    """토큰 저장소로 검증한 user_id"""
+    user_id = token_store.validate(token)
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return user_id
+
+
+def _issue_tokens(user_id: str) -> AuthToken:
+    return AuthToken(
+        access_token=token_store.issue(user_id),
+        refresh_token=f"refresh_{user_id}",
+        expires_in=TOKEN_TTL_SECONDS,
+    )
+
+# ============ Simulation ============
+# MOCK_SIMULATION_CONFIG: 시뮬레이션 설정 파일 (mock_simulation.py 참고, 없으면 꺼짐)
+
+simulator = Simulator(load_simulation_config(os.getenv("MOCK_SIMULATION_CONFIG")))
+
+
+def _rate_limit_client(request: Request) -> str:
+    """속도 제한 키: 유효한 토큰이면 사용자 id, 아니면 클라이언트 IP (임의 헤더 값으로 우회 불가)"""
+    value = request.headers.get("authorization") or request.query_params.get("authorization")
+    if value:
+        user_id = token_store.validate(value[len("Bearer "):] if value.startswith("Bearer ") else value)
+        if user_id is not None:
+            return f"user:{user_id}"
+    return f"ip:{request.client.host if request.client else ''}"
+
+
+@app.middleware("http")
+async def simulate_load(request: Request, call_next):
+    """경로별 속도 제한, 지연, 오류 주입"""
+    decision = simulator.decide(request.url.path, _rate_limit_client(request)) if simulator.enabled else None
+    if decision is None:
+        return await call_next(request)
+    if decision.status == 429:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Rate limit exceeded"},
+            headers={"Retry-After": str(math.ceil(decision.retry_after))},
+        )
+    if decision.delay:
+        await asyncio.sleep(decision.delay)
+    if decision.status is not None:
+        return JSONResponse(status_code=decision.status, content={"detail": "Injected error"})
+    return await call_next(request)
+
+# ============ Paging ============
+
+HISTORY_PAGE_SIZE = 100
+TRENDS_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+MAX_CHART_POINTS = 5000
+# 다운샘플링에 쓰는 원본 점 상한 (넘으면 균등 간격으로 솎아서 계산)
+MAX_DOWNSAMPLE_SOURCE = 50_000
+
+
+def _page(lo: int, hi: int, cursor: Optional[str], limit: int) -> Tuple[int, int, Optional[str]]:
+    try:
+        return page(lo, hi, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # ============ Auth Endpoints ============
 
@@ -101,18 +294,7 @@ async def login(request: LoginRequest):
     if not user or user["password"] != request.password:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    access_token = f"access_{user['id']}"
-    refresh_token = f"refresh_{user['id']}"
-    tokens_db[access_token] = {
-        "user_id": user["id"],
-        "expires": (datetime.now() + timedelta(hours=1)).isoformat(),
-    }
-    
-    return AuthToken(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        expires_in=3600,
-    )
+    return _issue_tokens(user["id"])
 
 @app.post("/auth/signup", response_model=AuthToken)
 async def signup(request: SignupRequest):
@@ -129,18 +311,7 @@ async def signup(request: SignupRequest):
         "created_at": datetime.now().isoformat(),
     }
     
-    access_token = f"access_{user_id}"
-    refresh_token = f"refresh_{user_id}"
-    tokens_db[access_token] = {
-        "user_id": user_id,
-        "expires": (datetime.now() + timedelta(hours=1)).isoformat(),
-    }
-    
-    return AuthToken(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        expires_in=3600,
-    )
+    return _issue_tokens(user_id)
 
 @app.post("/auth/refresh-token", response_model=AuthToken)
 async def refresh_token(refresh_token: str):
@@ -149,29 +320,11 @@ async def refresh_token(refresh_token: str):
         raise HTTPException(status_code=401, detail="Invalid token")
     
     user_id = refresh_token.replace("refresh_", "")
-    access_token = f"access_{user_id}"
-    tokens_db[access_token] = {
-        "user_id": user_id,
-        "expires": (datetime.now() + timedelta(hours=1)).isoformat(),
-    }
-    
-    return AuthToken(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        expires_in=3600,
-    )
+    return _issue_tokens(user_id)
 
 @app.get("/auth/me", response_model=User)
-async def get_me(authorization: str = None):
+async def get_me(user_id: str = Depends(current_user_id)):
     """현재 사용자 정보"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    access_token = authorization.replace("Bearer ", "")
-    if access_token not in tokens_db:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user_id = tokens_db[access_token]["user_id"]
     for user in users_db.values():
         if user["id"] == user_id:
             return User(
@@ -184,25 +337,16 @@ async def get_me(authorization: str = None):
     raise HTTPException(status_code=404, detail="User not found")
 
 @app.post("/auth/logout")
-async def logout(authorization: str = None):
+async def logout(token: str = Depends(bearer_token)):
     """로그아웃"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    access_token = authorization.replace("Bearer ", "")
-    if access_token in tokens_db:
-        del tokens_db[access_token]
-    
+    token_store.revoke(token)
     return {"status": "logged out"}
 
 # ============ Home Endpoints ============
 
 @app.get("/home/health-score")
-async def get_health_score(authorization: str = None):
+async def get_health_score(user_id: str = Depends(current_user_id)):
     """건강 점수 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return HealthScore(
         score=85,
         status="normal",
@@ -210,11 +354,8 @@ async def get_health_score(authorization: str = None):
     )
 
 @app.get("/home/recent-measurements")
-async def get_recent_measurements(authorization: str = None):
+async def get_recent_measurements(user_id: str = Depends(current_user_id)):
     """최근 측정 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return {
         "measurements": [
             {
@@ -233,11 +374,8 @@ async def get_recent_measurements(authorization: str = None):
     }
 
 @app.get("/home/environment")
-async def get_environment_data(authorization: str = None):
+async def get_environment_data(user_id: str = Depends(current_user_id)):
     """환경 데이터 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return {
         "temperature": 22,
         "humidity": 55,
@@ -246,11 +384,8 @@ async def get_environment_data(authorization: str = None):
     }
 
 @app.get("/home/ai-insight")
-async def get_ai_insight(authorization: str = None):
+async def get_ai_insight(user_id: str = Depends(current_user_id)):
     """AI 인사이트 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return {
         "message": "건강한 상태입니다. 계속 좋은 습관을 유지하세요.",
         "severity": "info",
@@ -260,11 +395,8 @@ async def get_ai_insight(authorization: str = None):
 # ============ Measurement Endpoints ============
 
 @app.post("/measurement/start")
-async def start_measurement(measurement_type: str, authorization: str = None):
+async def start_measurement(measurement_type: str, user_id: str = Depends(current_user_id)):
     """측정 시작"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return {
         "session_id": f"session_{measurement_type}",
         "status": "started",
@@ -272,11 +404,8 @@ async def start_measurement(measurement_type: str, authorization: str = None):
     }
 
 @app.get("/measurement/result/{session_id}")
-async def get_measurement_result(session_id: str, authorization: str = None):
+async def get_measurement_result(session_id: str, user_id: str = Depends(current_user_id)):
     """측정 결과 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return {
         "session_id": session_id,
         "value": 85,
@@ -286,45 +415,83 @@ async def get_measurement_result(session_id: str, authorization: str = None):
     }
 
 @app.get("/measurement/history")
-async def get_measurement_history(authorization: str = None):
-    """측정 기록 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    return {
-        "measurements": [
-            {
-                "id": f"m{i}",
-                "type": ["health", "environment", "water"][i % 3],
-                "value": 70 + i,
-                "timestamp": (datetime.now() - timedelta(days=i)).isoformat(),
-            }
-            for i in range(10)
-        ]
-    }
+async def get_measurement_history(
+    cursor: Optional[str] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    user_id: str = Depends(current_user_id),
+):
+    """측정 기록 조회 (최신순, 커서 페이지네이션; 시뮬레이션이 꺼져 있으면 기존 Mock 값 10개)"""
+    datasets = simulator.datasets
+    first, last, next_cursor = _page(*datasets.history_range(start, end), cursor, limit)
+    # 큰 데이터셋: jsonable_encoder 를 거치지 않고 바로 직렬화
+    return JSONResponse({"measurements": list(datasets.history(first, last)), "next_cursor": next_cursor})
 
 # ============ Data Hub Endpoints ============
 
 @app.get("/data-hub/trends")
-async def get_trends(measurement_type: str, authorization: str = None):
-    """추세 데이터 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    return {
-        "type": measurement_type,
-        "data": [
-            {"date": (datetime.now() - timedelta(days=i)).isoformat(), "value": 70 + i}
-            for i in range(30)
-        ],
-    }
+async def get_trends(
+    measurement_type: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(TRENDS_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    points: Optional[int] = Query(None, ge=2, le=MAX_CHART_POINTS),
+    downsample: str = "lttb",
+    user_id: str = Depends(current_user_id),
+):
+    """
+    추세 데이터 조회 (최신순)
+
+    points 가 있으면 구간 전체를 화면 크기에 맞게 다운샘플링
+    - lttb: 모양을 보존하는 원본 점 points 개
+    - minmax: 균등 구간 points 개의 avg (value), min, max
+    원본이 MAX_DOWNSAMPLE_SOURCE 를 넘으면 source_stride 간격으로 솎은 점으로 계산 (count 도 솎은 점 기준)
+    시뮬레이션이 꺼져 있으면 기존 Mock 값 (70 + i, 30일치)
+    """
+    if downsample not in DOWNSAMPLE_METHODS:
+        raise HTTPException(status_code=400, detail=f"downsample must be one of {', '.join(DOWNSAMPLE_METHODS)}")
+    datasets = simulator.datasets
+    lo, hi = datasets.trend_range(start, end)
+    response = {"type": measurement_type, "source_points": hi - lo, "downsample": None}
+
+    if points is None or hi - lo <= points:
+        first, last, next_cursor = _page(lo, hi, cursor, limit)
+        response.update(data=list(datasets.trends(measurement_type, first, last)), next_cursor=next_cursor)
+        return JSONResponse(response)
+
+    stride = max(1, math.ceil((hi - lo) / MAX_DOWNSAMPLE_SOURCE))
+    series = IndexedSeries(partial(datasets.trend_value, measurement_type), lo, hi, stride)
+    # CPU 작업: 이벤트 루프를 막지 않도록 스레드에서 계산
+    data = await asyncio.get_running_loop().run_in_executor(
+        None, _downsample_trends, datasets, series, points, downsample
+    )
+    response.update(data=data, next_cursor=None, downsample=downsample, source_stride=stride)
+    return JSONResponse(response)
+
+
+def _downsample_trends(datasets, series: IndexedSeries, points: int, method: str) -> List[Dict[str, Any]]:
+    anchor = datasets.anchor
+    if method == "lttb":
+        return [
+            {"date": datasets.trend_date(series.source_index(i), anchor), "value": series[i]}
+            for i in lttb(series, points)
+        ]
+    return [
+        {
+            "date": datasets.trend_date(series.source_index((first + last - 1) / 2), anchor),
+            "value": round(avg, 2),
+            "min": low,
+            "max": high,
+            "count": last - first,
+        }
+        for first, last, low, high, avg in minmax_buckets(series, points)
+    ]
 
 @app.post("/data-hub/export")
-async def export_data(format: str, authorization: str = None):
+async def export_data(format: str, user_id: str = Depends(current_user_id)):
     """데이터 내보내기"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return {
         "format": format,
         "url": f"/downloads/data_{datetime.now().timestamp()}.{format.lower()}",
@@ -334,11 +501,8 @@ async def export_data(format: str, authorization: str = None):
 # ============ AI Coach Endpoints ============
 
 @app.post("/coaching/chat")
-async def chat(message: str, authorization: str = None):
+async def chat(message: str, user_id: str = Depends(current_user_id)):
     """AI 채팅"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     # 간단한 Mock 응답
     responses = {
         "건강": "건강 관리에 대해 알려드리겠습니다.",
@@ -360,11 +524,8 @@ async def chat(message: str, authorization: str = None):
 # ============ Marketplace Endpoints ============
 
 @app.get("/marketplace/cartridges")
-async def get_cartridges(category: Optional[str] = None, authorization: str = None):
+async def get_cartridges(category: Optional[str] = None, user_id: str = Depends(current_user_id)):
     """카트리지 목록 조회"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     cartridges = [
         {
             "id": f"cart{i}",
@@ -382,11 +543,8 @@ async def get_cartridges(category: Optional[str] = None, authorization: str = No
     return {"cartridges": cartridges}
 
 @app.post("/marketplace/cart/add")
-async def add_to_cart(cartridge_id: str, authorization: str = None):
+async def add_to_cart(cartridge_id: str, user_id: str = Depends(current_user_id)):
     """장바구니에 추가"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     return {"status": "added", "cartridge_id": cartridge_id}
 
 # ============ Health Check ============
@@ -394,7 +552,12 @@ async def add_to_cart(cartridge_id: str, authorization: str = None):
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
-    return {"status": "ok", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "ok",
+        "timestamp": datetime.now().isoformat(),
+        "tokens": token_store.metrics(),
+        "simulation": simulator.metrics(),
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,371 @@
+"""
+MPS Mock API - 시뮬레이션 모드
+부하 테스트용 대역 (SDK/게이트웨이 클라이언트 오프라인 성능 테스트)
+
+설정 파일 (JSON, MOCK_SIMULATION_CONFIG 환경 변수로 지정) 로 제어:
+- seed: 합성 데이터셋과 지연/오류 샘플링의 시드 (같은 시드 = 같은 응답/순서)
+- datasets: /measurement/history, /data-hub/trends 의 합성 데이터 크기
+    레코드는 인덱스로부터 바로 계산 (크기와 무관하게 메모리 일정)
+- routes: 경로 접두사별 지연 분포, 오류율, 속도 제한 ("default" 는 모든 경로의 기본값)
+- rate_limit: 토큰 버킷 (초당 요청 수, 버스트), 클라이언트별 또는 전역
+
+예시: mock_simulation.example.json
+"""
+
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from mock_series import index_range
+
+MEASUREMENT_TYPES = ("health", "environment", "water")
+LATENCY_DISTRIBUTIONS = ("none", "fixed", "uniform", "normal", "lognormal")
+DEFAULT_EXEMPT_ROUTES = ("/health",)
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(seed: int, index: int, stream: int = 0) -> float:
+    """(seed, index, stream) -> [0, 1) 균등 난수 (splitmix64, 상태 없음)"""
+    z = (seed * 0x9E3779B97F4A7C15 + index * 0xBF58476D1CE4E5B9 + stream * 0x94D049BB133111EB) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return ((z ^ (z >> 31)) >> 11) / float(1 << 53)
+
+
+# ============ 설정 ============
+
+@dataclass
+class LatencyConfig:
+    """
+    지연 분포 (밀리초)
+
+    fixed: value_ms / uniform: min_ms ~ max_ms / normal: mean_ms, stddev_ms
+    lognormal: median_ms, sigma
+    tail_probability 확률로 tail_ms 추가 (느린 꼬리)
+    """
+    distribution: str = "none"
+    value_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0
+    median_ms: float = 0.0
+    sigma: float = 0.5
+    tail_probability: float = 0.0
+    tail_ms: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """지연 샘플 (초)"""
+        if self.distribution == "fixed":
+            ms = self.value_ms
+        elif self.distribution == "uniform":
+            ms = rng.uniform(self.min_ms, self.max_ms)
+        elif self.distribution == "normal":
+            ms = rng.gauss(self.mean_ms, self.stddev_ms)
+        elif self.distribution == "lognormal":
+            ms = self.median_ms * math.exp(rng.gauss(0.0, self.sigma))
+        else:
+            ms = 0.0
+        if self.tail_probability and rng.random() < self.tail_probability:
+            ms += self.tail_ms
+        return max(ms, 0.0) / 1000
+
+
+@dataclass
+class RateLimitConfig:
+    requests_per_second: float = 0.0  # 0 = 제한 없음
+    burst: int = 0  # 0 = requests_per_second 와 같게
+    per: str = "client"  # client | global
+
+
+@dataclass
+class RouteConfig:
+    latency: LatencyConfig = field(default_factory=LatencyConfig)
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (500, 503)
+    rate_limit: Optional[RateLimitConfig] = None
+
+
+@dataclass
+class DatasetConfig:
+    history_size: int = 10
+    history_interval_minutes: float = 1440.0
+    trend_points: int = 30
+    trend_interval_minutes: float = 1440.0
+    anchor: Optional[datetime] = None  # 가장 최근 레코드 시각 (없으면 서버 시작 시각)
+
+
+@dataclass
+class SimulationConfig:
+    enabled: bool = False
+    seed: int = 0
+    datasets: DatasetConfig = field(default_factory=DatasetConfig)
+    routes: Dict[str, RouteConfig] = field(default_factory=dict)
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    exempt_routes: Tuple[str, ...] = DEFAULT_EXEMPT_ROUTES
+
+
+def _dataclass_from(cls, data: Dict[str, Any], where: str):
+    if not isinstance(data, dict):
+        raise ValueError(f"{where} must be an object")
+    known = cls.__dataclass_fields__
+    unknown = set(data) - set(known)
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+    return cls(**data)
+
+
+def _route_config(data: Dict[str, Any], where: str) -> RouteConfig:
+    data = dict(data)
+    latency = _dataclass_from(LatencyConfig, data.pop("latency", {}), f"{where}.latency")
+    if latency.distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"{where}.latency.distribution must be one of {LATENCY_DISTRIBUTIONS}")
+    rate_limit = data.pop("rate_limit", None)
+    route = _dataclass_from(RouteConfig, data, where)
+    route.latency = latency
+    route.error_statuses = tuple(route.error_statuses)
+    if not route.error_statuses or not all(isinstance(s, int) and 400 <= s <= 599 for s in route.error_statuses):
+        raise ValueError(f"{where}.error_statuses must be a non-empty list of 4xx/5xx status codes")
+    if not 0 <= route.error_rate <= 1:
+        raise ValueError(f"{where}.error_rate must be between 0 and 1")
+    if rate_limit is not None:
+        route.rate_limit = _dataclass_from(RateLimitConfig, rate_limit, f"{where}.rate_limit")
+    return route
+
+
+def parse_simulation_config(data: Dict[str, Any]) -> SimulationConfig:
+    """설정 JSON -> SimulationConfig (잘못된 키/값은 ValueError)"""
+    data = dict(data)
+    datasets = dict(data.pop("datasets", {}))
+    if datasets.get("anchor"):
+        datasets["anchor"] = datetime.fromisoformat(datasets["anchor"])
+    routes = data.pop("routes", {})
+    rate_limit = data.pop("rate_limit", {})
+    config = _dataclass_from(SimulationConfig, {"enabled": True, **data}, "simulation")
+    config.datasets = _dataclass_from(DatasetConfig, datasets, "datasets")
+    span = max(
+        config.datasets.history_size * config.datasets.history_interval_minutes,
+        config.datasets.trend_points * config.datasets.trend_interval_minutes,
+    )
+    if span > 1000 * 365 * 1440:
+        raise ValueError("datasets span more than 1000 years; reduce the size or interval")
+    config.routes = {path: _route_config(route, f"routes[{path}]") for path, route in routes.items()}
+    config.rate_limit = _dataclass_from(RateLimitConfig, rate_limit, "rate_limit")
+    config.exempt_routes = tuple(config.exempt_routes)
+    return config
+
+
+def load_simulation_config(path: Optional[str]) -> SimulationConfig:
+    """설정 파일 로드 (경로가 없으면 시뮬레이션 꺼짐)"""
+    if not path:
+        return SimulationConfig()
+    with open(path, encoding="utf-8") as f:
+        return parse_simulation_config(json.load(f))
+
+
+# ============ 합성 데이터셋 ============
+
+class SyntheticDatasets:
+    """
+    시드 기반 합성 데이터셋
+
+    레코드 i 는 (seed, i) 만으로 계산되므로 목록 전체를 만들지 않고
+    임의 구간을 바로 생성할 수 있다.
+
+    legacy=True (시뮬레이션 꺼짐) 이면 기존 Mock 과 같은 값 (값 70 + i, 종류 i % 3,
+    기준 시각 = 요청 시각) 을 돌려준다.
+    """
+
+    def __init__(self, config: DatasetConfig, seed: int, legacy: bool = False):
+        self.config = config
+        self.seed = seed
+        self.legacy = legacy
+        self._started = datetime.now().replace(microsecond=0)
+
+    @property
+    def anchor(self) -> datetime:
+        if self.config.anchor:
+            return self.config.anchor
+        return datetime.now() if self.legacy else self._started
+
+    def history_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, int]:
+        """start <= 시각 <= end 인 측정 기록 인덱스 구간"""
+        interval = timedelta(minutes=self.config.history_interval_minutes)
+        return index_range(self.anchor, interval, self.config.history_size, start, end)
+
+    def history_record(self, index: int, anchor: Optional[datetime] = None) -> Dict[str, Any]:
+        if self.legacy:
+            kind, value = MEASUREMENT_TYPES[index % len(MEASUREMENT_TYPES)], 70 + index
+        else:
+            kind = MEASUREMENT_TYPES[int(_mix(self.seed, index, 1) * len(MEASUREMENT_TYPES))]
+            value = round(60 + 40 * _mix(self.seed, index, 2), 1)
+        anchor = anchor or self.anchor
+        return {
+            "id": f"m{index}",
+            "type": kind,
+            "value": value,
+            "timestamp": (anchor - timedelta(minutes=index * self.config.history_interval_minutes)).isoformat(),
+        }
+
+    def history(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """최신순 측정 기록 [start, stop)"""
+        stop = self.config.history_size if stop is None else min(stop, self.config.history_size)
+        anchor = self.anchor
+        return (self.history_record(i, anchor) for i in range(start, stop))
+
+    def trend_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, int]:
+        """start <= 시각 <= end 인 추세 인덱스 구간"""
+        interval = timedelta(minutes=self.config.trend_interval_minutes)
+        return index_range(self.anchor, interval, self.config.trend_points, start, end)
+
+    def trend_date(self, index: float, anchor: Optional[datetime] = None) -> str:
+        anchor = anchor or self.anchor
+        return (anchor - timedelta(minutes=index * self.config.trend_interval_minutes)).isoformat()
+
+    def trend_value(self, measurement_type: str, index: int) -> float:
+        if self.legacy:
+            return 70 + index
+        # 하루 주기 + 완만한 추세 + 잡음; 측정 종류마다 다른 스트림
+        stream = 10 + sum(map(ord, measurement_type))
+        minutes = index * self.config.trend_interval_minutes
+        daily = 8 * math.sin(2 * math.pi * minutes / 1440)
+        drift = 0.002 * index
+        noise = 6 * (_mix(self.seed, index, stream) - 0.5)
+        return round(70 + daily + drift + noise, 2)
+
+    def trend_point(self, measurement_type: str, index: int, anchor: Optional[datetime] = None) -> Dict[str, Any]:
+        return {"date": self.trend_date(index, anchor), "value": self.trend_value(measurement_type, index)}
+
+    def trends(self, measurement_type: str, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """최신순 추세 [start, stop)"""
+        stop = self.config.trend_points if stop is None else min(stop, self.config.trend_points)
+        anchor = self.anchor
+        return (self.trend_point(measurement_type, i, anchor) for i in range(start, stop))
+
+
+# ============ 속도 제한 / 주입 ============
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """토큰 1개 사용; 성공이면 0, 아니면 다음 토큰까지 대기 시간 (초)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        """가득 찬 버킷은 새 버킷과 같으므로 버려도 된다"""
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    rate_limited: int = 0
+    injected_errors: int = 0
+    injected_latency_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "injected_errors": self.injected_errors,
+            "injected_latency_seconds": round(self.injected_latency_seconds, 3),
+        }
+
+
+@dataclass
+class Decision:
+    """요청 하나에 대한 시뮬레이션 결정"""
+    route: str
+    delay: float = 0.0
+    status: Optional[int] = None  # 주입할 오류 응답 상태
+    retry_after: Optional[float] = None  # 429 일 때
+
+
+class Simulator:
+    # 버킷 수가 이 값 (이후 직전 정리 후의 2배) 에 이르면 가득 찬 버킷 정리
+    MIN_SWEEP_SIZE = 1024
+
+    def __init__(self, config: SimulationConfig, clock=time.monotonic):
+        self.config = config
+        self.clock = clock
+        self.rng = random.Random(config.seed)
+        self.datasets = SyntheticDatasets(config.datasets, config.seed, legacy=not config.enabled)
+        # 긴 접두사부터 매칭
+        self._prefixes = sorted((path for path in config.routes if path != "default"), key=len, reverse=True)
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._sweep_at = self.MIN_SWEEP_SIZE
+        self.stats: Dict[str, RouteStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def route_for(self, path: str) -> Tuple[str, RouteConfig]:
+        for prefix in self._prefixes:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return prefix, self.config.routes[prefix]
+        return "default", self.config.routes.get("default") or RouteConfig()
+
+    def decide(self, path: str, client: str) -> Optional[Decision]:
+        """
+        속도 제한 -> 오류 주입 -> 지연 순서로 결정 (꺼져 있거나 제외 경로면 None)
+
+        client 는 검증된 사용자 id 또는 클라이언트 IP (요청마다 바꿀 수 있는 값이면 제한을 우회할 수 있음)
+        """
+        if not self.enabled or path in self.config.exempt_routes:
+            return None
+        name, route = self.route_for(path)
+        stats = self.stats.setdefault(name, RouteStats())
+        stats.requests += 1
+        decision = Decision(name)
+
+        limit = route.rate_limit or self.config.rate_limit
+        if limit.requests_per_second > 0:
+            key = (name if route.rate_limit else "*", client if limit.per == "client" else "*")
+            now = self.clock()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self._sweep_at:
+                    self._sweep(now)
+                burst = limit.burst or max(limit.requests_per_second, 1)
+                bucket = self._buckets[key] = TokenBucket(limit.requests_per_second, burst, now)
+            wait = bucket.take(now)
+            if wait > 0:
+                stats.rate_limited += 1
+                decision.status, decision.retry_after = 429, wait
+                return decision
+
+        decision.delay = route.latency.sample(self.rng)
+        stats.injected_latency_seconds += decision.delay
+        if route.error_rate and self.rng.random() < route.error_rate:
+            stats.injected_errors += 1
+            decision.status = self.rng.choice(route.error_statuses)
+        return decision
+
+    def _sweep(self, now: float) -> None:
+        """한동안 요청이 없어 가득 찬 버킷 제거 (분할 상환 O(1))"""
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if not bucket.full(now)}
+        self._sweep_at = max(self.MIN_SWEEP_SIZE, 2 * len(self._buckets))
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "rate_limit_buckets": len(self._buckets),
+            "seed": self.config.seed,
+            "routes": {name: stats.to_dict() for name, stats in self.stats.items()},
+        }
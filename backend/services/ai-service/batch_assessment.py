@@ -0,0 +1,206 @@
+"""
+Batch Vitals Assessment - 병동 단위 일괄 진단
+Version: 1.0
+
+MedicalExpertBackedCoach.comprehensive_assessment 의 컬럼 기반 벡터화 버전
+- 혈당/혈압/심박수/체온/SpO2 배열을 한 번에 평가
+- 환자별 경로와 동일한 심각도, 응급 여부, 신뢰도 산출
+- AssessmentResult 객체, datetime, 로그 문자열 생성 없음
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, Iterable[float], float]
+
+# VitalSigns 기본 품질 값과 동일
+DEFAULT_DATA_QUALITY = 0.95
+DEFAULT_SENSOR_QUALITY = 0.92
+
+VITAL_COLUMNS = (
+    "glucose_mg_dl",
+    "systolic_bp",
+    "diastolic_bp",
+    "heart_rate_bpm",
+    "temperature_celsius",
+    "spo2_percent",
+)
+
+
+@dataclass
+class BatchAssessmentResult:
+    """
+    일괄 진단 결과 (환자별 값이 같은 인덱스에 위치)
+
+    유효하지 않은 행은 overall_severity 0, is_emergency False, confidence NaN
+    """
+    is_valid: np.ndarray
+    glucose_severity: np.ndarray
+    bp_severity: np.ndarray
+    hr_severity: np.ndarray
+    temp_severity: np.ndarray
+    overall_severity: np.ndarray
+    is_emergency: np.ndarray
+    confidence: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.is_valid)
+
+    def row(self, index: int) -> Dict:
+        """단일 행을 comprehensive_assessment 요약 필드 형태로 변환"""
+        if not self.is_valid[index]:
+            return {'is_valid': False}
+        return {
+            'overall_severity': int(self.overall_severity[index]),
+            'is_emergency': bool(self.is_emergency[index]),
+            'confidence': float(self.confidence[index]),
+        }
+
+
+def _column(values: ArrayLike, size: int, name: str) -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 0:
+        return np.full(size, float(array))
+    if array.shape != (size,):
+        raise ValueError(f"{name} must have shape ({size},), got {array.shape}")
+    return array
+
+
+def _validate(g, sbp, dbp, hr, temp, spo2) -> np.ndarray:
+    """VitalSigns.validate 와 동일한 범위 검증"""
+    return (
+        (40 <= g) & (g <= 500)
+        & (40 <= sbp) & (sbp <= 200)
+        & (30 <= dbp) & (dbp <= 130)
+        & (0 <= hr) & (hr <= 200)
+        & (25 <= temp) & (temp <= 45)
+        & (0 <= spo2) & (spo2 <= 100)
+        & (sbp > dbp)
+    )
+
+
+def _glucose(g):
+    """assess_glucose 와 동일 (ADA 기준)"""
+    conditions = [g < 40, g < 70, (70 <= g) & (g <= 130), g <= 180, g <= 250]
+    severity = np.select(conditions, [4, 3, 1, 2, 3], default=4)
+    confidence = np.select(conditions, [0.99, 0.90, 0.95, 0.85, 0.85], default=0.90)
+    emergency = (g < 40) | (g > 250)
+    return severity, confidence, emergency
+
+
+def _blood_pressure(sbp, dbp):
+    """assess_blood_pressure 와 동일 (ACC/AHA 기준)"""
+    conditions = [
+        (sbp > 180) | (dbp > 120),
+        (sbp >= 160) | (dbp >= 100),
+        (sbp >= 140) | (dbp >= 90),
+        (sbp >= 130) | (dbp >= 80),
+    ]
+    severity = np.select(conditions, [4, 3, 2, 2], default=1)
+    confidence = np.select(conditions, [0.98, 0.90, 0.88, 0.85], default=0.95)
+    return severity, confidence, conditions[0]
+
+
+def _heart_rate(hr):
+    """assess_heart_rate 와 동일 (WHO 기준)"""
+    conditions = [
+        (hr >= 150) | (hr <= 40),
+        (hr >= 120) | (hr <= 50),
+        (60 <= hr) & (hr <= 100),
+    ]
+    severity = np.select(conditions, [4, 3, 1], default=2)
+    confidence = np.select(conditions, [0.95, 0.85, 0.95], default=0.80)
+    return severity, confidence, conditions[0]
+
+
+def _temperature(temp):
+    """assess_temperature 와 동일"""
+    conditions = [
+        (temp < 35) | (temp > 40),
+        (temp < 36.5) | (temp > 39.5),
+        (36.5 <= temp) & (temp <= 37.5),
+    ]
+    severity = np.select(conditions, [4, 3, 1], default=2)
+    confidence = np.select(conditions, [0.97, 0.90, 0.98], default=0.85)
+    return severity, confidence, conditions[0]
+
+
+def _round3(values: np.ndarray) -> np.ndarray:
+    """
+    파이썬 round(x, 3) 과 비트 단위로 동일한 반올림
+
+    np.round 는 x * 1000 을 거치므로 경계값에서 결과가 달라질 수 있다.
+    신뢰도는 조합 수가 적어 고유값에만 round 를 적용한다.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    rounded = np.fromiter((round(float(v), 3) for v in unique), dtype=np.float64, count=len(unique))
+    return rounded[inverse]
+
+
+def assess_vitals_batch(
+    glucose_mg_dl: ArrayLike,
+    systolic_bp: ArrayLike,
+    diastolic_bp: ArrayLike,
+    heart_rate_bpm: ArrayLike,
+    temperature_celsius: ArrayLike,
+    spo2_percent: ArrayLike,
+    data_quality: ArrayLike = DEFAULT_DATA_QUALITY,
+    sensor_quality: ArrayLike = DEFAULT_SENSOR_QUALITY,
+) -> BatchAssessmentResult:
+    """
+    생리 신호 배열 일괄 평가
+
+    Args:
+        glucose_mg_dl ~ spo2_percent: 환자별 생리 신호 (길이 N)
+        data_quality, sensor_quality: 스칼라 또는 길이 N 배열
+
+    Returns:
+        BatchAssessmentResult (comprehensive_assessment 와 동일한 값)
+    """
+    g = np.asarray(glucose_mg_dl, dtype=np.float64)
+    size = g.shape[0] if g.ndim else 1
+    g = _column(g, size, "glucose_mg_dl")
+    sbp = _column(systolic_bp, size, "systolic_bp")
+    dbp = _column(diastolic_bp, size, "diastolic_bp")
+    hr = _column(heart_rate_bpm, size, "heart_rate_bpm")
+    temp = _column(temperature_celsius, size, "temperature_celsius")
+    spo2 = _column(spo2_percent, size, "spo2_percent")
+    dq = _column(data_quality, size, "data_quality")
+    sq = _column(sensor_quality, size, "sensor_quality")
+
+    is_valid = _validate(g, sbp, dbp, hr, temp, spo2)
+
+    g_sev, g_conf, g_emerg = _glucose(g)
+    bp_sev, bp_conf, bp_emerg = _blood_pressure(sbp, dbp)
+    hr_sev, hr_conf, hr_emerg = _heart_rate(hr)
+    t_sev, t_conf, t_emerg = _temperature(temp)
+
+    overall = np.maximum(np.maximum(g_sev, bp_sev), np.maximum(hr_sev, t_sev))
+    emergency = g_emerg | bp_emerg | hr_emerg | t_emerg
+
+    # comprehensive_assessment 와 같은 연산 순서 (좌→우 합산 후 평균, 품질 보정)
+    confidence = (g_conf + bp_conf + hr_conf + t_conf) / 4 * dq * sq
+    confidence = np.where(is_valid, confidence, np.nan)
+    if is_valid.any():
+        confidence[is_valid] = _round3(confidence[is_valid])
+
+    return BatchAssessmentResult(
+        is_valid=is_valid,
+        glucose_severity=g_sev.astype(np.int8),
+        bp_severity=bp_sev.astype(np.int8),
+        hr_severity=hr_sev.astype(np.int8),
+        temp_severity=t_sev.astype(np.int8),
+        overall_severity=np.where(is_valid, overall, 0).astype(np.int8),
+        is_emergency=emergency & is_valid,
+        confidence=confidence,
+    )
+
+
+def vitals_columns(records: List[Dict]) -> Dict[str, np.ndarray]:
+    """VitalSigns 형태의 dict 목록을 컬럼 배열로 변환"""
+    return {
+        name: np.fromiter((r[name] for r in records), dtype=np.float64, count=len(records))
+        for name in VITAL_COLUMNS
+    }
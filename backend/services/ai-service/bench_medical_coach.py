@@ -0,0 +1,367 @@
+"""
+MedicalExpertBackedCoach 성능 벤치마크
+실행: python bench_medical_coach.py [벤치마크 이름 ...]
+"""
+
+import logging
+import sys
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from medical_coach import MedicalExpertBackedCoach, VitalSigns
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {}
+
+
+def benchmark(func: Callable[[], None]) -> Callable[[], None]:
+    """벤치마크 등록"""
+    BENCHMARKS[func.__name__.replace("bench_", "")] = func
+    return func
+
+
+def _random_vitals(n: int, seed: int = 42) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {
+        "glucose_mg_dl": rng.uniform(45, 400, n).round(),
+        "systolic_bp": rng.integers(90, 200, n).astype(np.float64),
+        "diastolic_bp": rng.integers(50, 89, n).astype(np.float64),
+        "heart_rate_bpm": rng.integers(45, 170, n).astype(np.float64),
+        "temperature_celsius": rng.uniform(35.5, 40.5, n).round(1),
+        "spo2_percent": rng.integers(85, 100, n).astype(np.float64),
+    }
+
+
+def _report(name: str, count: int, seconds: float) -> None:
+    print(f"{name:<40} {count:>10,} items  {seconds * 1000:>10.1f} ms  {count / seconds:>14,.0f} items/s")
+
+
+@benchmark
+def bench_batch_assessment() -> None:
+    """comprehensive_assessment 반복 vs assess_vitals_batch"""
+    from batch_assessment import assess_vitals_batch
+
+    n = 100_000
+    columns = _random_vitals(n)
+
+    sample = 10_000
+    coach = MedicalExpertBackedCoach("bench")
+    records = [
+        VitalSigns(**{k: v[i] for k, v in columns.items()})
+        for i in range(sample)
+    ]
+    start = time.perf_counter()
+    for vitals in records:
+        coach.comprehensive_assessment(vitals)
+    _report("per-patient comprehensive_assessment", sample, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    assess_vitals_batch(**columns)
+    _report("assess_vitals_batch", n, time.perf_counter() - start)
+
+
+@benchmark
+def bench_emergency_stream() -> None:
+    """50k events/s 실시간 재생 시 응급 감지 지연 (p50/p99)"""
+    from emergency_stream import StreamingEmergencyDetector
+
+    rate = 50_000
+    n = 150_000
+    patients = 10_000
+    columns = _random_vitals(n, seed=7)
+    rng = np.random.default_rng(7)
+    patient_ids = [f"patient_{i}" for i in rng.integers(0, patients, n)]
+
+    for mode in ("push", "push_batch"):
+        detector = StreamingEmergencyDetector(dedup_window=60.0, clock=time.perf_counter)
+        arrivals = time.perf_counter() + 0.01 + np.arange(n) / rate
+        index = 0
+        start = time.perf_counter()
+        while index < n:
+            ready = int(np.searchsorted(arrivals, time.perf_counter(), side="right"))
+            if ready <= index:
+                continue
+            if mode == "push":
+                for i in range(index, ready):
+                    detector.push(
+                        patient_ids[i],
+                        *(float(columns[k][i]) for k in columns),
+                        received_at=float(arrivals[i]),
+                    )
+            else:
+                detector.push_batch(
+                    patient_ids[index:ready],
+                    *(columns[k][index:ready] for k in columns),
+                    received_at=arrivals[index:ready],
+                )
+            index = ready
+        elapsed = time.perf_counter() - start
+        stats = detector.stats
+        print(
+            f"{mode:<12} {stats.events:>8,} events in {elapsed:.2f}s "
+            f"({stats.events / elapsed:,.0f}/s offered {rate:,}/s)  "
+            f"alerts={stats.alerts:,} suppressed={stats.suppressed:,}  "
+            f"p50={stats.latency_percentile(50) * 1e6:.0f}us "
+            f"p99={stats.latency_percentile(99) * 1e6:.0f}us "
+            f"over_budget={stats.budget_violations}"
+        )
+
+
+@benchmark
+def bench_assessment_serialization() -> None:
+    """asdict 기반 to_dict vs 직접 to_dict / to_json_bytes"""
+    import dataclasses
+    import json
+
+    def legacy_to_dict(result):
+        data = dataclasses.asdict(result)
+        data['vital_sign_type'] = result.vital_sign_type.value
+        data['severity_level'] = result.severity_level.value
+        return data
+
+    coach = MedicalExpertBackedCoach("bench")
+    results = [
+        assess(value)
+        for value in (35, 55, 100, 150, 200, 300)
+        for assess in (coach.assess_glucose,)
+    ] + [coach.assess_blood_pressure(120, 80), coach.assess_blood_pressure(190, 125)]
+    n = 20_000
+    workload = [results[i % len(results)] for i in range(n)]
+
+    cases = [
+        ("legacy asdict + json.dumps", lambda r: json.dumps(legacy_to_dict(r), default=str).encode()),
+        ("to_dict + json.dumps", lambda r: json.dumps(r.to_dict(), default=str).encode()),
+        ("legacy asdict only", legacy_to_dict),
+        ("to_dict only", lambda r: r.to_dict()),
+        ("to_json_bytes", lambda r: r.to_json_bytes()),
+    ]
+    try:
+        import orjson
+        cases.append(("to_dict + orjson.dumps", lambda r: orjson.dumps(r.to_dict())))
+    except ImportError:
+        pass
+
+    for name, serialize in cases:
+        start = time.perf_counter()
+        for result in workload:
+            serialize(result)
+        _report(name, n, time.perf_counter() - start)
+
+
+@benchmark
+def bench_vitals_window() -> None:
+    """100k 모니터링 환자 롤링 윈도우 갱신 + 변화율 규칙 평가"""
+    from vitals_window import VitalsWindowStore, VITAL_FIELDS
+
+    patients = 100_000
+    ticks = 20
+    store = VitalsWindowStore(window_size=12, capacity=patients)
+    slots = store.slots([f"patient_{i}" for i in range(patients)])
+    columns = _random_vitals(patients, seed=11)
+    values = np.column_stack([columns[name] for name in VITAL_FIELDS])
+    rng = np.random.default_rng(11)
+
+    start = time.perf_counter()
+    alerts = 0
+    for tick in range(ticks):
+        values[:, 0] += rng.normal(0, 8, patients)
+        store.push_batch(slots, values, np.full(patients, tick * 300.0))
+        alerts += sum(len(hits) for hits in store.triggered_slots().values())
+    elapsed = time.perf_counter() - start
+    _report(f"push_batch + triggered_slots ({patients:,} pts)", patients * ticks, elapsed)
+    print(f"{'':<40} {elapsed / ticks * 1000:.1f} ms per full-ward tick, {alerts:,} rule hits")
+
+    sample = 50_000
+    vitals = [VitalSigns(*(float(v) for v in values[i])) for i in range(sample)]
+    start = time.perf_counter()
+    for i in range(sample):
+        patient_id = f"patient_{i}"
+        store.push(patient_id, vitals[i], timestamp=ticks * 300.0)
+        store.evaluate_trends(patient_id)
+    _report("push + evaluate_trends (per reading)", sample, time.perf_counter() - start)
+
+
+@benchmark
+def bench_event_logging() -> None:
+    """INFO 로깅 활성 상태의 comprehensive_assessment 처리량 (동기 기록 vs 샘플링 + 백그라운드 기록)"""
+    import os
+    import tempfile
+    from event_log import BatchingLogHandler, StructuredEventLogger, install_batching_handler
+
+    n = 20_000
+    # 정상 위주 트래픽 (응급 1%)
+    records = [VitalSigns(400.0 if i % 100 == 0 else 100.0, 115, 75, 72, 36.8, 98) for i in range(n)]
+
+    bench_logger = logging.getLogger("bench_event_logging")
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logging.disable(logging.NOTSET)
+    try:
+        for name, sample_rate, background in (
+            ("sync handler, sample 1.0", 1.0, False),
+            ("sync handler, sample 0.01", 0.01, False),
+            ("batching writer, sample 1.0", 1.0, True),
+            ("batching writer, sample 0.01", 0.01, True),
+        ):
+            target = logging.FileHandler(os.devnull)
+            target.setFormatter(formatter)
+            handler = install_batching_handler(bench_logger, target) if background else target
+            if not background:
+                bench_logger.addHandler(target)
+            coach = MedicalExpertBackedCoach("bench")
+            coach.events = StructuredEventLogger(bench_logger, info_sample_rate=sample_rate)
+
+            start = time.perf_counter()
+            for vitals in records:
+                coach.comprehensive_assessment(vitals)
+            handler.flush()  # 백그라운드 기록까지 끝난 시점으로 측정
+            elapsed = time.perf_counter() - start
+            bench_logger.removeHandler(handler)
+            handler.close()
+            _report(name, n, elapsed)
+
+        # 기록 스레드 비용만: 큐에 쌓인 레코드를 파일로 기록하는 시간 (레코드 단위 vs 배치)
+        queued = [
+            logging.makeLogRecord(
+                {"name": "bench", "levelno": logging.INFO, "levelname": "INFO", "msg": f"NORMAL assessment for p{i}"}
+            )
+            for i in range(n)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            for batch_size in (1, 256):
+                target = logging.FileHandler(os.path.join(tmp, f"events-{batch_size}.log"))
+                target.setFormatter(formatter)
+                handler = BatchingLogHandler(target, batch_size=batch_size)
+                target.acquire()
+                for record in queued:
+                    handler.handle(record)
+                start = time.perf_counter()
+                target.release()
+                handler.flush(timeout=60)
+                elapsed = time.perf_counter() - start
+                handler.close()
+                _report(f"writer drain to file, batch_size={batch_size}", n, elapsed)
+    finally:
+        logging.disable(logging.CRITICAL)
+
+
+@benchmark
+def bench_vitals_dataset() -> None:
+    """테스트 케이스 로드 + 일괄 평가: json.load vs 컬럼형 memmap"""
+    import json
+    import tempfile
+    from pathlib import Path
+    from batch_assessment import assess_vitals_batch, vitals_columns
+    from vitals_dataset import load_dataset, write_test_cases
+
+    source = Path(__file__).resolve().parents[3] / "medical_test_cases_100.json"
+    with open(source, encoding="utf-8") as f:
+        data = json.load(f)
+    repeat = 2_000
+    cases = [dict(case, case_id=r * 1000 + case["case_id"]) for r in range(repeat) for case in data["test_cases"]]
+    n = len(cases)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "cases.json"
+        dataset_path = Path(tmp) / "cases.mvd"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"metadata": data["metadata"], "test_cases": cases}, f, ensure_ascii=False)
+        write_test_cases(dataset_path, cases, data["metadata"])
+        print(f"{'':<40} json {json_path.stat().st_size / 1e6:.1f} MB, "
+              f"columnar {dataset_path.stat().st_size / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        with open(json_path, encoding="utf-8") as f:
+            loaded = json.load(f)["test_cases"]
+        assess_vitals_batch(**vitals_columns([case["vitals"] for case in loaded]))
+        _report("json.load + vitals_columns + assess", n, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        assess_vitals_batch(**load_dataset(dataset_path).vitals_columns())
+        _report("load_dataset (memmap) + assess", n, time.perf_counter() - start)
+
+
+@benchmark
+def bench_message_bundles() -> None:
+    """코칭 문구 현지화: 문구당 HTTP 호출 (로컬 루프백) vs mmap 번들 ID 조회"""
+    import json
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import httpx
+    from message_bundles import build_bundles, load_bundles
+
+    coach = MedicalExpertBackedCoach("bench_bundles")
+    vitals = VitalSigns(
+        glucose_mg_dl=320, systolic_bp=185, diastolic_bp=125, heart_rate_bpm=155,
+        temperature_celsius=39.5, spo2_percent=88,
+    )
+    report = coach.comprehensive_assessment(vitals)
+    texts = [text for assessment in report["assessments"]
+             for text in (assessment["diagnosis"], *assessment["recommendations"])]
+    n = 20_000
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            payload = json.dumps({"data": {"translated_text": "[EN] " + body["text"]}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    calls = 500
+    with httpx.Client(base_url=f"http://127.0.0.1:{server.server_port}") as client:
+        start = time.perf_counter()
+        for i in range(calls):
+            client.post("/api/v1/translate", json={"text": texts[i % len(texts)], "target_language": "en"})
+        _report("HTTP call per string (loopback)", calls, time.perf_counter() - start)
+    server.shutdown()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        build = build_bundles(tmp, ["ko", "en", "ja"], lambda batch, source, target: [f"[{target}] {t}" for t in batch])
+        print(f"{'':<40} build {build['messages']} messages x 3 languages: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        start = time.perf_counter()
+        messages = load_bundles(tmp)
+        print(f"{'':<40} load_bundles (mmap): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        message_ids = [messages.message_id(text) for text in texts]
+        start = time.perf_counter()
+        for i in range(n):
+            messages.text(message_ids[i % len(message_ids)], "en")
+        _report("bundle lookup by message ID", n, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(n):
+            messages.localize(texts[i % len(texts)], "en")
+        _report("bundle localize(text)", n, time.perf_counter() - start)
+        messages.close()
+
+
+def main(argv) -> int:
+    logging.disable(logging.CRITICAL)
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            return 1
+        print(f"\n== {name} ==")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,301 @@
+"""
+Streaming Emergency Detector - 실시간 응급 감지 스트림
+Version: 1.0
+
+MedicalExpertBackedCoach.emergency_detection 의 스트리밍 버전
+- 다수 환자의 생리 신호 이벤트를 연속 처리
+- 환자별 상태를 고정 크기 배열(슬롯)로 유지
+- 동일 응급 사유 중복 알림 억제 (설정 가능한 시간 창)
+- 감지 지연 시간 측정 및 예산 초과 집계
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntFlag
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmergencyReason(IntFlag):
+    """응급 사유 (비트 플래그)"""
+    SEVERE_HYPOGLYCEMIA = 1
+    DKA_RISK = 2
+    HYPERTENSIVE_CRISIS = 4
+    CRITICAL_HEART_RATE = 8
+    EXTREME_TEMPERATURE = 16
+    HYPOXIA = 32
+
+
+@dataclass
+class EmergencyEvent:
+    """응급 알림 이벤트"""
+    patient_id: str
+    reasons: EmergencyReason
+    glucose_mg_dl: float
+    systolic_bp: float
+    diastolic_bp: float
+    heart_rate_bpm: float
+    temperature_celsius: float
+    spo2_percent: float
+    received_at: float
+    detected_at: float
+
+    @property
+    def latency(self) -> float:
+        """수신부터 감지까지 걸린 시간 (초)"""
+        return self.detected_at - self.received_at
+
+    def reason_texts(self) -> List[str]:
+        """emergency_detection 과 동일한 사유 문자열 (필요할 때만 생성)"""
+        texts = []
+        if self.reasons & EmergencyReason.SEVERE_HYPOGLYCEMIA:
+            texts.append("심각한 저혈당 (< 40 mg/dL)")
+        if self.reasons & EmergencyReason.DKA_RISK:
+            texts.append("당뇨병성 케톤산증 위험 (고혈당 + 저산소)")
+        if self.reasons & EmergencyReason.HYPERTENSIVE_CRISIS:
+            texts.append("고혈압 위기 (SBP > 180 AND DBP > 120)")
+        if self.reasons & EmergencyReason.CRITICAL_HEART_RATE:
+            texts.append(f"위험한 심박수 ({self.heart_rate_bpm} bpm)")
+        if self.reasons & EmergencyReason.EXTREME_TEMPERATURE:
+            texts.append(f"극단적 체온 ({self.temperature_celsius}°C)")
+        if self.reasons & EmergencyReason.HYPOXIA:
+            texts.append("저산소증 (SpO2 < 90%)")
+        return texts
+
+
+def emergency_reasons(glucose, systolic, diastolic, heart_rate, temperature, spo2) -> int:
+    """단일 측정값의 응급 사유 비트마스크 (emergency_detection 과 동일한 규칙)"""
+    mask = 0
+    if glucose < 40:
+        mask |= EmergencyReason.SEVERE_HYPOGLYCEMIA
+    elif glucose > 350 and spo2 < 92:
+        mask |= EmergencyReason.DKA_RISK
+    if systolic > 180 and diastolic > 120:
+        mask |= EmergencyReason.HYPERTENSIVE_CRISIS
+    if heart_rate > 150 or heart_rate < 40:
+        mask |= EmergencyReason.CRITICAL_HEART_RATE
+    if temperature < 35 or temperature > 40:
+        mask |= EmergencyReason.EXTREME_TEMPERATURE
+    if spo2 < 90:
+        mask |= EmergencyReason.HYPOXIA
+    return int(mask)
+
+
+def emergency_reasons_batch(glucose, systolic, diastolic, heart_rate, temperature, spo2) -> np.ndarray:
+    """배열 입력의 응급 사유 비트마스크 (uint8)"""
+    glucose = np.asarray(glucose)
+    spo2 = np.asarray(spo2)
+    heart_rate = np.asarray(heart_rate)
+    temperature = np.asarray(temperature)
+    hypo = glucose < 40
+    mask = hypo * np.uint8(EmergencyReason.SEVERE_HYPOGLYCEMIA)
+    mask |= (~hypo & (glucose > 350) & (spo2 < 92)) * np.uint8(EmergencyReason.DKA_RISK)
+    mask |= ((np.asarray(systolic) > 180) & (np.asarray(diastolic) > 120)) * np.uint8(EmergencyReason.HYPERTENSIVE_CRISIS)
+    mask |= ((heart_rate > 150) | (heart_rate < 40)) * np.uint8(EmergencyReason.CRITICAL_HEART_RATE)
+    mask |= ((temperature < 35) | (temperature > 40)) * np.uint8(EmergencyReason.EXTREME_TEMPERATURE)
+    mask |= (spo2 < 90) * np.uint8(EmergencyReason.HYPOXIA)
+    return mask.astype(np.uint8)
+
+
+@dataclass
+class DetectorStats:
+    """스트림 처리 통계 (지연은 최근 max_latency_samples 개를 링 버퍼에 보관)"""
+    events: int = 0
+    alerts: int = 0
+    suppressed: int = 0
+    budget_violations: int = 0
+    max_latency_samples: int = 100_000
+    latency_count: int = 0
+    _latency_ring: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.max_latency_samples < 1:
+            raise ValueError("max_latency_samples must be at least 1")
+        self._latency_ring = np.empty(self.max_latency_samples)
+
+    def record_latency(self, latency: float) -> None:
+        self._latency_ring[self.latency_count % self.max_latency_samples] = latency
+        self.latency_count += 1
+
+    @property
+    def latencies(self) -> np.ndarray:
+        """보관 중인 지연 샘플 (순서 무관)"""
+        return self._latency_ring[:min(self.latency_count, self.max_latency_samples)]
+
+    def latency_percentile(self, q: float) -> float:
+        """최근 알림 감지 지연 백분위수 (초)"""
+        if not self.latency_count:
+            return 0.0
+        return float(np.percentile(self.latencies, q))
+
+
+class StreamingEmergencyDetector:
+    """
+    다중 환자 스트리밍 응급 감지기
+
+    환자 ID 를 슬롯 인덱스로 매핑하고, 마지막 알림 시각과 사유를
+    슬롯 배열에 저장한다. 직전 알림 사유에 포함되는 응급은
+    dedup_window 초 동안 다시 알리지 않는다.
+    """
+
+    def __init__(
+        self,
+        on_emergency: Optional[Callable[[EmergencyEvent], None]] = None,
+        dedup_window: float = 300.0,
+        latency_budget: float = 0.005,
+        capacity: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        max_latency_samples: int = 100_000,
+    ):
+        """
+        초기화
+
+        Args:
+            on_emergency: 알림 콜백
+            dedup_window: 중복 알림 억제 시간 창 (초)
+            latency_budget: 감지 지연 예산 (초)
+            capacity: 초기 환자 슬롯 수 (1 이상, 부족하면 두 배로 확장)
+            clock: 시각 함수 (received_at 과 같은 기준이어야 함)
+            max_latency_samples: 보관할 최근 지연 샘플 수 (1 이상)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.on_emergency = on_emergency
+        self.dedup_window = dedup_window
+        self.latency_budget = latency_budget
+        self.clock = clock
+        self.max_latency_samples = max_latency_samples
+        self.stats = DetectorStats(max_latency_samples=max_latency_samples)
+
+        self._slots: Dict[str, int] = {}
+        self._last_alert_time = np.full(capacity, -np.inf)
+        self._last_alert_mask = np.zeros(capacity, dtype=np.uint8)
+
+    @property
+    def patient_count(self) -> int:
+        return len(self._slots)
+
+    def _slot(self, patient_id: str) -> int:
+        slot = self._slots.get(patient_id)
+        if slot is None:
+            slot = len(self._slots)
+            if slot == len(self._last_alert_time):
+                self._last_alert_time = np.concatenate(
+                    [self._last_alert_time, np.full(slot, -np.inf)]
+                )
+                self._last_alert_mask = np.concatenate(
+                    [self._last_alert_mask, np.zeros(slot, dtype=np.uint8)]
+                )
+            self._slots[patient_id] = slot
+        return slot
+
+    def push(
+        self,
+        patient_id: str,
+        glucose_mg_dl: float,
+        systolic_bp: float,
+        diastolic_bp: float,
+        heart_rate_bpm: float,
+        temperature_celsius: float,
+        spo2_percent: float,
+        received_at: Optional[float] = None,
+    ) -> Optional[EmergencyEvent]:
+        """
+        단일 이벤트 처리
+
+        Returns:
+            알림이 발생하면 EmergencyEvent, 아니면 None
+        """
+        if received_at is None:
+            received_at = self.clock()
+        self.stats.events += 1
+        mask = emergency_reasons(
+            glucose_mg_dl, systolic_bp, diastolic_bp,
+            heart_rate_bpm, temperature_celsius, spo2_percent,
+        )
+        if not mask:
+            return None
+        return self._maybe_fire(
+            patient_id, mask,
+            (glucose_mg_dl, systolic_bp, diastolic_bp,
+             heart_rate_bpm, temperature_celsius, spo2_percent),
+            received_at,
+        )
+
+    def push_batch(
+        self,
+        patient_ids: Sequence[str],
+        glucose_mg_dl,
+        systolic_bp,
+        diastolic_bp,
+        heart_rate_bpm,
+        temperature_celsius,
+        spo2_percent,
+        received_at=None,
+    ) -> List[EmergencyEvent]:
+        """
+        컬럼 배열 이벤트 일괄 처리 (배열 순서 = 도착 순서)
+
+        응급 판정은 벡터화하고, 응급 행만 순서대로 중복 억제를 적용한다.
+        """
+        columns = [np.asarray(c, dtype=np.float64) for c in (
+            glucose_mg_dl, systolic_bp, diastolic_bp,
+            heart_rate_bpm, temperature_celsius, spo2_percent,
+        )]
+        count = len(patient_ids)
+        if received_at is None:
+            received_at = np.full(count, self.clock())
+        else:
+            received_at = np.broadcast_to(np.asarray(received_at, dtype=np.float64), (count,))
+        self.stats.events += count
+
+        masks = emergency_reasons_batch(*columns)
+        fired = []
+        for i in np.flatnonzero(masks):
+            event = self._maybe_fire(
+                patient_ids[i], int(masks[i]),
+                tuple(float(c[i]) for c in columns),
+                float(received_at[i]),
+            )
+            if event is not None:
+                fired.append(event)
+        return fired
+
+    def _maybe_fire(self, patient_id, mask, values, received_at) -> Optional[EmergencyEvent]:
+        slot = self._slot(patient_id)
+        now = self.clock()
+        last_mask = int(self._last_alert_mask[slot])
+        in_window = now - self._last_alert_time[slot] < self.dedup_window
+        if in_window and mask & ~last_mask == 0:
+            self.stats.suppressed += 1
+            return None
+
+        # 시간 창 안에서는 이미 알린 사유를 누적 (A -> B -> A 가 A 를 다시 알리지 않도록)
+        self._last_alert_time[slot] = now
+        self._last_alert_mask[slot] = last_mask | mask if in_window else mask
+        event = EmergencyEvent(patient_id, EmergencyReason(mask), *values, received_at, now)
+
+        stats = self.stats
+        stats.alerts += 1
+        latency = now - received_at
+        stats.record_latency(latency)
+        if latency > self.latency_budget:
+            stats.budget_violations += 1
+            logger.warning("Emergency detection latency %.3f ms over budget for %s",
+                           latency * 1000, patient_id)
+
+        logger.critical("EMERGENCY for %s: %s", patient_id, event.reasons)
+        if self.on_emergency is not None:
+            self.on_emergency(event)
+        return event
+
+    def reset_patient(self, patient_id: str) -> None:
+        """환자 알림 상태 초기화 (예: 응급 처치 완료 후)"""
+        slot = self._slots.get(patient_id)
+        if slot is not None:
+            self._last_alert_time[slot] = -np.inf
+            self._last_alert_mask[slot] = 0
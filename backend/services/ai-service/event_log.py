@@ -0,0 +1,273 @@
+"""
+Structured Event Logging - 의료 코치 구조화 로깅
+Version: 1.0
+
+- 이벤트 이름 + 필드로 기록, 메시지 문자열은 핸들러가 출력할 때만 생성
+  (리스트 등 가변 필드는 기록 시점에 tuple 로 고정)
+- INFO 결과는 설정한 비율로 샘플링
+- 표준 QueueHandler + 기록 스레드로 일괄 기록 (요청 경로에서 I/O 제거)
+- CRITICAL / 응급 이벤트는 샘플링·큐 초과와 무관하게 항상 기록
+"""
+
+import logging
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler
+from typing import Callable, Dict, Optional
+
+# 이벤트별 사람이 읽는 메시지 템플릿 (기존 로그 문구 유지)
+EVENT_MESSAGES: Dict[str, str] = {
+    "critical_glucose": "CRITICAL GLUCOSE: {glucose_mg_dl} mg/dL for {patient_id}",
+    "critical_bp": "CRITICAL BP: {systolic}/{diastolic} for {patient_id}",
+    "invalid_vitals": "Invalid vital signs: {errors}",
+    "emergency_assessment": "EMERGENCY DETECTED for {patient_id}: {risk_factors}",
+    "urgent_assessment": "URGENT assessment for {patient_id}: {risk_factors}",
+    "normal_assessment": "NORMAL assessment for {patient_id}",
+    "emergency_detection": "EMERGENCY for {patient_id}: {reasons}",
+}
+
+
+class EventMessage:
+    """지연 포맷 메시지 (str() 호출 시에만 문자열 생성)"""
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: Dict):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self) -> str:
+        # 고정된 tuple 필드도 기존 문구처럼 리스트 모양으로 출력
+        fields = {k: list(v) if type(v) is tuple else v for k, v in self.fields.items()}
+        template = EVENT_MESSAGES.get(self.event)
+        if template is not None:
+            return template.format(**fields)
+        return " ".join([self.event] + [f"{k}={v}" for k, v in fields.items()])
+
+
+def _snapshot(fields: Dict) -> Dict:
+    """호출자가 나중에 바꿔도 기록 내용이 변하지 않도록 가변 필드 고정"""
+    for key, value in fields.items():
+        if isinstance(value, (list, set)):
+            fields[key] = tuple(value)
+        elif isinstance(value, dict):
+            fields[key] = dict(value)
+    return fields
+
+
+class StructuredEventLogger:
+    """
+    구조화 이벤트 로거
+
+    레코드에는 event / event_fields 속성이 추가되어 JSON 포매터 등에서
+    그대로 사용할 수 있다.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        info_sample_rate: float = 1.0,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        초기화
+
+        Args:
+            logger: 기록할 표준 로거
+            info_sample_rate: INFO 이벤트 기록 비율 (0-1)
+            rng: 샘플링 난수 함수
+        """
+        self.logger = logger
+        self.info_sample_rate = info_sample_rate
+        self.rng = rng
+        self.sampled_out = 0
+
+    def critical(self, event: str, **fields) -> None:
+        """CRITICAL 이벤트 (항상 기록, 응급 표시)"""
+        self._emit(logging.CRITICAL, event, fields, emergency=True)
+
+    def error(self, event: str, **fields) -> None:
+        self._emit(logging.ERROR, event, fields)
+
+    def warning(self, event: str, **fields) -> None:
+        self._emit(logging.WARNING, event, fields)
+
+    def info(self, event: str, **fields) -> None:
+        """INFO 이벤트 (info_sample_rate 비율로 샘플링)"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if self.info_sample_rate < 1.0 and self.rng() >= self.info_sample_rate:
+            self.sampled_out += 1
+            return
+        self._emit(logging.INFO, event, fields)
+
+    def _emit(self, level: int, event: str, fields: Dict, emergency: bool = False) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        fields = _snapshot(fields)
+        self.logger.log(
+            level,
+            EventMessage(event, fields),
+            extra={"event": event, "event_fields": fields, "emergency": emergency},
+            stacklevel=3,
+        )
+
+
+class _FlushMarker:
+    """flush() 가 큐에 넣는 표식: 앞선 레코드가 기록되면 done 이 설정됨"""
+
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class BatchingLogHandler(QueueHandler):
+    """
+    백그라운드 일괄 기록 핸들러 (표준 QueueHandler + 기록 스레드)
+
+    emit() 은 레코드를 큐에 넣기만 하고, 기록 스레드가 큐에 쌓인 레코드를
+    최대 batch_size 개씩 꺼내 대상 핸들러 잠금 한 번 안에서 기록한 뒤
+    flush 도 배치당 한 번만 한다. StreamHandler 계열 대상은 배치를 한 번의
+    write 로 기록한다. 큐가 max_queue 를 넘으면 ERROR 미만의 일반 레코드만
+    버리며, CRITICAL/응급 레코드는 절대 버리지 않는다. 메시지 포맷은 기록
+    스레드에서 한다 (prepare 에서 미리 포맷하지 않음).
+
+    written 은 기록에 성공한 레코드 수, failed 는 포맷/쓰기에 실패한 수.
+    StreamHandler 가 아닌 대상이 emit 안에서 스스로 삼킨 오류는 집계되지 않는다.
+    """
+
+    def __init__(self, target: logging.Handler, max_queue: int = 100_000, batch_size: int = 256):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        super().__init__(queue.Queue())
+        self.target = target
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self._writer = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._writer.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if (
+            self.queue.qsize() >= self.max_queue
+            and record.levelno < logging.ERROR
+            and not getattr(record, "emergency", False)
+        ):
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+    def _run(self) -> None:
+        records = self.queue
+        while True:
+            batch = [records.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch([item for item in batch if isinstance(item, logging.LogRecord)])
+            stop = False
+            for item in batch:
+                if isinstance(item, _FlushMarker):
+                    item.done.set()
+                elif item is _STOP:
+                    stop = True
+                records.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch) -> None:
+        target = self.target
+        batch = [record for record in batch if target.filter(record)]
+        if not batch:
+            return
+        self.batches += 1
+        target.acquire()
+        try:
+            if isinstance(target, logging.StreamHandler) and target.stream is not None:
+                self._write_stream(target, batch)
+            else:
+                for record in batch:
+                    try:
+                        target.emit(record)
+                    except Exception:
+                        self._failed(record)
+                    else:
+                        self.written += 1
+            target.flush()
+        finally:
+            target.release()
+
+    def _write_stream(self, target: logging.StreamHandler, batch) -> None:
+        parts = []
+        for record in batch:
+            try:
+                parts.append(target.format(record) + target.terminator)
+            except Exception:
+                self._failed(record)
+        if not parts:
+            return
+        try:
+            target.stream.write("".join(parts))
+        except Exception:
+            self._failed(batch[-1], len(parts))
+        else:
+            self.written += len(parts)
+
+    def _failed(self, record: logging.LogRecord, count: int = 1) -> None:
+        self.failed += count
+        self.handleError(record)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """지금까지 큐에 넣은 레코드가 모두 기록될 때까지 대기 (최대 timeout 초)"""
+        if self._writer.is_alive():
+            marker = _FlushMarker()
+            self.queue.put_nowait(marker)
+            marker.done.wait(timeout)
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self.queue.put_nowait(_STOP)
+            self._writer.join()
+            self.target.close()
+        super().close()
+
+
+def install_batching_handler(
+    logger: logging.Logger,
+    target: logging.Handler,
+    **options,
+) -> BatchingLogHandler:
+    """
+    로거에 백그라운드 기록 핸들러 설치
+
+    Returns:
+        설치된 BatchingLogHandler (종료 시 close() 호출)
+    """
+    handler = BatchingLogHandler(target, **options)
+    logger.addHandler(handler)
+    return handler
+
+
+def configure_event_logging(
+    events: StructuredEventLogger,
+    info_sample_rate: Optional[float] = None,
+) -> StructuredEventLogger:
+    """샘플링 비율 등 설정 변경"""
+    if info_sample_rate is not None:
+        if not 0.0 <= info_sample_rate <= 1.0:
+            raise ValueError("info_sample_rate must be between 0 and 1")
+        events.info_sample_rate = info_sample_rate
+    return events
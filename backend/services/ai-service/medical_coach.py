@@ -12,11 +12,23 @@ Created: 2026-01-02
 import logging
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from enum import Enum
+import itertools
 import json
+import os
+import secrets
+
+from event_log import StructuredEventLogger
+
+try:
+    import orjson
+except ImportError:  # requirements.txt 밖(루트 스크립트 등)에서는 json 으로 직렬화
+    orjson = None
 
 logger = logging.getLogger(__name__)
+# 구조화 이벤트 로거 (INFO 샘플링: configure_event_logging(events, info_sample_rate=...))
+events = StructuredEventLogger(logger)
 
 
 class SeverityLevel(Enum):
@@ -77,7 +89,58 @@ class VitalSigns:
         return asdict(self)
 
 
-@dataclass
+# ==================== 권장사항 (심각도 구간별 공유 상수) ====================
+
+GLUCOSE_SEVERE_HYPO_RECOMMENDATIONS = (
+    "즉시 응급실로 이동",
+    "포도당 IV 투여 필요",
+    "가족/보호자에게 알림",
+    "의료 기록 자동 전송",
+)
+GLUCOSE_HYPO_RECOMMENDATIONS = (
+    "즉시 탄수화물 섭취 (포도당, 주스 등)",
+    "15분 후 재측정",
+    "의료진 상담 권장",
+)
+GLUCOSE_NORMAL_RECOMMENDATIONS = (
+    "현재 관리 방식 유지",
+    "정기적 모니터링 계속",
+)
+GLUCOSE_HIGH_RECOMMENDATIONS = (
+    "인슐린 투여 검토",
+    "의료진 상담",
+    "2시간 후 재측정",
+)
+GLUCOSE_SEVERE_HYPER_RECOMMENDATIONS = (
+    "즉시 응급실 방문",
+    "혈중 케톤 검사",
+    "인슐린 IV 투여 필요",
+    "전해질 모니터링",
+)
+BP_CRISIS_RECOMMENDATIONS = (
+    "즉시 응급실 방문",
+    "혈압강하제 IV 투여",
+    "신경학적 검사",
+    "장기 모니터링",
+)
+BP_STAGE2_RECOMMENDATIONS = (
+    "의료진 상담 필수",
+    "약물 치료 검토",
+    "생활 습관 개선",
+)
+BP_NORMAL_RECOMMENDATIONS = ("정상 범위 유지",)
+
+
+def _json_default(value):
+    """json.dumps 대체 경로의 datetime / NumPy 스칼라 변환 (orjson 과 같은 결과)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+@dataclass(slots=True)
 class AssessmentResult:
     """진단 결과"""
     assessment_id: str
@@ -88,7 +151,7 @@ class AssessmentResult:
     severity_level: SeverityLevel
     confidence: float  # 0-1
     diagnosis: str
-    recommendations: List[str] = field(default_factory=list)
+    recommendations: Tuple[str, ...] = ()
     is_emergency: bool = False
     
     assessment_time: datetime = field(default_factory=datetime.now)
@@ -97,31 +160,99 @@ class AssessmentResult:
     
     def to_dict(self) -> Dict:
         """딕셔너리로 변환"""
-        data = asdict(self)
-        data['vital_sign_type'] = self.vital_sign_type.value
-        data['severity_level'] = self.severity_level.value
-        return data
+        return {
+            'assessment_id': self.assessment_id,
+            'patient_id': self.patient_id,
+            'vital_sign_type': self.vital_sign_type.value,
+            'value': self.value,
+            'severity_level': self.severity_level.value,
+            'confidence': self.confidence,
+            'diagnosis': self.diagnosis,
+            'recommendations': list(self.recommendations),
+            'is_emergency': self.is_emergency,
+            'assessment_time': self.assessment_time,
+            'next_check_time': self.next_check_time,
+            'healthcare_provider_note': self.healthcare_provider_note,
+        }
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        JSON (UTF-8 bytes) 직렬화
+
+        orjson 이 있으면 orjson.dumps(to_dict()) (직접 작성한 인코더보다 빠름),
+        없으면 같은 형식의 json.dumps
+        """
+        data = self.to_dict()
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+# ==================== 진단 ID 생성 ====================
+
+class AssessmentIdGenerator:
+    """
+    프로세스 고유 단조 증가 ID 생성기
+    
+    ID = <pid+난수 접두사>-<순번(16진수)>. itertools.count 의 next() 는
+    GIL 하에서 원자적이므로 락이 필요 없다. fork 된 자식 프로세스는
+    새 접두사와 순번으로 다시 시작한다.
+    """
+    
+    def __init__(self):
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self) -> None:
+        self.prefix = f"{os.getpid():x}{secrets.token_hex(4)}"
+        self._counter = itertools.count(1)
+    
+    def __call__(self) -> str:
+        return f"{self.prefix}-{next(self._counter):x}"
+
+
+next_assessment_id = AssessmentIdGenerator()
 
 
 class MedicalExpertBackedCoach:
     """의료 전문가 기반 AI 진단 코치"""
     
-    def __init__(self, patient_id: str, medical_history: Optional[Dict] = None):
+    def __init__(
+        self,
+        patient_id: str,
+        medical_history: Optional[Dict] = None,
+        history_loader: Optional[Callable[[str], Dict]] = None,
+    ):
         """
         초기화
         
         Args:
             patient_id: 환자 고유 ID
             medical_history: 환자의 의료 기록 (기저질환, 약물 등)
+            history_loader: 의료 기록 지연 로더 (처음 접근할 때 patient_id 로 호출)
         """
         self.patient_id = patient_id
-        self.medical_history = medical_history or {}
+        self._medical_history = medical_history
+        self._history_loader = history_loader
         self.logger = logger
-        self.assessment_count = 0
+        self.events = events
+    
+    @property
+    def medical_history(self) -> Dict:
+        """환자의 의료 기록 (필요할 때 로드)"""
+        if self._medical_history is None:
+            loader = self._history_loader
+            self._medical_history = (loader(self.patient_id) if loader else None) or {}
+        return self._medical_history
+    
+    @medical_history.setter
+    def medical_history(self, value: Optional[Dict]) -> None:
+        self._medical_history = value
     
     # ==================== 혈당 평가 ====================
     
-    def assess_glucose(self, glucose_mg_dl: float) -> AssessmentResult:
+    def assess_glucose(self, glucose_mg_dl: float, now: Optional[datetime] = None) -> AssessmentResult:
         """
         혈당 평가 (ADA 기준)
         
@@ -129,8 +260,8 @@ class MedicalExpertBackedCoach:
         경고: 130-180 mg/dL 또는 <70 mg/dL
         응급: <40 mg/dL 또는 >350 mg/dL
         """
-        self.assessment_count += 1
-        assessment_id = f"glucose_{self.patient_id}_{self.assessment_count}"
+        now = now or datetime.now()
+        assessment_id = f"glucose_{self.patient_id}_{next_assessment_id()}"
         
         result = AssessmentResult(
             assessment_id=assessment_id,
@@ -140,82 +271,62 @@ class MedicalExpertBackedCoach:
             severity_level=SeverityLevel.LEVEL_1_NORMAL,
             confidence=0.0,
             diagnosis="",
-            recommendations=[],
+            recommendations=(),
             is_emergency=False,
-            next_check_time=datetime.now() + timedelta(hours=4)
+            assessment_time=now,
+            next_check_time=now + timedelta(hours=4)
         )
         
         # 진단 로직
         if glucose_mg_dl < 40:
             result.severity_level = SeverityLevel.LEVEL_4_CRITICAL
             result.diagnosis = "심각한 저혈당 (Severe Hypoglycemia) - 즉시 응급실 방문 필수"
-            result.recommendations = [
-                "즉시 응급실로 이동",
-                "포도당 IV 투여 필요",
-                "가족/보호자에게 알림",
-                "의료 기록 자동 전송"
-            ]
+            result.recommendations = GLUCOSE_SEVERE_HYPO_RECOMMENDATIONS
             result.confidence = 0.99
             result.is_emergency = True
-            result.next_check_time = datetime.now() + timedelta(minutes=5)
-            self.logger.critical(f"CRITICAL GLUCOSE: {glucose_mg_dl} mg/dL for {self.patient_id}")
+            result.next_check_time = now + timedelta(minutes=5)
+            self.events.critical("critical_glucose", patient_id=self.patient_id, glucose_mg_dl=glucose_mg_dl)
             
         elif glucose_mg_dl < 70:
             result.severity_level = SeverityLevel.LEVEL_3_URGENT
             result.diagnosis = "저혈당 (Hypoglycemia) - 긴급 대응 필요"
-            result.recommendations = [
-                "즉시 탄수화물 섭취 (포도당, 주스 등)",
-                "15분 후 재측정",
-                "의료진 상담 권장"
-            ]
+            result.recommendations = GLUCOSE_HYPO_RECOMMENDATIONS
             result.confidence = 0.90
-            result.next_check_time = datetime.now() + timedelta(minutes=15)
+            result.next_check_time = now + timedelta(minutes=15)
             
         elif 70 <= glucose_mg_dl <= 130:
             result.severity_level = SeverityLevel.LEVEL_1_NORMAL
             result.diagnosis = "정상 혈당 (Normal Glucose) - 관리 중"
-            result.recommendations = [
-                "현재 관리 방식 유지",
-                "정기적 모니터링 계속"
-            ]
+            result.recommendations = GLUCOSE_NORMAL_RECOMMENDATIONS
             result.confidence = 0.95
             
         elif glucose_mg_dl <= 180:
             result.severity_level = SeverityLevel.LEVEL_2_WARNING
             result.diagnosis = "약간 높은 혈당 (Elevated Glucose) - 모니터링 필요"
             result.confidence = 0.85
-            result.next_check_time = datetime.now() + timedelta(hours=2)
+            result.next_check_time = now + timedelta(hours=2)
             
         elif glucose_mg_dl <= 250:
             result.severity_level = SeverityLevel.LEVEL_3_URGENT
             result.diagnosis = "높은 혈당 (High Glucose) - 의료 개입 필요"
-            result.recommendations = [
-                "인슐린 투여 검토",
-                "의료진 상담",
-                "2시간 후 재측정"
-            ]
+            result.recommendations = GLUCOSE_HIGH_RECOMMENDATIONS
             result.confidence = 0.85
-            result.next_check_time = datetime.now() + timedelta(hours=2)
+            result.next_check_time = now + timedelta(hours=2)
             
         else:  # > 250
             result.severity_level = SeverityLevel.LEVEL_4_CRITICAL
             result.diagnosis = "심각한 고혈당 (Severe Hyperglycemia) - 당뇨병성 케톤산증 위험"
-            result.recommendations = [
-                "즉시 응급실 방문",
-                "혈중 케톤 검사",
-                "인슐린 IV 투여 필요",
-                "전해질 모니터링"
-            ]
+            result.recommendations = GLUCOSE_SEVERE_HYPER_RECOMMENDATIONS
             result.confidence = 0.90
             result.is_emergency = True
-            result.next_check_time = datetime.now() + timedelta(minutes=5)
-            self.logger.critical(f"CRITICAL GLUCOSE: {glucose_mg_dl} mg/dL for {self.patient_id}")
+            result.next_check_time = now + timedelta(minutes=5)
+            self.events.critical("critical_glucose", patient_id=self.patient_id, glucose_mg_dl=glucose_mg_dl)
         
         return result
     
     # ==================== 혈압 평가 ====================
     
-    def assess_blood_pressure(self, systolic: int, diastolic: int) -> AssessmentResult:
+    def assess_blood_pressure(self, systolic: int, diastolic: int, now: Optional[datetime] = None) -> AssessmentResult:
         """
         혈압 평가 (ACC/AHA 기준)
         
@@ -225,8 +336,8 @@ class MedicalExpertBackedCoach:
         2단계: >= 140/90
         위기: > 180/120
         """
-        self.assessment_count += 1
-        assessment_id = f"bp_{self.patient_id}_{self.assessment_count}"
+        now = now or datetime.now()
+        assessment_id = f"bp_{self.patient_id}_{next_assessment_id()}"
         
         result = AssessmentResult(
             assessment_id=assessment_id,
@@ -236,34 +347,26 @@ class MedicalExpertBackedCoach:
             severity_level=SeverityLevel.LEVEL_1_NORMAL,
             confidence=0.0,
             diagnosis="",
-            recommendations=[],
+            recommendations=(),
             is_emergency=False,
-            next_check_time=datetime.now() + timedelta(days=7)
+            assessment_time=now,
+            next_check_time=now + timedelta(days=7)
         )
         
         # 진단 로직
         if systolic > 180 or diastolic > 120:
             result.severity_level = SeverityLevel.LEVEL_4_CRITICAL
             result.diagnosis = "고혈압 위기 (Hypertensive Crisis) - 즉시 응급실"
-            result.recommendations = [
-                "즉시 응급실 방문",
-                "혈압강하제 IV 투여",
-                "신경학적 검사",
-                "장기 모니터링"
-            ]
+            result.recommendations = BP_CRISIS_RECOMMENDATIONS
             result.confidence = 0.98
             result.is_emergency = True
-            result.next_check_time = datetime.now() + timedelta(minutes=5)
-            self.logger.critical(f"CRITICAL BP: {systolic}/{diastolic} for {self.patient_id}")
+            result.next_check_time = now + timedelta(minutes=5)
+            self.events.critical("critical_bp", patient_id=self.patient_id, systolic=systolic, diastolic=diastolic)
             
         elif systolic >= 160 or diastolic >= 100:
             result.severity_level = SeverityLevel.LEVEL_3_URGENT
             result.diagnosis = "2단계 고혈압 (Stage 2 HTN) - 긴급 대응"
-            result.recommendations = [
-                "의료진 상담 필수",
-                "약물 치료 검토",
-                "생활 습관 개선"
-            ]
+            result.recommendations = BP_STAGE2_RECOMMENDATIONS
             result.confidence = 0.90
             
         elif systolic >= 140 or diastolic >= 90:
@@ -279,17 +382,17 @@ class MedicalExpertBackedCoach:
         else:
             result.severity_level = SeverityLevel.LEVEL_1_NORMAL
             result.diagnosis = "정상 혈압 (Normal) - 관리 유지"
-            result.recommendations = ["정상 범위 유지"]
+            result.recommendations = BP_NORMAL_RECOMMENDATIONS
             result.confidence = 0.95
         
         return result
     
     # ==================== 심박수 평가 ====================
     
-    def assess_heart_rate(self, bpm: int) -> AssessmentResult:
+    def assess_heart_rate(self, bpm: int, now: Optional[datetime] = None) -> AssessmentResult:
         """심박수 평가 (WHO 기준)"""
-        self.assessment_count += 1
-        assessment_id = f"hr_{self.patient_id}_{self.assessment_count}"
+        now = now or datetime.now()
+        assessment_id = f"hr_{self.patient_id}_{next_assessment_id()}"
         
         result = AssessmentResult(
             assessment_id=assessment_id,
@@ -299,8 +402,9 @@ class MedicalExpertBackedCoach:
             severity_level=SeverityLevel.LEVEL_1_NORMAL,
             confidence=0.0,
             diagnosis="",
-            recommendations=[],
-            is_emergency=False
+            recommendations=(),
+            is_emergency=False,
+            assessment_time=now
         )
         
         if bpm >= 150 or bpm <= 40:
@@ -328,10 +432,10 @@ class MedicalExpertBackedCoach:
     
     # ==================== 체온 평가 ====================
     
-    def assess_temperature(self, celsius: float) -> AssessmentResult:
+    def assess_temperature(self, celsius: float, now: Optional[datetime] = None) -> AssessmentResult:
         """체온 평가"""
-        self.assessment_count += 1
-        assessment_id = f"temp_{self.patient_id}_{self.assessment_count}"
+        now = now or datetime.now()
+        assessment_id = f"temp_{self.patient_id}_{next_assessment_id()}"
         
         result = AssessmentResult(
             assessment_id=assessment_id,
@@ -341,8 +445,9 @@ class MedicalExpertBackedCoach:
             severity_level=SeverityLevel.LEVEL_1_NORMAL,
             confidence=0.0,
             diagnosis="",
-            recommendations=[],
-            is_emergency=False
+            recommendations=(),
+            is_emergency=False,
+            assessment_time=now
         )
         
         if celsius < 35 or celsius > 40:
@@ -390,18 +495,19 @@ class MedicalExpertBackedCoach:
         # 유효성 검증
         is_valid, errors = vitals.validate()
         if not is_valid:
-            self.logger.error(f"Invalid vital signs: {errors}")
+            self.events.error("invalid_vitals", patient_id=self.patient_id, errors=errors)
             return {
                 'patient_id': self.patient_id,
                 'is_valid': False,
                 'errors': errors
             }
         
-        # 각 신호 평가
-        glucose_result = self.assess_glucose(vitals.glucose_mg_dl)
-        bp_result = self.assess_blood_pressure(vitals.systolic_bp, vitals.diastolic_bp)
-        hr_result = self.assess_heart_rate(vitals.heart_rate_bpm)
-        temp_result = self.assess_temperature(vitals.temperature_celsius)
+        # 각 신호 평가 (동일 시각 기준)
+        now = datetime.now()
+        glucose_result = self.assess_glucose(vitals.glucose_mg_dl, now)
+        bp_result = self.assess_blood_pressure(vitals.systolic_bp, vitals.diastolic_bp, now)
+        hr_result = self.assess_heart_rate(vitals.heart_rate_bpm, now)
+        temp_result = self.assess_temperature(vitals.temperature_celsius, now)
         
         # 종합 심각도 (최악의 수준)
         assessments = [glucose_result, bp_result, hr_result, temp_result]
@@ -425,7 +531,7 @@ class MedicalExpertBackedCoach:
         
         # 다음 검사 시간 (가장 빠른 것)
         next_check_times = [a.next_check_time for a in assessments if a.next_check_time]
-        next_check_time = min(next_check_times) if next_check_times else datetime.now() + timedelta(hours=4)
+        next_check_time = min(next_check_times) if next_check_times else now + timedelta(hours=4)
         
         # 종합 권장사항
         all_recommendations = []
@@ -435,15 +541,15 @@ class MedicalExpertBackedCoach:
         
         # 로깅
         if is_emergency:
-            self.logger.critical(f"EMERGENCY DETECTED for {self.patient_id}: {risk_factors}")
+            self.events.critical("emergency_assessment", patient_id=self.patient_id, risk_factors=list(risk_factors))
         elif overall_severity >= 3:
-            self.logger.warning(f"URGENT assessment for {self.patient_id}: {risk_factors}")
+            self.events.warning("urgent_assessment", patient_id=self.patient_id, risk_factors=list(risk_factors))
         else:
-            self.logger.info(f"NORMAL assessment for {self.patient_id}")
+            self.events.info("normal_assessment", patient_id=self.patient_id)
         
         return {
             'patient_id': self.patient_id,
-            'assessment_time': datetime.now().isoformat(),
+            'assessment_time': now.isoformat(),
             'overall_severity': overall_severity,
             'is_emergency': is_emergency,
             'risk_factors': risk_factors,
@@ -454,6 +560,28 @@ class MedicalExpertBackedCoach:
             'confidence_level': self._get_confidence_level(confidence)
         }
     
+    def assess_with_trends(self, vitals: VitalSigns, window) -> Dict:
+        """
+        추세 반영 종합 평가
+        
+        측정값을 환자 롤링 윈도우(vitals_window.VitalsWindowStore)에 추가하고
+        변화율 규칙 결과를 종합 평가에 반영한다. 저장된 이력을 다시 읽지 않는다.
+        
+        Returns:
+            comprehensive_assessment 결과 + 'trends'
+        """
+        result = self.comprehensive_assessment(vitals)
+        if result.get('is_valid') is False:
+            return result
+        
+        window.push(self.patient_id, vitals)
+        findings = window.evaluate_trends(self.patient_id)
+        result['trends'] = [f.to_dict() for f in findings]
+        for finding in findings:
+            result['risk_factors'].append(f"추세: {finding.diagnosis}")
+            result['overall_severity'] = max(result['overall_severity'], finding.severity.value)
+        return result
+    
     def emergency_detection(self, vitals: VitalSigns) -> Tuple[bool, List[str], str]:
         """
         응급 상황 감지
@@ -489,7 +617,7 @@ class MedicalExpertBackedCoach:
         action = "즉시 응급실 방문" if is_emergency else "정기 모니터링"
         
         if is_emergency:
-            self.logger.critical(f"EMERGENCY for {self.patient_id}: {emergency_reasons}")
+            self.events.critical("emergency_detection", patient_id=self.patient_id, reasons=emergency_reasons)
         
         return is_emergency, emergency_reasons, action
     
@@ -0,0 +1,499 @@
+"""
+Message Bundles - 정적 코칭 문구의 언어별 컴파일 번들
+Version: 1.0
+
+- 빌드 단계에서 코칭 엔진 소스의 정적 문자열을 AST 로 추출 (모듈 import 없음)
+    RuleBasedCoachingEngine (main.py): recommendation / metric 값, insights 문구
+    MedicalExpertBackedCoach (medical_coach.py): 진단, *_RECOMMENDATIONS 상수, 응급 사유
+    PersonalizedCoach (models/personalized_coach.py): CoachingMessage 제목/내용/행동 항목, 코칭 템플릿
+  f-string 처럼 실행 시 만들어지는 문구는 제외 (개수만 보고)
+- catalog.json 이 문구 -> 정수 메시지 ID 를 고정 (재빌드해도 기존 ID 유지, 새 문구는 뒤에 추가)
+- 언어별 <lang>.msgb 번들을 mmap 으로 열어 ID 로 바로 조회 (번역 서비스 호출 없음)
+- 번역 출처: <lang>.json 번역 사전 또는 빌드 시 번역 서비스 /api/v1/translate:batch
+  번역이 없는 문구는 원문 유지
+
+번들 파일 구조:
+    MAGIC (8) | 헤더 길이 uint32 (4) | 헤더 JSON (UTF-8) | 패딩 | 오프셋 uint32 x (count + 1) | UTF-8 문자열 ...
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import mmap
+import re
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"MPSMSG1\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+CATALOG_FILE = "catalog.json"
+BUNDLE_SUFFIX = ".msgb"
+SERVICE_ROOT = Path(__file__).resolve().parent
+
+PathLike = Union[str, Path]
+# (문구 목록, 원문 언어, 대상 언어) -> 번역 (없으면 None)
+Translator = Callable[[List[str], str, str], List[Optional[str]]]
+
+# (서비스 기준 경로, 추출 대상 클래스)
+MESSAGE_SOURCES = (
+    ("main.py", ("RuleBasedCoachingEngine",)),
+    ("medical_coach.py", ("MedicalExpertBackedCoach",)),
+    ("models/personalized_coach.py", ("PersonalizedCoach",)),
+)
+TEXT_KEYS = frozenset({"recommendation", "metric"})  # dict 리터럴 키
+TEXT_KEYWORDS = frozenset({"title", "content", "action_items"})  # CoachingMessage 인자
+TEXT_TARGETS = frozenset({"diagnosis", "action"})  # 대입 대상 (속성/변수 이름)
+TEXT_LISTS = frozenset({"insights", "emergency_reasons"})  # .append() 대상
+TEMPLATE_METHODS = frozenset({"_load_coaching_templates"})  # 반환 dict 의 문구 목록
+CONSTANT_SUFFIX = "_RECOMMENDATIONS"  # 모듈 수준 권장사항 상수
+
+_HANGUL = re.compile("[가-힣]")
+
+
+def source_language(text: str) -> str:
+    return "ko" if _HANGUL.search(text) else "en"
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+# ==================== 추출 ====================
+
+@dataclass
+class ExtractedMessage:
+    """추출된 문구 (sources: "파일:줄" 목록)"""
+    text: str
+    sources: List[str] = field(default_factory=list)
+
+    @property
+    def language(self) -> str:
+        return source_language(self.text)
+
+
+class _MessageVisitor(ast.NodeVisitor):
+    def __init__(self, path: str, classes: Sequence[str]):
+        self.path = path
+        self.classes = frozenset(classes)
+        self.scope: List[str] = []
+        self.found: List[Tuple[str, str]] = []
+        self.dynamic = 0
+
+    @property
+    def _in_class(self) -> bool:
+        return bool(self.scope) and self.scope[0] in self.classes
+
+    def _add(self, node: ast.AST) -> None:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if node.value.strip():
+                self.found.append((node.value, f"{self.path}:{node.lineno}"))
+        elif isinstance(node, ast.JoinedStr):
+            if all(isinstance(value, ast.Constant) for value in node.values):
+                # 치환 없는 f-string 은 정적 문구
+                self._add(ast.Constant("".join(value.value for value in node.values), lineno=node.lineno))
+            else:
+                self.dynamic += 1
+        elif isinstance(node, ast.IfExp):
+            self._add(node.body)
+            self._add(node.orelse)
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            for element in node.elts:
+                self._add(element)
+
+    def _scoped(self, node) -> None:
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    visit_ClassDef = visit_FunctionDef = visit_AsyncFunctionDef = _scoped
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if not self.scope and isinstance(target, ast.Name) and target.id.endswith(CONSTANT_SUFFIX):
+                self._add(node.value)
+            elif self._in_class and (
+                (isinstance(target, ast.Attribute) and target.attr in TEXT_TARGETS)
+                or (isinstance(target, ast.Name) and target.id in TEXT_TARGETS)
+            ):
+                self._add(node.value)
+        self.generic_visit(node)
+
+    def visit_Dict(self, node: ast.Dict) -> None:
+        if self._in_class:
+            for key, value in zip(node.keys, node.values):
+                if self.scope[-1] in TEMPLATE_METHODS:
+                    self._add(value)
+                elif isinstance(key, ast.Constant) and key.value in TEXT_KEYS:
+                    self._add(value)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if self._in_class:
+            func = node.func
+            if (
+                isinstance(func, ast.Attribute) and func.attr == "append"
+                and isinstance(func.value, ast.Name) and func.value.id in TEXT_LISTS and node.args
+            ):
+                self._add(node.args[0])
+            elif isinstance(func, ast.Name) and func.id == "CoachingMessage":
+                for keyword in node.keywords:
+                    if keyword.arg in TEXT_KEYWORDS:
+                        self._add(keyword.value)
+        self.generic_visit(node)
+
+
+def extract_messages(
+    root: PathLike = SERVICE_ROOT,
+    sources: Sequence[Tuple[str, Sequence[str]]] = MESSAGE_SOURCES,
+) -> Tuple[List[ExtractedMessage], int]:
+    """
+    정적 문구 추출 (소스 순서 유지, 중복 문구는 하나로)
+
+    Returns:
+        (문구 목록, 제외된 동적 문구 수)
+    """
+    root = Path(root)
+    messages: Dict[str, ExtractedMessage] = {}
+    dynamic = 0
+    for relative, classes in sources:
+        tree = ast.parse((root / relative).read_text(encoding="utf-8"), filename=relative)
+        visitor = _MessageVisitor(relative, classes)
+        visitor.visit(tree)
+        dynamic += visitor.dynamic
+        for text, location in visitor.found:
+            messages.setdefault(text, ExtractedMessage(text)).sources.append(location)
+    return list(messages.values()), dynamic
+
+
+# ==================== 카탈로그 ====================
+
+class MessageCatalog:
+    """
+    문구 <-> 메시지 ID 대응표
+
+    ID 는 목록 위치이며 한 번 배정되면 바뀌지 않는다.
+    코드에서 사라진 문구는 retired 로 표시만 한다 (ID 재사용 없음).
+    """
+
+    def __init__(self, entries: Optional[List[Dict]] = None):
+        self.entries: List[Dict] = entries or []
+        self.ids: Dict[str, int] = {entry["text"]: entry["id"] for entry in self.entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, path: PathLike) -> "MessageCatalog":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalog version: {data.get('version')}")
+        return cls(data["messages"])
+
+    def save(self, path: PathLike) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "messages": self.entries}, f, indent=2, ensure_ascii=False)
+
+    def merge(self, messages: Iterable[ExtractedMessage]) -> int:
+        """추출 결과 반영; 새로 배정한 ID 수 반환"""
+        current = set()
+        added = 0
+        for message in messages:
+            current.add(message.text)
+            message_id = self.ids.get(message.text)
+            if message_id is None:
+                message_id = self.ids[message.text] = len(self.entries)
+                self.entries.append({"id": message_id, "text": message.text})
+                added += 1
+            entry = self.entries[message_id]
+            entry.update(language=message.language, sources=message.sources)
+            entry.pop("retired", None)
+        for entry in self.entries:
+            if entry["text"] not in current:
+                entry["retired"] = True
+        return added
+
+    def texts(self) -> List[str]:
+        return [entry["text"] for entry in self.entries]
+
+    def digest(self) -> str:
+        """번들과 카탈로그가 같은 빌드인지 확인하는 해시"""
+        return hashlib.sha256("\0".join(self.texts()).encode("utf-8")).hexdigest()[:16]
+
+
+# ==================== 번들 파일 ====================
+
+def write_bundle(path: PathLike, language: str, texts: Sequence[str], catalog_digest: str) -> int:
+    """메시지 ID 순서의 문구 목록을 번들 파일로 기록; 파일 크기 반환"""
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    header = json.dumps({
+        "format": "mps-message-bundle",
+        "version": FORMAT_VERSION,
+        "language": language,
+        "count": len(encoded),
+        "catalog": catalog_digest,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 4 + len(header))
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+        f.write(offsets.tobytes())
+        f.write(b"".join(encoded))
+        return f.tell()
+
+
+class MessageBundle:
+    """
+    mmap 으로 연 언어별 번들
+
+    text(message_id) 는 해당 문구 구간만 디코딩한다 (한 번 디코딩한 문구는 보관).
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a message bundle")
+        (header_size,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_size].decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported bundle version: {header.get('version')}")
+
+        self.language: str = header["language"]
+        self.count: int = header["count"]
+        self.catalog_digest: str = header["catalog"]
+        data_start = _aligned(header_start + header_size)
+        self.offsets = np.frombuffer(self._mmap, dtype="<u4", count=self.count + 1, offset=data_start)
+        self._blob_start = data_start + self.offsets.nbytes
+        self._decoded: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def text(self, message_id: int) -> str:
+        text = self._decoded.get(message_id)
+        if text is None:
+            if not 0 <= message_id < self.count:
+                raise KeyError(message_id)
+            start = self._blob_start + int(self.offsets[message_id])
+            end = self._blob_start + int(self.offsets[message_id + 1])
+            text = self._decoded[message_id] = self._mmap[start:end].decode("utf-8")
+        return text
+
+    __getitem__ = text
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self.offsets = None  # mmap 을 참조하는 뷰를 먼저 해제
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "MessageBundle":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class LocalizedMessages:
+    """
+    카탈로그 + 언어별 번들
+
+    localize() 는 카탈로그에 없는 문구 (동적 문구 등) 를 그대로 돌려준다.
+    번들이 없는 언어는 원문으로 대체한다.
+    """
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+        self.catalog = MessageCatalog.load(self.directory / CATALOG_FILE)
+        self.bundles: Dict[str, MessageBundle] = {}
+        digest = self.catalog.digest()
+        for path in sorted(self.directory.glob(f"*{BUNDLE_SUFFIX}")):
+            bundle = MessageBundle(path)
+            self.bundles[bundle.language] = bundle
+            if bundle.catalog_digest != digest:
+                self.close()
+                raise ValueError(f"{path} was built from a different catalog")
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self.bundles)
+
+    def message_id(self, text: str) -> Optional[int]:
+        return self.catalog.ids.get(text)
+
+    def text(self, message_id: int, language: str) -> str:
+        """메시지 ID 의 문구 (번들이 없는 언어는 원문); 범위 밖 ID 는 KeyError"""
+        bundle = self.bundles.get(language)
+        if bundle is not None:
+            return bundle.text(message_id)
+        entries = self.catalog.entries
+        if not 0 <= message_id < len(entries):
+            raise KeyError(message_id)
+        return entries[message_id]["text"]
+
+    def localize(self, text: str, language: str) -> str:
+        message_id = self.catalog.ids.get(text)
+        return text if message_id is None else self.text(message_id, language)
+
+    def localize_all(self, texts: Iterable[str], language: str) -> List[str]:
+        return [self.localize(text, language) for text in texts]
+
+    def close(self) -> None:
+        for bundle in self.bundles.values():
+            bundle.close()
+        self.bundles.clear()
+
+
+def load_bundles(directory: PathLike) -> LocalizedMessages:
+    return LocalizedMessages(directory)
+
+
+# ==================== 빌드 ====================
+
+def dictionary_translator(directory: PathLike) -> Translator:
+    """<lang>.json ({원문: 번역}) 번역 사전 기반 번역기"""
+    directory = Path(directory)
+    dictionaries: Dict[str, Dict[str, str]] = {}
+
+    def translate(texts: List[str], source: str, target: str) -> List[Optional[str]]:
+        if target not in dictionaries:
+            path = directory / f"{target}.json"
+            dictionaries[target] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        dictionary = dictionaries[target]
+        return [dictionary.get(text) for text in texts]
+
+    return translate
+
+
+def service_translator(url: str, token: str, batch_size: int = 500, timeout: float = 30.0) -> Translator:
+    """번역 서비스 /api/v1/translate:batch 기반 번역기 (빌드 시에만 호출)"""
+    import httpx
+
+    client = httpx.Client(
+        base_url=url.rstrip("/"), headers={"Authorization": f"Bearer {token}"}, timeout=timeout
+    )
+
+    def translate(texts: List[str], source: str, target: str) -> List[Optional[str]]:
+        results: List[Optional[str]] = []
+        for start in range(0, len(texts), batch_size):
+            response = client.post("/api/v1/translate:batch", json={
+                "segments": texts[start:start + batch_size],
+                "source_language": source,
+                "target_language": target,
+                "context": "coaching",
+            })
+            response.raise_for_status()
+            results.extend(item["translated_text"] for item in response.json()["data"])
+        return results
+
+    return translate
+
+
+def build_bundles(
+    out_dir: PathLike,
+    languages: Sequence[str],
+    translator: Optional[Translator] = None,
+    root: PathLike = SERVICE_ROOT,
+    sources: Sequence[Tuple[str, Sequence[str]]] = MESSAGE_SOURCES,
+) -> Dict:
+    """
+    문구 추출 -> 카탈로그 갱신 -> 언어별 번들 기록
+
+    Returns:
+        빌드 보고 (문구 수, 새 ID 수, 언어별 번역/원문 대체 수와 파일 크기)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    messages, dynamic = extract_messages(root, sources)
+    catalog = MessageCatalog.load(out_dir / CATALOG_FILE)
+    added = catalog.merge(messages)
+    catalog.save(out_dir / CATALOG_FILE)
+
+    texts = catalog.texts()
+    digest = catalog.digest()
+    report = {"messages": len(texts), "new": added, "dynamic_skipped": dynamic, "languages": {}}
+    for language in languages:
+        rendered = list(texts)
+        translated = 0
+        # 원문 언어별로 묶어 번역기 호출
+        by_source: Dict[str, List[int]] = {}
+        for message_id, text in enumerate(texts):
+            source = source_language(text)
+            if source != language:
+                by_source.setdefault(source, []).append(message_id)
+        for source, ids in by_source.items():
+            if translator is None:
+                continue
+            for message_id, result in zip(ids, translator([texts[i] for i in ids], source, language)):
+                if result:
+                    rendered[message_id] = result
+                    translated += 1
+        size = write_bundle(out_dir / f"{language}{BUNDLE_SUFFIX}", language, rendered, digest)
+        report["languages"][language] = {
+            "translated": translated,
+            "fallback": sum(len(ids) for ids in by_source.values()) - translated,
+            "bytes": size,
+        }
+    return report
+
+
+def main(argv: Sequence[str]) -> int:
+    """
+    실행:
+        python message_bundles.py build bundles/ --languages ko,en,ja --translations locales/
+        python message_bundles.py build bundles/ --languages en --service-url http://translation:8000 --token ...
+        python message_bundles.py show bundles/ en 3
+    """
+    parser = argparse.ArgumentParser(prog="message_bundles.py", usage=main.__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build")
+    build.add_argument("out_dir")
+    build.add_argument("--languages", required=True)
+    build.add_argument("--translations")
+    build.add_argument("--service-url")
+    build.add_argument("--token")
+    show = commands.add_parser("show")
+    show.add_argument("out_dir")
+    show.add_argument("language")
+    show.add_argument("message_id", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        messages = load_bundles(args.out_dir)
+        print(messages.text(args.message_id, args.language))
+        messages.close()
+        return 0
+
+    translator = None
+    if args.service_url:
+        translator = service_translator(args.service_url, args.token or "")
+    elif args.translations:
+        translator = dictionary_translator(args.translations)
+    report = build_bundles(args.out_dir, [language.strip() for language in args.languages.split(",")], translator)
+    print(f"✓ {report['messages']} messages ({report['new']} new, {report['dynamic_skipped']} dynamic skipped)")
+    for language, stats in report["languages"].items():
+        print(f"  {language}: {stats['translated']} translated, {stats['fallback']} fallback, {stats['bytes']:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
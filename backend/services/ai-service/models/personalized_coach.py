@@ -4,7 +4,7 @@
 """
 
 import numpy as np
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, FrozenSet, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
@@ -241,52 +241,30 @@ class PersonalizedCoach:
         Returns:
             조정된 계획
         """
-        adjustments = {
-            "intensity_modifier": 1.0,
-            "dietary_adjustments": [],
-            "focus_areas": [],
-            "warnings": [],
-        }
+        contributions = [
+            rule.apply(current_measurements, progress)
+            for rule in _active_rules(profile)
+        ]
+        return _compose_adjustments(contributions)
+    
+    def create_plan_tracker(
+        self,
+        profile: UserProfile,
+        current_measurements: Optional[Dict[str, float]] = None,
+        progress: Optional[Dict[str, float]] = None,
+    ) -> "AdaptivePlanTracker":
+        """
+        적응형 계획 추적기 생성 (이벤트 기반 증분 재계산)
         
-        # 혈당 조절 목표인 경우
-        if GoalType.GLUCOSE_CONTROL in profile.goals:
-            glucose = current_measurements.get("glucose", 100)
-            if glucose > 140:
-                adjustments["dietary_adjustments"].append({
-                    "action": "reduce_carbs",
-                    "amount": "20%",
-                    "reason": "혈당 조절을 위해 탄수화물 섭취를 줄이세요.",
-                })
-                adjustments["focus_areas"].append("post_meal_exercise")
-            elif glucose < 70:
-                adjustments["warnings"].append({
-                    "type": "hypoglycemia_risk",
-                    "message": "저혈당 위험이 있습니다. 간식을 준비해두세요.",
-                })
-        
-        # 체중 관리 목표인 경우
-        if GoalType.WEIGHT_LOSS in profile.goals:
-            weight_progress = progress.get("weight", 0)
-            if weight_progress < 0.5:  # 목표의 50% 미만 진행
-                adjustments["intensity_modifier"] = 1.2
-                adjustments["focus_areas"].append("increased_cardio")
-            elif weight_progress > 1.5:  # 너무 빠른 감량
-                adjustments["warnings"].append({
-                    "type": "rapid_weight_loss",
-                    "message": "체중이 너무 빨리 감소하고 있습니다. 건강한 속도로 조절하세요.",
-                })
-                adjustments["intensity_modifier"] = 0.8
-        
-        # 피트니스 향상 목표인 경우
-        if GoalType.FITNESS_IMPROVEMENT in profile.goals:
-            if "heart_rate_recovery" in current_measurements:
-                recovery = current_measurements["heart_rate_recovery"]
-                if recovery < 20:  # 회복이 느린 경우
-                    adjustments["focus_areas"].append("recovery_training")
-                else:
-                    adjustments["intensity_modifier"] = 1.1
-        
-        return adjustments
+        Args:
+            profile: 사용자 프로필
+            current_measurements: 초기 측정값
+            progress: 초기 진행률
+            
+        Returns:
+            AdaptivePlanTracker 인스턴스
+        """
+        return AdaptivePlanTracker(profile, current_measurements, progress)
     
     def _generate_glucose_coaching(
         self,
@@ -646,6 +624,227 @@ class PersonalizedCoach:
         return {}  # 실제로는 외부 데이터베이스 연동
 
 
+# ==================== 적응형 계획 규칙 ====================
+
+MEASUREMENTS = "current_measurements"
+PROGRESS = "progress"
+
+
+@dataclass(frozen=True)
+class AdjustmentRule:
+    """
+    적응형 계획 조정 규칙
+    
+    inputs 는 규칙이 읽는 입력 키 집합 ((출처, 키) 쌍)이며,
+    해당 키가 바뀔 때만 규칙을 다시 실행한다.
+    """
+    name: str
+    goal: GoalType
+    inputs: FrozenSet[Tuple[str, str]]
+    apply: Callable[[Dict[str, float], Dict[str, float]], Dict[str, Any]]
+
+
+def _empty_contribution() -> Dict[str, Any]:
+    return {
+        "intensity_modifier": None,
+        "dietary_adjustments": [],
+        "focus_areas": [],
+        "warnings": [],
+    }
+
+
+def _glucose_rule(
+    current_measurements: Dict[str, float],
+    progress: Dict[str, float],
+) -> Dict[str, Any]:
+    """혈당 조절 목표 규칙"""
+    contribution = _empty_contribution()
+    glucose = current_measurements.get("glucose", 100)
+    if glucose > 140:
+        contribution["dietary_adjustments"].append({
+            "action": "reduce_carbs",
+            "amount": "20%",
+            "reason": "혈당 조절을 위해 탄수화물 섭취를 줄이세요.",
+        })
+        contribution["focus_areas"].append("post_meal_exercise")
+    elif glucose < 70:
+        contribution["warnings"].append({
+            "type": "hypoglycemia_risk",
+            "message": "저혈당 위험이 있습니다. 간식을 준비해두세요.",
+        })
+    return contribution
+
+
+def _weight_loss_rule(
+    current_measurements: Dict[str, float],
+    progress: Dict[str, float],
+) -> Dict[str, Any]:
+    """체중 관리 목표 규칙"""
+    contribution = _empty_contribution()
+    weight_progress = progress.get("weight", 0)
+    if weight_progress < 0.5:  # 목표의 50% 미만 진행
+        contribution["intensity_modifier"] = 1.2
+        contribution["focus_areas"].append("increased_cardio")
+    elif weight_progress > 1.5:  # 너무 빠른 감량
+        contribution["warnings"].append({
+            "type": "rapid_weight_loss",
+            "message": "체중이 너무 빨리 감소하고 있습니다. 건강한 속도로 조절하세요.",
+        })
+        contribution["intensity_modifier"] = 0.8
+    return contribution
+
+
+def _fitness_rule(
+    current_measurements: Dict[str, float],
+    progress: Dict[str, float],
+) -> Dict[str, Any]:
+    """피트니스 향상 목표 규칙"""
+    contribution = _empty_contribution()
+    if "heart_rate_recovery" in current_measurements:
+        recovery = current_measurements["heart_rate_recovery"]
+        if recovery < 20:  # 회복이 느린 경우
+            contribution["focus_areas"].append("recovery_training")
+        else:
+            contribution["intensity_modifier"] = 1.1
+    return contribution
+
+
+# 규칙 순서가 조정 결과의 순서(및 intensity_modifier 우선순위)를 결정한다.
+ADAPTIVE_PLAN_RULES: Tuple[AdjustmentRule, ...] = (
+    AdjustmentRule(
+        name="glucose",
+        goal=GoalType.GLUCOSE_CONTROL,
+        inputs=frozenset({(MEASUREMENTS, "glucose")}),
+        apply=_glucose_rule,
+    ),
+    AdjustmentRule(
+        name="weight_loss",
+        goal=GoalType.WEIGHT_LOSS,
+        inputs=frozenset({(PROGRESS, "weight")}),
+        apply=_weight_loss_rule,
+    ),
+    AdjustmentRule(
+        name="fitness",
+        goal=GoalType.FITNESS_IMPROVEMENT,
+        inputs=frozenset({(MEASUREMENTS, "heart_rate_recovery")}),
+        apply=_fitness_rule,
+    ),
+)
+
+
+def _active_rules(profile: UserProfile) -> List[AdjustmentRule]:
+    """사용자 목표에 해당하는 규칙 목록"""
+    return [rule for rule in ADAPTIVE_PLAN_RULES if rule.goal in profile.goals]
+
+
+def _compose_adjustments(contributions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """규칙별 결과를 규칙 순서대로 합쳐 조정 계획 생성"""
+    adjustments = {
+        "intensity_modifier": 1.0,
+        "dietary_adjustments": [],
+        "focus_areas": [],
+        "warnings": [],
+    }
+    for contribution in contributions:
+        if contribution["intensity_modifier"] is not None:
+            adjustments["intensity_modifier"] = contribution["intensity_modifier"]
+        adjustments["dietary_adjustments"].extend(contribution["dietary_adjustments"])
+        adjustments["focus_areas"].extend(contribution["focus_areas"])
+        adjustments["warnings"].extend(contribution["warnings"])
+    return adjustments
+
+
+PlanSubscriber = Callable[[Dict[str, Any]], None]
+
+
+class AdaptivePlanTracker:
+    """
+    의존성 추적 기반 적응형 계획
+    
+    측정값/진행률 이벤트가 들어오면 변경된 입력을 읽는 규칙만 다시 실행하고,
+    캐시된 계획을 갱신한 뒤 구독자에게 변경된 항목(diff)만 전달한다.
+    """
+    
+    def __init__(
+        self,
+        profile: UserProfile,
+        current_measurements: Optional[Dict[str, float]] = None,
+        progress: Optional[Dict[str, float]] = None,
+    ):
+        self.profile = profile
+        self.rules = _active_rules(profile)
+        self._inputs: Dict[str, Dict[str, float]] = {
+            MEASUREMENTS: dict(current_measurements or {}),
+            PROGRESS: dict(progress or {}),
+        }
+        self._contributions: Dict[str, Dict[str, Any]] = {
+            rule.name: rule.apply(self._inputs[MEASUREMENTS], self._inputs[PROGRESS])
+            for rule in self.rules
+        }
+        self._plan = self._compose()
+        self._subscribers: List[PlanSubscriber] = []
+        self.rule_runs = 0
+    
+    @property
+    def plan(self) -> Dict[str, Any]:
+        """현재 캐시된 계획"""
+        return self._plan
+    
+    def subscribe(self, callback: PlanSubscriber) -> Callable[[], None]:
+        """
+        계획 변경 구독
+        
+        Returns:
+            구독 해제 함수
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+    
+    def on_measurement(self, measurements: Dict[str, float]) -> Dict[str, Any]:
+        """새 측정값 이벤트 처리"""
+        return self._apply_event(MEASUREMENTS, measurements)
+    
+    def on_progress(self, progress: Dict[str, float]) -> Dict[str, Any]:
+        """새 진행률 이벤트 처리"""
+        return self._apply_event(PROGRESS, progress)
+    
+    def _apply_event(self, source: str, values: Dict[str, float]) -> Dict[str, Any]:
+        """
+        이벤트 반영 후 영향받는 규칙만 재실행
+        
+        Returns:
+            변경된 계획 항목 (변경 없으면 빈 dict)
+        """
+        current = self._inputs[source]
+        changed = {
+            (source, key) for key, value in values.items()
+            if current.get(key) != value
+        }
+        if not changed:
+            return {}
+        current.update(values)
+        
+        rerun = [rule for rule in self.rules if rule.inputs & changed]
+        if not rerun:
+            return {}
+        for rule in rerun:
+            self._contributions[rule.name] = rule.apply(
+                self._inputs[MEASUREMENTS], self._inputs[PROGRESS]
+            )
+            self.rule_runs += 1
+        
+        plan = self._compose()
+        diff = {key: value for key, value in plan.items() if self._plan[key] != value}
+        self._plan = plan
+        if diff:
+            for callback in list(self._subscribers):
+                callback(diff)
+        return diff
+    
+    def _compose(self) -> Dict[str, Any]:
+        return _compose_adjustments([self._contributions[rule.name] for rule in self.rules])
+
+
 # 싱글톤 인스턴스
 _personalized_coach: Optional[PersonalizedCoach] = None
 
@@ -0,0 +1,98 @@
+"""
+Batch Vitals Assessment - Unit Tests
+테스트 실행: pytest test_batch_assessment.py -v
+"""
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from medical_coach import MedicalExpertBackedCoach, VitalSigns
+from batch_assessment import assess_vitals_batch, vitals_columns
+
+TEST_CASES_PATH = Path(__file__).resolve().parents[3] / "medical_test_cases_100.json"
+
+
+def _per_patient(records, data_quality=0.95, sensor_quality=0.92):
+    logging.disable(logging.CRITICAL)
+    try:
+        coach = MedicalExpertBackedCoach("batch_reference")
+        return [
+            coach.comprehensive_assessment(
+                VitalSigns(**r, data_quality=data_quality, sensor_quality=sensor_quality)
+            )
+            for r in records
+        ]
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _assert_agrees(batch, expected):
+    for i, result in enumerate(expected):
+        if result.get('is_valid') is False:
+            assert not batch.is_valid[i]
+            continue
+        assert batch.is_valid[i]
+        assert batch.row(i) == {
+            'overall_severity': result['overall_severity'],
+            'is_emergency': result['is_emergency'],
+            'confidence': result['confidence'],
+        }
+
+
+class TestBatchAssessment:
+    """일괄 진단 테스트"""
+
+    def test_agrees_with_per_patient_on_test_cases(self):
+        """medical_test_cases_100.json 에서 환자별 경로와 정확히 일치"""
+        with open(TEST_CASES_PATH, encoding="utf-8") as f:
+            records = [case["vitals"] for case in json.load(f)["test_cases"]]
+
+        batch = assess_vitals_batch(**vitals_columns(records))
+
+        assert len(batch) == len(records)
+        _assert_agrees(batch, _per_patient(records))
+
+    def test_agrees_on_random_and_boundary_vitals(self):
+        """경계값 포함 무작위 입력에서도 일치"""
+        rng = np.random.default_rng(7)
+        n = 2000
+        records = [
+            {
+                "glucose_mg_dl": float(rng.choice([39, 40, 69.5, 70, 130, 130.5, 180, 250, 251, 500, 501])),
+                "systolic_bp": int(rng.integers(35, 205)),
+                "diastolic_bp": int(rng.integers(25, 135)),
+                "heart_rate_bpm": int(rng.integers(0, 201)),
+                "temperature_celsius": float(rng.choice([34.9, 35.0, 36.4, 36.5, 37.5, 37.6, 39.5, 39.6, 40.0, 40.1])),
+                "spo2_percent": float(rng.integers(80, 101)),
+            }
+            for _ in range(n)
+        ]
+
+        batch = assess_vitals_batch(**vitals_columns(records), data_quality=0.9, sensor_quality=0.8)
+
+        _assert_agrees(batch, _per_patient(records, 0.9, 0.8))
+
+    def test_invalid_rows(self):
+        """범위 밖 / 수축기 <= 이완기 는 무효 처리"""
+        batch = assess_vitals_batch(
+            glucose_mg_dl=[35, 100],
+            systolic_bp=[120, 80],
+            diastolic_bp=[80, 90],
+            heart_rate_bpm=[72, 72],
+            temperature_celsius=[37.0, 37.0],
+            spo2_percent=[98, 98],
+        )
+
+        assert not batch.is_valid.any()
+        assert (batch.overall_severity == 0).all()
+        assert not batch.is_emergency.any()
+        assert np.isnan(batch.confidence).all()
+
+    def test_shape_mismatch(self):
+        """컬럼 길이 불일치"""
+        with pytest.raises(ValueError):
+            assess_vitals_batch([100, 100], [120], [80, 80], [72, 72], [37.0, 37.0], [98, 98])
@@ -0,0 +1,145 @@
+"""
+Streaming Emergency Detector - Unit Tests
+테스트 실행: pytest test_emergency_stream.py -v
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from medical_coach import MedicalExpertBackedCoach, VitalSigns
+from emergency_stream import (
+    EmergencyReason,
+    StreamingEmergencyDetector,
+    emergency_reasons,
+    emergency_reasons_batch,
+)
+
+TEST_CASES_PATH = Path(__file__).resolve().parents[3] / "medical_test_cases_100.json"
+
+NORMAL = (100, 120, 80, 72, 36.8, 98)
+HYPOGLYCEMIA = (35, 120, 80, 72, 36.8, 98)
+HYPOGLYCEMIA_AND_HYPOXIA = (35, 120, 80, 72, 36.8, 85)
+HYPOXIA = (100, 120, 80, 72, 36.8, 85)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def detector(clock):
+    return StreamingEmergencyDetector(dedup_window=60.0, clock=clock, capacity=2)
+
+
+class TestStreamingEmergencyDetector:
+    """스트리밍 응급 감지 테스트"""
+
+    def test_reasons_match_emergency_detection(self, detector):
+        """사유는 emergency_detection 과 동일"""
+        coach = MedicalExpertBackedCoach("stream_reference")
+        with open(TEST_CASES_PATH, encoding="utf-8") as f:
+            cases = json.load(f)["test_cases"]
+
+        for i, case in enumerate(cases):
+            v = case["vitals"]
+            is_emergency, reasons, _ = coach.emergency_detection(VitalSigns(**v))
+            event = detector.push(f"patient_{i}", *v.values())
+
+            assert (event is not None) == is_emergency
+            if event is not None:
+                assert event.reason_texts() == reasons
+
+    def test_batch_masks_match_scalar(self):
+        """벡터화 판정은 단일 판정과 동일"""
+        rows = [NORMAL, HYPOGLYCEMIA, (400, 190, 125, 160, 41, 88), (360, 120, 80, 39, 34.9, 91)]
+        masks = emergency_reasons_batch(*zip(*rows))
+
+        assert [int(m) for m in masks] == [emergency_reasons(*r) for r in rows]
+
+    def test_duplicate_alert_suppressed_within_window(self, detector, clock):
+        """같은 사유는 시간 창 안에서 한 번만 알림"""
+        assert detector.push("p1", *HYPOGLYCEMIA) is not None
+        clock.now = 30.0
+        assert detector.push("p1", *HYPOGLYCEMIA) is None
+        clock.now = 61.0
+        assert detector.push("p1", *HYPOGLYCEMIA) is not None
+
+        assert detector.stats.alerts == 2
+        assert detector.stats.suppressed == 1
+
+    def test_new_reason_is_not_suppressed(self, detector, clock):
+        """새로운 사유가 추가되면 즉시 알림"""
+        detector.push("p1", *HYPOGLYCEMIA)
+        clock.now = 5.0
+        event = detector.push("p1", *HYPOGLYCEMIA_AND_HYPOXIA)
+
+        assert event is not None
+        assert event.reasons == EmergencyReason.SEVERE_HYPOGLYCEMIA | EmergencyReason.HYPOXIA
+
+    def test_alternating_reasons_are_accumulated(self, detector, clock):
+        """시간 창 안에서 A -> B -> A 는 A 를 다시 알리지 않음"""
+        assert detector.push("p1", *HYPOGLYCEMIA) is not None
+        clock.now = 5.0
+        assert detector.push("p1", *HYPOXIA) is not None
+        clock.now = 10.0
+        assert detector.push("p1", *HYPOGLYCEMIA) is None
+        assert detector.push("p1", *HYPOGLYCEMIA_AND_HYPOXIA) is None
+
+        assert detector.stats.alerts == 2
+
+    def test_patients_are_independent(self, detector):
+        """환자별 상태 분리 및 슬롯 확장"""
+        fired = [detector.push(f"p{i}", *HYPOGLYCEMIA) for i in range(5)]
+
+        assert all(event is not None for event in fired)
+        assert detector.patient_count == 5
+
+    def test_push_batch_dedups_in_order(self, detector):
+        """일괄 처리에서도 도착 순서대로 중복 억제"""
+        rows = [HYPOGLYCEMIA, NORMAL, HYPOGLYCEMIA, HYPOGLYCEMIA_AND_HYPOXIA]
+        received = []
+        detector.on_emergency = received.append
+
+        fired = detector.push_batch(["p1", "p1", "p1", "p2"], *zip(*rows))
+
+        assert [e.patient_id for e in fired] == ["p1", "p2"]
+        assert received == fired
+        assert detector.stats.events == 4
+        assert detector.stats.suppressed == 1
+
+    def test_latency_budget(self, clock):
+        """지연 예산 초과 집계"""
+        detector = StreamingEmergencyDetector(latency_budget=0.005, clock=clock)
+        clock.now = 1.0
+        event = detector.push("p1", *HYPOGLYCEMIA, received_at=0.99)
+
+        assert event.latency == pytest.approx(0.01)
+        assert detector.stats.budget_violations == 1
+        assert detector.stats.latency_percentile(99) == pytest.approx(0.01)
+
+    def test_latency_samples_keep_most_recent(self, clock):
+        """지연 샘플은 링 버퍼 (최근 max_latency_samples 개)"""
+        detector = StreamingEmergencyDetector(dedup_window=0.0, clock=clock, max_latency_samples=3)
+        for i in range(10):
+            clock.now = float(i)
+            detector.push("p1", *HYPOGLYCEMIA, received_at=i - i / 100)
+
+        assert detector.stats.latency_count == 10
+        assert sorted(detector.stats.latencies) == pytest.approx([0.07, 0.08, 0.09])
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            StreamingEmergencyDetector(capacity=0)
+        with pytest.raises(ValueError):
+            StreamingEmergencyDetector(max_latency_samples=0)
@@ -0,0 +1,233 @@
+"""
+Structured Event Logging - Unit Tests
+테스트 실행: pytest test_event_log.py -v
+"""
+
+import io
+import logging
+
+import pytest
+
+from event_log import (
+    BatchingLogHandler,
+    EventMessage,
+    StructuredEventLogger,
+    configure_event_logging,
+)
+from medical_coach import MedicalExpertBackedCoach, VitalSigns
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class CountingMessage:
+    """str() 호출 횟수 확인용"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "counted"
+
+
+@pytest.fixture
+def capture():
+    test_logger = logging.getLogger("test_event_log")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    test_logger.addHandler(handler)
+    yield test_logger, handler
+    test_logger.removeHandler(handler)
+
+
+class TestStructuredEventLogger:
+    """구조화 이벤트 로거 테스트"""
+
+    def test_message_matches_legacy_text(self):
+        """사람이 읽는 메시지는 기존 문구와 동일"""
+        message = EventMessage("critical_glucose", {"patient_id": "p1", "glucose_mg_dl": 35})
+
+        assert str(message) == "CRITICAL GLUCOSE: 35 mg/dL for p1"
+        assert str(EventMessage("custom", {"a": 1})) == "custom a=1"
+
+    def test_structured_fields_on_record(self, capture):
+        """레코드에 이벤트 이름과 필드 부착"""
+        test_logger, handler = capture
+        StructuredEventLogger(test_logger).critical("critical_bp", patient_id="p1", systolic=190, diastolic=125)
+
+        record = handler.records[0]
+        assert record.event == "critical_bp"
+        assert record.event_fields == {"patient_id": "p1", "systolic": 190, "diastolic": 125}
+        assert record.emergency is True
+        assert record.getMessage() == "CRITICAL BP: 190/125 for p1"
+
+    def test_formatting_is_deferred(self, capture):
+        """비활성 레벨이면 포맷하지 않음"""
+        test_logger, handler = capture
+        test_logger.setLevel(logging.WARNING)
+        value = CountingMessage()
+
+        events = StructuredEventLogger(test_logger)
+        events.info("normal_assessment", patient_id=value)
+        assert value.calls == 0
+
+        events.warning("custom", value=value)
+        assert len(handler.records) == 1
+        assert handler.records[0].getMessage() == "custom value=counted"
+
+    def test_info_sampling_never_drops_critical(self, capture):
+        """INFO 만 샘플링, CRITICAL 은 항상 기록"""
+        test_logger, handler = capture
+        events = StructuredEventLogger(test_logger, rng=lambda: 0.5)
+        configure_event_logging(events, info_sample_rate=0.1)
+
+        for _ in range(10):
+            events.info("normal_assessment", patient_id="p1")
+            events.critical("critical_glucose", patient_id="p1", glucose_mg_dl=35)
+
+        assert [r.levelno for r in handler.records] == [logging.CRITICAL] * 10
+        assert events.sampled_out == 10
+
+    def test_mutable_fields_are_snapshotted(self, capture):
+        """기록 후 호출자가 리스트를 바꿔도 레코드는 그대로"""
+        test_logger, handler = capture
+        reasons = ["심각한 저혈당 (< 40 mg/dL)"]
+
+        StructuredEventLogger(test_logger).critical("emergency_detection", patient_id="p1", reasons=reasons)
+        reasons.append("저산소증 (SpO2 < 90%)")
+
+        record = handler.records[0]
+        assert record.event_fields["reasons"] == ("심각한 저혈당 (< 40 mg/dL)",)
+        assert record.getMessage() == "EMERGENCY for p1: ['심각한 저혈당 (< 40 mg/dL)']"
+
+    def test_invalid_sample_rate(self, capture):
+        with pytest.raises(ValueError):
+            configure_event_logging(StructuredEventLogger(capture[0]), info_sample_rate=1.5)
+
+
+class TestBatchingLogHandler:
+    """백그라운드 일괄 기록 테스트"""
+
+    def test_records_written_in_order(self, capture):
+        """모든 레코드를 순서대로 전달"""
+        test_logger, target = capture
+        test_logger.removeHandler(target)
+        handler = BatchingLogHandler(target)
+        test_logger.addHandler(handler)
+        events = StructuredEventLogger(test_logger)
+
+        for i in range(100):
+            events.info("custom", seq=i)
+        handler.close()
+        test_logger.removeHandler(handler)
+
+        assert [r.event_fields["seq"] for r in target.records] == list(range(100))
+        assert handler.written == 100
+
+    def test_overflow_drops_info_only(self):
+        """큐 초과 시 INFO 만 버리고 CRITICAL 은 유지"""
+        target = ListHandler()
+        handler = BatchingLogHandler(target, max_queue=0)
+
+        handler.handle(logging.makeLogRecord({"levelno": logging.INFO, "msg": "info"}))
+        handler.handle(logging.makeLogRecord({"levelno": logging.WARNING, "msg": "urgent", "emergency": True}))
+        handler.handle(logging.makeLogRecord({"levelno": logging.CRITICAL, "msg": "critical"}))
+        handler.close()
+
+        assert [r.msg for r in target.records] == ["urgent", "critical"]
+        assert handler.dropped == 1
+
+    def test_failures_are_not_counted_as_written(self, monkeypatch):
+        """대상 핸들러 기록 실패는 written 이 아니라 failed 로 집계"""
+        monkeypatch.setattr(logging, "raiseExceptions", False)
+        target = logging.StreamHandler(BrokenStream())
+        handler = BatchingLogHandler(target)
+
+        handler.handle(logging.makeLogRecord({"levelno": logging.INFO, "msg": "lost"}))
+        handler.flush()
+        handler.close()
+
+        assert (handler.written, handler.failed) == (0, 1)
+        assert "handleError" not in vars(target)
+
+    def test_formatting_happens_on_writer_thread(self):
+        """큐에 넣을 때 메시지를 미리 포맷하지 않음"""
+        test_logger = logging.Logger("test_event_log.writer", logging.INFO)
+        target = ListHandler()
+        handler = BatchingLogHandler(target)
+        test_logger.addHandler(handler)
+        value = CountingMessage()
+
+        StructuredEventLogger(test_logger).warning("custom", value=value)
+        assert value.calls == 0
+        handler.close()
+
+        assert target.records[0].getMessage() == "custom value=counted"
+
+
+    def test_queued_records_written_as_one_batch(self):
+        """쌓인 레코드는 대상 잠금 한 번, write 한 번으로 기록"""
+        stream = CountingStream()
+        target = logging.StreamHandler(stream)
+        handler = BatchingLogHandler(target, batch_size=64)
+
+        target.acquire()
+        try:
+            for i in range(100):
+                handler.handle(logging.makeLogRecord({"levelno": logging.INFO, "msg": f"line {i}"}))
+        finally:
+            target.release()
+        handler.flush()
+        handler.close()
+
+        assert stream.getvalue().splitlines() == [f"line {i}" for i in range(100)]
+        assert handler.written == 100
+        # 첫 배치 (잠금 대기 중 꺼낸 레코드) + 나머지 64개 단위
+        assert stream.writes == handler.batches <= 3
+
+    def test_rejects_empty_batch(self):
+        with pytest.raises(ValueError):
+            BatchingLogHandler(ListHandler(), batch_size=0)
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class BrokenStream:
+    def write(self, text):
+        raise OSError("disk full")
+
+    def flush(self):
+        pass
+
+
+class TestCoachEvents:
+    """의료 코치 이벤트 로깅 테스트"""
+
+    def test_coach_emits_structured_events(self, capture):
+        test_logger, handler = capture
+        coach = MedicalExpertBackedCoach("p1")
+        coach.events = StructuredEventLogger(test_logger)
+
+        coach.comprehensive_assessment(VitalSigns(400, 115, 75, 72, 36.8, 98))
+        coach.comprehensive_assessment(VitalSigns(100, 115, 75, 72, 36.8, 98))
+
+        assert [r.event for r in handler.records] == [
+            "critical_glucose", "emergency_assessment", "normal_assessment",
+        ]
+        assert handler.records[1].event_fields["patient_id"] == "p1"
@@ -3,13 +3,19 @@ AI Medical Coach - Unit Tests
 테스트 실행: pytest test_medical_coach.py -v
 """
 
+import json
+import numpy as np
+import orjson
 import pytest
+import medical_coach
 from datetime import datetime
 from medical_coach import (
     MedicalExpertBackedCoach, 
     VitalSigns, 
     SeverityLevel,
-    VitalSignType
+    VitalSignType,
+    GLUCOSE_SEVERE_HYPO_RECOMMENDATIONS,
+    AssessmentIdGenerator,
 )
 
 
@@ -306,6 +312,133 @@ class TestClinicalGuidelines:
         assert crisis['severity'] == SeverityLevel.LEVEL_4_CRITICAL
 
 
+class TestAssessmentResultSerialization:
+    """진단 결과 직렬화 테스트"""
+    
+    @pytest.fixture
+    def results(self):
+        coach = MedicalExpertBackedCoach('patient "quoted"\n환자')
+        return [
+            coach.assess_glucose(35),
+            coach.assess_glucose(150),
+            coach.assess_blood_pressure(120, 80),
+            coach.assess_heart_rate(72),
+            coach.assess_temperature(36.8),
+        ]
+    
+    def test_slotted(self, results):
+        """__slots__ 사용 (인스턴스 dict 없음)"""
+        assert not hasattr(results[0], '__dict__')
+    
+    def test_shared_recommendations(self):
+        """같은 심각도 구간은 권장사항 튜플 공유"""
+        coach = MedicalExpertBackedCoach('test')
+        first = coach.assess_glucose(30)
+        second = coach.assess_glucose(35)
+        
+        assert first.recommendations is GLUCOSE_SEVERE_HYPO_RECOMMENDATIONS
+        assert second.recommendations is first.recommendations
+    
+    def test_to_dict(self, results):
+        """enum 은 값으로, 권장사항은 리스트로 변환"""
+        data = results[0].to_dict()
+        
+        assert data['vital_sign_type'] == 'glucose'
+        assert data['severity_level'] == 4
+        assert data['recommendations'] == list(GLUCOSE_SEVERE_HYPO_RECOMMENDATIONS)
+        assert isinstance(data['assessment_time'], datetime)
+    
+    def test_to_json_bytes_matches_to_dict(self, results):
+        """JSON bytes 는 to_dict 결과와 동일한 내용"""
+        for result in results:
+            expected = result.to_dict()
+            expected['assessment_time'] = expected['assessment_time'].isoformat()
+            if expected['next_check_time'] is not None:
+                expected['next_check_time'] = expected['next_check_time'].isoformat()
+            
+            assert json.loads(result.to_json_bytes()) == expected
+    
+    def test_to_json_bytes_orjson_compatible(self, results):
+        """orjson.dumps(to_dict()) 와 바이트 단위로 동일"""
+        for result in results:
+            assert result.to_json_bytes() == orjson.dumps(result.to_dict())
+    
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_to_json_bytes_numpy_values(self, results, monkeypatch, use_orjson):
+        """NumPy 스칼라 값도 일반 숫자로 직렬화 (json 대체 경로 포함)"""
+        if not use_orjson:
+            monkeypatch.setattr(medical_coach, 'orjson', None)
+        result = results[0]
+        result.value = np.float64(35.5)
+        result.confidence = np.float32(0.5)
+        
+        data = json.loads(result.to_json_bytes())
+        
+        assert (data['value'], data['confidence']) == (35.5, 0.5)
+
+
+class TestAssessmentIdGenerator:
+    """진단 ID 생성기 테스트"""
+    
+    def test_monotonic_and_unique(self):
+        """단조 증가, 중복 없음"""
+        generator = AssessmentIdGenerator()
+        ids = [generator() for _ in range(1000)]
+        sequence = [int(i.rsplit('-', 1)[1], 16) for i in ids]
+        
+        assert len(set(ids)) == 1000
+        assert sequence == sorted(sequence)
+    
+    def test_unique_across_generators(self):
+        """생성기(프로세스)마다 다른 접두사"""
+        assert AssessmentIdGenerator().prefix != AssessmentIdGenerator().prefix
+    
+    def test_unique_across_threads(self):
+        """스레드 동시 호출에서도 중복 없음"""
+        import threading
+        generator = AssessmentIdGenerator()
+        ids = []
+        
+        def worker():
+            ids.extend(generator() for _ in range(2000))
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(set(ids)) == 8000
+    
+    def test_assessment_ids_unique_across_coaches(self):
+        """같은 환자의 다른 코치 인스턴스도 ID 충돌 없음"""
+        first = MedicalExpertBackedCoach('p1').assess_glucose(100)
+        second = MedicalExpertBackedCoach('p1').assess_glucose(100)
+        
+        assert first.assessment_id != second.assessment_id
+        assert first.assessment_id.startswith('glucose_p1_')
+
+
+class TestMedicalHistory:
+    """의료 기록 로드 테스트"""
+    
+    def test_lazy_medical_history(self):
+        """의료 기록은 처음 접근할 때 한 번만 로드"""
+        calls = []
+        
+        def loader(patient_id):
+            calls.append(patient_id)
+            return {'conditions': ['diabetes']}
+        
+        coach = MedicalExpertBackedCoach('p1', history_loader=loader)
+        coach.assess_glucose(100)
+        assert calls == []
+        
+        assert coach.medical_history == {'conditions': ['diabetes']}
+        assert coach.medical_history == {'conditions': ['diabetes']}
+        assert calls == ['p1']
+
+
 # 테스트 실행
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--tb=short'])
@@ -0,0 +1,143 @@
+"""
+Message Bundles - Unit Tests
+테스트 실행: pytest test_message_bundles.py -v
+"""
+
+import json
+
+import pytest
+
+from medical_coach import GLUCOSE_SEVERE_HYPO_RECOMMENDATIONS, MedicalExpertBackedCoach
+from message_bundles import (
+    CATALOG_FILE,
+    MessageBundle,
+    build_bundles,
+    dictionary_translator,
+    extract_messages,
+    load_bundles,
+    write_bundle,
+)
+
+SOURCE = '''
+class Coach:
+    def evaluate(self, value):
+        insights = []
+        insights.append("Stay hydrated.")
+        insights.append(f"Glucose is {value}")
+        return {"recommendation": "Rest now.", "priority": "low"}
+
+def helper():
+    return {"recommendation": "not extracted"}
+'''
+
+
+@pytest.fixture
+def translations(tmp_path):
+    directory = tmp_path / "locales"
+    directory.mkdir()
+    (directory / "en.json").write_text(json.dumps({"즉시 응급실로 이동": "Go to the emergency room now"}), encoding="utf-8")
+    (directory / "ko.json").write_text(json.dumps({"Blood Glucose": "혈당"}), encoding="utf-8")
+    return dictionary_translator(directory)
+
+
+class TestExtraction:
+    """정적 문구 추출 테스트"""
+
+    def test_extracts_all_three_coaches(self):
+        """세 코치의 권장사항/인사이트/진단 문구"""
+        texts = {message.text for message in extract_messages()[0]}
+
+        assert "Your blood glucose is too low. Consume a snack with fast-acting carbohydrates immediately." in texts
+        assert "⚠️ Critical health indicators detected. Seek immediate medical attention." in texts
+        assert set(GLUCOSE_SEVERE_HYPO_RECOMMENDATIONS) <= texts
+        assert "저산소증 (SpO2 < 90%)" in texts
+        assert "작은 습관이 큰 변화를 만듭니다." in texts
+
+        coach = MedicalExpertBackedCoach("patient_bundle")
+        assert coach.assess_glucose(35).diagnosis in texts
+
+    def test_skips_dynamic_and_out_of_scope_strings(self, tmp_path):
+        """f-string 과 대상 클래스 밖의 문구는 제외"""
+        (tmp_path / "coach.py").write_text(SOURCE, encoding="utf-8")
+
+        messages, dynamic = extract_messages(tmp_path, [("coach.py", ["Coach"])])
+
+        assert [message.text for message in messages] == ["Stay hydrated.", "Rest now."]
+        assert messages[0].sources == ["coach.py:5"]
+        assert dynamic == 1
+
+
+class TestBundles:
+    """번들 빌드/조회 테스트"""
+
+    def test_bundle_round_trip(self, tmp_path):
+        """ID 순서대로 문구 조회 (빈 문자열, 다국어 포함)"""
+        texts = ["혈당", "", "Blood pressure 🩺", "血圧"]
+        write_bundle(tmp_path / "x.msgb", "xx", texts, "digest")
+
+        with MessageBundle(tmp_path / "x.msgb") as bundle:
+            assert bundle.language == "xx"
+            assert [bundle.text(i) for i in range(len(bundle))] == texts
+            with pytest.raises(KeyError):
+                bundle.text(len(texts))
+
+    def test_build_and_localize(self, tmp_path, translations):
+        """번역 사전 적용, 번역 없는 문구와 동적 문구는 원문 유지"""
+        report = build_bundles(tmp_path / "bundles", ["ko", "en"], translations)
+        messages = load_bundles(tmp_path / "bundles")
+
+        assert report["languages"]["en"]["translated"] == 1
+        assert report["languages"]["ko"]["translated"] == 1
+        assert messages.localize("즉시 응급실로 이동", "en") == "Go to the emergency room now"
+        assert messages.localize("즉시 응급실로 이동", "ko") == "즉시 응급실로 이동"
+        assert messages.localize("Blood Glucose", "ko") == "혈당"
+        assert messages.localize("의료진 상담", "en") == "의료진 상담"
+        assert messages.localize("위험한 심박수 (180 bpm)", "en") == "위험한 심박수 (180 bpm)"
+        assert messages.localize("Blood Glucose", "ja") == "Blood Glucose"
+        message_id = messages.message_id("Blood Glucose")
+        assert messages.text(message_id, "ko") == "혈당"
+        messages.close()
+
+    @pytest.mark.parametrize("language", ["en", "ja"])
+    def test_text_rejects_unknown_ids(self, tmp_path, language):
+        """번들 유무와 무관하게 범위 밖 ID 는 KeyError"""
+        build_bundles(tmp_path, ["en"])
+        messages = load_bundles(tmp_path)
+        count = len(messages.catalog.entries)
+
+        try:
+            for message_id in (-1, count):
+                with pytest.raises(KeyError):
+                    messages.text(message_id, language)
+            messages.text(count - 1, language)
+        finally:
+            messages.close()
+
+    def test_ids_are_stable_across_rebuilds(self, tmp_path):
+        """재빌드 시 기존 ID 유지, 새 문구는 뒤에 추가, 사라진 문구는 retired"""
+        source = tmp_path / "coach.py"
+        source.write_text(SOURCE, encoding="utf-8")
+        out = tmp_path / "bundles"
+        build_bundles(out, ["en"], root=tmp_path, sources=[("coach.py", ["Coach"])])
+
+        source.write_text(
+            SOURCE.replace('"Stay hydrated."', '"Walk for 10 minutes."'), encoding="utf-8"
+        )
+        report = build_bundles(out, ["en"], root=tmp_path, sources=[("coach.py", ["Coach"])])
+        catalog = json.loads((out / CATALOG_FILE).read_text(encoding="utf-8"))["messages"]
+
+        assert report["new"] == 1
+        assert [(m["id"], m["text"], m.get("retired", False)) for m in catalog] == [
+            (0, "Stay hydrated.", True),
+            (1, "Rest now.", False),
+            (2, "Walk for 10 minutes.", False),
+        ]
+        with MessageBundle(out / "en.msgb") as bundle:
+            assert bundle.text(2) == "Walk for 10 minutes."
+
+    def test_rejects_bundle_from_another_catalog(self, tmp_path):
+        build_bundles(tmp_path, ["en"])
+        write_bundle(tmp_path / "ja.msgb", "ja", ["stale"], "other")
+
+        with pytest.raises(ValueError):
+            load_bundles(tmp_path)
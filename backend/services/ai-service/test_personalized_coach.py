@@ -0,0 +1,120 @@
+"""
+PersonalizedCoach - Adaptive Plan Tests
+테스트 실행: pytest test_personalized_coach.py -v
+"""
+
+import pytest
+from models.personalized_coach import (
+    PersonalizedCoach,
+    AdaptivePlanTracker,
+    GoalType,
+)
+
+
+@pytest.fixture
+def coach():
+    return PersonalizedCoach()
+
+
+@pytest.fixture
+def profile(coach):
+    return coach.create_user_profile({
+        "user_id": "user_001",
+        "goals": ["glucose_control", "weight_loss", "fitness_improvement"],
+    })
+
+
+class TestAdaptivePlan:
+    """적응형 계획 테스트"""
+
+    def test_high_glucose_adjustment(self, coach, profile):
+        """고혈당 시 탄수화물 감량"""
+        plan = coach.get_adaptive_plan(profile, {"glucose": 160}, {"weight": 1.0})
+
+        assert plan["dietary_adjustments"][0]["action"] == "reduce_carbs"
+        assert plan["focus_areas"] == ["post_meal_exercise"]
+        assert plan["intensity_modifier"] == 1.0
+
+    def test_fitness_overrides_weight_intensity(self, coach, profile):
+        """규칙 순서대로 intensity_modifier 적용"""
+        plan = coach.get_adaptive_plan(
+            profile, {"glucose": 100, "heart_rate_recovery": 25}, {"weight": 0.2}
+        )
+
+        assert plan["intensity_modifier"] == 1.1
+        assert plan["focus_areas"] == ["increased_cardio"]
+
+
+class TestAdaptivePlanTracker:
+    """이벤트 기반 적응형 계획 추적기 테스트"""
+
+    def test_initial_plan_matches_full_recompute(self, coach, profile):
+        """초기 계획은 전체 계산과 동일"""
+        measurements = {"glucose": 65, "heart_rate_recovery": 15}
+        progress = {"weight": 1.8}
+        tracker = coach.create_plan_tracker(profile, measurements, progress)
+
+        assert tracker.plan == coach.get_adaptive_plan(profile, measurements, progress)
+
+    def test_only_affected_rules_rerun(self, coach, profile):
+        """변경된 입력을 읽는 규칙만 재실행"""
+        tracker = coach.create_plan_tracker(profile, {"glucose": 100}, {"weight": 1.0})
+
+        tracker.on_progress({"weight": 0.3})
+
+        assert tracker.rule_runs == 1
+
+    def test_unchanged_event_is_noop(self, coach, profile):
+        """값이 같으면 재계산 및 알림 없음"""
+        tracker = coach.create_plan_tracker(profile, {"glucose": 100}, {"weight": 1.0})
+        received = []
+        tracker.subscribe(received.append)
+
+        assert tracker.on_measurement({"glucose": 100}) == {}
+        assert tracker.on_measurement({"steps": 5000}) == {}
+        assert tracker.rule_runs == 0
+        assert received == []
+
+    def test_subscribers_receive_diff(self, coach, profile):
+        """구독자는 변경된 항목만 수신"""
+        tracker = coach.create_plan_tracker(profile, {"glucose": 100}, {"weight": 1.0})
+        received = []
+        tracker.subscribe(received.append)
+
+        tracker.on_measurement({"glucose": 55})
+
+        assert len(received) == 1
+        assert set(received[0]) == {"warnings"}
+        assert received[0]["warnings"][0]["type"] == "hypoglycemia_risk"
+
+    def test_patched_plan_matches_full_recompute(self, coach, profile):
+        """증분 갱신 결과는 전체 재계산과 동일"""
+        tracker = coach.create_plan_tracker(profile, {"glucose": 100}, {"weight": 1.0})
+        events = [
+            ("m", {"glucose": 150}),
+            ("p", {"weight": 0.1}),
+            ("m", {"heart_rate_recovery": 30}),
+            ("p", {"weight": 2.0}),
+            ("m", {"glucose": 60, "heart_rate_recovery": 10}),
+        ]
+        measurements, progress = {"glucose": 100}, {"weight": 1.0}
+
+        for kind, values in events:
+            if kind == "m":
+                measurements.update(values)
+                tracker.on_measurement(values)
+            else:
+                progress.update(values)
+                tracker.on_progress(values)
+            assert tracker.plan == coach.get_adaptive_plan(profile, measurements, progress)
+
+    def test_unsubscribe(self, coach, profile):
+        """구독 해제 후 알림 없음"""
+        tracker = AdaptivePlanTracker(profile, {"glucose": 100}, {"weight": 1.0})
+        received = []
+        unsubscribe = tracker.subscribe(received.append)
+        unsubscribe()
+
+        tracker.on_measurement({"glucose": 200})
+
+        assert received == []
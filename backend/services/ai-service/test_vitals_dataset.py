@@ -0,0 +1,88 @@
+"""
+Vitals Dataset - Unit Tests
+테스트 실행: pytest test_vitals_dataset.py -v
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from batch_assessment import assess_vitals_batch, vitals_columns
+from vitals_dataset import (
+    ColumnSpec,
+    DatasetWriter,
+    KIND_INT,
+    convert_json,
+    export_json,
+    load_dataset,
+    write_test_cases,
+)
+
+TEST_CASES_PATH = Path(__file__).resolve().parents[3] / "medical_test_cases_100.json"
+
+
+class TestVitalsDataset:
+    """컬럼형 데이터셋 테스트"""
+
+    def test_json_round_trip_is_byte_identical(self, tmp_path):
+        """JSON -> 컬럼형 -> JSON 결과가 원본 파일과 동일"""
+        dataset = convert_json(TEST_CASES_PATH, tmp_path / "cases.mvd")
+        export_json(tmp_path / "cases.mvd", tmp_path / "cases.json")
+
+        assert len(dataset) == 88
+        assert (tmp_path / "cases.json").read_bytes() == TEST_CASES_PATH.read_bytes()
+
+    def test_column_types(self, tmp_path):
+        """정수/실수/불리언/문자열 컬럼 타입"""
+        dataset = convert_json(TEST_CASES_PATH, tmp_path / "cases.mvd")
+
+        assert dataset["vitals.systolic_bp"].dtype == np.int16
+        assert dataset["vitals.temperature_celsius"].dtype == np.float64
+        assert dataset.specs["expected_results.is_emergency"].kind == "bool"
+        assert dataset.strings("scenario")[0] == "정상"
+
+    def test_mixed_int_float_preserved(self, tmp_path):
+        """같은 컬럼의 int / float 구분 유지"""
+        cases = [
+            {"case_id": 1, "vitals": {"glucose_mg_dl": 100}, "ok": True},
+            {"case_id": 2, "vitals": {"glucose_mg_dl": 100.5}, "ok": False},
+            {"case_id": 3, "vitals": {"glucose_mg_dl": 101.0}, "ok": True},
+        ]
+        write_test_cases(tmp_path / "mixed.mvd", cases, {"source": "test"})
+        restored = load_dataset(tmp_path / "mixed.mvd").to_json_dict()
+
+        assert restored == {"metadata": {"source": "test"}, "test_cases": cases}
+        assert [type(c["vitals"]["glucose_mg_dl"]) for c in restored["test_cases"]] == [int, float, float]
+
+    def test_views_are_memory_mapped(self, tmp_path):
+        """컬럼은 파일을 가리키는 읽기 전용 뷰이며 일괄 평가 결과는 JSON 경로와 동일"""
+        dataset = convert_json(TEST_CASES_PATH, tmp_path / "cases.mvd")
+        columns = dataset.vitals_columns()
+
+        assert all(isinstance(c.base, np.memmap) and not c.flags.writeable for c in columns.values())
+
+        with open(TEST_CASES_PATH, encoding="utf-8") as f:
+            records = [case["vitals"] for case in json.load(f)["test_cases"]]
+        expected = assess_vitals_batch(**vitals_columns(records))
+        actual = assess_vitals_batch(**columns)
+
+        assert np.array_equal(actual.overall_severity, expected.overall_severity)
+        assert np.array_equal(actual.is_emergency, expected.is_emergency)
+
+    def test_chunked_writer(self, tmp_path):
+        """행 수를 미리 정하고 구간별로 기록"""
+        spec = ColumnSpec("case_id", KIND_INT, "<i4")
+        with DatasetWriter(tmp_path / "chunks.mvd", 10, [spec]) as writer:
+            writer.write(5, {"case_id": np.arange(5, 10)})
+            writer.write(0, {"case_id": np.arange(0, 5)})
+
+        assert load_dataset(tmp_path / "chunks.mvd")["case_id"].tolist() == list(range(10))
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "not_a_dataset.mvd"
+        path.write_bytes(b"{}")
+
+        with pytest.raises(ValueError):
+            load_dataset(path)
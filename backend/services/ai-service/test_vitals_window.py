@@ -0,0 +1,131 @@
+"""
+Vitals Window - Unit Tests
+테스트 실행: pytest test_vitals_window.py -v
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from medical_coach import MedicalExpertBackedCoach, VitalSigns
+from vitals_window import VitalsWindowStore, VITAL_FIELDS
+
+START = datetime(2026, 1, 2, 9, 0, 0)
+
+
+def reading(minutes: float, glucose: float = 100, spo2: float = 98, heart_rate: int = 72) -> VitalSigns:
+    return VitalSigns(
+        glucose_mg_dl=glucose,
+        systolic_bp=115,
+        diastolic_bp=75,
+        heart_rate_bpm=heart_rate,
+        temperature_celsius=36.8,
+        spo2_percent=spo2,
+        measurement_time=START + timedelta(minutes=minutes),
+    )
+
+
+class TestVitalsWindowStore:
+    """롤링 윈도우 테스트"""
+
+    def test_rate_needs_two_readings(self):
+        """측정값이 하나면 변화율 없음"""
+        store = VitalsWindowStore()
+        store.push("p1", reading(0))
+
+        assert store.rate_per_min("p1", "glucose_mg_dl") is None
+        assert store.rate_per_min("unknown", "glucose_mg_dl") is None
+
+    def test_rate_per_min(self):
+        """분당 변화율"""
+        store = VitalsWindowStore()
+        store.push("p1", reading(0, glucose=150))
+        store.push("p1", reading(5, glucose=130))
+
+        assert store.rate_per_min("p1", "glucose_mg_dl") == pytest.approx(-4.0)
+
+    def test_ring_wraps_to_window(self):
+        """윈도우 크기 초과 시 가장 오래된 값부터 덮어씀"""
+        store = VitalsWindowStore(window_size=3)
+        for minute, glucose in enumerate([200, 100, 110, 120]):
+            store.push("p1", reading(minute * 5, glucose=glucose))
+
+        times, values = store.history("p1", "glucose_mg_dl")
+
+        assert list(values) == [100, 110, 120]
+        assert store.rate_per_min("p1", "glucose_mg_dl") == pytest.approx(2.0)
+
+    def test_evaluate_trends(self):
+        """혈당 급강하 규칙 감지"""
+        store = VitalsWindowStore()
+        store.push("p1", reading(0, glucose=160))
+        store.push("p1", reading(5, glucose=140))
+
+        findings = store.evaluate_trends("p1")
+
+        assert [f.rule for f in findings] == ["glucose_rapid_fall"]
+
+    def test_min_span(self):
+        """최소 시간 간격 미만이면 평가하지 않음"""
+        store = VitalsWindowStore(min_span_seconds=120)
+        store.push("p1", reading(0, glucose=160))
+        store.push("p1", reading(1, glucose=100))
+
+        assert store.evaluate_trends("p1") == []
+
+    def test_batch_matches_scalar(self):
+        """일괄 갱신/평가 결과는 단일 경로와 동일"""
+        rng = np.random.default_rng(3)
+        patients = [f"p{i}" for i in range(50)]
+        scalar = VitalsWindowStore(window_size=4, capacity=8)
+        batch = VitalsWindowStore(window_size=4, capacity=8)
+        slots = batch.slots(patients)
+
+        for tick in range(6):
+            values = np.column_stack([
+                rng.uniform(60, 250, len(patients)).round(),
+                np.full(len(patients), 115), np.full(len(patients), 75),
+                rng.integers(50, 130, len(patients)), np.full(len(patients), 36.8),
+                rng.integers(88, 100, len(patients)),
+            ])
+            for patient_id, row in zip(patients, values):
+                vitals = reading(tick * 5, glucose=row[0], spo2=row[5], heart_rate=row[3])
+                scalar.push(patient_id, vitals, timestamp=tick * 300.0)
+            batch.push_batch(slots, values, np.full(len(patients), tick * 300.0))
+
+        rates = batch.rates_per_min("glucose_mg_dl")
+        for patient_id, slot in zip(patients, slots):
+            assert rates[slot] == pytest.approx(scalar.rate_per_min(patient_id, "glucose_mg_dl"))
+
+        triggered = batch.triggered_slots()
+        for patient_id, slot in zip(patients, slots):
+            rules = {f.rule for f in scalar.evaluate_trends(patient_id)}
+            assert rules == {name for name, hits in triggered.items() if slot in hits}
+
+    def test_grows_capacity(self):
+        """환자 수가 용량을 넘으면 확장"""
+        store = VitalsWindowStore(capacity=2)
+        for i in range(5):
+            store.push(f"p{i}", reading(0))
+
+        assert len(store) == 5
+        assert store.capacity >= 5
+        assert len(VITAL_FIELDS) == 6
+
+
+class TestAssessWithTrends:
+    """추세 반영 종합 평가 테스트"""
+
+    def test_trend_escalates_severity(self):
+        """정상 범위라도 급격한 하강이면 심각도 상향"""
+        coach = MedicalExpertBackedCoach("p1")
+        store = VitalsWindowStore()
+
+        first = coach.assess_with_trends(reading(0, glucose=125), store)
+        second = coach.assess_with_trends(reading(10, glucose=95), store)
+
+        assert first['overall_severity'] == 1 and first['trends'] == []
+        assert second['trends'][0]['rule'] == "glucose_rapid_fall"
+        assert second['overall_severity'] == 3
+        assert any(r.startswith("추세:") for r in second['risk_factors'])
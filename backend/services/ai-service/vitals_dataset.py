@@ -0,0 +1,329 @@
+"""
+Vitals Dataset - 테스트 케이스/생리 신호 컬럼형 바이너리 포맷
+Version: 1.0
+
+- 고정 폭 타입 컬럼 + JSON 헤더, 컬럼은 64바이트 정렬
+- np.memmap 으로 열어 컬럼을 복사 없이 배열 뷰로 반환 (assess_vitals_batch 에 바로 전달)
+- 문자열은 사전 인코딩 (정수 코드 + 헤더의 사전)
+- medical_test_cases_100.json 형식과 무손실 상호 변환 (int/float/bool 구분 유지)
+
+파일 구조:
+    MAGIC (8) | 헤더 길이 uint32 (4) | 헤더 JSON (UTF-8) | 패딩 | 컬럼 ...
+"""
+
+import json
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from batch_assessment import VITAL_COLUMNS
+
+MAGIC = b"MPSVDS1\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+PathLike = Union[str, Path]
+
+# 컬럼 종류 (JSON 값 타입)
+KIND_INT = "int"
+KIND_FLOAT = "float"
+KIND_BOOL = "bool"
+KIND_STR = "str"
+# float 로 저장하되 정수였던 값은 마스크 컬럼으로 표시
+KIND_MIXED = "mixed"
+INT_MASK_SUFFIX = ":is_int"
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    컬럼 정의
+
+    name 은 JSON 경로 (예: "vitals.glucose_mg_dl")
+    """
+    name: str
+    kind: str
+    dtype: str
+    dictionary: Optional[Tuple[str, ...]] = None
+
+    def to_header(self, offset: int) -> Dict:
+        entry = {"name": self.name, "kind": self.kind, "dtype": self.dtype, "offset": offset}
+        if self.dictionary is not None:
+            entry["dictionary"] = list(self.dictionary)
+        return entry
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _smallest_int_dtype(values: np.ndarray) -> str:
+    if len(values) == 0:
+        return "<i8"
+    low, high = int(values.min()), int(values.max())
+    for dtype in ("<i1", "<i2", "<i4"):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return "<i8"
+
+
+def _code_dtype(size: int) -> str:
+    if size <= np.iinfo(np.uint8).max:
+        return "<u1"
+    if size <= np.iinfo(np.uint16).max:
+        return "<u2"
+    return "<u4"
+
+
+class DatasetWriter:
+    """
+    컬럼형 데이터셋 기록기
+
+    행 수를 미리 알고 파일을 할당한 뒤 write() 로 구간별로 채운다.
+    청크 단위로 생성되는 대용량 데이터도 메모리 사용량이 일정하다.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        rows: int,
+        columns: Sequence[ColumnSpec],
+        metadata: Optional[Dict] = None,
+    ):
+        self.path = Path(path)
+        self.rows = rows
+        self.columns = tuple(columns)
+
+        # 헤더 길이가 오프셋에 영향을 주므로 고정점이 될 때까지 반복
+        data_start = 0
+        while True:
+            offsets = []
+            offset = data_start
+            for column in self.columns:
+                offsets.append(offset)
+                offset = _aligned(offset + rows * np.dtype(column.dtype).itemsize)
+            header = json.dumps({
+                "format": "mps-vitals-dataset",
+                "version": FORMAT_VERSION,
+                "rows": rows,
+                "metadata": metadata or {},
+                "columns": [c.to_header(o) for c, o in zip(self.columns, offsets)],
+            }, ensure_ascii=False).encode("utf-8")
+            needed = _aligned(len(MAGIC) + 4 + len(header))
+            if needed <= data_start:
+                break
+            data_start = needed
+
+        self.offsets = dict(zip((c.name for c in self.columns), offsets))
+        with open(self.path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.truncate(max(offset, data_start))
+        self._raw = np.memmap(self.path, dtype=np.uint8, mode="r+") if offset > data_start else None
+
+    def _view(self, column: ColumnSpec) -> np.ndarray:
+        start = self.offsets[column.name]
+        size = self.rows * np.dtype(column.dtype).itemsize
+        return self._raw[start:start + size].view(column.dtype)
+
+    def write(self, start: int, values: Dict[str, np.ndarray]) -> None:
+        """start 행부터 컬럼 값 기록 (문자열 컬럼은 사전 코드)"""
+        for column in self.columns:
+            data = values[column.name]
+            self._view(column)[start:start + len(data)] = data
+
+    def close(self) -> None:
+        if self._raw is not None:
+            self._raw.flush()
+            self._raw = None
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class VitalsDataset:
+    """
+    메모리 맵으로 연 컬럼형 데이터셋
+
+    columns 의 배열은 파일을 직접 가리키는 읽기 전용 뷰이다.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a vitals dataset")
+            (header_size,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_size).decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset version: {header.get('version')}")
+
+        self.rows: int = header["rows"]
+        self.metadata: Dict = header["metadata"]
+        self.specs: Dict[str, ColumnSpec] = {}
+        self.columns: Dict[str, np.ndarray] = {}
+        raw = np.memmap(self.path, dtype=np.uint8, mode="r") if self.rows else None
+        for entry in header["columns"]:
+            dictionary = entry.get("dictionary")
+            spec = ColumnSpec(entry["name"], entry["kind"], entry["dtype"],
+                              tuple(dictionary) if dictionary is not None else None)
+            self.specs[spec.name] = spec
+            size = self.rows * np.dtype(spec.dtype).itemsize
+            if raw is None:
+                self.columns[spec.name] = np.empty(0, dtype=spec.dtype)
+            else:
+                self.columns[spec.name] = raw[entry["offset"]:entry["offset"] + size].view(spec.dtype)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def strings(self, name: str) -> List[str]:
+        """사전 인코딩 문자열 컬럼 디코딩"""
+        dictionary = self.specs[name].dictionary
+        return [dictionary[code] for code in self.columns[name].tolist()]
+
+    def vitals_columns(self, prefix: str = "vitals.") -> Dict[str, np.ndarray]:
+        """assess_vitals_batch(**dataset.vitals_columns()) 용 컬럼 뷰"""
+        return {name: self.columns[prefix + name] for name in VITAL_COLUMNS}
+
+    def _python_column(self, spec: ColumnSpec) -> List[Any]:
+        values = self.columns[spec.name]
+        if spec.kind == KIND_STR:
+            return self.strings(spec.name)
+        if spec.kind == KIND_BOOL:
+            return values.astype(bool).tolist()
+        if spec.kind == KIND_MIXED:
+            is_int = self.columns[spec.name + INT_MASK_SUFFIX].astype(bool).tolist()
+            return [int(v) if i else v for v, i in zip(values.tolist(), is_int)]
+        return values.tolist()
+
+    def iter_records(self) -> Iterator[Dict]:
+        """원래 JSON 케이스 형태로 한 행씩 복원"""
+        specs = [s for s in self.specs.values() if not s.name.endswith(INT_MASK_SUFFIX)]
+        paths = [spec.name.split(".") for spec in specs]
+        columns = [self._python_column(spec) for spec in specs]
+        for row in zip(*columns):
+            record: Dict = {}
+            for path, value in zip(paths, row):
+                target = record
+                for key in path[:-1]:
+                    target = target.setdefault(key, {})
+                target[path[-1]] = value
+            yield record
+
+    def to_json_dict(self) -> Dict:
+        """{"metadata": ..., "test_cases": [...]} 로 복원"""
+        return {"metadata": self.metadata, "test_cases": list(self.iter_records())}
+
+
+def load_dataset(path: PathLike) -> VitalsDataset:
+    return VitalsDataset(path)
+
+
+# ==================== JSON 변환 ====================
+
+def _flatten(record: Dict, prefix: str = "") -> Dict[str, Any]:
+    flat = {}
+    for key, value in record.items():
+        if "." in key:
+            raise ValueError(f"Unsupported key with '.': {key}")
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def _encode_column(name: str, values: List[Any]) -> List[Tuple[ColumnSpec, np.ndarray]]:
+    types = {type(v) for v in values}
+    if types <= {bool}:
+        return [(ColumnSpec(name, KIND_BOOL, "<u1"), np.array(values, dtype=np.uint8))]
+    if types <= {str}:
+        dictionary = tuple(dict.fromkeys(values))
+        index = {value: code for code, value in enumerate(dictionary)}
+        dtype = _code_dtype(len(dictionary))
+        codes = np.array([index[v] for v in values], dtype=dtype)
+        return [(ColumnSpec(name, KIND_STR, dtype, dictionary), codes)]
+    if types <= {int}:
+        array = np.array(values, dtype=np.int64)
+        dtype = _smallest_int_dtype(array)
+        return [(ColumnSpec(name, KIND_INT, dtype), array.astype(dtype))]
+    if types <= {float}:
+        return [(ColumnSpec(name, KIND_FLOAT, "<f8"), np.array(values, dtype=np.float64))]
+    if types <= {int, float} and all(abs(v) < 2 ** 53 for v in values if type(v) is int):
+        is_int = np.array([type(v) is int for v in values], dtype=np.uint8)
+        return [
+            (ColumnSpec(name, KIND_MIXED, "<f8"), np.array(values, dtype=np.float64)),
+            (ColumnSpec(name + INT_MASK_SUFFIX, KIND_BOOL, "<u1"), is_int),
+        ]
+    raise ValueError(f"Unsupported value types for column {name}: {sorted(t.__name__ for t in types)}")
+
+
+def write_test_cases(path: PathLike, test_cases: Sequence[Dict], metadata: Optional[Dict] = None) -> None:
+    """
+    테스트 케이스 목록을 컬럼형 파일로 기록
+
+    모든 케이스는 같은 키 구조여야 한다 (medical_test_cases_100.json 형식).
+    """
+    flat = [_flatten(case) for case in test_cases]
+    names = list(flat[0]) if flat else []
+    for i, record in enumerate(flat):
+        if list(record) != names:
+            raise ValueError(f"Test case {i} has a different key layout")
+
+    encoded: List[Tuple[ColumnSpec, np.ndarray]] = []
+    for name in names:
+        encoded.extend(_encode_column(name, [record[name] for record in flat]))
+
+    with DatasetWriter(path, len(flat), [spec for spec, _ in encoded], metadata) as writer:
+        if flat:
+            writer.write(0, {spec.name: values for spec, values in encoded})
+
+
+def convert_json(json_path: PathLike, dataset_path: PathLike) -> VitalsDataset:
+    """JSON 테스트 케이스 파일 -> 컬럼형 파일"""
+    with open(json_path, encoding="utf-8") as f:
+        data = json.load(f)
+    write_test_cases(dataset_path, data["test_cases"], data.get("metadata"))
+    return load_dataset(dataset_path)
+
+
+def export_json(dataset_path: PathLike, json_path: PathLike) -> None:
+    """컬럼형 파일 -> JSON (medical_test_case_generator.export_json 과 같은 형식)"""
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(load_dataset(dataset_path).to_json_dict(), f, indent=2, ensure_ascii=False)
+
+
+def main(argv: Sequence[str]) -> int:
+    """
+    실행:
+        python vitals_dataset.py to-columnar cases.json cases.mvd
+        python vitals_dataset.py to-json cases.mvd cases.json
+    """
+    if len(argv) != 3 or argv[0] not in ("to-columnar", "to-json"):
+        print(main.__doc__)
+        return 1
+    command, source, target = argv
+    if command == "to-columnar":
+        dataset = convert_json(source, target)
+        print(f"✓ {len(dataset)} cases -> {target} ({Path(target).stat().st_size:,} bytes)")
+    else:
+        export_json(source, target)
+        print(f"✓ {source} -> {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,266 @@
+"""
+Vitals Window - 환자별 시계열 링 버퍼와 추세 기반 평가
+Version: 1.0
+
+- 환자별 최근 N개 측정값을 미리 할당된 배열(링 버퍼)에 저장
+- 변화율 규칙 (예: 혈당 분당 2 mg/dL 이상 하강) 을 측정값당 O(1) 로 평가
+- 다수 환자 일괄 갱신/평가 (NumPy)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from medical_coach import SeverityLevel, VitalSigns
+
+VITAL_FIELDS = (
+    "glucose_mg_dl",
+    "systolic_bp",
+    "diastolic_bp",
+    "heart_rate_bpm",
+    "temperature_celsius",
+    "spo2_percent",
+)
+VITAL_INDEX = {name: i for i, name in enumerate(VITAL_FIELDS)}
+
+
+@dataclass(frozen=True)
+class TrendRule:
+    """
+    변화율 규칙
+
+    threshold_per_min 이 음수면 하강 속도, 양수면 상승 속도 기준
+    """
+    name: str
+    vital: str
+    threshold_per_min: float
+    severity: SeverityLevel
+    diagnosis: str
+
+    def triggered(self, rate_per_min: float) -> bool:
+        if self.threshold_per_min < 0:
+            return rate_per_min < self.threshold_per_min
+        return rate_per_min > self.threshold_per_min
+
+
+DEFAULT_TREND_RULES: Tuple[TrendRule, ...] = (
+    TrendRule(
+        name="glucose_rapid_fall",
+        vital="glucose_mg_dl",
+        threshold_per_min=-2.0,
+        severity=SeverityLevel.LEVEL_3_URGENT,
+        diagnosis="급격한 혈당 하강 (> 2 mg/dL/min) - 저혈당 임박",
+    ),
+    TrendRule(
+        name="glucose_rapid_rise",
+        vital="glucose_mg_dl",
+        threshold_per_min=3.0,
+        severity=SeverityLevel.LEVEL_2_WARNING,
+        diagnosis="급격한 혈당 상승 (> 3 mg/dL/min)",
+    ),
+    TrendRule(
+        name="spo2_falling",
+        vital="spo2_percent",
+        threshold_per_min=-1.0,
+        severity=SeverityLevel.LEVEL_3_URGENT,
+        diagnosis="산소포화도 하강 (> 1 %/min)",
+    ),
+    TrendRule(
+        name="heart_rate_rising",
+        vital="heart_rate_bpm",
+        threshold_per_min=5.0,
+        severity=SeverityLevel.LEVEL_2_WARNING,
+        diagnosis="심박수 급상승 (> 5 bpm/min)",
+    ),
+)
+
+
+@dataclass
+class TrendFinding:
+    """추세 규칙 감지 결과"""
+    rule: str
+    vital: str
+    rate_per_min: float
+    severity: SeverityLevel
+    diagnosis: str
+
+    def to_dict(self) -> Dict:
+        return {
+            'rule': self.rule,
+            'vital': self.vital,
+            'rate_per_min': round(self.rate_per_min, 3),
+            'severity_level': self.severity.value,
+            'diagnosis': self.diagnosis,
+        }
+
+
+class VitalsWindowStore:
+    """
+    환자별 생리 신호 롤링 윈도우
+
+    모든 환자의 윈도우를 (capacity, window_size) 배열에 저장한다.
+    변화율은 윈도우의 가장 오래된 값과 최신 값으로 계산하므로
+    측정값 추가와 규칙 평가 모두 O(1) 이다.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 12,
+        capacity: int = 1024,
+        rules: Sequence[TrendRule] = DEFAULT_TREND_RULES,
+        min_span_seconds: float = 60.0,
+    ):
+        """
+        초기화
+
+        Args:
+            window_size: 환자별 보관 측정값 수
+            capacity: 초기 환자 슬롯 수 (부족하면 두 배로 확장)
+            rules: 변화율 규칙
+            min_span_seconds: 변화율 계산에 필요한 최소 시간 간격
+        """
+        self.window_size = window_size
+        self.rules = tuple(rules)
+        self.min_span_seconds = min_span_seconds
+        self._slots: Dict[str, int] = {}
+        self._times = np.zeros((capacity, window_size), dtype=np.float64)
+        self._values = np.zeros((len(VITAL_FIELDS), capacity, window_size), dtype=np.float32)
+        self._head = np.zeros(capacity, dtype=np.int32)
+        self._count = np.zeros(capacity, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def capacity(self) -> int:
+        return self._times.shape[0]
+
+    def slot(self, patient_id: str) -> int:
+        """환자 슬롯 인덱스 (없으면 할당)"""
+        slot = self._slots.get(patient_id)
+        if slot is None:
+            slot = len(self._slots)
+            if slot == self.capacity:
+                self._grow()
+            self._slots[patient_id] = slot
+        return slot
+
+    def slots(self, patient_ids: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.slot(p) for p in patient_ids), dtype=np.int64, count=len(patient_ids))
+
+    def _grow(self) -> None:
+        capacity = self.capacity
+        self._times = np.concatenate([self._times, np.zeros_like(self._times)])
+        self._values = np.concatenate([self._values, np.zeros_like(self._values)], axis=1)
+        self._head = np.concatenate([self._head, np.zeros(capacity, dtype=np.int32)])
+        self._count = np.concatenate([self._count, np.zeros(capacity, dtype=np.int32)])
+
+    # ==================== 단일 환자 ====================
+
+    def push(self, patient_id: str, vitals: VitalSigns, timestamp: Optional[float] = None) -> int:
+        """
+        측정값 추가
+
+        Args:
+            timestamp: 측정 시각 (epoch 초). 없으면 vitals.measurement_time 사용
+        """
+        slot = self.slot(patient_id)
+        if timestamp is None:
+            timestamp = vitals.measurement_time.timestamp()
+        head = self._head[slot]
+        self._times[slot, head] = timestamp
+        values = self._values
+        values[0, slot, head] = vitals.glucose_mg_dl
+        values[1, slot, head] = vitals.systolic_bp
+        values[2, slot, head] = vitals.diastolic_bp
+        values[3, slot, head] = vitals.heart_rate_bpm
+        values[4, slot, head] = vitals.temperature_celsius
+        values[5, slot, head] = vitals.spo2_percent
+        self._head[slot] = (head + 1) % self.window_size
+        if self._count[slot] < self.window_size:
+            self._count[slot] += 1
+        return slot
+
+    def _ends(self, slot: int) -> Tuple[int, int]:
+        head = int(self._head[slot])
+        oldest = head if self._count[slot] == self.window_size else 0
+        return oldest, (head - 1) % self.window_size
+
+    def rate_per_min(self, patient_id: str, vital: str) -> Optional[float]:
+        """윈도우 내 분당 변화율 (데이터 부족 시 None)"""
+        slot = self._slots.get(patient_id)
+        if slot is None or self._count[slot] < 2:
+            return None
+        oldest, newest = self._ends(slot)
+        span = self._times[slot, newest] - self._times[slot, oldest]
+        if span < self.min_span_seconds or span <= 0:
+            return None
+        values = self._values[VITAL_INDEX[vital], slot]
+        return (float(values[newest]) - float(values[oldest])) / span * 60.0
+
+    def evaluate_trends(self, patient_id: str) -> List[TrendFinding]:
+        """환자의 변화율 규칙 평가"""
+        findings = []
+        rates: Dict[str, Optional[float]] = {}
+        for rule in self.rules:
+            if rule.vital not in rates:
+                rates[rule.vital] = self.rate_per_min(patient_id, rule.vital)
+            rate = rates[rule.vital]
+            if rate is not None and rule.triggered(rate):
+                findings.append(TrendFinding(rule.name, rule.vital, rate, rule.severity, rule.diagnosis))
+        return findings
+
+    def history(self, patient_id: str, vital: str) -> Tuple[np.ndarray, np.ndarray]:
+        """윈도우 내 (시각, 값) 을 시간순으로 반환"""
+        slot = self._slots[patient_id]
+        count = int(self._count[slot])
+        order = (np.arange(count) + (self._head[slot] if count == self.window_size else 0)) % self.window_size
+        return self._times[slot, order], self._values[VITAL_INDEX[vital], slot, order]
+
+    # ==================== 다수 환자 일괄 처리 ====================
+
+    def push_batch(self, slots: np.ndarray, values: np.ndarray, timestamps: np.ndarray) -> None:
+        """
+        환자별 측정값 1개씩 일괄 추가
+
+        Args:
+            slots: 환자 슬롯 (배치 내 중복 없음)
+            values: (len(slots), 6) 배열, VITAL_FIELDS 순서
+            timestamps: 측정 시각 (epoch 초)
+        """
+        slots = np.asarray(slots)
+        heads = self._head[slots]
+        self._times[slots, heads] = timestamps
+        self._values[:, slots, heads] = np.asarray(values, dtype=np.float32).T
+        self._head[slots] = (heads + 1) % self.window_size
+        self._count[slots] = np.minimum(self._count[slots] + 1, self.window_size)
+
+    def rates_per_min(self, vital: str) -> np.ndarray:
+        """모든 환자 슬롯의 분당 변화율 (계산 불가 시 NaN)"""
+        used = len(self._slots)
+        rows = np.arange(used)
+        head = self._head[:used]
+        count = self._count[:used]
+        oldest = np.where(count == self.window_size, head, 0)
+        newest = (head - 1) % self.window_size
+        span = self._times[rows, newest] - self._times[rows, oldest]
+        values = self._values[VITAL_INDEX[vital], :used]
+        delta = values[rows, newest].astype(np.float64) - values[rows, oldest]
+        valid = (count >= 2) & (span >= self.min_span_seconds) & (span > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(valid, delta / span * 60.0, np.nan)
+
+    def triggered_slots(self) -> Dict[str, np.ndarray]:
+        """규칙별로 조건을 만족하는 환자 슬롯"""
+        rates: Dict[str, np.ndarray] = {}
+        triggered = {}
+        for rule in self.rules:
+            if rule.vital not in rates:
+                rates[rule.vital] = self.rates_per_min(rule.vital)
+            rate = rates[rule.vital]
+            with np.errstate(invalid="ignore"):
+                hit = rate < rule.threshold_per_min if rule.threshold_per_min < 0 else rate > rule.threshold_per_min
+            triggered[rule.name] = np.flatnonzero(hit)
+        return triggered
+
@@ -0,0 +1,653 @@
+"""
+Translation service benchmarks
+Run: python bench_translation_service.py [benchmark name ...]
+
+Runs in-process against a temporary SQLite database (DATABASE_URL is overridden).
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+_db_dir = tempfile.mkdtemp(prefix="translation-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+os.environ.setdefault("TRANSLATION_MEMORY_RECONCILE_SECONDS", "0")
+
+import jwt
+from fastapi.testclient import TestClient
+
+import main
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {}
+
+
+def benchmark(func: Callable[[], None]) -> Callable[[], None]:
+    """Register a benchmark"""
+    BENCHMARKS[func.__name__.replace("bench_", "")] = func
+    return func
+
+
+def _report(name: str, count: int, seconds: float, unit: str = "items") -> None:
+    print(f"{name:<40} {count:>10,} {unit}  {seconds * 1000:>10.1f} ms  {count / seconds:>14,.0f} {unit}/s")
+
+
+def _auth_headers(user_id: str = "bench-user", **claims) -> Dict[str, str]:
+    token = jwt.encode({"id": user_id, **claims}, main.JWT_SECRET, algorithm=main.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _with_latency(seconds: float):
+    """Stand-in for a remote provider: perform_translation plus network latency"""
+    original = main.perform_translation
+
+    async def translate(text, source_language, target_language, context=None):
+        await asyncio.sleep(seconds)
+        return await original(text, source_language, target_language, context)
+
+    return translate
+
+
+def _coaching_report(index: int, segments: int = 60, unique: int = 40):
+    return [f"리포트 {index} 문장 {i % unique}: 오늘의 건강 코칭 권장사항입니다." for i in range(segments)]
+
+
+@benchmark
+def bench_translate_batch() -> None:
+    """Localize coaching reports: POST /translate per segment vs POST /translate:batch"""
+    reports = 10
+    headers = _auth_headers()
+    original = main.perform_translation
+    with TestClient(main.app) as client:
+        for latency in (0.0, 0.005):
+            main.perform_translation = _with_latency(latency)
+            print(f"-- {reports} reports x 60 segments (40 unique), provider latency {latency * 1000:.0f} ms")
+            main.translation_memory.clear()
+            segments = 0
+            start = time.perf_counter()
+            for index in range(reports):
+                for text in _coaching_report(index):
+                    client.post(
+                        "/api/v1/translate",
+                        json={"text": text, "source_language": "ko", "target_language": "en"},
+                        headers=headers,
+                    )
+                    segments += 1
+            _report("single-segment POST /translate", segments, time.perf_counter() - start, "segments")
+
+            main.translation_memory.clear()
+            segments = 0
+            start = time.perf_counter()
+            for index in range(reports):
+                report = _coaching_report(index + reports)
+                response = client.post(
+                    "/api/v1/translate:batch",
+                    json={"segments": report, "source_language": "ko", "target_language": "en"},
+                    headers=headers,
+                )
+                segments += response.json()["count"]
+            _report("POST /translate:batch", segments, time.perf_counter() - start, "segments")
+            main.perform_translation = original
+
+
+def _seed_history(user_id: str, rows: int) -> None:
+    """Insert a large translation history directly through sqlite3"""
+    import sqlite3
+    import uuid
+    from datetime import timedelta
+
+    path = os.environ["DATABASE_URL"].split("///", 1)[1]
+    start = datetime(2025, 1, 1)
+
+    def timestamp(i):
+        # same text format SQLAlchemy's SQLite DateTime writes
+        return f"{start + timedelta(seconds=i):%Y-%m-%d %H:%M:%S.%f}"
+
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO translations (id, user_id, source_language, target_language, source_text, "
+            "translated_text, context, is_approved, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
+            (
+                (str(uuid.uuid4()), user_id, "ko", "en", f"문장 {i} " * 20, f"[EN] sentence {i} " * 20, None,
+                 timestamp(i), timestamp(i))
+                for i in range(rows)
+            ),
+        )
+
+
+@benchmark
+def bench_async_db() -> None:
+    """Event-loop stalls under load: sync Session (legacy) vs AsyncSession on get_translations"""
+    import statistics
+    import httpx
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session, sessionmaker
+
+    history_rows = 100_000
+    heavy_requests = 20
+    headers = _auth_headers("heavy-history-user")
+
+    # legacy endpoint: same query through a synchronous Session inside an async handler
+    sync_engine = create_engine(os.environ["DATABASE_URL"], pool_size=heavy_requests)
+    SyncSession = sessionmaker(bind=sync_engine)
+    legacy_app = FastAPI()
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @legacy_app.get("/api/v1/translations")
+    async def legacy_get_translations(
+        user: Dict = Depends(main.verify_token), db: Session = Depends(get_sync_db), limit: int = 50
+    ):
+        rows = db.query(main.Translation).filter(main.Translation.user_id == user.get("id")).order_by(
+            main.Translation.created_at.desc()
+        ).limit(limit).all()
+        return {"count": len(rows)}
+
+    @legacy_app.get("/health")
+    async def legacy_health():
+        return await main.health_check()
+
+    async def load(app) -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            probe_latency = []
+            done = asyncio.Event()
+
+            async def probe():
+                # fixed-rate /health probe; latency counts from the scheduled send time,
+                # so time spent waiting for a blocked event loop is included
+                interval = 0.005
+                scheduled = time.perf_counter()
+                while not done.is_set():
+                    await client.get("/health")
+                    probe_latency.append(time.perf_counter() - scheduled)
+                    scheduled = max(scheduled + interval, time.perf_counter())
+                    await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+
+            async def heavy():
+                await client.get("/api/v1/translations?limit=50", headers=headers)
+
+            async def history_load():
+                await asyncio.gather(*(heavy() for _ in range(heavy_requests)))
+                done.set()
+
+            start = time.perf_counter()
+            await asyncio.gather(probe(), history_load())
+            elapsed = time.perf_counter() - start
+        probe_latency.sort()
+        print(
+            f"  {heavy_requests / elapsed:6.1f} history req/s   /health ({len(probe_latency)} probes)"
+            f" p50 {statistics.median(probe_latency) * 1000:7.1f} ms"
+            f"   p99 {probe_latency[int(len(probe_latency) * 0.99) - 1] * 1000:7.1f} ms"
+            f"   max {probe_latency[-1] * 1000:7.1f} ms"
+        )
+
+    with TestClient(main.app):
+        _seed_history("heavy-history-user", history_rows)
+    print(f"-- {heavy_requests} concurrent history queries ({history_rows:,} rows) + /health probes every 5 ms")
+    print("sync Session (legacy)")
+    asyncio.run(load(legacy_app))
+    print("AsyncSession")
+
+    async def run_async():
+        await main.init_database()
+        try:
+            await load(main.app)
+        finally:
+            await main.engine.dispose()
+
+    asyncio.run(run_async())
+
+
+@benchmark
+def bench_history_pagination() -> None:
+    """Deep history pages: offset vs keyset cursor, full vs summary view"""
+    import sqlite3
+
+    history_rows = 100_000
+    repeat = 20
+    headers = _auth_headers("deep-history-user")
+    path = os.environ["DATABASE_URL"].split("///", 1)[1]
+
+    with TestClient(main.app) as client:
+        _seed_history("deep-history-user", history_rows)
+        with sqlite3.connect(path) as conn:
+            boundaries = conn.execute(
+                "SELECT created_at, id FROM translations WHERE user_id = ? ORDER BY created_at DESC, id DESC",
+                ("deep-history-user",),
+            ).fetchall()
+
+        print(f"-- {history_rows:,} rows for one user, 50 rows per page, mean of {repeat} fetches")
+        for depth in (0, 1_000, 10_000, 50_000, 99_000):
+            timings = {}
+            for mode in ("offset", "cursor", "cursor+summary"):
+                if mode == "offset":
+                    params = {"limit": 50, "offset": depth}
+                else:
+                    params = {"limit": 50}
+                    if depth:
+                        created_at, translation_id = boundaries[depth - 1]
+                        params["cursor"] = main.encode_history_cursor(
+                            datetime.fromisoformat(created_at), translation_id
+                        )
+                    if mode == "cursor+summary":
+                        params["view"] = "summary"
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    response = client.get("/api/v1/translations", params=params, headers=headers)
+                timings[mode] = ((time.perf_counter() - start) / repeat, len(response.content))
+            print(
+                f"depth {depth:>6,}   "
+                + "   ".join(f"{mode} {ms * 1000:6.2f} ms / {size / 1024:5.1f} KiB" for mode, (ms, size) in timings.items())
+            )
+
+
+@benchmark
+def bench_template_cache() -> None:
+    """Template reads: per-call DB query (legacy) vs cache, and one bulk request vs many single ones"""
+    from sqlalchemy import select
+
+    templates = 500
+    screen_keys = 40
+    repeat = 50
+    headers = _auth_headers("template-admin")
+
+    with TestClient(main.app) as client:
+        for i in range(templates):
+            client.post(
+                "/api/v1/templates",
+                json={
+                    "template_key": f"screen.{i // 20}.label.{i}",
+                    "translations": {"ko": f"라벨 {i}", "en": f"Label {i}", "ja": f"ラベル {i}"},
+                    "category": "ui",
+                },
+                headers=headers,
+            )
+        keys = [f"screen.0.label.{i}" for i in range(20)] + [f"screen.1.label.{i}" for i in range(20, 40)]
+        assert len(keys) == screen_keys
+
+        async def legacy_lookup(key):
+            # the query get_template_translation ran on every call before the cache
+            async with main.SessionLocal() as db:
+                result = await db.execute(
+                    select(main.TranslationTemplate).where(
+                        main.TranslationTemplate.template_key == key,
+                        main.TranslationTemplate.is_active == True,
+                    )
+                )
+                return result.scalars().first()
+
+        async def legacy_screen():
+            for key in keys:
+                await legacy_lookup(key)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            client.portal.call(legacy_screen)
+        _report("DB query per template (handler only)", repeat * screen_keys, time.perf_counter() - start, "templates")
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for key in keys:
+                client.get(f"/api/v1/templates/{key}", params={"language": "en"})
+        _report("GET /templates/{key} (cached)", repeat * screen_keys, time.perf_counter() - start, "templates")
+
+        params = {"keys": ",".join(keys), "language": "en"}
+        start = time.perf_counter()
+        for _ in range(repeat):
+            response = client.get("/api/v1/templates", params=params)
+        _report("GET /templates?keys= (1 req/screen)", repeat * screen_keys, time.perf_counter() - start, "templates")
+
+        etag = response.headers["etag"]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            client.get("/api/v1/templates", params=params, headers={"If-None-Match": etag})
+        _report("GET /templates?keys= + If-None-Match", repeat * screen_keys, time.perf_counter() - start, "templates")
+        print(f"{'':<40} bulk body {len(response.content):,} bytes, 304 body 0 bytes")
+
+
+@benchmark
+def bench_glossary_index() -> None:
+    """Glossary lookups: ILIKE '%term%' scan (legacy) vs in-memory trigram/prefix index"""
+    import random
+    import sqlite3
+    import uuid
+    from sqlalchemy import select
+
+    path = os.environ["DATABASE_URL"].split("///", 1)[1]
+    rng = random.Random(5)
+    syllables = "혈압당뇨맥박체온산소포화도심장신장간폐위장염증통증수축이완성급만"
+    queries = 200
+
+    with TestClient(main.app) as client:
+        total = 0
+        for size in (1_000, 10_000, 100_000):
+            with sqlite3.connect(path) as conn:
+                conn.executemany(
+                    "INSERT INTO glossary_entries (id, term, language, definition, category, created_at) "
+                    "VALUES (?, ?, 'ko', ?, 'medical', ?)",
+                    (
+                        (str(uuid.uuid4()), "".join(rng.choices(syllables, k=rng.randint(2, 6))) + f" {total + i}",
+                         "정의", f"2025-01-01 00:00:00.{(total + i) % 1_000_000:06d}")
+                        for i in range(size - total)
+                    ),
+                )
+                terms = [row[0][:3] for row in conn.execute(
+                    "SELECT term FROM glossary_entries ORDER BY random() LIMIT ?", (queries,)
+                )]
+            total = size
+
+            async def rebuild_index():
+                main.glossary_index.clear()
+                async with main.SessionLocal() as db:
+                    await main.refresh_glossary_index(db)
+
+            start = time.perf_counter()
+            client.portal.call(rebuild_index)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            async def legacy():
+                async with main.SessionLocal() as db:
+                    for term in terms:
+                        result = await db.execute(
+                            select(main.GlossaryEntry).where(
+                                main.GlossaryEntry.term.ilike(f"%{term}%"),
+                                main.GlossaryEntry.language == "ko",
+                            )
+                        )
+                        result.scalars().first()
+
+            print(f"-- {size:,} entries (index built in {build_ms:.0f} ms)")
+            start = time.perf_counter()
+            client.portal.call(legacy)
+            _report("ILIKE '%term%' query", queries, time.perf_counter() - start, "lookups")
+            start = time.perf_counter()
+            for term in terms:
+                main.glossary_index.lookup(term, "ko")
+            _report("index lookup (substring)", queries, time.perf_counter() - start, "lookups")
+            start = time.perf_counter()
+            for term in terms:
+                main.glossary_index.search(term + "x", "ko", limit=10)
+            _report("index search (top-10, fuzzy)", queries, time.perf_counter() - start, "lookups")
+
+
+@benchmark
+def bench_term_protection() -> None:
+    """Glossary term protection on long documents: per-term replace loop vs one Aho-Corasick pass"""
+    import random
+    import uuid
+    from glossary_index import GlossaryIndex, GlossaryRecord
+    from term_protection import GlossaryTermProtector
+
+    rng = random.Random(9)
+    syllables = "혈압당뇨맥박체온산소포화도심장신장간폐위장염증통증수축이완성급만"
+    filler = "환자는 오늘 아침 식사 후 측정한 결과를 기록했습니다 그리고 ".split()
+
+    for terms in (100, 1_000, 5_000):
+        vocabulary = sorted({"".join(rng.choices(syllables, k=rng.randint(3, 6))) for _ in range(terms)})
+        glossary = GlossaryIndex()
+        glossary.add_many(
+            GlossaryRecord(str(uuid.uuid4()), term, "ko", None, "medical", translations={"en": f"term-{i}"})
+            for i, term in enumerate(vocabulary)
+        )
+        protector = GlossaryTermProtector(glossary)
+        words = [rng.choice(vocabulary) if rng.random() < 0.1 else rng.choice(filler) for _ in range(200_000)]
+        document = " ".join(words)
+        size_mb = len(document.encode("utf-8")) / 1e6
+
+        start = time.perf_counter()
+        protector.compiled("ko", "en")
+        build = time.perf_counter() - start
+
+        # what clients did before: one replace per glossary term, longest first
+        start = time.perf_counter()
+        replaced = document
+        for term in sorted(vocabulary, key=len, reverse=True):
+            if term in replaced:
+                replaced = replaced.replace(term, "\0")
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        segment = protector.protect(document, "ko", "en")
+        automaton = time.perf_counter() - start
+
+        print(f"-- {len(vocabulary):,} terms, {size_mb:.1f} MB document, {len(segment.replacements):,} distinct terms hit"
+              f" (automaton built in {build * 1000:.0f} ms)")
+        print(f"{'per-term str.replace loop':<40} {naive * 1000:>10.1f} ms  {size_mb / naive:>8.1f} MB/s")
+        print(f"{'Aho-Corasick protect':<40} {automaton * 1000:>10.1f} ms  {size_mb / automaton:>8.1f} MB/s")
+
+
+@benchmark
+def bench_token_cache() -> None:
+    """GET /api/v1/translations requests/sec and verify_token cost: jwt.decode per request vs verified-token cache"""
+    requests = 2_000
+    calls = 50_000
+    headers = _auth_headers("token-bench-user")
+    authorization = headers["Authorization"]
+
+    with TestClient(main.app) as client:
+        _seed_history("token-bench-user", 20)
+        for name, size in (("jwt.decode per request", 0), ("verified-token cache", main.TOKEN_CACHE_SIZE)):
+            main.token_cache.max_entries = size
+            main.token_cache.clear()
+
+            start = time.perf_counter()
+            for _ in range(calls):
+                main.verify_token(authorization)
+            _report(f"verify_token, {name}", calls, time.perf_counter() - start, "calls")
+
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get("/api/v1/translations", params={"limit": 20, "view": "summary"}, headers=headers)
+            _report(f"GET /translations, {name}", requests, time.perf_counter() - start, "req")
+    main.token_cache.max_entries = main.TOKEN_CACHE_SIZE
+
+
+@benchmark
+def bench_translation_backend() -> None:
+    """Fake provider (40 ms + 2 ms/segment, 3% of calls +400 ms): per-segment calls vs batching/coalescing/hedging"""
+    import random
+    from translation_backend import FakeLatencyProvider, TranslationBackend
+
+    segments = 3_000
+    clients = 300
+    rng = random.Random(3)
+    # coaching text is repetitive: ~30% of segments are already in flight from another request
+    texts = [f"권장사항 {rng.randrange(int(segments * 0.7))}" for _ in range(segments)]
+
+    def provider(name="fake", seed=1, **limits):
+        fake = FakeLatencyProvider(
+            latency=0.04, per_segment=0.002, tail_probability=0.03, tail_latency=0.4, seed=seed, **limits
+        )
+        fake.name = name
+        return fake
+
+    configs = [
+        ("per-segment calls, 8 concurrent", lambda: TranslationBackend(
+            provider(max_concurrency=8, max_batch_size=1), batch_window=0)),
+        ("batch 32 / 5 ms window + coalescing", lambda: TranslationBackend(
+            provider(max_concurrency=8, max_batch_size=32), batch_window=0.005)),
+        ("... + hedge after 150 ms", lambda: TranslationBackend(
+            provider(max_concurrency=8, max_batch_size=32), fallbacks=[provider("fake-b", 2, max_concurrency=8)],
+            batch_window=0.005, hedge_after=0.15)),
+    ]
+
+    async def load(backend):
+        latencies = []
+        queue = list(texts)
+
+        async def client():
+            while queue:
+                text = queue.pop()
+                start = time.perf_counter()
+                await backend.translate(text, "ko", "en")
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        return time.perf_counter() - start, sorted(latencies)
+
+    print(f"-- {segments:,} segments from {clients} concurrent callers")
+    for name, build in configs:
+        backend = build()
+        elapsed, latencies = asyncio.run(load(backend))
+        stats = backend.stats
+        print(
+            f"{name:<40} {segments / elapsed:>8,.0f} seg/s   p50 {latencies[len(latencies) // 2] * 1000:6.0f} ms"
+            f"   p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.0f} ms   provider calls {stats.provider_calls:,}"
+            f"   coalesced {stats.coalesced:,}   hedges {stats.hedges} (won {stats.hedge_wins})"
+        )
+
+
+@benchmark
+def bench_preference_cache() -> None:
+    """Language preferences: one query per user vs write-through cache vs the batch endpoint"""
+    from sqlalchemy import event
+
+    users = [f"pref-bench-{i}" for i in range(200)]
+    rounds = 5
+    queries = []
+
+    def count(conn, cursor, statement, *args):
+        if "language_preferences" in statement:
+            queries.append(statement)
+
+    with TestClient(main.app) as client:
+        for user_id in users[::2]:  # half the users have a row, half get defaults
+            client.put("/api/v1/language-preferences", json={"preferred_language": "en"}, headers=_auth_headers(user_id))
+        headers = {user_id: _auth_headers(user_id) for user_id in users}
+        event.listen(main.engine.sync_engine, "before_cursor_execute", count)
+        try:
+            for name, size in (("per-user query", 0), ("write-through cache", main.PREFERENCE_CACHE_SIZE)):
+                main.preference_cache.max_entries = size
+                main.preference_cache.clear()
+                queries.clear()
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    for user_id in users:
+                        client.get("/api/v1/language-preferences", headers=headers[user_id])
+                _report(f"GET /language-preferences, {name}", rounds * len(users), time.perf_counter() - start, "req")
+                print(f"{'':<40} {len(queries):,} queries")
+
+            main.preference_cache.max_entries = 0
+            main.preference_cache.clear()
+            queries.clear()
+            start = time.perf_counter()
+            for _ in range(rounds):
+                client.get(
+                    "/api/v1/language-preferences:batch",
+                    params={"user_ids": ",".join(users)},
+                    headers=_auth_headers("bench-admin", role="admin"),
+                )
+            _report(f"batch of {len(users)}, one IN query", rounds * len(users), time.perf_counter() - start, "users")
+            print(f"{'':<40} {len(queries):,} queries")
+        finally:
+            event.remove(main.engine.sync_engine, "before_cursor_execute", count)
+            main.preference_cache.max_entries = main.PREFERENCE_CACHE_SIZE
+
+
+@benchmark
+def bench_bulk_io() -> None:
+    """Glossary loading: one POST per entry vs streaming bulk import; export memory with a server-side cursor"""
+    import tracemalloc
+    from bulk_io import RowEncoder
+
+    per_entry = 1_000
+    bulk = 200_000
+    headers = _auth_headers()
+
+    def entries(prefix, count):
+        for i in range(count):
+            yield {
+                "term": f"{prefix}{i}",
+                "language": "en",
+                "definition": f"definition {i}",
+                "category": "medical",
+                "translations": {"ko": f"용어 {i}"},
+            }
+
+    def body(rows, size=64 * 1024):
+        buffer = []
+        for row in rows:
+            buffer.append(json.dumps(row, ensure_ascii=False) + "\n")
+            if len(buffer) >= 500:
+                yield "".join(buffer).encode()
+                buffer = []
+        if buffer:
+            yield "".join(buffer).encode()
+
+    with TestClient(main.app) as client:
+        start = time.perf_counter()
+        for row in entries("single", per_entry):
+            client.post("/api/v1/glossary", json=row, headers=headers)
+        elapsed = time.perf_counter() - start
+        _report("POST /glossary per entry", per_entry, elapsed, "rows")
+        print(f"{'':<40} 1M entries would take ~{1_000_000 / (per_entry / elapsed) / 60:,.0f} min")
+
+        start = time.perf_counter()
+        report = client.post("/api/v1/glossary:import", content=body(entries("bulk", bulk)), headers=headers).json()["data"]
+        elapsed = time.perf_counter() - start
+        _report(f"glossary:import, {main.BULK_IMPORT_CHUNK_SIZE}-row chunks", bulk, elapsed, "rows")
+        print(f"{'':<40} server reported {report['rows_per_second']:,.0f} rows/s; "
+              f"1M entries ~{1_000_000 / (bulk / elapsed) / 60:,.1f} min")
+
+        start = time.perf_counter()
+        again = client.post("/api/v1/glossary:import", content=body(entries("bulk", bulk)), headers=headers).json()["data"]
+        _report("glossary:import, all updates", again["updated"], time.perf_counter() - start, "rows")
+
+        query = main.select(
+            main.GlossaryEntry.term,
+            main.GlossaryEntry.language,
+            main.GlossaryEntry.definition,
+            main.GlossaryEntry.category,
+            main.GlossaryEntry.translations,
+        ).order_by(main.GlossaryEntry.language, main.GlossaryEntry.term)
+
+        async def materialized():
+            async with main.SessionLocal() as db:
+                result = await db.execute(query)
+                encoder = RowEncoder("ndjson", main.GLOSSARY_COLUMNS, main.SUPPORTED_LANGUAGES)
+                return encoder.encode(row._asdict() for row in result.all()).count("\n")
+
+        async def streamed():
+            # the export generator itself; TestClient buffers whole response bodies
+            encoder = RowEncoder("ndjson", main.GLOSSARY_COLUMNS, main.SUPPORTED_LANGUAGES)
+            return sum([chunk.count("\n") async for chunk in main._stream_export(query, encoder)])
+
+        for name, export in (
+            ("SELECT .all(), encode in one go", materialized),
+            ("export via server-side cursor", streamed),
+        ):
+            tracemalloc.start()
+            start = time.perf_counter()
+            rows = client.portal.call(export)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            _report(name, rows, elapsed, "rows")
+            print(f"{'':<40} peak traced memory {peak / 1024 / 1024:,.1f} MiB")
+
+
+def run(argv) -> int:
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            return 1
+        print(f"\n== {name} ==")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1:]))
@@ -0,0 +1,287 @@
+"""
+Streaming bulk import/export for translation templates and glossary entries
+
+Imports are parsed incrementally from the request body (NDJSON: one JSON
+object per line; CSV: a header row, then one record per row) and handed to
+the caller in chunks, so each chunk can be upserted in its own transaction
+without the whole file ever being in memory. Invalid rows are skipped and
+reported with their line number. Exports go the other way: rows are encoded
+as they come off a server-side cursor.
+
+CSV layout: scalar columns by name plus one "translations.<lang>" column per
+language, e.g.
+  templates: template_key,category,is_active,translations.ko,translations.en
+  glossary:  term,language,definition,category,translations.en
+NDJSON uses the same field names with translations as a nested object.
+
+Fields missing from a row (or empty in CSV) keep their stored value when the
+row updates an existing record; new records get the column defaults.
+"""
+
+import codecs
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence
+
+FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+TRANSLATION_COLUMN_PREFIX = "translations."
+MAX_REPORTED_ERRORS = 20
+
+TEMPLATE_COLUMNS = ("template_key", "category", "is_active")
+GLOSSARY_COLUMNS = ("term", "language", "definition", "category")
+TEMPLATE_DEFAULTS = {"translations": {}, "category": None, "is_active": True}
+GLOSSARY_DEFAULTS = {"definition": None, "category": None, "translations": None}
+
+
+class BulkFormatError(ValueError):
+    """The body cannot be parsed at all (unknown format, CSV without a header)"""
+
+
+@dataclass
+class BulkRow:
+    line: int
+    data: Optional[Dict] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def skip(self, line: int, error: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def to_dict(self) -> Dict:
+        seconds = time.perf_counter() - self.started
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "chunks": self.chunks,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.rows / seconds, 1) if seconds > 0 else 0.0,
+            "errors": self.errors,
+        }
+
+
+def resolve_format(requested: Optional[str], content_type: Optional[str] = None) -> str:
+    """Explicit ?format= wins; otherwise go by Content-Type, defaulting to NDJSON"""
+    if requested:
+        if requested not in FORMATS:
+            raise BulkFormatError(f"Unsupported format: {requested} (use {' or '.join(FORMATS)})")
+        return requested
+    if content_type and "csv" in content_type:
+        return "csv"
+    return "ndjson"
+
+
+# ============================================
+# Parsing
+# ============================================
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream as UTF-8 and yield it line by line (without line endings)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[BulkRow]:
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as err:
+            yield BulkRow(line_number, error=f"invalid JSON: {err}")
+            continue
+        if not isinstance(data, dict):
+            yield BulkRow(line_number, error="expected a JSON object")
+            continue
+        yield BulkRow(line_number, data)
+
+
+def _csv_record(header: Sequence[str], values: Sequence[str]) -> Dict:
+    data: Dict = {}
+    translations = {}
+    for column, value in zip(header, values):
+        if column.startswith(TRANSLATION_COLUMN_PREFIX):
+            if value:
+                translations[column[len(TRANSLATION_COLUMN_PREFIX):]] = value
+        elif value != "":
+            data[column] = value
+    if translations:
+        data["translations"] = translations
+    return data
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[BulkRow]:
+    header = None
+    record_lines: List[str] = []
+    line_number = first_line = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not record_lines:
+            first_line = line_number
+        record_lines.append(line)
+        # a quoted field may span lines: wait until the quotes balance
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue
+        text, record_lines = "\n".join(record_lines), []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [column.strip() for column in values]
+            continue
+        if len(values) > len(header):
+            yield BulkRow(first_line, error=f"expected {len(header)} columns, got {len(values)}")
+            continue
+        yield BulkRow(first_line, _csv_record(header, values))
+    if record_lines:
+        yield BulkRow(first_line, error="unterminated quoted field")
+    if header is None:
+        raise BulkFormatError("CSV body has no header row")
+
+
+def iter_rows(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[BulkRow]:
+    return iter_csv(chunks) if format == "csv" else iter_ndjson(chunks)
+
+
+def _translations(value) -> Dict[str, str]:
+    if value is None:
+        return {}
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, dict) or not all(isinstance(text, str) for text in value.values()):
+        raise ValueError("translations must map language codes to strings")
+    return value
+
+
+def _flag(value, default: bool = True) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def template_row(data: Dict) -> Dict:
+    """Validated template fields; optional fields are only present if the row has them"""
+    key = data.get("template_key")
+    if not isinstance(key, str) or not key.strip():
+        raise ValueError("template_key is required")
+    row = {"template_key": key.strip()}
+    if "translations" in data:
+        row["translations"] = _translations(data["translations"])
+    if "category" in data:
+        row["category"] = data["category"]
+    if "is_active" in data:
+        row["is_active"] = _flag(data["is_active"])
+    return row
+
+
+def glossary_row(data: Dict) -> Dict:
+    """Validated glossary fields; optional fields are only present if the row has them"""
+    term = data.get("term")
+    if not isinstance(term, str) or not term.strip():
+        raise ValueError("term is required")
+    row = {"term": term.strip(), "language": data.get("language") or "ko"}
+    for column in ("definition", "category"):
+        if column in data:
+            row[column] = data[column]
+    if "translations" in data:
+        row["translations"] = _translations(data["translations"]) or None
+    return row
+
+
+async def iter_chunks(
+    rows: AsyncIterator[BulkRow],
+    validate: Callable[[Dict], Dict],
+    size: int,
+    stats: ImportStats,
+) -> AsyncIterator[List[Dict]]:
+    """Validated rows in lists of up to size; rejected rows are counted in stats"""
+    chunk: List[Dict] = []
+    async for row in rows:
+        stats.rows += 1
+        if row.error is None:
+            try:
+                chunk.append(validate(row.data))
+            except (TypeError, ValueError) as err:
+                row.error = str(err)
+        if row.error is not None:
+            stats.skip(row.line, row.error)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ============================================
+# Export
+# ============================================
+
+class RowEncoder:
+    """Encode exported rows (dicts) as NDJSON lines or CSV rows"""
+
+    def __init__(self, format: str, columns: Sequence[str], languages: Iterable[str]):
+        self.format = format
+        self.columns = list(columns)
+        # CSV needs its columns up front; NDJSON keeps every translation
+        self.languages = list(languages)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.format]
+
+    def header(self) -> str:
+        if self.format != "csv":
+            return ""
+        return self._csv([*self.columns, *(TRANSLATION_COLUMN_PREFIX + language for language in self.languages)])
+
+    def encode(self, rows: Iterable[Dict]) -> str:
+        if self.format != "csv":
+            return "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows)
+        for row in rows:
+            translations = row.get("translations") or {}
+            self._writer.writerow([
+                *("" if row.get(column) is None else row[column] for column in self.columns),
+                *(translations.get(language, "") for language in self.languages),
+            ])
+        return self._drain()
+
+    def _csv(self, values: Sequence) -> str:
+        self._writer.writerow(values)
+        return self._drain()
+
+    def _drain(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
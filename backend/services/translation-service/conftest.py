@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import jwt
+import pytest
+
+# main.py creates its engine at import time; point it at a throwaway SQLite file
+_db_dir = tempfile.mkdtemp(prefix="translation-service-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/translation.db")
+os.environ.setdefault("TRANSLATION_MEMORY_RECONCILE_SECONDS", "0")
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def make_token(user_id: str = "user-1") -> str:
+    import main
+    return jwt.encode({"id": user_id}, main.JWT_SECRET, algorithm=main.JWT_ALGORITHM)
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {make_token()}"}
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
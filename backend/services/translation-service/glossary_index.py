@@ -0,0 +1,285 @@
+"""
+In-memory glossary search index
+
+One index per language, built from glossary_entries at startup and extended
+as entries are added:
+  - sorted prefix array of normalized terms (bisect for prefix / exact hits)
+  - trigram inverted index over padded terms (substring candidates and fuzzy
+    similarity for misspelled queries)
+  - bigram inverted index (substring candidates for two-character queries;
+    single characters only match as a prefix)
+
+The database stays the source of truth; the service only reads from here.
+The refresh watermark only moves with rows read back from the database, never
+with entries this worker added itself.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# ranking tiers, best first
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_SUBSTRING = 2
+MATCH_FUZZY = 3
+MATCH_KINDS = {MATCH_EXACT: "exact", MATCH_PREFIX: "prefix", MATCH_SUBSTRING: "substring", MATCH_FUZZY: "fuzzy"}
+
+DEFAULT_MIN_SIMILARITY = 0.3
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(term.casefold().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of the padded text, so short terms (e.g. two-syllable Korean) still index"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def inner_trigrams(text: str) -> Set[str]:
+    """Trigrams that any term containing text must also contain (no padding)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass(frozen=True)
+class GlossaryRecord:
+    id: str
+    term: str
+    language: str
+    definition: Optional[str]
+    category: Optional[str]
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    # preferred rendering of the term per target language, {"en": "...", ...}
+    translations: Optional[Dict[str, str]] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "term": self.term,
+            "definition": self.definition,
+            "language": self.language,
+            "category": self.category,
+            "translations": self.translations or {},
+        }
+
+
+@dataclass(frozen=True)
+class GlossaryMatch:
+    record: GlossaryRecord
+    kind: int
+    similarity: float
+
+    def to_dict(self) -> Dict:
+        data = self.record.to_dict()
+        data["match"] = MATCH_KINDS[self.kind]
+        data["score"] = round(self.similarity, 4)
+        return data
+
+
+class LanguageGlossaryIndex:
+    def __init__(self):
+        self.records: List[GlossaryRecord] = []
+        self.terms: List[str] = []  # normalized, parallel to records
+        self._term_trigrams: List[Set[str]] = []
+        self._prefix: List[Tuple[str, int]] = []  # sorted (normalized term, record index)
+        self._postings: Dict[str, List[int]] = {}
+        self._bigram_postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: GlossaryRecord, keep_sorted: bool = True) -> int:
+        """Index one record; bulk loads pass keep_sorted=False and call sort_prefixes() once"""
+        index = len(self.records)
+        term = normalize_term(record.term)
+        grams = trigrams(term)
+        self.records.append(record)
+        self.terms.append(term)
+        self._term_trigrams.append(grams)
+        if keep_sorted:
+            insort(self._prefix, (term, index))
+        else:
+            self._prefix.append((term, index))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(index)
+        for gram in bigrams(term):
+            self._bigram_postings.setdefault(gram, []).append(index)
+        return index
+
+    def sort_prefixes(self) -> None:
+        self._prefix.sort()
+
+    def _prefix_range(self, query: str) -> Iterable[int]:
+        position = bisect_left(self._prefix, (query, -1))
+        while position < len(self._prefix) and self._prefix[position][0].startswith(query):
+            yield self._prefix[position][1]
+            position += 1
+
+    def _substring_candidates(self, query: str) -> Iterable[int]:
+        if len(query) < 2:
+            # a single character is served by the prefix range only
+            return ()
+        if len(query) == 2:
+            return self._bigram_postings.get(query, ())
+        postings = sorted((self._postings.get(gram, ()) for gram in inner_trigrams(query)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def _similarity(self, index: int, query_grams: Set[str], shared: int) -> float:
+        return shared / (len(query_grams) + len(self._term_trigrams[index]) - shared)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        fuzzy: bool = True,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+    ) -> List[GlossaryMatch]:
+        """
+        Top-k matches ranked exact > prefix > substring > fuzzy, then by
+        trigram similarity and shorter term
+        """
+        query = normalize_term(query)
+        if not query or not self.records:
+            return []
+        query_grams = trigrams(query)
+        matches: Dict[int, int] = {}
+        for index in self._prefix_range(query):
+            matches[index] = MATCH_EXACT if self.terms[index] == query else MATCH_PREFIX
+        for index in self._substring_candidates(query):
+            if index not in matches and query in self.terms[index]:
+                matches[index] = MATCH_SUBSTRING
+
+        ranked = []
+        for index, kind in matches.items():
+            shared = len(query_grams & self._term_trigrams[index])
+            similarity = self._similarity(index, query_grams, shared)
+            ranked.append((kind, -similarity, len(self.terms[index]), index))
+        if fuzzy:
+            shared_counts = Counter()
+            for gram in query_grams:
+                shared_counts.update(self._postings.get(gram, ()))
+            for index, shared in shared_counts.items():
+                if index in matches:
+                    continue
+                similarity = self._similarity(index, query_grams, shared)
+                if similarity >= min_similarity:
+                    ranked.append((MATCH_FUZZY, -similarity, len(self.terms[index]), index))
+
+        return [
+            GlossaryMatch(self.records[index], kind, -negative_similarity)
+            for kind, negative_similarity, _, index in heapq.nsmallest(limit, ranked)
+        ]
+
+
+class GlossaryIndex:
+    """Per-language glossary indexes with an updated_at watermark for incremental refresh"""
+
+    def __init__(self):
+        self.loaded = False
+        # bumped on every change, so derived structures know when to rebuild;
+        # per-language versions let them ignore changes to other languages
+        self.version = 0
+        self._language_versions: Dict[str, int] = {}
+        self.watermark: Optional[datetime] = None
+        self._languages: Dict[str, LanguageGlossaryIndex] = {}
+        self._ids: Dict[str, int] = {}  # id -> position in its language index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, record: GlossaryRecord, keep_sorted: bool = True) -> bool:
+        """Index one entry; returns False if it is already indexed or has no term"""
+        if record.id in self._ids or not record.term:
+            return False
+        self._bump(record.language)
+        self._ids[record.id] = self._languages.setdefault(record.language, LanguageGlossaryIndex()).add(
+            record, keep_sorted
+        )
+        return True
+
+    def replace(self, record: GlossaryRecord) -> bool:
+        """
+        Swap in a new version of an indexed entry (definition, category,
+        translations); term and language must be unchanged
+        """
+        position = self._ids.get(record.id)
+        index = self._languages.get(record.language)
+        if position is None or index is None or index.records[position].id != record.id:
+            return False
+        if normalize_term(record.term) != index.terms[position] or index.records[position] == record:
+            return False
+        index.records[position] = record
+        self._bump(record.language)
+        return True
+
+    def _bump(self, language: str) -> None:
+        self.version += 1
+        self._language_versions[language] = self._language_versions.get(language, 0) + 1
+
+    def language_version(self, language: str) -> int:
+        return self._language_versions.get(language, 0)
+
+    def add_many(self, records: Iterable[GlossaryRecord]) -> int:
+        """Index new entries and replace changed ones; returns how many changed"""
+        added = sum(
+            self.replace(record) if record.id in self._ids else self.add(record, keep_sorted=False)
+            for record in records
+        )
+        for index in self._languages.values():
+            index.sort_prefixes()
+        self.loaded = True
+        return added
+
+    def apply_refresh(self, records: Iterable[GlossaryRecord]) -> int:
+        """
+        add_many for rows read from the database; only these move the watermark,
+        so an entry committed late by another worker is still picked up
+        """
+        records = list(records)
+        changed = self.add_many(records)
+        for record in records:
+            changed_at = record.updated_at or record.created_at
+            if changed_at is not None and (self.watermark is None or changed_at > self.watermark):
+                self.watermark = changed_at
+        return changed
+
+    def search(self, query: str, language: str, limit: int = 10, fuzzy: bool = True) -> List[GlossaryMatch]:
+        index = self._languages.get(language)
+        if index is None:
+            return []
+        return index.search(query, limit=limit, fuzzy=fuzzy)
+
+    def records(self, language: str) -> List[GlossaryRecord]:
+        index = self._languages.get(language)
+        return list(index.records) if index is not None else []
+
+    def lookup(self, term: str, language: str) -> Optional[GlossaryRecord]:
+        """Best entry whose term contains term (the old ILIKE '%term%' semantics)"""
+        matches = self.search(term, language, limit=1, fuzzy=False)
+        return matches[0].record if matches else None
+
+    def metrics(self) -> Dict[str, int]:
+        return {"entries": len(self._ids), "languages": len(self._languages)}
+
+    def clear(self) -> None:
+        for language in list(self._languages):
+            self._bump(language)
+        self._languages.clear()
+        self._ids.clear()
+        self.watermark = None
+        self.loaded = False
+        self.version += 1
@@ -1,15 +1,49 @@
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Boolean, JSON
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from sqlalchemy import func, insert, inspect, select, text, tuple_, update, Column, String, Text, DateTime, Boolean, JSON, Index
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 import jwt
+import base64
+import binascii
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Optional, List, Dict
 import os
 import json
+import uuid
+import asyncio
 import logging
 
+from bulk_io import (
+    GLOSSARY_COLUMNS,
+    GLOSSARY_DEFAULTS,
+    TEMPLATE_COLUMNS,
+    TEMPLATE_DEFAULTS,
+    BulkFormatError,
+    ImportStats,
+    RowEncoder,
+    glossary_row,
+    iter_chunks,
+    iter_rows,
+    resolve_format,
+    template_row,
+)
+from glossary_index import GlossaryIndex, GlossaryRecord
+from preference_cache import DEFAULT_PREFERENCES, PreferenceCache
+from template_cache import TemplateCache
+from term_protection import CompiledGlossary, GlossaryTermProtector
+from token_cache import TokenRevokedError, TokenVerificationCache
+from translation_backend import (
+    FakeLatencyProvider,
+    HttpTranslationProvider,
+    MockProvider,
+    TranslationBackend,
+)
+from translation_memory import SqliteMemoryStore, TranslationMemory, memory_key
+
 # ============================================
 # Configuration
 # ============================================
@@ -31,13 +65,56 @@ DATABASE_URL = os.getenv(
     "DATABASE_URL",
     "postgresql://postgres:password@db:5432/mps_translation"
 )
-engine = create_engine(DATABASE_URL, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+
+
+def async_database_url(url: str) -> str:
+    """Map DATABASE_URL onto its async driver (asyncpg for PostgreSQL, aiosqlite for SQLite)"""
+    scheme, _, rest = url.partition("://")
+    if scheme in ("postgresql", "postgres", "postgresql+psycopg2"):
+        return f"postgresql+asyncpg://{rest}"
+    if scheme == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+def create_database_engine(url: str):
+    options = {
+        "echo": False,
+        "pool_pre_ping": True,
+        # compiled SQL cache (SQLAlchemy side)
+        "query_cache_size": DB_STATEMENT_CACHE_SIZE,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE_SECONDS,
+            # prepared statement cache per connection (asyncpg side)
+            connect_args={"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+        )
+    return create_async_engine(url, **options)
+
+
+engine = create_database_engine(async_database_url(DATABASE_URL))
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
 
 # JWT
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key")
 JWT_ALGORITHM = "HS256"
+# verified-token cache (0 disables)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", 300))
+TOKEN_REVOCATION_MAX_TTL_SECONDS = float(os.getenv("TOKEN_REVOCATION_MAX_TTL_SECONDS", 7 * 86400))
+token_cache = TokenVerificationCache(
+    max_entries=TOKEN_CACHE_SIZE,
+    max_ttl=TOKEN_CACHE_MAX_TTL_SECONDS,
+    max_revocation_ttl=TOKEN_REVOCATION_MAX_TTL_SECONDS,
+)
 
 # Supported languages
 SUPPORTED_LANGUAGES = {
@@ -53,6 +130,96 @@ SUPPORTED_LANGUAGES = {
     "pt": "Portuguese",
 }
 
+# Translation memory (in-process LRU + optional shared SQLite tier)
+TRANSLATION_MEMORY_SIZE = int(os.getenv("TRANSLATION_MEMORY_SIZE", 10000))
+TRANSLATION_MEMORY_PATH = os.getenv("TRANSLATION_MEMORY_PATH")
+TRANSLATION_MEMORY_RECONCILE_SECONDS = float(os.getenv("TRANSLATION_MEMORY_RECONCILE_SECONDS", 300))
+# each reconciliation re-reads this far behind the watermark, for rows committed after later-stamped ones
+TRANSLATION_MEMORY_RECONCILE_LAG_SECONDS = float(os.getenv("TRANSLATION_MEMORY_RECONCILE_LAG_SECONDS", 60))
+translation_memory = TranslationMemory(
+    max_entries=TRANSLATION_MEMORY_SIZE,
+    store=SqliteMemoryStore(TRANSLATION_MEMORY_PATH) if TRANSLATION_MEMORY_PATH else None,
+)
+
+# Translation provider (mock, fake or http; see translation_backend.py)
+TRANSLATION_PROVIDER = os.getenv("TRANSLATION_PROVIDER", "mock")
+TRANSLATION_PROVIDER_URL = os.getenv("TRANSLATION_PROVIDER_URL")
+TRANSLATION_PROVIDER_API_KEY = os.getenv("TRANSLATION_PROVIDER_API_KEY")
+TRANSLATION_PROVIDER_CONCURRENCY = int(os.getenv("TRANSLATION_PROVIDER_CONCURRENCY", 8))
+TRANSLATION_PROVIDER_BATCH_SIZE = int(os.getenv("TRANSLATION_PROVIDER_BATCH_SIZE", 32))
+TRANSLATION_PROVIDER_TIMEOUT_SECONDS = float(os.getenv("TRANSLATION_PROVIDER_TIMEOUT_SECONDS", 10))
+# batching only pays off against a remote provider
+TRANSLATION_BATCH_WINDOW_MS = float(
+    os.getenv("TRANSLATION_BATCH_WINDOW_MS", 0 if TRANSLATION_PROVIDER == "mock" else 5)
+)
+TRANSLATION_HEDGE_AFTER_MS = float(os.getenv("TRANSLATION_HEDGE_AFTER_MS", 0))  # 0 disables hedging
+TRANSLATION_MAX_ATTEMPTS = int(os.getenv("TRANSLATION_MAX_ATTEMPTS", 2))
+FAKE_PROVIDER_LATENCY_MS = float(os.getenv("FAKE_PROVIDER_LATENCY_MS", 50))
+
+
+def create_translation_backend() -> TranslationBackend:
+    limits = {
+        "max_concurrency": TRANSLATION_PROVIDER_CONCURRENCY,
+        "max_batch_size": TRANSLATION_PROVIDER_BATCH_SIZE,
+    }
+    if TRANSLATION_PROVIDER == "http":
+        if not TRANSLATION_PROVIDER_URL:
+            raise RuntimeError("TRANSLATION_PROVIDER=http requires TRANSLATION_PROVIDER_URL")
+        provider = HttpTranslationProvider(
+            "http",
+            TRANSLATION_PROVIDER_URL,
+            api_key=TRANSLATION_PROVIDER_API_KEY,
+            timeout=TRANSLATION_PROVIDER_TIMEOUT_SECONDS,
+            **limits,
+        )
+    elif TRANSLATION_PROVIDER == "fake":
+        provider = FakeLatencyProvider(latency=FAKE_PROVIDER_LATENCY_MS / 1000, **limits)
+    else:
+        provider = MockProvider(**limits)
+    return TranslationBackend(
+        provider,
+        batch_window=TRANSLATION_BATCH_WINDOW_MS / 1000,
+        hedge_after=TRANSLATION_HEDGE_AFTER_MS / 1000 if TRANSLATION_HEDGE_AFTER_MS > 0 else None,
+        max_attempts=TRANSLATION_MAX_ATTEMPTS,
+    )
+
+
+translation_backend = create_translation_backend()
+
+# Batch translation limits
+MAX_BATCH_SEGMENTS = int(os.getenv("MAX_BATCH_SEGMENTS", 500))
+BATCH_TRANSLATION_CONCURRENCY = int(os.getenv("BATCH_TRANSLATION_CONCURRENCY", 16))
+
+# Template cache (all active templates, refreshed by updated_at watermark)
+TEMPLATE_CACHE_REFRESH_SECONDS = float(os.getenv("TEMPLATE_CACHE_REFRESH_SECONDS", 30))
+# each refresh re-reads this far behind the watermark, for rows committed after later-stamped ones
+TEMPLATE_CACHE_REFRESH_LAG_SECONDS = float(os.getenv("TEMPLATE_CACHE_REFRESH_LAG_SECONDS", 60))
+MAX_TEMPLATE_KEYS = int(os.getenv("MAX_TEMPLATE_KEYS", 200))
+template_cache = TemplateCache()
+
+# Language preference cache (write-through, with negative entries for users without a row)
+PREFERENCE_CACHE_SIZE = int(os.getenv("PREFERENCE_CACHE_SIZE", 100000))
+PREFERENCE_CACHE_TTL_SECONDS = float(os.getenv("PREFERENCE_CACHE_TTL_SECONDS", 300))
+PREFERENCE_NEGATIVE_TTL_SECONDS = float(os.getenv("PREFERENCE_NEGATIVE_TTL_SECONDS", 60))
+MAX_PREFERENCE_BATCH = int(os.getenv("MAX_PREFERENCE_BATCH", 500))
+preference_cache = PreferenceCache(
+    max_entries=PREFERENCE_CACHE_SIZE,
+    ttl=PREFERENCE_CACHE_TTL_SECONDS,
+    negative_ttl=PREFERENCE_NEGATIVE_TTL_SECONDS,
+)
+
+# Glossary search index (per-language trigram + prefix index, refreshed by updated_at watermark)
+GLOSSARY_INDEX_REFRESH_SECONDS = float(os.getenv("GLOSSARY_INDEX_REFRESH_SECONDS", 60))
+# each refresh re-reads this far behind the watermark, for rows committed after later-stamped ones
+GLOSSARY_INDEX_REFRESH_LAG_SECONDS = float(os.getenv("GLOSSARY_INDEX_REFRESH_LAG_SECONDS", 60))
+MAX_GLOSSARY_RESULTS = int(os.getenv("MAX_GLOSSARY_RESULTS", 50))
+glossary_index = GlossaryIndex()
+term_protector = GlossaryTermProtector(glossary_index)
+
+# Bulk import/export (rows per upsert transaction / per server-side cursor fetch)
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
+BULK_EXPORT_BATCH_SIZE = int(os.getenv("BULK_EXPORT_BATCH_SIZE", 1000))
+
 # ============================================
 # Database Models
 # ============================================
@@ -67,10 +234,19 @@ class Translation(Base):
     source_text = Column(Text)
     translated_text = Column(Text)
     context = Column(String)
+    # digest of the glossary applied (term_protection), part of the translation memory key
+    glossary_version = Column(String)
     is_approved = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # history pages: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_translations_user_created_id", "user_id", "created_at", "id"),
+        # translation memory reconciliation: keyset pages on (coalesce(updated_at, created_at), id)
+        Index("ix_translations_changed_id", func.coalesce(updated_at, created_at), "id"),
+    )
+
 
 class TranslationTemplate(Base):
     __tablename__ = "translation_templates"
@@ -81,6 +257,7 @@ class TranslationTemplate(Base):
     category = Column(String)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 
 class LanguagePreference(Base):
@@ -103,39 +280,119 @@ class GlossaryEntry(Base):
     language = Column(String)
     definition = Column(Text)
     category = Column(String)  # medical, technical, etc.
+    translations = Column(JSON)  # preferred rendering per target language {"en": "...", ...}
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 
 # ============================================
 # Database Initialization
 # ============================================
 
-Base.metadata.create_all(bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
+@app.on_event("startup")
+async def init_database():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        # create_all skips indexes on tables that already exist; IF NOT EXISTS instead of
+        # checkfirst, which cannot see expression indexes (ix_translations_changed_id)
+        for table in (Translation.__table__, TranslationTemplate.__table__, GlossaryEntry.__table__):
+            for index in table.indexes:
+                await conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _add_missing_columns(conn):
+    """Add columns introduced after a table was first created (nullable only)"""
+    inspector = inspect(conn)
+    for table, column in (
+        (TranslationTemplate.__table__, TranslationTemplate.__table__.c.updated_at),
+        (GlossaryEntry.__table__, GlossaryEntry.__table__.c.translations),
+        (GlossaryEntry.__table__, GlossaryEntry.__table__.c.updated_at),
+        (Translation.__table__, Translation.__table__.c.glossary_version),
+    ):
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+@app.on_event("shutdown")
+async def close_database():
+    await engine.dispose()
+    await translation_backend.aclose()
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 # ============================================
 # Authentication
 # ============================================
 
+def _decode_token(token: str) -> Dict:
+    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+
+
 def verify_token(authorization: Optional[str] = Header(None)) -> Dict:
     if not authorization:
         raise HTTPException(status_code=401, detail="Token not provided")
     
     try:
         token = authorization.split(" ")[1]
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        # signature is only checked on the first request with a given token
+        return token_cache.verify(token, _decode_token)
+    except TokenRevokedError:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
     except Exception as err:
         raise HTTPException(status_code=403, detail="Invalid token")
 
 
+@app.post("/api/v1/auth/revoke")
+async def revoke_token(
+    request: Dict,
+    user: Dict = Depends(verify_token),
+    authorization: Optional[str] = Header(None),
+):
+    """
+    Add a token (default: the caller's own) or a jti to the revocation list
+
+    Callers may only revoke their own tokens; admins may revoke any token.
+    The revocation lasts until the token's verified exp (capped).
+    """
+    is_admin = user.get("role") == "admin"
+    token = request.get("token")
+    jti = request.get("jti")
+    if token is None and jti is None:
+        token = authorization.split(" ")[1]
+
+    expires_at = None
+    if token is not None:
+        try:
+            payload = _decode_token(token)
+        except jwt.ExpiredSignatureError:
+            # already unusable, nothing to revoke
+            return {"success": True, "message": "Token already expired"}
+        except jwt.PyJWTError:
+            raise HTTPException(status_code=400, detail="Invalid token")
+        if payload.get("id") != user.get("id") and not is_admin:
+            raise HTTPException(status_code=403, detail="Cannot revoke another user's token")
+        expires_at = payload.get("exp")
+    if jti is not None:
+        if jti != user.get("jti") and not is_admin:
+            raise HTTPException(status_code=403, detail="Cannot revoke another user's token")
+        if token is None and jti == user.get("jti"):
+            expires_at = user.get("exp")
+
+    token_cache.revoke(token=token, jti=jti, expires_at=expires_at)
+    logger.info(f"Token revoked by {user.get('id')} (jti={jti})")
+    return {
+        "success": True,
+        "message": "Token revoked",
+    }
+
+
 # ============================================
 # Health Check
 # ============================================
@@ -149,6 +406,242 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus text exposition of service metrics
+    """
+    lines = []
+    for name, value in translation_memory.metrics().items():
+        lines.append(f"translation_memory_{name} {value}")
+    for name, value in template_cache.metrics().items():
+        lines.append(f"template_cache_{name} {value}")
+    for name, value in glossary_index.metrics().items():
+        lines.append(f"glossary_index_{name} {value}")
+    for name, value in term_protector.metrics().items():
+        lines.append(f"glossary_protection_{name} {value}")
+    for name, value in token_cache.metrics().items():
+        lines.append(f"jwt_cache_{name} {value}")
+    for name, value in translation_backend.metrics().items():
+        lines.append(f"translation_backend_{name} {value}")
+    for name, value in preference_cache.metrics().items():
+        lines.append(f"preference_cache_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# ============================================
+# Translation Memory
+# ============================================
+
+RECONCILE_BATCH_SIZE = 1000
+
+
+async def reconcile_translation_memory(db: AsyncSession) -> int:
+    """
+    Pull translations rows created or updated (e.g. approved) since the last
+    reconciliation into the memory. The first run only loads the most recently
+    changed TRANSLATION_MEMORY_SIZE rows.
+    """
+    # rows never updated fall back to created_at
+    changed_at = func.coalesce(Translation.updated_at, Translation.created_at)
+    columns = (
+        Translation.source_text,
+        Translation.source_language,
+        Translation.target_language,
+        Translation.context,
+        Translation.glossary_version,
+        Translation.translated_text,
+        Translation.is_approved,
+        changed_at,
+        Translation.id,
+    )
+    if translation_memory.watermark is None:
+        result = await db.execute(
+            select(*columns).order_by(changed_at.desc(), Translation.id.desc()).limit(TRANSLATION_MEMORY_SIZE)
+        )
+        return translation_memory.reconcile(reversed(result.all()))
+
+    # re-read an overlap window: a row stamped before the watermark may commit after it;
+    # rows the memory already holds unchanged are skipped
+    since = translation_memory.watermark - timedelta(seconds=TRANSLATION_MEMORY_RECONCILE_LAG_SECONDS)
+    query = select(*columns).order_by(changed_at.asc(), Translation.id.asc()).limit(RECONCILE_BATCH_SIZE)
+    total = 0
+    after = None
+    while True:
+        # keyset paging on (changed_at, id): each page is an index range scan, however deep
+        # (the plain >= bound lets SQLite seek the index; the row-value compare alone scans it)
+        if after is None:
+            page = query.where(changed_at >= since)
+        else:
+            page = query.where(changed_at >= after[0], tuple_(changed_at, Translation.id) > after)
+        rows = (await db.execute(page)).all()
+        total += translation_memory.reconcile(rows)
+        if len(rows) < RECONCILE_BATCH_SIZE:
+            return total
+        after = tuple(rows[-1][-2:])
+
+
+async def _reconcile_translation_memory_periodically():
+    while True:
+        await asyncio.sleep(TRANSLATION_MEMORY_RECONCILE_SECONDS)
+        try:
+            async with SessionLocal() as db:
+                await reconcile_translation_memory(db)
+        except Exception as err:
+            logger.error(f"Error reconciling translation memory: {err}")
+
+
+@app.on_event("startup")
+async def warm_translation_memory():
+    try:
+        async with SessionLocal() as db:
+            loaded = await reconcile_translation_memory(db)
+        logger.info(f"Translation memory warmed with {loaded} translations")
+    except Exception as err:
+        logger.error(f"Error warming translation memory: {err}")
+    if TRANSLATION_MEMORY_RECONCILE_SECONDS > 0:
+        app.state.reconcile_task = asyncio.create_task(_reconcile_translation_memory_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_translation_memory_reconciliation():
+    task = getattr(app.state, "reconcile_task", None)
+    if task is not None:
+        task.cancel()
+    if translation_memory.store is not None:
+        # commit queued write-behind entries before the worker exits
+        await asyncio.get_running_loop().run_in_executor(None, translation_memory.store.flush)
+
+
+# ============================================
+# Template Cache
+# ============================================
+
+async def refresh_template_cache(db: AsyncSession) -> int:
+    """
+    Apply template rows changed since the last refresh (all rows on first load).
+    Returns the number of cached templates that changed.
+    """
+    # rows created before updated_at existed fall back to created_at
+    changed_at = func.coalesce(TranslationTemplate.updated_at, TranslationTemplate.created_at)
+    query = select(
+        TranslationTemplate.template_key,
+        TranslationTemplate.translations,
+        TranslationTemplate.category,
+        TranslationTemplate.is_active,
+        changed_at,
+    )
+    if template_cache.watermark is not None:
+        # re-read an overlap window: a row stamped before the watermark may commit after it;
+        # re-applying unchanged rows is a no-op
+        since = template_cache.watermark - timedelta(seconds=TEMPLATE_CACHE_REFRESH_LAG_SECONDS)
+        query = query.where(changed_at >= since)
+    result = await db.execute(query.order_by(changed_at.asc()))
+    return template_cache.apply(result.all(), advance_watermark=True)
+
+
+async def _refresh_template_cache_periodically():
+    while True:
+        await asyncio.sleep(TEMPLATE_CACHE_REFRESH_SECONDS)
+        try:
+            async with SessionLocal() as db:
+                await refresh_template_cache(db)
+        except Exception as err:
+            logger.error(f"Error refreshing template cache: {err}")
+
+
+@app.on_event("startup")
+async def load_template_cache():
+    try:
+        async with SessionLocal() as db:
+            await refresh_template_cache(db)
+        logger.info(f"Template cache loaded with {len(template_cache)} templates")
+    except Exception as err:
+        logger.error(f"Error loading template cache: {err}")
+    if TEMPLATE_CACHE_REFRESH_SECONDS > 0:
+        app.state.template_refresh_task = asyncio.create_task(_refresh_template_cache_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_template_cache_refresh():
+    task = getattr(app.state, "template_refresh_task", None)
+    if task is not None:
+        task.cancel()
+
+
+# ============================================
+# Glossary Index
+# ============================================
+
+def _glossary_record(entry: GlossaryEntry) -> GlossaryRecord:
+    return GlossaryRecord(
+        id=entry.id,
+        term=entry.term,
+        language=entry.language,
+        definition=entry.definition,
+        category=entry.category,
+        created_at=entry.created_at,
+        updated_at=entry.updated_at,
+        translations=entry.translations,
+    )
+
+
+async def refresh_glossary_index(db: AsyncSession) -> int:
+    """
+    Index glossary entries created or updated since the last refresh (all entries
+    on first load). Returns the number of newly indexed or replaced entries.
+    """
+    # rows written before updated_at existed fall back to created_at
+    changed_at = func.coalesce(GlossaryEntry.updated_at, GlossaryEntry.created_at)
+    query = select(GlossaryEntry)
+    if glossary_index.watermark is not None:
+        # re-read an overlap window: a row stamped before the watermark may commit after it;
+        # already indexed, unchanged entries are skipped by id
+        since = glossary_index.watermark - timedelta(seconds=GLOSSARY_INDEX_REFRESH_LAG_SECONDS)
+        query = query.where(changed_at >= since)
+    result = await db.execute(query.order_by(changed_at.asc()))
+    records = [_glossary_record(entry) for entry in result.scalars()]
+    changed = glossary_index.apply_refresh(records)
+    if changed:
+        await refresh_term_protection({record.language for record in records})
+    return changed
+
+
+async def refresh_term_protection(languages) -> None:
+    """Recompile the term protection automata of changed source languages off the event loop"""
+    for language in languages:
+        await term_protector.refresh(language)
+
+
+async def _refresh_glossary_index_periodically():
+    while True:
+        await asyncio.sleep(GLOSSARY_INDEX_REFRESH_SECONDS)
+        try:
+            async with SessionLocal() as db:
+                await refresh_glossary_index(db)
+        except Exception as err:
+            logger.error(f"Error refreshing glossary index: {err}")
+
+
+@app.on_event("startup")
+async def load_glossary_index():
+    try:
+        async with SessionLocal() as db:
+            await refresh_glossary_index(db)
+        logger.info(f"Glossary index loaded with {len(glossary_index)} entries")
+    except Exception as err:
+        logger.error(f"Error loading glossary index: {err}")
+    if GLOSSARY_INDEX_REFRESH_SECONDS > 0:
+        app.state.glossary_refresh_task = asyncio.create_task(_refresh_glossary_index_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_glossary_index_refresh():
+    task = getattr(app.state, "glossary_refresh_task", None)
+    if task is not None:
+        task.cancel()
+
+
 # ============================================
 # Translation Endpoints
 # ============================================
@@ -157,7 +650,7 @@ async def health_check():
 async def translate_text(
     request: Dict,
     user: Dict = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Translate text from source language to target language
@@ -171,9 +664,15 @@ async def translate_text(
         if not text:
             raise HTTPException(status_code=400, detail="Text is required")
 
-        # Simple translation logic (in production, use Google Translate API, etc.)
-        translated_text = await perform_translation(
-            text, source_language, target_language, context
+        # Identical segments are served from the translation memory
+        glossary = await term_protector.compiled_async(source_language, target_language)
+        translated_text = await translation_memory.translate(
+            text,
+            source_language,
+            target_language,
+            context,
+            partial(translate_with_glossary, glossary=glossary),
+            glossary_version=glossary.digest,
         )
 
         # Save to database
@@ -187,10 +686,10 @@ async def translate_text(
             source_text=text,
             translated_text=translated_text,
             context=context,
+            glossary_version=glossary.digest,
         )
         db.add(translation)
-        db.commit()
-        db.refresh(translation)
+        await db.commit()
 
         return {
             "success": True,
@@ -209,35 +708,196 @@ async def translate_text(
         raise HTTPException(status_code=500, detail="Translation failed")
 
 
-@app.get("/api/v1/translations")
-async def get_translations(
+@app.post("/api/v1/translate:batch")
+async def translate_batch(
+    request: Dict,
     user: Dict = Depends(verify_token),
-    db: Session = Depends(get_db),
-    limit: int = 50,
-    offset: int = 0,
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Get user's translation history
+    Translate many segments in one request
+
+    Body: {"segments": ["...", {"text": "...", "context": "..."}, ...],
+           "source_language": "ko", "target_language": "en", "context": null}
+    Identical segments are translated once, unique segments run concurrently,
+    and all Translation rows are written with one bulk insert in one transaction.
+    Results are returned in request order.
     """
+    source_language = request.get("source_language", "ko")
+    target_language = request.get("target_language", "en")
+    default_context = request.get("context")
+    segments = request.get("segments")
+
+    if not isinstance(segments, list) or not segments:
+        raise HTTPException(status_code=400, detail="Segments are required")
+    if len(segments) > MAX_BATCH_SEGMENTS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_SEGMENTS} segments per request"
+        )
+
+    items = []
+    for segment in segments:
+        if isinstance(segment, dict):
+            text, context = segment.get("text"), segment.get("context", default_context)
+        else:
+            text, context = segment, default_context
+        if not text or not isinstance(text, str):
+            raise HTTPException(status_code=400, detail="Every segment needs text")
+        items.append((text, context))
+
     try:
-        translations = db.query(Translation).filter(
-            Translation.user_id == user.get("id")
-        ).order_by(Translation.created_at.desc()).limit(limit).offset(offset).all()
+        glossary = await term_protector.compiled_async(source_language, target_language)
+        backend = partial(translate_with_glossary, glossary=glossary)
+
+        # Dedupe by translation memory key, keeping the first occurrence
+        unique: Dict = {}
+        for text, context in items:
+            unique.setdefault(
+                memory_key(text, source_language, target_language, context, glossary.digest), (text, context)
+            )
+
+        semaphore = asyncio.Semaphore(BATCH_TRANSLATION_CONCURRENCY)
+
+        async def translate_one(text: str, context: Optional[str]) -> str:
+            async with semaphore:
+                return await translation_memory.translate(
+                    text, source_language, target_language, context, backend, glossary_version=glossary.digest
+                )
+
+        translated = await asyncio.gather(*(translate_one(t, c) for t, c in unique.values()))
+        by_key = dict(zip(unique.keys(), translated))
+
+        user_id = user.get("id")
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "source_language": source_language,
+                "target_language": target_language,
+                "source_text": text,
+                "translated_text": by_key[
+                    memory_key(text, source_language, target_language, context, glossary.digest)
+                ],
+                "context": context,
+                "glossary_version": glossary.digest,
+                "is_approved": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for text, context in items
+        ]
+        await db.execute(insert(Translation), rows)
+        await db.commit()
 
         return {
             "success": True,
             "data": [
                 {
-                    "id": t.id,
-                    "source_language": t.source_language,
-                    "target_language": t.target_language,
-                    "source_text": t.source_text,
-                    "translated_text": t.translated_text,
-                    "created_at": t.created_at.isoformat(),
+                    "id": row["id"],
+                    "source_text": row["source_text"],
+                    "translated_text": row["translated_text"],
+                    "context": row["context"],
                 }
-                for t in translations
+                for row in rows
             ],
-            "count": len(translations),
+            "source_language": source_language,
+            "target_language": target_language,
+            "count": len(rows),
+            "unique_segments": len(unique),
+        }
+
+    except Exception as err:
+        await db.rollback()
+        logger.error(f"Error translating batch: {err}")
+        raise HTTPException(status_code=500, detail="Batch translation failed")
+
+
+HISTORY_PAGE_MAX = int(os.getenv("HISTORY_PAGE_MAX", 200))
+HISTORY_VIEWS = ("full", "summary")
+
+
+def encode_history_cursor(created_at: datetime, translation_id: str) -> str:
+    """Opaque cursor for the history row after which the next page starts"""
+    raw = json.dumps([created_at.isoformat(), translation_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_history_cursor(cursor: str):
+    """Return (created_at, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, translation_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(translation_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as err:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from err
+
+
+@app.get("/api/v1/translations")
+async def get_translations(
+    user: Dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_db),
+    limit: int = 50,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    view: str = "full",
+):
+    """
+    Get user's translation history, newest first
+
+    Pass the returned next_cursor as cursor to fetch the following page; each
+    page is an index range scan on (user_id, created_at, id) regardless of depth.
+    offset is kept for older clients. view=summary skips source_text.
+    """
+    if view not in HISTORY_VIEWS:
+        raise HTTPException(status_code=400, detail=f"view must be one of {', '.join(HISTORY_VIEWS)}")
+    after = None
+    if cursor:
+        try:
+            after = decode_history_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    limit = max(1, min(limit, HISTORY_PAGE_MAX))
+
+    try:
+        columns = [
+            Translation.id,
+            Translation.source_language,
+            Translation.target_language,
+            Translation.translated_text,
+            Translation.created_at,
+        ]
+        if view == "full":
+            columns.insert(3, Translation.source_text)
+
+        query = select(*columns).where(Translation.user_id == user.get("id"))
+        if after is not None:
+            # row-value comparison so the index serves it as a single range
+            query = query.where(tuple_(Translation.created_at, Translation.id) < after)
+        elif offset:
+            query = query.offset(offset)
+        # one extra row tells whether another page exists
+        result = await db.execute(
+            query.order_by(Translation.created_at.desc(), Translation.id.desc()).limit(limit + 1)
+        )
+        rows = result.mappings().all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        data = []
+        for row in rows:
+            item = dict(row)
+            item["created_at"] = row["created_at"].isoformat()
+            data.append(item)
+
+        return {
+            "success": True,
+            "data": data,
+            "count": len(data),
+            "has_more": has_more,
+            "next_cursor": (
+                encode_history_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more else None
+            ),
         }
 
     except Exception as err:
@@ -249,47 +909,85 @@ async def get_translations(
 # Template Translations
 # ============================================
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+@app.get("/api/v1/templates")
+async def get_templates(
+    keys: str,
+    language: str = "ko",
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get many translated templates in one response
+
+    keys is comma-separated. Responses carry an ETag; send it back as
+    If-None-Match to get 304 Not Modified while the templates are unchanged.
+    """
+    template_keys = list(dict.fromkeys(key.strip() for key in keys.split(",") if key.strip()))
+    if not template_keys:
+        raise HTTPException(status_code=400, detail="keys is required")
+    if len(template_keys) > MAX_TEMPLATE_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TEMPLATE_KEYS} keys per request")
+
+    try:
+        if not template_cache.loaded:
+            await refresh_template_cache(db)
+        data, missing, etag = template_cache.bulk(template_keys, language)
+    except Exception as err:
+        logger.error(f"Error fetching templates: {err}")
+        raise HTTPException(status_code=500, detail="Failed to fetch templates")
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(
+        {"success": True, "language": language, "data": data, "missing": missing},
+        headers=headers,
+    )
+
+
 @app.get("/api/v1/templates/{template_key}")
 async def get_template_translation(
     template_key: str,
     language: str = "ko",
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get translated template by key and language
     """
     try:
-        template = db.query(TranslationTemplate).filter(
-            TranslationTemplate.template_key == template_key,
-            TranslationTemplate.is_active == True,
-        ).first()
-
-        if not template:
-            raise HTTPException(status_code=404, detail="Template not found")
-
-        translations = template.translations or {}
-        translated_text = translations.get(language, translations.get("ko", ""))
-
-        return {
-            "success": True,
-            "data": {
-                "key": template.template_key,
-                "language": language,
-                "text": translated_text,
-                "category": template.category,
-            },
-        }
-
+        if not template_cache.loaded:
+            await refresh_template_cache(db)
+        template = template_cache.get(template_key)
     except Exception as err:
         logger.error(f"Error fetching template: {err}")
         raise HTTPException(status_code=500, detail="Failed to fetch template")
 
+    if template is None:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    return {
+        "success": True,
+        "data": {
+            "key": template.key,
+            "language": language,
+            "text": template_cache.text(template_key, language),
+            "category": template.category,
+        },
+    }
+
 
 @app.post("/api/v1/templates")
 async def create_template(
     request: Dict,
     user: Dict = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Create new translation template (admin only)
@@ -304,8 +1002,10 @@ async def create_template(
             category=request.get("category"),
         )
         db.add(template)
-        db.commit()
-        db.refresh(template)
+        await db.commit()
+        template_cache.apply([
+            (template.template_key, template.translations, template.category, True, template.updated_at)
+        ])
 
         return {
             "success": True,
@@ -326,37 +1026,52 @@ async def create_template(
 # Language Preferences
 # ============================================
 
+def _preferences_dict(prefs) -> Dict:
+    return {
+        "preferred_language": prefs.preferred_language,
+        "secondary_language": prefs.secondary_language,
+        "auto_translate": prefs.auto_translate,
+    }
+
+
+async def load_language_preferences(db: AsyncSession, user_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Preferences for every user id (defaults for users without a row);
+    cache misses are resolved with one IN query
+    """
+    generation = preference_cache.generation
+    found, missing = preference_cache.lookup(user_ids)
+    if missing:
+        result = await db.execute(
+            select(
+                LanguagePreference.user_id,
+                LanguagePreference.preferred_language,
+                LanguagePreference.secondary_language,
+                LanguagePreference.auto_translate,
+            ).where(LanguagePreference.user_id.in_(missing))
+        )
+        rows = {row.user_id: _preferences_dict(row) for row in result}
+        preference_cache.fill(missing, rows, generation)
+        for user_id in missing:
+            found[user_id] = rows.get(user_id, dict(DEFAULT_PREFERENCES))
+    return found
+
+
 @app.get("/api/v1/language-preferences")
 async def get_language_preferences(
     user: Dict = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get user's language preferences
     """
     try:
-        prefs = db.query(LanguagePreference).filter(
-            LanguagePreference.user_id == user.get("id")
-        ).first()
-
-        if not prefs:
-            # Return default preferences
-            return {
-                "success": True,
-                "data": {
-                    "preferred_language": "ko",
-                    "secondary_language": "en",
-                    "auto_translate": False,
-                },
-            }
+        user_id = user.get("id")
+        preferences = await load_language_preferences(db, [user_id])
 
         return {
             "success": True,
-            "data": {
-                "preferred_language": prefs.preferred_language,
-                "secondary_language": prefs.secondary_language,
-                "auto_translate": prefs.auto_translate,
-            },
+            "data": preferences[user_id],
         }
 
     except Exception as err:
@@ -364,11 +1079,44 @@ async def get_language_preferences(
         raise HTTPException(status_code=500, detail="Failed to fetch preferences")
 
 
+@app.get("/api/v1/language-preferences:batch")
+async def get_language_preferences_batch(
+    user_ids: str,
+    user: Dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get language preferences for many users at once (user_ids is comma-separated)
+
+    Only admins may read other users' preferences.
+    """
+    ids = list(dict.fromkeys(user_id.strip() for user_id in user_ids.split(",") if user_id.strip()))
+    if not ids:
+        raise HTTPException(status_code=400, detail="user_ids is required")
+    if user.get("role") != "admin" and any(user_id != user.get("id") for user_id in ids):
+        raise HTTPException(status_code=403, detail="Cannot read other users' preferences")
+    if len(ids) > MAX_PREFERENCE_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PREFERENCE_BATCH} user ids per request")
+
+    try:
+        preferences = await load_language_preferences(db, ids)
+
+        return {
+            "success": True,
+            "data": {user_id: preferences[user_id] for user_id in ids},
+            "count": len(ids),
+        }
+
+    except Exception as err:
+        logger.error(f"Error fetching language preferences batch: {err}")
+        raise HTTPException(status_code=500, detail="Failed to fetch preferences")
+
+
 @app.put("/api/v1/language-preferences")
 async def update_language_preferences(
     request: Dict,
     user: Dict = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Update user's language preferences
@@ -377,9 +1125,10 @@ async def update_language_preferences(
         import uuid
         user_id = user.get("id")
         
-        prefs = db.query(LanguagePreference).filter(
-            LanguagePreference.user_id == user_id
-        ).first()
+        result = await db.execute(
+            select(LanguagePreference).where(LanguagePreference.user_id == user_id)
+        )
+        prefs = result.scalars().first()
 
         if not prefs:
             prefs = LanguagePreference(
@@ -396,17 +1145,13 @@ async def update_language_preferences(
             prefs.auto_translate = request.get("auto_translate", prefs.auto_translate)
             prefs.updated_at = datetime.utcnow()
 
-        db.commit()
-        db.refresh(prefs)
+        await db.commit()
+        preference_cache.put(user_id, _preferences_dict(prefs))
 
         return {
             "success": True,
             "message": "Preferences updated successfully",
-            "data": {
-                "preferred_language": prefs.preferred_language,
-                "secondary_language": prefs.secondary_language,
-                "auto_translate": prefs.auto_translate,
-            },
+            "data": _preferences_dict(prefs),
         }
 
     except Exception as err:
@@ -418,20 +1163,48 @@ async def update_language_preferences(
 # Glossary
 # ============================================
 
+@app.get("/api/v1/glossary")
+async def search_glossary(
+    q: str,
+    language: str = "ko",
+    limit: int = 10,
+    fuzzy: bool = True,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ranked glossary search: exact, prefix and substring matches first, then
+    fuzzy (trigram similarity) matches when fuzzy=true
+    """
+    limit = max(1, min(limit, MAX_GLOSSARY_RESULTS))
+    try:
+        if not glossary_index.loaded:
+            await refresh_glossary_index(db)
+        matches = glossary_index.search(q, language, limit=limit, fuzzy=fuzzy)
+
+        return {
+            "success": True,
+            "data": [match.to_dict() for match in matches],
+            "count": len(matches),
+        }
+
+    except Exception as err:
+        logger.error(f"Error searching glossary: {err}")
+        raise HTTPException(status_code=500, detail="Failed to search glossary")
+
+
 @app.get("/api/v1/glossary/{term}")
 async def get_glossary_entry(
     term: str,
     language: str = "ko",
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Get glossary entry by term
+    Get glossary entry by term (best-ranked entry whose term contains it)
     """
     try:
-        entry = db.query(GlossaryEntry).filter(
-            GlossaryEntry.term.ilike(f"%{term}%"),
-            GlossaryEntry.language == language,
-        ).first()
+        if not glossary_index.loaded:
+            await refresh_glossary_index(db)
+        entry = glossary_index.lookup(term, language)
 
         if not entry:
             return {
@@ -442,12 +1215,7 @@ async def get_glossary_entry(
 
         return {
             "success": True,
-            "data": {
-                "term": entry.term,
-                "definition": entry.definition,
-                "language": entry.language,
-                "category": entry.category,
-            },
+            "data": entry.to_dict(),
         }
 
     except Exception as err:
@@ -459,7 +1227,7 @@ async def get_glossary_entry(
 async def add_glossary_entry(
     request: Dict,
     user: Dict = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Add new glossary entry
@@ -472,10 +1240,12 @@ async def add_glossary_entry(
             language=request.get("language", "ko"),
             definition=request.get("definition"),
             category=request.get("category"),
+            translations=request.get("translations"),
         )
         db.add(entry)
-        db.commit()
-        db.refresh(entry)
+        await db.commit()
+        glossary_index.add(_glossary_record(entry))
+        await refresh_term_protection([entry.language])
 
         return {
             "success": True,
@@ -491,31 +1261,275 @@ async def add_glossary_entry(
         raise HTTPException(status_code=500, detail="Failed to add glossary entry")
 
 
+# ============================================
+# Bulk Import / Export
+# ============================================
+
+async def upsert_templates(db: AsyncSession, rows: List[Dict], stats: ImportStats) -> None:
+    """
+    Insert or update one chunk of templates (keyed by template_key) in a single
+    transaction; updates only touch the fields present in the row
+    """
+    rows = list({row["template_key"]: row for row in rows}.values())
+    result = await db.execute(
+        select(
+            TranslationTemplate.template_key,
+            TranslationTemplate.id,
+            TranslationTemplate.translations,
+            TranslationTemplate.category,
+            TranslationTemplate.is_active,
+        ).where(TranslationTemplate.template_key.in_([row["template_key"] for row in rows]))
+    )
+    existing = {template.template_key: template for template in result}
+    now = datetime.utcnow()
+    inserts, updates, merged = [], [], []
+    for row in rows:
+        template = existing.get(row["template_key"])
+        if template is None:
+            row = {**TEMPLATE_DEFAULTS, **row}
+            inserts.append({**row, "id": str(uuid.uuid4()), "created_at": now, "updated_at": now})
+            merged.append(row)
+        else:
+            updates.append({**row, "id": template.id, "updated_at": now})
+            merged.append({**template._asdict(), **row})
+    if inserts:
+        await db.execute(insert(TranslationTemplate), inserts)
+    for group in _group_by_columns(updates):
+        await db.execute(update(TranslationTemplate), group)
+    await db.commit()
+    template_cache.apply(
+        (row["template_key"], row["translations"], row["category"], row["is_active"], now) for row in merged
+    )
+    stats.inserted += len(inserts)
+    stats.updated += len(updates)
+
+
+def _group_by_columns(rows: List[Dict]):
+    """Bulk UPDATE parameter sets grouped by their column set (one executemany per shape)"""
+    groups: Dict[tuple, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups.values()
+
+
+async def upsert_glossary_entries(
+    db: AsyncSession, rows: List[Dict], stats: ImportStats
+) -> List[GlossaryRecord]:
+    """
+    Insert or update one chunk of glossary entries (keyed by language and term)
+    in a single transaction; updates only touch the fields present in the row.
+    Returns the records of newly inserted entries.
+    """
+    rows = list({(row["language"], row["term"]): row for row in rows}.values())
+    result = await db.execute(
+        select(
+            GlossaryEntry.id,
+            GlossaryEntry.term,
+            GlossaryEntry.language,
+            GlossaryEntry.definition,
+            GlossaryEntry.category,
+            GlossaryEntry.translations,
+            GlossaryEntry.created_at,
+        ).where(GlossaryEntry.term.in_(list({row["term"] for row in rows})))
+    )
+    existing = {(entry.language, entry.term): entry for entry in result}
+    now = datetime.utcnow()
+    inserts, updates, replaced = [], [], []
+    for row in rows:
+        entry = existing.get((row["language"], row["term"]))
+        if entry is None:
+            inserts.append({**GLOSSARY_DEFAULTS, **row, "id": str(uuid.uuid4()), "created_at": now, "updated_at": now})
+        else:
+            updates.append({**row, "id": entry.id, "updated_at": now})
+            replaced.append(GlossaryRecord(**{**entry._asdict(), **row, "updated_at": now}))
+    if inserts:
+        await db.execute(insert(GlossaryEntry), inserts)
+    for group in _group_by_columns(updates):
+        await db.execute(update(GlossaryEntry), group)
+    await db.commit()
+    for record in replaced:
+        glossary_index.replace(record)
+    stats.inserted += len(inserts)
+    stats.updated += len(updates)
+    return [GlossaryRecord(**row) for row in inserts]
+
+
+@app.post("/api/v1/templates:import")
+async def import_templates(
+    request: Request,
+    format: Optional[str] = None,
+    user: Dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Bulk create/update templates from an NDJSON or CSV body (see bulk_io.py)
+
+    The body is parsed as it arrives and upserted in chunks of
+    BULK_IMPORT_CHUNK_SIZE rows, one transaction per chunk.
+    """
+    stats = ImportStats()
+    try:
+        rows = iter_rows(request.stream(), resolve_format(format, request.headers.get("content-type")))
+        async for chunk in iter_chunks(rows, template_row, BULK_IMPORT_CHUNK_SIZE, stats):
+            await upsert_templates(db, chunk, stats)
+            stats.chunks += 1
+    except BulkFormatError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+    except Exception as err:
+        logger.error(f"Error importing templates after {stats.chunks} chunks: {err}")
+        raise HTTPException(status_code=500, detail="Failed to import templates")
+
+    report = stats.to_dict()
+    logger.info(f"Imported {report['rows']} template rows ({report['rows_per_second']} rows/s)")
+    return {"success": True, "data": report}
+
+
+@app.post("/api/v1/glossary:import")
+async def import_glossary(
+    request: Request,
+    format: Optional[str] = None,
+    user: Dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Bulk create/update glossary entries from an NDJSON or CSV body (see bulk_io.py)
+
+    Entries are matched on (language, term). New entries are added to the
+    search index once the import finishes.
+    """
+    stats = ImportStats()
+    added: List[GlossaryRecord] = []
+    languages = set()
+    try:
+        rows = iter_rows(request.stream(), resolve_format(format, request.headers.get("content-type")))
+        async for chunk in iter_chunks(rows, glossary_row, BULK_IMPORT_CHUNK_SIZE, stats):
+            added.extend(await upsert_glossary_entries(db, chunk, stats))
+            languages.update(row["language"] for row in chunk)
+            stats.chunks += 1
+    except BulkFormatError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+    except Exception as err:
+        logger.error(f"Error importing glossary after {stats.chunks} chunks: {err}")
+        raise HTTPException(status_code=500, detail="Failed to import glossary")
+    finally:
+        # committed chunks are indexed even if a later chunk failed
+        glossary_index.add_many(added)
+        await refresh_term_protection(languages)
+
+    report = stats.to_dict()
+    logger.info(f"Imported {report['rows']} glossary rows ({report['rows_per_second']} rows/s)")
+    return {"success": True, "data": report}
+
+
+async def _export_languages(db: AsyncSession, query, translations_column) -> List[str]:
+    """SUPPORTED_LANGUAGES plus every other language found in the exported rows' translations"""
+    languages = set()
+    result = await db.stream(
+        query.with_only_columns(translations_column).order_by(None).execution_options(
+            yield_per=BULK_EXPORT_BATCH_SIZE
+        )
+    )
+    async for translations in result.scalars():
+        languages.update(translations or ())
+    return list(SUPPORTED_LANGUAGES) + sorted(languages - SUPPORTED_LANGUAGES.keys())
+
+
+async def _stream_export(query, encoder: RowEncoder, translations_column):
+    # own session: the response body outlives the request handler
+    async with SessionLocal() as db:
+        if encoder.format == "csv":
+            # CSV columns are fixed by the header, so collect the languages first
+            encoder.languages = await _export_languages(db, query, translations_column)
+        yield encoder.header()
+        result = await db.stream(query.execution_options(yield_per=BULK_EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encoder.encode(row._asdict() for row in rows)
+
+
+def _export_response(
+    query, format: Optional[str], columns, translations_column, filename: str
+) -> StreamingResponse:
+    try:
+        format = resolve_format(format)
+    except BulkFormatError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+    encoder = RowEncoder(format, columns, SUPPORTED_LANGUAGES)
+    return StreamingResponse(
+        _stream_export(query, encoder, translations_column),
+        media_type=encoder.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+
+@app.get("/api/v1/templates:export")
+async def export_templates(
+    format: Optional[str] = None,
+    user: Dict = Depends(verify_token),
+):
+    """
+    Stream every template as NDJSON (default) or CSV, read through a server-side cursor
+    """
+    query = select(
+        TranslationTemplate.template_key,
+        TranslationTemplate.category,
+        TranslationTemplate.is_active,
+        TranslationTemplate.translations,
+    ).order_by(TranslationTemplate.template_key)
+    return _export_response(query, format, TEMPLATE_COLUMNS, TranslationTemplate.translations, "templates")
+
+
+@app.get("/api/v1/glossary:export")
+async def export_glossary(
+    format: Optional[str] = None,
+    language: Optional[str] = None,
+    user: Dict = Depends(verify_token),
+):
+    """
+    Stream glossary entries (optionally one language) as NDJSON (default) or CSV
+    """
+    query = select(
+        GlossaryEntry.term,
+        GlossaryEntry.language,
+        GlossaryEntry.definition,
+        GlossaryEntry.category,
+        GlossaryEntry.translations,
+    ).order_by(GlossaryEntry.language, GlossaryEntry.term)
+    if language:
+        query = query.where(GlossaryEntry.language == language)
+    return _export_response(query, format, GLOSSARY_COLUMNS, GlossaryEntry.translations, "glossary")
+
+
 # ============================================
 # Helper Functions
 # ============================================
 
+async def translate_with_glossary(
+    text: str,
+    source_language: str,
+    target_language: str,
+    context: Optional[str] = None,
+    glossary: Optional[CompiledGlossary] = None,
+) -> str:
+    """
+    perform_translation with glossary terms swapped for placeholders beforehand
+    and replaced by their target-language rendering (or the original term) afterwards
+    """
+    if glossary is None:
+        glossary = await term_protector.compiled_async(source_language, target_language)
+    segment = term_protector.protect(text, source_language, target_language, glossary)
+    translated = await perform_translation(segment.text, source_language, target_language, context)
+    return segment.restore(translated)
+
+
 async def perform_translation(
     text: str, source_language: str, target_language: str, context: Optional[str] = None
 ) -> str:
     """
-    Perform actual translation
-    In production, integrate with Google Translate, Microsoft Translator, etc.
+    Perform actual translation through the configured provider
+    (coalesced, batched and concurrency-limited by translation_backend)
     """
     try:
-        # Simple placeholder - in production use actual translation API
-        if source_language == target_language:
-            return text
-        
-        # Mock translation (replace with real API call)
-        translation_map = {
-            ("ko", "en"): f"[EN] {text}",
-            ("en", "ko"): f"[KO] {text}",
-            ("ko", "ja"): f"[JA] {text}",
-            ("ko", "zh"): f"[ZH] {text}",
-        }
-        
-        return translation_map.get((source_language, target_language), text)
+        return await translation_backend.translate(text, source_language, target_language, context)
     
     except Exception as err:
         logger.error(f"Translation error: {err}")
@@ -0,0 +1,150 @@
+"""
+Write-through cache of user language preferences
+
+Entries are filled on read (one IN query for any batch of misses) and replaced
+on every successful update_language_preferences commit. Users without a row
+are cached too (negative entries), so the default-preferences case does not
+cost a query per request. TTLs bound staleness across workers, since a write
+only updates the cache of the worker that handled it.
+
+Every write takes a new generation stamp. A read notes the generation before
+it queries and passes it to fill(), which then skips users whose entry was
+written (put or invalidated) in the meantime, so a slow read can never put
+its older row over a newer write-through.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_PREFERENCES = {
+    "preferred_language": "ko",
+    "secondary_language": "en",
+    "auto_translate": False,
+}
+
+
+@dataclass
+class PreferenceCacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    queries: int = 0
+    stale_fills: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "hits_total": self.hits,
+            "negative_hits_total": self.negative_hits,
+            "misses_total": self.misses,
+            "evictions_total": self.evictions,
+            "queries_total": self.queries,
+            "stale_fills_total": self.stale_fills,
+        }
+
+
+class PreferenceCache:
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl: float = 300.0,
+        negative_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.stats = PreferenceCacheStats()
+        # user_id -> (preferences, or None for "no row", expires_at, generation)
+        self._entries: "OrderedDict[str, Tuple[Optional[Dict], float, int]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Current write generation; read it before querying and pass it to fill()"""
+        return self._generation
+
+    def lookup(self, user_ids: Iterable[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Split user_ids into cached preferences (defaults for negative entries)
+        and the ids that still need a query
+        """
+        now = self.clock()
+        found, missing = {}, []
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                # Expired entries stay until refilled or evicted so that their
+                # generation still guards against stale fills
+                if entry is None or entry[1] <= now:
+                    missing.append(user_id)
+                    self.stats.misses += 1
+                    continue
+                self._entries.move_to_end(user_id)
+                if entry[0] is None:
+                    self.stats.negative_hits += 1
+                    found[user_id] = dict(DEFAULT_PREFERENCES)
+                else:
+                    self.stats.hits += 1
+                    found[user_id] = dict(entry[0])
+        return found, missing
+
+    def fill(self, user_ids: Iterable[str], rows: Dict[str, Dict], generation: Optional[int] = None) -> None:
+        """
+        Store query results: rows for users that have one, negative entries for the rest
+
+        generation is the value of self.generation read before the query; users
+        written after it keep their newer entry.
+        """
+        now = self.clock()
+        with self._lock:
+            self.stats.queries += 1
+            if generation is None:
+                generation = self._generation
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[2] > generation:
+                    self.stats.stale_fills += 1
+                    continue
+                preferences = rows.get(user_id)
+                ttl = self.ttl if preferences is not None else self.negative_ttl
+                self._store(user_id, dict(preferences) if preferences is not None else None, now + ttl, generation)
+
+    def put(self, user_id: str, preferences: Dict) -> None:
+        """Write-through after a committed update"""
+        with self._lock:
+            self._generation += 1
+            self._store(user_id, dict(preferences), self.clock() + self.ttl, self._generation)
+
+    def _store(self, user_id: str, preferences: Optional[Dict], expires_at: float, generation: int) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[user_id] = (preferences, expires_at, generation)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        # An already-expired entry rather than a pop, so in-flight fills still
+        # see the newer generation
+        with self._lock:
+            self._generation += 1
+            self._store(user_id, None, float("-inf"), self._generation)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        data = self.stats.to_dict()
+        data["entries"] = len(self._entries)
+        return data
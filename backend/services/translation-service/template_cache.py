@@ -0,0 +1,139 @@
+"""
+In-process cache of active translation templates
+
+Every active template is held as a (template_key, language) -> text map so
+template reads never touch the database. The cache is loaded once at startup
+and then refreshed incrementally from rows whose updated_at is at or after the
+last seen watermark minus an overlap window; rows that became inactive are
+dropped. updated_at is stamped by the writer before commit, so a row can become
+visible after a later-stamped one; only rows read back from the database move
+the watermark, never this worker's own writes.
+
+Every change bumps version, which keys the memoized bulk responses and their
+ETags.
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+FALLBACK_LANGUAGE = "ko"
+BULK_MEMO_SIZE = 256
+
+
+@dataclass(frozen=True)
+class CachedTemplate:
+    key: str
+    translations: Dict[str, str]
+    category: Optional[str]
+
+    def text(self, language: str) -> str:
+        return self.translations.get(language, self.translations.get(FALLBACK_LANGUAGE, ""))
+
+
+class TemplateCache:
+    def __init__(self):
+        self.version = 0
+        self.loaded = False
+        # updated_at of the newest template row read from the database
+        self.watermark: Optional[datetime] = None
+        self._templates: Dict[str, CachedTemplate] = {}
+        self._texts: Dict[Tuple[str, str], str] = {}
+        self._bulk: Dict[Tuple[int, str, Tuple[str, ...]], Tuple[Dict, List[str], str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def apply(self, rows: Iterable[Tuple], advance_watermark: bool = False) -> int:
+        """
+        Merge template rows
+
+        rows: (template_key, translations, category, is_active, updated_at)
+        advance_watermark: the rows were read from the database (refresh)
+        Returns the number of templates whose cached content changed.
+        """
+        changed = 0
+        with self._lock:
+            for key, translations, category, is_active, updated_at in rows:
+                if advance_watermark and updated_at is not None and (
+                    self.watermark is None or updated_at > self.watermark
+                ):
+                    self.watermark = updated_at
+                current = self._templates.get(key)
+                if not is_active:
+                    if current is not None:
+                        self._drop(current)
+                        changed += 1
+                    continue
+                template = CachedTemplate(key, dict(translations or {}), category)
+                if template == current:
+                    continue
+                if current is not None:
+                    self._drop(current)
+                self._templates[key] = template
+                for language, text in template.translations.items():
+                    self._texts[(key, language)] = text
+                changed += 1
+            if changed:
+                self.version += 1
+                self._bulk.clear()
+            self.loaded = True
+        return changed
+
+    def _drop(self, template: CachedTemplate) -> None:
+        del self._templates[template.key]
+        for language in template.translations:
+            self._texts.pop((template.key, language), None)
+
+    def get(self, key: str) -> Optional[CachedTemplate]:
+        return self._templates.get(key)
+
+    def text(self, key: str, language: str) -> Optional[str]:
+        text = self._texts.get((key, language))
+        if text is not None:
+            return text
+        template = self._templates.get(key)
+        return template.text(language) if template is not None else None
+
+    def bulk(self, keys: Sequence[str], language: str) -> Tuple[Dict[str, Dict], List[str], str]:
+        """Return ({key: {text, category}}, missing keys, ETag) for many keys in one lookup"""
+        memo_key = (self.version, language, tuple(keys))
+        cached = self._bulk.get(memo_key)
+        if cached is not None:
+            return cached
+
+        data, missing = {}, []
+        for key in keys:
+            template = self._templates.get(key)
+            if template is None:
+                missing.append(key)
+            else:
+                data[key] = {"text": self.text(key, language), "category": template.category}
+        # content hash, so every worker hands out the same ETag for the same templates
+        digest = hashlib.sha1(
+            json.dumps([language, data, missing], sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        result = (data, missing, f'"{digest[:32]}"')
+
+        with self._lock:
+            if memo_key[0] == self.version:
+                if len(self._bulk) >= BULK_MEMO_SIZE:
+                    self._bulk.clear()
+                self._bulk[memo_key] = result
+        return result
+
+    def metrics(self) -> Dict[str, int]:
+        return {"entries": len(self._templates), "texts": len(self._texts), "version": self.version}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._texts.clear()
+            self._bulk.clear()
+            self.watermark = None
+            self.loaded = False
+            self.version += 1
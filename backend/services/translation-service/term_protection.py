@@ -0,0 +1,310 @@
+"""
+Glossary term protection for machine translation
+
+Before a segment goes to the translation backend, every glossary term of the
+source language is found in one linear pass with an Aho-Corasick automaton
+and replaced by a placeholder. After translation each placeholder becomes the
+term's preferred rendering for the target language (GlossaryEntry.translations)
+or, if there is none, the original term, so it comes back untouched.
+
+One automaton is compiled per (source, target) language pair and rebuilt only
+when the source language's glossary changes. Rebuilds run in the default
+executor while requests keep using the previous automaton. Each automaton
+carries a digest of its terms and renderings, which the translation memory
+uses as the glossary version of its entries.
+
+Text that already looks like a placeholder is protected as itself, so user
+input such as "[[G0]]" is never substituted.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from glossary_index import GlossaryIndex, GlossaryRecord
+
+PLACEHOLDER = "[[G{}]]"
+PLACEHOLDER_PATTERN = re.compile(r"\[\[G(\d+)\]\]")
+
+logger = logging.getLogger(__name__)
+
+
+def _fold(text: str) -> str:
+    """Lower-case without changing length, so match offsets stay valid in the original text"""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+class AhoCorasick:
+    """Multi-pattern matcher; find() reports leftmost-longest, non-overlapping matches"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[int] = [-1]  # pattern ending exactly at this node
+        self._output_link: List[int] = [0]  # nearest proper suffix node with an output
+        for index, pattern in enumerate(self.patterns):
+            self._insert(pattern, index)
+        self._link()
+
+    def _insert(self, pattern: str, index: int) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(-1)
+                self._output_link.append(0)
+            node = next_node
+        if pattern and self._output[node] == -1:
+            self._output[node] = index
+
+    def _link(self) -> None:
+        # breadth-first, so a node's fail link is final before its children need it;
+        # depth-1 nodes keep fail = 0
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                target = self._fail[child]
+                self._output_link[child] = target if self._output[target] != -1 else self._output_link[target]
+                queue.append(child)
+
+    def iter_all(self, text: str):
+        """Yield (start, end, pattern index) for every occurrence, overlapping included"""
+        goto, fail, output, output_link = self._goto, self._fail, self._output, self._output_link
+        patterns = self.patterns
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if output[node] != -1 else output_link[node]
+            while match:
+                index = output[match]
+                end = position + 1
+                yield end - len(patterns[index]), end, index
+                match = output_link[match]
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        matches = sorted(self.iter_all(text), key=lambda m: (m[0], m[0] - m[1]))
+        selected = []
+        covered = 0
+        for start, end, index in matches:
+            if start >= covered:
+                selected.append((start, end, index))
+                covered = end
+        return selected
+
+
+@dataclass
+class ProtectedSegment:
+    text: str
+    replacements: List[str] = field(default_factory=list)
+    terms: List[GlossaryRecord] = field(default_factory=list)
+
+    def restore(self, translated: str) -> str:
+        if not self.replacements:
+            return translated
+
+        def substitute(match):
+            index = int(match.group(1))
+            return self.replacements[index] if index < len(self.replacements) else match.group(0)
+
+        return PLACEHOLDER_PATTERN.sub(substitute, translated)
+
+
+class CompiledGlossary:
+    """Automaton over one source language's terms with their target-language replacements"""
+
+    def __init__(self, records: Sequence[GlossaryRecord], target_language: str):
+        self.target_language = target_language
+        patterns: Dict[str, GlossaryRecord] = {}
+        for record in records:
+            pattern = _fold(record.term.strip())
+            current = patterns.get(pattern)
+            # prefer an entry that actually has a rendering for the target language
+            if current is None or (
+                not (current.translations or {}).get(target_language)
+                and (record.translations or {}).get(target_language)
+            ):
+                patterns[pattern] = record
+        self.records = list(patterns.values())
+        self.automaton = AhoCorasick(list(patterns))
+        self.digest = self._digest(patterns)
+
+    def _digest(self, patterns: Dict[str, GlossaryRecord]) -> str:
+        """Stable across workers and restarts; empty when there is nothing to protect"""
+        if not patterns:
+            return ""
+        digest = hashlib.sha1()
+        for pattern in sorted(patterns):
+            rendering = (patterns[pattern].translations or {}).get(self.target_language) or ""
+            digest.update(f"{pattern}\0{rendering}\0".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def _term_matches(self, text: str):
+        for start, end, index in self.automaton.find(_fold(text)):
+            # Latin terms must not match inside a longer word ("BP" in "BPM"); Hangul terms may carry particles
+            if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+                continue
+            if end < len(text) and _is_word_char(text[end - 1]) and _is_word_char(text[end]):
+                continue
+            yield start, end, index
+
+    def protect(self, text: str) -> ProtectedSegment:
+        matches = list(self._term_matches(text))
+        if not matches:
+            return ProtectedSegment(text)
+        # literal placeholders in the input are protected as themselves (index -1)
+        matches += [(m.start(), m.end(), -1) for m in PLACEHOLDER_PATTERN.finditer(text)]
+        matches.sort()
+
+        parts, replacements, terms = [], [], []
+        placeholders: Dict[object, int] = {}
+        position = 0
+        for start, end, index in matches:
+            if start < position:
+                continue
+            original = text[start:end]
+            slot_key = original if index < 0 else index
+            slot = placeholders.get(slot_key)
+            if slot is None:
+                slot = placeholders[slot_key] = len(replacements)
+                if index < 0:
+                    replacements.append(original)
+                else:
+                    record = self.records[index]
+                    replacements.append((record.translations or {}).get(self.target_language) or original)
+                    terms.append(record)
+            parts.append(text[position:start])
+            parts.append(PLACEHOLDER.format(slot))
+            position = end
+        parts.append(text[position:])
+        return ProtectedSegment("".join(parts), replacements, terms)
+
+
+EMPTY_GLOSSARY = CompiledGlossary([], "")
+
+
+class GlossaryTermProtector:
+    def __init__(self, glossary: GlossaryIndex):
+        self.glossary = glossary
+        self.rebuilds = 0
+        self.protected_terms = 0
+        self._compiled: Dict[Tuple[str, str], Tuple[int, CompiledGlossary]] = {}
+        self._building: Dict[Tuple[str, str], "asyncio.Future[CompiledGlossary]"] = {}
+
+    def _cached(self, key: Tuple[str, str]) -> Tuple[Optional[CompiledGlossary], int]:
+        """(cached automaton or None, current version); the automaton may be stale"""
+        cached = self._compiled.get(key)
+        return (cached[1] if cached else None), (cached[0] if cached else -1)
+
+    def _store(self, key: Tuple[str, str], version: int, compiled: CompiledGlossary) -> None:
+        if self._compiled.get(key, (-1,))[0] < version:
+            self._compiled[key] = (version, compiled)
+            self.rebuilds += 1
+
+    def compiled(self, source_language: str, target_language: str) -> CompiledGlossary:
+        """Current automaton, compiled in the calling thread if stale (offline use)"""
+        if source_language == target_language:
+            return EMPTY_GLOSSARY
+        key = (source_language, target_language)
+        version = self.glossary.language_version(source_language)
+        compiled, compiled_version = self._cached(key)
+        if compiled is None or compiled_version != version:
+            compiled = CompiledGlossary(self.glossary.records(source_language), target_language)
+            self._store(key, version, compiled)
+        return compiled
+
+    async def compiled_async(self, source_language: str, target_language: str) -> CompiledGlossary:
+        """
+        Automaton for the request path: a stale one is served while its
+        replacement compiles in the executor; only the first build is awaited
+        """
+        if source_language == target_language:
+            return EMPTY_GLOSSARY
+        key = (source_language, target_language)
+        version = self.glossary.language_version(source_language)
+        compiled, compiled_version = self._cached(key)
+        if compiled is not None and compiled_version == version:
+            return compiled
+
+        future = self._build(key, version)
+        if compiled is not None:
+            return compiled
+        return await asyncio.shield(future)
+
+    async def refresh(self, source_language: str) -> None:
+        """
+        Rebuild (in the executor) every stale automaton of source_language and wait
+        for it, so a worker's own glossary writes apply to its next request
+        """
+        for _ in range(3):  # a build already running may predate the latest change
+            version = self.glossary.language_version(source_language)
+            stale = [
+                key for key, (compiled_version, _) in list(self._compiled.items())
+                if key[0] == source_language and compiled_version != version
+            ]
+            if not stale:
+                return
+            futures = [asyncio.shield(self._build(key, version)) for key in stale]
+            await asyncio.gather(*futures, return_exceptions=True)
+
+    def _build(self, key: Tuple[str, str], version: int) -> "asyncio.Future[CompiledGlossary]":
+        future = self._building.get(key)
+        if future is None:
+            records = self.glossary.records(key[0])  # snapshot on the loop
+            future = asyncio.get_running_loop().run_in_executor(None, CompiledGlossary, records, key[1])
+            self._building[key] = future
+            future.add_done_callback(lambda done: self._built(key, version, done))
+        return future
+
+    def _built(self, key: Tuple[str, str], version: int, future: "asyncio.Future[CompiledGlossary]") -> None:
+        self._building.pop(key, None)
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.error(f"Error compiling glossary {key}: {future.exception()}")
+            return
+        self._store(key, version, future.result())
+
+    def protect(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        compiled: Optional[CompiledGlossary] = None,
+    ) -> ProtectedSegment:
+        if source_language == target_language or not text:
+            return ProtectedSegment(text)
+        if compiled is None:
+            compiled = self.compiled(source_language, target_language)
+        segment = compiled.protect(text)
+        self.protected_terms += len(segment.terms)
+        return segment
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "automata": len(self._compiled),
+            "rebuilds_total": self.rebuilds,
+            "protected_terms_total": self.protected_terms,
+        }
@@ -0,0 +1,182 @@
+"""
+Bulk import/export tests
+Run: pytest test_bulk_io.py -v
+"""
+
+import asyncio
+import json
+import uuid
+
+import pytest
+
+import main
+from bulk_io import BulkFormatError, RowEncoder, iter_csv, iter_ndjson
+from glossary_index import GlossaryIndex
+
+
+def collect(parser, *chunks):
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    async def scenario():
+        return [row async for row in parser(body())]
+
+    return asyncio.run(scenario())
+
+
+def ndjson(rows):
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode()
+
+
+class TestParsing:
+    def test_ndjson_split_across_chunks(self):
+        body = ndjson([{"term": "혈압"}, {"term": "맥박"}])
+
+        rows = collect(iter_ndjson, body[:5], body[5:17], body[17:])
+
+        assert [row.data for row in rows] == [{"term": "혈압"}, {"term": "맥박"}]
+
+    def test_ndjson_reports_bad_lines(self):
+        rows = collect(iter_ndjson, b'{"term": "a"}\n\nnot json\n[1]\n')
+
+        assert [(row.line, row.error is None) for row in rows] == [(1, True), (3, False), (4, False)]
+
+    def test_csv_translation_columns_and_multiline_fields(self):
+        body = 'term,definition,translations.en\n혈압,"blood\n""pressure""",blood pressure\n맥박,,\n'.encode()
+
+        rows = collect(iter_csv, body[:20], body[20:])
+
+        assert [(row.line, row.data) for row in rows] == [
+            (2, {"term": "혈압", "definition": 'blood\n"pressure"', "translations": {"en": "blood pressure"}}),
+            (4, {"term": "맥박"}),
+        ]
+
+    def test_csv_requires_header(self):
+        with pytest.raises(BulkFormatError):
+            collect(iter_csv, b"")
+
+    def test_csv_encoder_round_trips(self):
+        encoder = RowEncoder("csv", ["term", "category"], ["en", "ja"])
+        text = encoder.header() + encoder.encode([{"term": "혈압, 수축기", "category": None, "translations": {"ja": "血圧"}}])
+
+        rows = collect(iter_csv, text.encode())
+
+        assert rows[0].data == {"term": "혈압, 수축기", "translations": {"ja": "血圧"}}
+
+
+class TestBulkEndpoints:
+    def test_template_import_upserts_and_exports(self, client, auth_headers):
+        prefix = f"bulk-{uuid.uuid4().hex[:6]}"
+        rows = [{"template_key": f"{prefix}.{i}", "translations": {"ko": f"문장 {i}", "en": f"line {i}"}} for i in range(5)]
+        rows.append({"translations": {"ko": "키 없음"}})
+
+        first = client.post("/api/v1/templates:import", content=ndjson(rows), headers=auth_headers).json()["data"]
+        body = "template_key,category,translations.en\n" + f"{prefix}.0,greeting,hello\n"
+        second = client.post(
+            "/api/v1/templates:import", content=body.encode(),
+            headers={**auth_headers, "Content-Type": "text/csv"},
+        ).json()["data"]
+
+        assert (first["rows"], first["inserted"], first["skipped"]) == (6, 5, 1)
+        assert first["errors"] == [{"line": 6, "error": "template_key is required"}]
+        assert (second["inserted"], second["updated"]) == (0, 1)
+        assert client.get(f"/api/v1/templates/{prefix}.0", params={"language": "en"}).json()["data"]["text"] == "hello"
+
+        exported = client.get("/api/v1/templates:export", headers=auth_headers)
+        lines = [json.loads(line) for line in exported.text.splitlines()]
+        mine = {line["template_key"]: line for line in lines if line["template_key"].startswith(prefix)}
+
+        assert exported.headers["content-type"].startswith("application/x-ndjson")
+        assert len(mine) == 5
+        assert mine[f"{prefix}.0"] == {
+            "template_key": f"{prefix}.0", "category": "greeting", "is_active": True, "translations": {"en": "hello"},
+        }
+
+    def test_glossary_import_chunks_and_indexes(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(main, "BULK_IMPORT_CHUNK_SIZE", 2)
+        suffix = uuid.uuid4().hex[:6]
+        rows = [{"term": f"bulkterm{suffix}{i}", "language": "en", "definition": f"v1 {i}"} for i in range(5)]
+
+        first = client.post("/api/v1/glossary:import", content=ndjson(rows), headers=auth_headers).json()["data"]
+        rows[0]["definition"] = "v2"
+        second = client.post("/api/v1/glossary:import", content=ndjson(rows[:1]), headers=auth_headers).json()["data"]
+
+        assert (first["inserted"], first["chunks"]) == (5, 3)
+        assert second["updated"] == 1
+        entry = client.get(f"/api/v1/glossary/bulkterm{suffix}0", params={"language": "en"}).json()["data"]
+        assert entry["definition"] == "v2"
+
+        exported = client.get(
+            "/api/v1/glossary:export", params={"format": "csv", "language": "en"}, headers=auth_headers
+        ).text.splitlines()
+        assert exported[0].startswith("term,language,definition,category,translations.ko,translations.en")
+        assert ",".join([f"bulkterm{suffix}0", "en", "v2", ""] + [""] * len(main.SUPPORTED_LANGUAGES)) in exported
+
+    def test_partial_rows_keep_stored_fields(self, client, auth_headers):
+        term = f"partial{uuid.uuid4().hex[:6]}"
+        full = {"term": term, "language": "en", "definition": "d1", "category": "medical", "translations": {"ko": "부분"}}
+        client.post("/api/v1/glossary:import", content=ndjson([full]), headers=auth_headers)
+        key = f"partial-{uuid.uuid4().hex[:6]}"
+        client.post(
+            "/api/v1/templates:import",
+            content=ndjson([{"template_key": key, "category": "c", "is_active": False, "translations": {"ko": "가"}}]),
+            headers=auth_headers,
+        )
+
+        client.post(
+            "/api/v1/glossary:import", content=ndjson([{"term": term, "language": "en", "definition": "d2"}]),
+            headers=auth_headers,
+        )
+        client.post(
+            "/api/v1/templates:import", content=f"template_key,translations.en\n{key},A\n".encode(),
+            headers={**auth_headers, "Content-Type": "text/csv"},
+        )
+
+        entry = client.get(f"/api/v1/glossary/{term}", params={"language": "en"}).json()["data"]
+        assert (entry["definition"], entry["category"], entry["translations"]) == ("d2", "medical", {"ko": "부분"})
+        lines = client.get("/api/v1/templates:export", headers=auth_headers).text.splitlines()
+        template = next(json.loads(line) for line in lines if key in line)
+        assert (template["category"], template["is_active"], template["translations"]) == ("c", False, {"en": "A"})
+
+    def test_updates_reach_other_workers(self, client, auth_headers, monkeypatch):
+        """Another worker picks up updated entries through its updated_at refresh"""
+        term = f"worker{uuid.uuid4().hex[:6]}"
+        old = ndjson([{"term": term, "language": "en", "definition": "old"}])
+        client.post("/api/v1/glossary:import", content=old, headers=auth_headers)
+        other = GlossaryIndex()
+
+        async def refresh():
+            async with main.SessionLocal() as db:
+                return await main.refresh_glossary_index(db)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(main, "glossary_index", other)
+            client.portal.call(refresh)
+        new = ndjson([{"term": term, "language": "en", "definition": "new"}])
+        client.post("/api/v1/glossary:import", content=new, headers=auth_headers)
+        with monkeypatch.context() as patch:
+            patch.setattr(main, "glossary_index", other)
+            assert client.portal.call(refresh) >= 1
+
+        assert other.lookup(term, "en").definition == "new"
+
+    def test_csv_export_includes_unsupported_languages(self, client, auth_headers):
+        term = f"viet{uuid.uuid4().hex[:6]}"
+        client.post(
+            "/api/v1/glossary:import",
+            content=ndjson([{"term": term, "language": "en", "translations": {"vi": "huyết áp"}}]),
+            headers=auth_headers,
+        )
+
+        exported = client.get(
+            "/api/v1/glossary:export", params={"format": "csv", "language": "en"}, headers=auth_headers
+        ).text.splitlines()
+
+        assert "translations.vi" in exported[0].split(",")
+        assert any(line.startswith(term) and line.endswith("huyết áp") for line in exported)
+
+    def test_rejects_unknown_format(self, client, auth_headers):
+        response = client.post("/api/v1/glossary:import", params={"format": "xml"}, content=b"", headers=auth_headers)
+
+        assert response.status_code == 400
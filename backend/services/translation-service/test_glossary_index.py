@@ -0,0 +1,146 @@
+"""
+Glossary index tests
+Run: pytest test_glossary_index.py -v
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+import main
+from glossary_index import GlossaryIndex, GlossaryRecord
+
+
+def record(term, language="ko", definition=None):
+    return GlossaryRecord(id=str(uuid.uuid4()), term=term, language=language, definition=definition, category="medical")
+
+
+def build(*terms, language="ko"):
+    index = GlossaryIndex()
+    index.add_many(record(term, language) for term in terms)
+    return index
+
+
+class TestGlossaryIndex:
+    def test_ranks_exact_prefix_substring(self):
+        index = build("수축기 혈압", "혈압", "혈압계", "이완기 혈압", "혈당")
+
+        matches = index.search("혈압", "ko", fuzzy=False)
+
+        assert [m.record.term for m in matches] == ["혈압", "혈압계", "수축기 혈압", "이완기 혈압"]
+        assert [m.to_dict()["match"] for m in matches] == ["exact", "prefix", "substring", "substring"]
+
+    def test_case_insensitive_like_ilike(self):
+        index = build("Blood Pressure", "Heart Rate", language="en")
+
+        assert index.lookup("pressure", "en").term == "Blood Pressure"
+        assert index.lookup("BLOOD", "en").term == "Blood Pressure"
+        assert index.lookup("pressure", "ko") is None
+
+    def test_fuzzy_matches_misspellings(self):
+        index = build("hypertension", "hypotension", "hyperglycemia", "tachycardia", language="en")
+
+        assert index.lookup("hypertensoin", "en") is None
+        matches = index.search("hypertensoin", "en", limit=2)
+
+        assert matches[0].record.term == "hypertension"
+        assert matches[0].to_dict()["match"] == "fuzzy"
+        assert "tachycardia" not in [m.record.term for m in matches]
+
+    def test_incremental_add_and_top_k(self):
+        index = build(*(f"term {i:03d}" for i in range(100)), language="en")
+        index.add(record("term 000 extra", "en"))
+
+        assert len(index) == 101
+        assert [m.record.term for m in index.search("term 000", "en", limit=2)] == ["term 000", "term 000 extra"]
+        assert len(index.search("term", "en", limit=5)) == 5
+
+    def test_duplicate_ids_are_ignored(self):
+        index = GlossaryIndex()
+        entry = record("맥박")
+
+        assert index.add(entry) is True
+        assert index.add(entry) is False
+        assert len(index) == 1
+
+
+    def test_short_queries_use_bigrams_and_prefixes(self):
+        index = build("수축기 혈압", "혈압계", "혈당", "압박")
+
+        assert [m.record.term for m in index.search("혈압", "ko", fuzzy=False)] == ["혈압계", "수축기 혈압"]
+        assert [m.record.term for m in index.search("혈", "ko", fuzzy=False)] == ["혈당", "혈압계"]
+
+    def test_watermark_moves_only_with_refreshed_rows(self):
+        index = GlossaryIndex()
+        start = datetime(2026, 1, 1)
+        index.add(GlossaryRecord("local", "맥박", "ko", None, None, created_at=start + timedelta(hours=1)))
+        assert index.watermark is None
+
+        index.apply_refresh([GlossaryRecord("a", "혈압", "ko", None, None, created_at=start)])
+        # committed late by another worker, stamped before the watermark
+        late = GlossaryRecord("b", "혈당", "ko", None, None, created_at=start - timedelta(seconds=5))
+        assert index.apply_refresh([late]) == 1
+
+        assert index.watermark == start
+        assert index.lookup("혈당", "ko") == late
+
+
+class TestGlossaryEndpoints:
+    def test_refresh_rereads_overlap_window(self, client, auth_headers):
+        client.post("/api/v1/glossary", json={"term": f"기준{uuid.uuid4().hex[:6]}"}, headers=auth_headers)
+
+        async def scenario():
+            async with main.SessionLocal() as db:
+                await main.refresh_glossary_index(db)
+                late = main.GlossaryEntry(
+                    id=str(uuid.uuid4()), term=f"지연커밋{uuid.uuid4().hex[:6]}", language="ko",
+                    created_at=main.glossary_index.watermark - timedelta(seconds=5),
+                    updated_at=main.glossary_index.watermark - timedelta(seconds=5),
+                )
+                db.add(late)
+                await db.commit()
+                await main.refresh_glossary_index(db)
+                return late.term
+
+        term = client.portal.call(scenario)
+
+        assert main.glossary_index.lookup(term, "ko").term == term
+
+    def test_reads_come_from_index(self, client, auth_headers):
+        term = f"심방세동-{uuid.uuid4().hex[:6]}"
+        response = client.post(
+            "/api/v1/glossary",
+            json={"term": term, "language": "ko", "definition": "불규칙한 심장 박동", "category": "medical"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        executed = []
+
+        def record_statement(conn, cursor, statement, *args):
+            executed.append(statement)
+
+        event.listen(main.engine.sync_engine, "before_cursor_execute", record_statement)
+        try:
+            entry = client.get(f"/api/v1/glossary/{term[:5]}").json()["data"]
+            search = client.get("/api/v1/glossary", params={"q": term, "limit": 3}).json()
+        finally:
+            event.remove(main.engine.sync_engine, "before_cursor_execute", record_statement)
+
+        assert entry["term"].startswith("심방세동")
+        assert search["data"][0] == {
+            "term": term,
+            "definition": "불규칙한 심장 박동",
+            "language": "ko",
+            "category": "medical",
+            "translations": {},
+            "match": "exact",
+            "score": 1.0,
+        }
+        assert not [sql for sql in executed if "glossary_entries" in sql]
+
+    def test_missing_term(self, client):
+        body = client.get(f"/api/v1/glossary/{uuid.uuid4().hex}", params={"language": "fr"}).json()
+
+        assert body["data"] is None
@@ -0,0 +1,171 @@
+"""
+Language preference cache tests
+Run: pytest test_preference_cache.py -v
+"""
+
+import uuid
+
+import jwt
+import pytest
+from sqlalchemy import event
+
+import main
+from conftest import make_token
+from preference_cache import DEFAULT_PREFERENCES, PreferenceCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        if "language_preferences" in statement:
+            executed.append(statement)
+
+    event.listen(main.engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(main.engine.sync_engine, "before_cursor_execute", record)
+
+
+def new_user():
+    user_id = f"pref-{uuid.uuid4().hex[:8]}"
+    return user_id, {"Authorization": f"Bearer {make_token(user_id)}"}
+
+
+@pytest.fixture
+def admin_headers():
+    token = jwt.encode({"id": "pref-admin", "role": "admin"}, main.JWT_SECRET, algorithm=main.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestPreferenceCache:
+    def test_lookup_splits_hits_and_misses(self):
+        cache = PreferenceCache()
+        cache.fill(["a", "b"], {"a": {"preferred_language": "en", "secondary_language": "ko", "auto_translate": True}})
+
+        found, missing = cache.lookup(["a", "b", "c"])
+
+        assert found["a"]["preferred_language"] == "en"
+        assert found["b"] == DEFAULT_PREFERENCES
+        assert missing == ["c"]
+        assert (cache.stats.hits, cache.stats.negative_hits, cache.stats.misses) == (1, 1, 1)
+
+    def test_negative_entries_expire_sooner(self):
+        clock = FakeClock()
+        cache = PreferenceCache(ttl=300, negative_ttl=60, clock=clock)
+        cache.fill(["a", "b"], {"a": dict(DEFAULT_PREFERENCES)})
+
+        clock.now = 61
+
+        assert cache.lookup(["a", "b"])[1] == ["b"]
+
+    def test_write_through_replaces_negative_entry(self):
+        cache = PreferenceCache()
+        cache.fill(["a"], {})
+        cache.put("a", {"preferred_language": "ja", "secondary_language": "en", "auto_translate": False})
+
+        assert cache.lookup(["a"])[0]["a"]["preferred_language"] == "ja"
+
+    def test_stale_fill_keeps_newer_put(self):
+        cache = PreferenceCache()
+        generation = cache.generation
+        assert cache.lookup(["a", "b"])[1] == ["a", "b"]
+
+        cache.put("a", {"preferred_language": "ja", "secondary_language": "en", "auto_translate": False})
+        cache.fill(["a", "b"], {"a": dict(DEFAULT_PREFERENCES)}, generation)
+
+        found, missing = cache.lookup(["a", "b"])
+        assert found["a"]["preferred_language"] == "ja"
+        assert found["b"] == DEFAULT_PREFERENCES
+        assert cache.stats.stale_fills == 1
+
+    def test_stale_fill_after_invalidate_is_dropped(self):
+        cache = PreferenceCache()
+        generation = cache.generation
+        cache.lookup(["a"])
+
+        cache.invalidate("a")
+        cache.fill(["a"], {"a": dict(DEFAULT_PREFERENCES)}, generation)
+
+        assert cache.lookup(["a"])[1] == ["a"]
+        cache.fill(["a"], {}, cache.generation)
+        assert cache.lookup(["a"])[1] == []
+
+
+class TestPreferenceEndpoints:
+    def test_default_preferences_are_negatively_cached(self, client, statements):
+        user_id, headers = new_user()
+
+        first = client.get("/api/v1/language-preferences", headers=headers).json()
+        second = client.get("/api/v1/language-preferences", headers=headers).json()
+
+        assert first["data"] == second["data"] == DEFAULT_PREFERENCES
+        assert len(statements) == 1
+
+    def test_update_writes_through(self, client, statements):
+        user_id, headers = new_user()
+        client.get("/api/v1/language-preferences", headers=headers)
+
+        client.put(
+            "/api/v1/language-preferences",
+            json={"preferred_language": "en", "auto_translate": True},
+            headers=headers,
+        )
+        statements.clear()
+        data = client.get("/api/v1/language-preferences", headers=headers).json()["data"]
+
+        assert data == {"preferred_language": "en", "secondary_language": "en", "auto_translate": True}
+        assert statements == []
+
+    def test_batch_uses_one_in_query(self, client, admin_headers, statements):
+        users = [new_user() for _ in range(5)]
+        for user_id, headers in users[:2]:
+            client.put("/api/v1/language-preferences", json={"preferred_language": "ja"}, headers=headers)
+        main.preference_cache.clear()
+        statements.clear()
+        ids = [user_id for user_id, _ in users]
+
+        body = client.get(
+            "/api/v1/language-preferences:batch", params={"user_ids": ",".join(ids)}, headers=admin_headers
+        ).json()
+        again = client.get(
+            "/api/v1/language-preferences:batch", params={"user_ids": ",".join(ids)}, headers=admin_headers
+        ).json()
+
+        assert list(body["data"]) == ids
+        assert [body["data"][user_id]["preferred_language"] for user_id in ids] == ["ja", "ja", "ko", "ko", "ko"]
+        assert again == body
+        assert len(statements) == 1
+        assert " IN " in statements[0]
+
+    def test_batch_is_limited_to_caller_unless_admin(self, client, admin_headers):
+        user_id, headers = new_user()
+        other_id, _ = new_user()
+
+        own = client.get("/api/v1/language-preferences:batch", params={"user_ids": user_id}, headers=headers)
+        other = client.get(
+            "/api/v1/language-preferences:batch", params={"user_ids": f"{user_id},{other_id}"}, headers=headers
+        )
+        admin = client.get("/api/v1/language-preferences:batch", params={"user_ids": other_id}, headers=admin_headers)
+
+        assert own.status_code == 200
+        assert other.status_code == 403
+        assert admin.status_code == 200
+
+    def test_batch_limits(self, client, auth_headers, admin_headers):
+        too_many = ",".join(f"u{i}" for i in range(main.MAX_PREFERENCE_BATCH + 1))
+
+        assert client.get(
+            "/api/v1/language-preferences:batch", params={"user_ids": too_many}, headers=admin_headers
+        ).status_code == 400
+        assert client.get(
+            "/api/v1/language-preferences:batch", params={"user_ids": " , "}, headers=auth_headers
+        ).status_code == 400
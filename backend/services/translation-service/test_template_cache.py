@@ -0,0 +1,173 @@
+"""
+Template cache tests
+Run: pytest test_template_cache.py -v
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, update
+
+import main
+from template_cache import TemplateCache
+
+
+def unique_key(name):
+    return f"{name}.{uuid.uuid4().hex[:8]}"
+
+
+def create_template(client, auth_headers, key, translations, category="ui"):
+    response = client.post(
+        "/api/v1/templates",
+        json={"template_key": key, "translations": translations, "category": category},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed through the service engine"""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(main.engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(main.engine.sync_engine, "before_cursor_execute", record)
+
+
+class TestTemplateCache:
+    def test_apply_tracks_versions_and_inactive_rows(self):
+        cache = TemplateCache()
+        t0, t1 = datetime(2025, 1, 1), datetime(2025, 1, 2)
+
+        assert cache.apply([("home.title", {"ko": "홈", "en": "Home"}, "ui", True, t0)]) == 1
+        version = cache.version
+        assert cache.apply([("home.title", {"ko": "홈", "en": "Home"}, "ui", True, t0)]) == 0
+        assert cache.version == version
+        assert cache.text("home.title", "en") == "Home"
+        assert cache.text("home.title", "fr") == "홈"
+
+        cache.apply([("home.title", {"ko": "홈"}, "ui", False, t1)], advance_watermark=True)
+
+        assert cache.get("home.title") is None
+        assert cache.text("home.title", "en") is None
+        assert cache.watermark == t1
+        assert cache.version == version + 1
+
+    def test_local_writes_do_not_move_watermark(self):
+        cache = TemplateCache()
+        cache.apply([("a", {"ko": "가"}, None, True, datetime(2025, 1, 5))])
+
+        assert cache.watermark is None
+
+    def test_bulk_etag_follows_content(self):
+        cache = TemplateCache()
+        cache.apply([("a", {"ko": "가"}, None, True, None), ("b", {"ko": "나"}, None, True, None)])
+        data, missing, etag = cache.bulk(["a", "b", "c"], "ko")
+        other = TemplateCache()
+        other.apply([("b", {"ko": "나"}, None, True, None), ("a", {"ko": "가"}, None, True, None)])
+
+        assert data == {"a": {"text": "가", "category": None}, "b": {"text": "나", "category": None}}
+        assert missing == ["c"]
+        assert other.bulk(["a", "b", "c"], "ko")[2] == etag
+
+        cache.apply([("a", {"ko": "가가"}, None, True, None)])
+
+        assert cache.bulk(["a", "b", "c"], "ko")[2] != etag
+
+
+class TestTemplateEndpoints:
+    def test_refresh_picks_up_late_commits(self, client, auth_headers):
+        """A row stamped before the watermark but committed after it is still loaded"""
+        create_template(client, auth_headers, unique_key("seed"), {"ko": "씨앗"})
+        key = unique_key("late.commit")
+
+        async def scenario():
+            async with main.SessionLocal() as db:
+                await main.refresh_template_cache(db)
+                stamped = main.template_cache.watermark - timedelta(seconds=5)
+                db.add(main.TranslationTemplate(
+                    id=str(uuid.uuid4()), template_key=key, translations={"ko": "늦은 커밋"},
+                    is_active=True, created_at=stamped, updated_at=stamped,
+                ))
+                await db.commit()
+                await main.refresh_template_cache(db)
+
+        client.portal.call(scenario)
+
+        assert main.template_cache.text(key, "ko") == "늦은 커밋"
+
+    def test_reads_do_not_query_database(self, client, auth_headers, statements):
+        key = unique_key("screen.title")
+        create_template(client, auth_headers, key, {"ko": "제목", "en": "Title"})
+        statements.clear()
+
+        single = client.get(f"/api/v1/templates/{key}", params={"language": "en"})
+        bulk = client.get("/api/v1/templates", params={"keys": key, "language": "en"})
+
+        assert single.json()["data"]["text"] == "Title"
+        assert bulk.json()["data"][key]["text"] == "Title"
+        assert not [sql for sql in statements if "translation_templates" in sql]
+
+    def test_unknown_template_is_404(self, client):
+        response = client.get(f"/api/v1/templates/{unique_key('missing')}")
+
+        assert response.status_code == 404
+
+    def test_bulk_etag_and_not_modified(self, client, auth_headers):
+        first, second = unique_key("a"), unique_key("b")
+        create_template(client, auth_headers, first, {"ko": "하나", "en": "one"})
+        params = {"keys": f"{first},{second}", "language": "en"}
+
+        response = client.get("/api/v1/templates", params=params)
+        etag = response.headers["etag"]
+        assert response.json()["missing"] == [second]
+
+        cached = client.get("/api/v1/templates", params=params, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        create_template(client, auth_headers, second, {"ko": "둘", "en": "two"})
+        changed = client.get("/api/v1/templates", params=params, headers={"If-None-Match": etag})
+
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["data"][second]["text"] == "two"
+
+    def test_bulk_rejects_too_many_keys(self, client):
+        keys = ",".join(f"k{i}" for i in range(main.MAX_TEMPLATE_KEYS + 1))
+
+        assert client.get("/api/v1/templates", params={"keys": keys}).status_code == 400
+
+    def test_refresh_picks_up_changes_made_elsewhere(self, client, auth_headers):
+        key = unique_key("banner")
+        create_template(client, auth_headers, key, {"ko": "배너", "en": "Banner"})
+
+        async def edit_and_refresh():
+            async with main.SessionLocal() as db:
+                await db.execute(
+                    update(main.TranslationTemplate)
+                    .where(main.TranslationTemplate.template_key == key)
+                    .values(translations={"ko": "배너", "en": "New banner"})
+                )
+                await db.commit()
+                return await main.refresh_template_cache(db)
+
+        assert client.portal.call(edit_and_refresh) == 1
+        assert client.get(f"/api/v1/templates/{key}", params={"language": "en"}).json()["data"]["text"] == "New banner"
+
+        async def deactivate_and_refresh():
+            async with main.SessionLocal() as db:
+                await db.execute(
+                    update(main.TranslationTemplate)
+                    .where(main.TranslationTemplate.template_key == key)
+                    .values(is_active=False)
+                )
+                await db.commit()
+                await main.refresh_template_cache(db)
+
+        client.portal.call(deactivate_and_refresh)
+        assert client.get(f"/api/v1/templates/{key}").status_code == 404
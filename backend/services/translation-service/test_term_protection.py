@@ -0,0 +1,178 @@
+"""
+Glossary term protection tests
+Run: pytest test_term_protection.py -v
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+import main
+from glossary_index import GlossaryIndex, GlossaryRecord
+from term_protection import AhoCorasick, GlossaryTermProtector
+
+
+def record(term, language="ko", translations=None):
+    return GlossaryRecord(
+        id=str(uuid.uuid4()), term=term, language=language, definition=None, category="medical",
+        translations=translations,
+    )
+
+
+@pytest.fixture
+def protector():
+    glossary = GlossaryIndex()
+    glossary.add_many([
+        record("혈압", translations={"en": "blood pressure"}),
+        record("수축기 혈압", translations={"en": "systolic blood pressure"}),
+        record("당화혈색소", translations={"en": "HbA1c"}),
+        record("인슐린"),
+        record("BP", language="en", translations={"ko": "혈압"}),
+    ])
+    return GlossaryTermProtector(glossary)
+
+
+class TestAhoCorasick:
+    def test_reports_every_occurrence(self):
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+
+        assert sorted(automaton.iter_all("ushers")) == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+
+    def test_find_prefers_leftmost_longest(self):
+        automaton = AhoCorasick(["혈압", "수축기 혈압", "압"])
+
+        assert automaton.find("수축기 혈압과 혈압") == [(0, 6, 1), (8, 10, 0)]
+
+
+class TestTermProtection:
+    def test_substitutes_and_protects_terms(self, protector):
+        segment = protector.protect("수축기 혈압과 당화혈색소, 인슐린 용량을 확인하세요. 혈압은 매일.", "ko", "en")
+
+        assert segment.text == "[[G0]]과 [[G1]], [[G2]] 용량을 확인하세요. [[G3]]은 매일."
+        assert segment.replacements == ["systolic blood pressure", "HbA1c", "인슐린", "blood pressure"]
+        assert segment.restore("<" + segment.text + ">") == (
+            "<systolic blood pressure과 HbA1c, 인슐린 용량을 확인하세요. blood pressure은 매일.>"
+        )
+
+    def test_repeated_term_shares_placeholder(self, protector):
+        segment = protector.protect("혈압, 혈압, 혈압", "ko", "en")
+
+        assert segment.text == "[[G0]], [[G0]], [[G0]]"
+        assert len(segment.terms) == 1
+
+    def test_latin_terms_respect_word_boundaries(self, protector):
+        segment = protector.protect("Check bp and BPM, then BP.", "en", "ko")
+
+        assert segment.text == "Check [[G0]] and BPM, then [[G0]]."
+        assert segment.replacements == ["혈압"]
+
+    def test_rebuilds_only_when_glossary_changes(self, protector):
+        protector.protect("혈압", "ko", "en")
+        protector.protect("혈압", "ko", "en")
+        assert protector.rebuilds == 1
+
+        protector.glossary.add(record("맥박", translations={"en": "pulse"}))
+        segment = protector.protect("맥박", "ko", "en")
+
+        assert protector.rebuilds == 2
+        assert segment.restore(segment.text) == "pulse"
+
+    def test_literal_placeholders_in_input_survive(self, protector):
+        segment = protector.protect("혈압 [[G0]] 기록", "ko", "en")
+
+        assert segment.text == "[[G0]] [[G1]] 기록"
+        assert segment.restore(segment.text) == "blood pressure [[G0]] 기록"
+        assert len(segment.terms) == 1
+
+    def test_other_languages_do_not_trigger_rebuilds(self, protector):
+        before = protector.compiled("ko", "en")
+        protector.glossary.add(record("pulse", language="en"))
+
+        assert protector.compiled("ko", "en") is before
+        assert protector.rebuilds == 1
+
+    def test_digest_tracks_renderings(self, protector):
+        digest = protector.compiled("ko", "en").digest
+        entry = protector.glossary.records("ko")[0]
+        protector.glossary.replace(GlossaryRecord(**{**entry.__dict__, "translations": {"en": "BP"}}))
+
+        assert protector.compiled("ko", "en").digest != digest
+        # content digest, so every worker agrees on it
+        other_worker = GlossaryTermProtector(protector.glossary)
+        assert other_worker.compiled("ko", "en").digest == protector.compiled("ko", "en").digest
+        assert protector.compiled("ko", "ko").digest == ""
+
+    def test_async_rebuild_serves_previous_automaton(self, protector):
+        async def scenario():
+            first = await protector.compiled_async("ko", "en")
+            protector.glossary.add(record("맥박", translations={"en": "pulse"}))
+            stale = await protector.compiled_async("ko", "en")
+            await asyncio.sleep(0.05)
+            while protector._building:
+                await asyncio.sleep(0.01)
+            fresh = await protector.compiled_async("ko", "en")
+            return first, stale, fresh
+
+        first, stale, fresh = asyncio.run(scenario())
+
+        assert stale is first
+        assert fresh is not first
+        assert fresh.protect("맥박").restore("[[G0]]") == "pulse"
+
+    def test_same_language_is_untouched(self, protector):
+        assert protector.protect("혈압", "ko", "ko").text == "혈압"
+
+
+class TestTranslateWithGlossary:
+    def test_translate_endpoint_applies_glossary(self, client, auth_headers, monkeypatch):
+        term = f"심근경색{uuid.uuid4().hex[:4]}"
+        client.post(
+            "/api/v1/glossary",
+            json={"term": term, "language": "ko", "translations": {"en": "myocardial infarction"}},
+            headers=auth_headers,
+        )
+        seen = []
+
+        async def backend(text, source_language, target_language, context=None):
+            seen.append(text)
+            return f"EN({text})"
+
+        monkeypatch.setattr(main, "perform_translation", backend)
+        main.translation_memory.clear()
+
+        response = client.post(
+            "/api/v1/translate",
+            json={"text": f"{term} 의심 증상", "source_language": "ko", "target_language": "en"},
+            headers=auth_headers,
+        )
+
+        assert seen == ["[[G0]] 의심 증상"]
+        assert response.json()["data"]["translated_text"] == "EN(myocardial infarction 의심 증상)"
+
+    def test_glossary_change_is_not_served_from_memory(self, client, auth_headers, monkeypatch):
+        term = f"협심증{uuid.uuid4().hex[:4]}"
+        client.post(
+            "/api/v1/glossary",
+            json={"term": term, "language": "ko", "translations": {"en": "angina"}},
+            headers=auth_headers,
+        )
+
+        async def backend(text, source_language, target_language, context=None):
+            return text
+
+        monkeypatch.setattr(main, "perform_translation", backend)
+        payload = {"text": f"{term} 기록", "source_language": "ko", "target_language": "en"}
+        assert client.post("/api/v1/translate", json=payload, headers=auth_headers).json()["data"][
+            "translated_text"
+        ] == "angina 기록"
+
+        entry = main.glossary_index.lookup(term, "ko")
+        main.glossary_index.replace(GlossaryRecord(**{**entry.__dict__, "translations": {"en": "angina pectoris"}}))
+        # the first request after the change may still be served by the previous automaton
+        results = [
+            client.post("/api/v1/translate", json=payload, headers=auth_headers).json()["data"]["translated_text"]
+            for _ in range(3)
+        ]
+
+        assert results[-1] == "angina pectoris 기록"
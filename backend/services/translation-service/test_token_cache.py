@@ -0,0 +1,189 @@
+"""
+Verified-token cache tests
+Run: pytest test_token_cache.py -v
+"""
+
+import time
+import uuid
+
+import jwt
+import pytest
+
+import main
+from token_cache import TokenRevokedError, TokenVerificationCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CountingDecoder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        return jwt.decode(token, "secret", algorithms=["HS256"], options={"verify_exp": False})
+
+
+def token(**claims):
+    return jwt.encode({"id": "user-1", **claims}, "secret", algorithm="HS256")
+
+
+class TestTokenVerificationCache:
+    def test_repeated_token_is_verified_once(self):
+        cache, decode = TokenVerificationCache(), CountingDecoder()
+        bearer = token()
+
+        payloads = [cache.verify(bearer, decode) for _ in range(5)]
+
+        assert decode.calls == 1
+        assert payloads[-1] == {"id": "user-1"}
+        assert cache.metrics()["hits_total"] == 4
+
+    def test_cached_entry_ends_at_exp(self):
+        clock = FakeClock()
+        cache, decode = TokenVerificationCache(clock=clock), CountingDecoder()
+        bearer = token(exp=int(clock.now) + 30)
+
+        cache.verify(bearer, decode)
+        clock.now += 29
+        cache.verify(bearer, decode)
+        assert decode.calls == 1
+
+        clock.now += 2
+        cache.verify(bearer, decode)
+        assert decode.calls == 2
+        assert cache.stats.expired == 1
+
+    def test_tokens_without_exp_are_reverified_after_max_ttl(self):
+        clock = FakeClock()
+        cache, decode = TokenVerificationCache(max_ttl=60, clock=clock), CountingDecoder()
+
+        cache.verify(token(), decode)
+        clock.now += 61
+        cache.verify(token(), decode)
+
+        assert decode.calls == 2
+
+    def test_invalid_tokens_are_not_cached(self):
+        cache = TokenVerificationCache()
+        bad = token() + "x"
+
+        for _ in range(2):
+            with pytest.raises(jwt.InvalidSignatureError):
+                cache.verify(bad, CountingDecoder())
+
+        assert len(cache) == 0
+
+    def test_revocation_by_token_and_jti(self):
+        clock = FakeClock()
+        cache, decode = TokenVerificationCache(clock=clock), CountingDecoder()
+        first, second = token(jti="a"), token(jti="b")
+        cache.verify(first, decode)
+        cache.verify(second, decode)
+
+        cache.revoke(token=first, expires_at=clock.now + 10)
+        cache.revoke(jti="b")
+
+        for bearer in (first, second):
+            with pytest.raises(TokenRevokedError):
+                cache.verify(bearer, decode)
+        assert cache.stats.revoked_rejections == 2
+
+        # digest revocations lapse once the token would have expired anyway
+        clock.now += 11
+        cache.revoke(jti="c")
+        assert cache.verify(first, decode)["jti"] == "a"
+
+    def test_revocations_without_expiry_are_capped(self):
+        clock = FakeClock()
+        cache = TokenVerificationCache(max_revocation_ttl=60, clock=clock)
+        bearer = token(jti="a")
+
+        cache.revoke(jti="a")
+        cache.revoke(token=bearer, expires_at=clock.now + 3600)
+        with pytest.raises(TokenRevokedError):
+            cache.verify(bearer, CountingDecoder())
+
+        clock.now += 61
+        cache.revoke(jti="b")
+        assert cache.metrics()["revocations"] == 1
+        assert cache.verify(bearer, CountingDecoder())["jti"] == "a"
+
+    def test_bounded(self):
+        cache = TokenVerificationCache(max_entries=2)
+
+        for i in range(3):
+            cache.verify(token(n=i), CountingDecoder())
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+
+
+class TestVerifyToken:
+    def test_revoke_endpoint_rejects_token_afterwards(self, client):
+        bearer = jwt.encode(
+            {"id": "user-revoke", "jti": str(uuid.uuid4()), "exp": int(time.time()) + 600},
+            main.JWT_SECRET,
+            algorithm=main.JWT_ALGORITHM,
+        )
+        headers = {"Authorization": f"Bearer {bearer}"}
+        assert client.get("/api/v1/translations", headers=headers).status_code == 200
+
+        assert client.post("/api/v1/auth/revoke", json={}, headers=headers).status_code == 200
+        response = client.get("/api/v1/translations", headers=headers)
+
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has been revoked"
+
+    def test_expired_token_is_rejected(self, client):
+        bearer = jwt.encode({"id": "user-old", "exp": int(time.time()) - 1}, main.JWT_SECRET, algorithm="HS256")
+
+        response = client.get("/api/v1/translations", headers={"Authorization": f"Bearer {bearer}"})
+
+        assert response.status_code == 403
+
+    def test_metrics_report_savings(self, client, auth_headers):
+        for _ in range(3):
+            client.get("/api/v1/translations", headers=auth_headers)
+
+        metrics = client.get("/metrics").text
+
+        assert "jwt_cache_hits_total" in metrics
+        assert "jwt_cache_saved_verification_seconds_total" in metrics
+
+    def test_cannot_revoke_another_users_token(self, client):
+        def bearer(user_id, **claims):
+            claims = {"id": user_id, "jti": str(uuid.uuid4()), "exp": int(time.time()) + 600, **claims}
+            return jwt.encode(claims, main.JWT_SECRET, algorithm=main.JWT_ALGORITHM)
+
+        victim, attacker, admin = bearer("user-victim"), bearer("user-attacker"), bearer("user-admin", role="admin")
+        victim_jti = jwt.decode(victim, options={"verify_signature": False})["jti"]
+        headers = {"Authorization": f"Bearer {attacker}"}
+
+        assert client.post("/api/v1/auth/revoke", json={"token": victim}, headers=headers).status_code == 403
+        assert client.post("/api/v1/auth/revoke", json={"jti": victim_jti}, headers=headers).status_code == 403
+        assert client.post("/api/v1/auth/revoke", json={"token": "garbage"}, headers=headers).status_code == 400
+        victim_headers = {"Authorization": f"Bearer {victim}"}
+        assert client.get("/api/v1/translations", headers=victim_headers).status_code == 200
+
+        admin_headers = {"Authorization": f"Bearer {admin}"}
+        assert client.post("/api/v1/auth/revoke", json={"token": victim}, headers=admin_headers).status_code == 200
+        assert client.get("/api/v1/translations", headers=victim_headers).status_code == 401
+
+    def test_revocation_expiry_comes_from_token(self, client):
+        bearer = jwt.encode(
+            {"id": "user-exp", "jti": str(uuid.uuid4()), "exp": int(time.time()) + 600},
+            main.JWT_SECRET,
+            algorithm=main.JWT_ALGORITHM,
+        )
+        headers = {"Authorization": f"Bearer {bearer}"}
+
+        client.post("/api/v1/auth/revoke", json={"expires_at": 1e12}, headers=headers)
+
+        assert max(main.token_cache._revoked_digests.values()) <= time.time() + 600
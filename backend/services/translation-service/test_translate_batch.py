@@ -0,0 +1,69 @@
+"""
+Batch translation endpoint tests
+Run: pytest test_translate_batch.py -v
+"""
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def fresh_memory():
+    main.translation_memory.clear()
+    yield
+
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, text, source_language, target_language, context=None):
+        self.calls.append((text, context))
+        return f"<{target_language}:{context or ''}> {text}"
+
+
+class TestTranslateBatch:
+    def test_dedupes_and_preserves_order(self, client, auth_headers, monkeypatch):
+        backend = CountingBackend()
+        monkeypatch.setattr(main, "perform_translation", backend)
+        segments = ["혈압 측정", "식후 산책", "혈압 측정", {"text": "혈압 측정", "context": "report"}, "식후 산책"]
+
+        response = client.post(
+            "/api/v1/translate:batch",
+            json={"segments": segments, "source_language": "ko", "target_language": "en"},
+            headers=auth_headers,
+        )
+
+        body = response.json()
+        assert response.status_code == 200
+        assert [item["source_text"] for item in body["data"]] == [
+            "혈압 측정", "식후 산책", "혈압 측정", "혈압 측정", "식후 산책",
+        ]
+        assert body["data"][3]["translated_text"] == "<en:report> 혈압 측정"
+        assert body["unique_segments"] == 3
+        assert len(backend.calls) == 3
+        assert len({item["id"] for item in body["data"]}) == 5
+
+    def test_rows_persisted_in_history(self, client, monkeypatch):
+        monkeypatch.setattr(main, "perform_translation", CountingBackend())
+        from conftest import make_token
+        headers = {"Authorization": f"Bearer {make_token('batch-history-user')}"}
+
+        client.post("/api/v1/translate:batch", json={"segments": ["a", "b", "a"]}, headers=headers)
+        history = client.get("/api/v1/translations", headers=headers).json()
+
+        assert history["count"] == 3
+
+    @pytest.mark.parametrize("body", [{}, {"segments": []}, {"segments": ["ok", ""]}])
+    def test_rejects_invalid_segments(self, client, auth_headers, body):
+        response = client.post("/api/v1/translate:batch", json=body, headers=auth_headers)
+
+        assert response.status_code == 400
+
+    def test_rejects_oversized_batch(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(main, "MAX_BATCH_SEGMENTS", 2)
+
+        response = client.post("/api/v1/translate:batch", json={"segments": ["a", "b", "c"]}, headers=auth_headers)
+
+        assert response.status_code == 400
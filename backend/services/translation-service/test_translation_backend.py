@@ -0,0 +1,160 @@
+"""
+Translation backend tests
+Run: pytest test_translation_backend.py -v
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from translation_backend import (
+    FakeLatencyProvider,
+    HttpTranslationProvider,
+    MockProvider,
+    TranslationBackend,
+    TranslationProvider,
+    TranslationProviderError,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FlakyProvider(MockProvider):
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.calls = 0
+
+    async def translate_batch(self, texts, source_language, target_language, context=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TranslationProviderError("temporary outage")
+        return await super().translate_batch(texts, source_language, target_language, context)
+
+
+class TestTranslationBackend:
+    def test_mock_provider_matches_placeholder_output(self):
+        backend = TranslationBackend(MockProvider(), batch_window=0)
+
+        async def scenario():
+            return [
+                await backend.translate("안녕하세요", "ko", "en"),
+                await backend.translate("hello", "en", "ko"),
+                await backend.translate("hola", "es", "fr"),
+                await backend.translate("같음", "ko", "ko"),
+            ]
+
+        assert run(scenario()) == ["[EN] 안녕하세요", "[KO] hello", "hola", "같음"]
+
+    def test_batches_and_coalesces_concurrent_segments(self):
+        provider = FakeLatencyProvider(latency=0.01, max_batch_size=8)
+        backend = TranslationBackend(provider, batch_window=0.005)
+        texts = [f"문장 {i % 10}" for i in range(30)]
+
+        async def scenario():
+            return await asyncio.gather(*(backend.translate(text, "ko", "en") for text in texts))
+
+        results = run(scenario())
+
+        assert results == [f"[EN] {text}" for text in texts]
+        assert backend.stats.coalesced == 20
+        assert provider.segments == 10
+        assert provider.calls == 2  # 8 + 2 unique segments
+
+    def test_per_provider_concurrency_limit(self):
+        provider = FakeLatencyProvider(latency=0.01, max_concurrency=3, max_batch_size=1)
+        backend = TranslationBackend(provider, batch_window=0)
+
+        async def scenario():
+            await asyncio.gather(*(backend.translate(f"t{i}", "ko", "en") for i in range(20)))
+
+        run(scenario())
+
+        assert provider.calls == 20
+        assert provider.peak_in_flight == 3
+
+    def test_retry_falls_back_to_next_provider(self):
+        primary, fallback = FlakyProvider(failures=1), MockProvider()
+        fallback.name = "fallback"
+        backend = TranslationBackend(primary, fallbacks=[fallback], batch_window=0, retry_backoff=0)
+
+        assert run(backend.translate("혈압", "ko", "en")) == "[EN] 혈압"
+        assert backend.stats.retries == 1
+        assert primary.calls == 1
+
+    def test_failure_reaches_every_waiter(self):
+        backend = TranslationBackend(FlakyProvider(failures=10), batch_window=0.001, max_attempts=2, retry_backoff=0)
+
+        async def scenario():
+            return await asyncio.gather(
+                backend.translate("a", "ko", "en"), backend.translate("a", "ko", "en"), return_exceptions=True
+            )
+
+        results = run(scenario())
+
+        assert all(isinstance(result, TranslationProviderError) for result in results)
+        assert backend.stats.failures == 1
+
+    def test_rejects_zero_attempts(self):
+        with pytest.raises(ValueError):
+            TranslationBackend(MockProvider(), max_attempts=0)
+
+    def test_provider_must_implement_translate_batch(self):
+        class Incomplete(TranslationProvider):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_hedged_request_cuts_tail_latency(self):
+        slow = FakeLatencyProvider(latency=0.5, max_batch_size=1)
+        fast = FakeLatencyProvider(latency=0.01, max_batch_size=1)
+        fast.name = "secondary"
+        backend = TranslationBackend(slow, fallbacks=[fast], batch_window=0, hedge_after=0.02)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            result = await backend.translate("맥박", "ko", "en")
+            return result, loop.time() - start
+
+        result, elapsed = run(scenario())
+
+        assert result == "[EN] 맥박"
+        assert elapsed < 0.3
+        assert backend.stats.hedges == 1
+        assert backend.stats.hedge_wins == 1
+
+
+class TestHttpTranslationProvider:
+    def test_posts_batch_over_shared_client(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"translations": [{"text": "blood pressure"}, "pulse"]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        provider = HttpTranslationProvider("remote", "https://mt.example/translate", api_key="k", client=client)
+
+        async def scenario():
+            try:
+                return await provider.translate_batch(["혈압", "맥박"], "ko", "en")
+            finally:
+                await provider.aclose()
+
+        assert run(scenario()) == ["blood pressure", "pulse"]
+        assert requests[0].headers["authorization"] == "Bearer k"
+        assert requests[0].read() == (
+            b'{"q": ["\\ud608\\uc555", "\\ub9e5\\ubc15"], "source": "ko", "target": "en", "context": null}'
+        )
+
+    def test_rejects_mismatched_response(self):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        provider = HttpTranslationProvider("remote", "https://mt.example/translate", client=client)
+
+        with pytest.raises(TranslationProviderError):
+            run(provider.translate_batch(["혈압"], "ko", "en"))
@@ -0,0 +1,113 @@
+"""
+Translation history pagination tests
+Run: pytest test_translation_history.py -v
+"""
+
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from conftest import make_token
+
+
+def seed_history(client, user_id, count, same_timestamp_every=3):
+    """Insert count rows; every few rows share a created_at to exercise the id tie-break"""
+    base = datetime(2025, 3, 1)
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "source_language": "ko",
+            "target_language": "en",
+            "source_text": f"원문 {i}",
+            "translated_text": f"text {i}",
+            "created_at": base + timedelta(minutes=i // same_timestamp_every),
+        }
+        for i in range(count)
+    ]
+
+    async def insert_rows():
+        async with main.SessionLocal() as db:
+            await db.execute(main.insert(main.Translation), rows)
+            await db.commit()
+
+    client.portal.call(insert_rows)
+    return rows
+
+
+def newest_first(rows):
+    return sorted(rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)
+
+
+@pytest.fixture
+def history_user():
+    user_id = f"history-{uuid.uuid4()}"
+    return user_id, {"Authorization": f"Bearer {make_token(user_id)}"}
+
+
+class TestTranslationHistory:
+    def test_cursor_pages_cover_history_once(self, client, history_user):
+        user_id, headers = history_user
+        rows = seed_history(client, user_id, 23)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+            body = client.get("/api/v1/translations", params=params, headers=headers).json()
+            seen.extend(item["id"] for item in body["data"])
+            cursor = body["next_cursor"]
+            if not body["has_more"]:
+                assert cursor is None
+                break
+
+        assert seen == [row["id"] for row in newest_first(rows)]
+
+    def test_offset_still_supported(self, client, history_user):
+        user_id, headers = history_user
+        rows = newest_first(seed_history(client, user_id, 8))
+
+        body = client.get("/api/v1/translations", params={"limit": 3, "offset": 3}, headers=headers).json()
+
+        assert [item["id"] for item in body["data"]] == [row["id"] for row in rows[3:6]]
+
+    def test_summary_view_skips_source_text(self, client, history_user):
+        user_id, headers = history_user
+        seed_history(client, user_id, 2)
+
+        full = client.get("/api/v1/translations", headers=headers).json()["data"][0]
+        summary = client.get("/api/v1/translations", params={"view": "summary"}, headers=headers).json()["data"][0]
+
+        assert full["source_text"].startswith("원문")
+        assert "source_text" not in summary
+        assert {key: value for key, value in full.items() if key != "source_text"} == summary
+
+    @pytest.mark.parametrize("params", [{"cursor": "not-a-cursor"}, {"view": "everything"}])
+    def test_rejects_bad_parameters(self, client, auth_headers, params):
+        response = client.get("/api/v1/translations", params=params, headers=auth_headers)
+
+        assert response.status_code == 400
+
+    def test_cursor_round_trip(self):
+        created_at = datetime(2025, 3, 1, 12, 30, 15, 123456)
+
+        cursor = main.encode_history_cursor(created_at, "abc")
+
+        assert "=" not in cursor
+        assert main.decode_history_cursor(cursor) == (created_at, "abc")
+
+    def test_page_query_uses_composite_index(self, client):
+        path = main.DATABASE_URL.split("///", 1)[1]
+        with sqlite3.connect(path) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM translations WHERE user_id = ? "
+                "AND (created_at, id) < (?, ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT 51",
+                ("u", "2025-01-01", "x"),
+            ).fetchall()
+
+        details = " ".join(row[-1] for row in plan)
+        assert "ix_translations_user_created_id" in details
+        assert "TEMP B-TREE" not in details
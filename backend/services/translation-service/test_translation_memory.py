@@ -0,0 +1,238 @@
+"""
+Translation memory tests
+Run: pytest test_translation_memory.py -v
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from translation_memory import SqliteMemoryStore, TranslationMemory, memory_key
+
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, text, source_language, target_language, context=None):
+        self.calls += 1
+        return f"[{target_language.upper()}] {text}"
+
+
+def translate(memory, backend, text, context=None):
+    return asyncio.run(memory.translate(text, "ko", "en", context, backend))
+
+
+class TestTranslationMemory:
+    def test_repeated_segment_skips_backend(self):
+        memory = TranslationMemory()
+        backend = CountingBackend()
+
+        first = translate(memory, backend, "혈당이 정상입니다")
+        second = translate(memory, backend, "  혈당이   정상입니다 ")
+
+        assert first == second == "[EN] 혈당이 정상입니다"
+        assert backend.calls == 1
+        assert memory.metrics()["saved_backend_calls_total"] == 1
+        assert memory.stats.hit_ratio == 0.5
+
+    def test_context_is_part_of_key(self):
+        memory = TranslationMemory()
+        backend = CountingBackend()
+
+        translate(memory, backend, "투약", context="medication")
+        translate(memory, backend, "투약", context="schedule")
+
+        assert backend.calls == 2
+        assert memory_key("a", "ko", "en", "x") != memory_key("a", "ko", "en", None)
+
+    def test_glossary_version_is_part_of_key(self):
+        """A glossary change makes earlier renderings unreachable"""
+        memory = TranslationMemory()
+        memory.put("혈압 측정", "ko", "en", None, "BP check", glossary_version="v1")
+
+        assert memory.get("혈압 측정", "ko", "en", glossary_version="v1") == "BP check"
+        assert memory.get("혈압 측정", "ko", "en", glossary_version="v2") is None
+
+    def test_store_without_glossary_version_is_rebuilt(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "memory.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE translation_memory (source_text TEXT, source_language TEXT, target_language TEXT, "
+            "context_hash TEXT, translated_text TEXT, is_approved INTEGER, updated_at REAL, "
+            "PRIMARY KEY (source_text, source_language, target_language, context_hash))"
+        )
+        conn.execute("INSERT INTO translation_memory VALUES ('a', 'ko', 'en', '', 'A', 0, 0)")
+        conn.commit()
+        conn.close()
+
+        store = SqliteMemoryStore(path)
+
+        assert len(store) == 0
+        store.put(memory_key("a", "ko", "en", None, "v1"), "A")
+        store.flush()
+        assert store.get(memory_key("a", "ko", "en", None, "v1")) == ("A", False)
+
+    def test_lru_eviction(self):
+        memory = TranslationMemory(max_entries=2)
+        memory.put("a", "ko", "en", None, "A")
+        memory.put("b", "ko", "en", None, "B")
+        memory.get("a", "ko", "en")
+        memory.put("c", "ko", "en", None, "C")
+
+        assert memory.get("b", "ko", "en") is None
+        assert memory.get("a", "ko", "en") == "A"
+        assert memory.stats.evictions == 1
+
+    def test_shared_store_tier(self, tmp_path):
+        path = str(tmp_path / "memory.db")
+        writer = TranslationMemory(store=SqliteMemoryStore(path))
+        reader = TranslationMemory(store=SqliteMemoryStore(path))
+
+        writer.put("운동", "ko", "en", None, "exercise")
+        writer.store.flush()
+
+        assert reader.get("운동", "ko", "en") == "exercise"
+        assert reader.stats.store_hits == 1
+        assert reader.get("운동", "ko", "en") == "exercise"
+        assert reader.stats.lru_hits == 1
+
+    def test_reconcile_prefers_approved_rows(self, tmp_path):
+        memory = TranslationMemory(store=SqliteMemoryStore(str(tmp_path / "memory.db")))
+        start = datetime(2026, 1, 1)
+        rows = [
+            ("수면", "ko", "en", None, None, "sleep (reviewed)", True, start),
+            ("수면", "ko", "en", None, None, "[EN] 수면", False, start + timedelta(seconds=1)),
+        ]
+
+        assert memory.reconcile(rows) == 2
+        memory.store.flush()
+        assert memory.get("수면", "ko", "en") == "sleep (reviewed)"
+        assert memory.store.get(memory_key("수면", "ko", "en")) == ("sleep (reviewed)", True)
+        assert memory.watermark == start + timedelta(seconds=1)
+
+    def test_store_hit_keeps_approved_pin(self, tmp_path):
+        path = str(tmp_path / "memory.db")
+        writer = TranslationMemory(store=SqliteMemoryStore(path))
+        writer.reconcile([("수면", "ko", "en", None, None, "sleep (reviewed)", True, datetime(2026, 1, 1))])
+        writer.store.flush()
+        reader = TranslationMemory(store=SqliteMemoryStore(path))
+
+        assert reader.get("수면", "ko", "en") == "sleep (reviewed)"
+        reader.put("수면", "ko", "en", None, "[EN] 수면")
+
+        assert reader.get("수면", "ko", "en") == "sleep (reviewed)"
+
+    def test_translate_reads_store_off_the_event_loop(self, tmp_path):
+        import threading
+        path = str(tmp_path / "memory.db")
+        writer = TranslationMemory(store=SqliteMemoryStore(path))
+        writer.put("운동", "ko", "en", None, "exercise")
+        writer.store.flush()
+        reader = TranslationMemory(store=SqliteMemoryStore(path))
+        read_threads = []
+        store_get = reader.store.get
+
+        def get(key):
+            read_threads.append(threading.current_thread())
+            return store_get(key)
+
+        reader.store.get = get
+        backend = CountingBackend()
+
+        assert translate(reader, backend, "운동") == "exercise"
+        assert backend.calls == 0
+        assert read_threads and threading.main_thread() not in read_threads
+
+    def test_writes_are_committed_behind_the_caller(self, tmp_path):
+        store = SqliteMemoryStore(str(tmp_path / "memory.db"))
+        store.put_many((memory_key(f"s{i}", "ko", "en"), f"S{i}", False) for i in range(100))
+
+        store.close()
+
+        assert len(SqliteMemoryStore(store.path)) == 100
+
+
+class TestTranslateEndpoint:
+    @pytest.fixture(autouse=True)
+    def fresh_memory(self):
+        import main
+        main.translation_memory.clear()
+        yield
+
+    def test_identical_requests_use_memory(self, client, auth_headers, monkeypatch):
+        import main
+        backend = CountingBackend()
+        monkeypatch.setattr(main, "perform_translation", backend)
+        before = main.translation_memory.stats.hits
+
+        payload = {"text": "물을 충분히 드세요", "source_language": "ko", "target_language": "en"}
+        responses = [client.post("/api/v1/translate", json=payload, headers=auth_headers) for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert {r.json()["data"]["translated_text"] for r in responses} == {"[EN] 물을 충분히 드세요"}
+        assert backend.calls == 1
+        assert main.translation_memory.stats.hits - before == 2
+
+        metrics = client.get("/metrics").text
+        assert "translation_memory_saved_backend_calls_total" in metrics
+        assert "translation_memory_hit_ratio" in metrics
+
+    def test_memory_warms_from_translations_table(self, client, auth_headers):
+        import main
+        payload = {"text": "산책하세요", "source_language": "ko", "target_language": "ja"}
+        client.post("/api/v1/translate", json=payload, headers=auth_headers)
+
+        main.translation_memory.clear()
+        main.translation_memory.watermark = None
+
+        async def reconcile():
+            async with main.SessionLocal() as db:
+                await main.reconcile_translation_memory(db)
+
+        client.portal.call(reconcile)
+
+        digest = main.term_protector.compiled("ko", "ja").digest
+        assert main.translation_memory.get("산책하세요", "ko", "ja", glossary_version=digest) == "[JA] 산책하세요"
+
+    def test_reconcile_picks_up_late_commits_and_approvals(self, client, monkeypatch):
+        import uuid
+        import main
+        monkeypatch.setattr(main, "RECONCILE_BATCH_SIZE", 2)
+        tag = uuid.uuid4().hex[:6]
+
+        def row(text, stamped, **fields):
+            return main.Translation(
+                id=str(uuid.uuid4()), user_id="u", source_language="ko", target_language="en",
+                source_text=f"{text}{tag}", translated_text=f"[EN] {text}{tag}",
+                created_at=stamped, updated_at=stamped, **fields,
+            )
+
+        async def scenario():
+            async with main.SessionLocal() as db:
+                base = row("기준", datetime.utcnow())
+                db.add(base)
+                await db.commit()
+                await main.reconcile_translation_memory(db)
+                watermark = main.translation_memory.watermark
+
+                # committed late by another worker, stamped before the watermark
+                db.add(row("지연", watermark - timedelta(seconds=5)))
+                db.add_all(row(f"신규{i}", watermark + timedelta(seconds=1)) for i in range(3))
+                # reviewed later: only updated_at moves
+                base.translated_text = f"reviewed {tag}"
+                base.is_approved = True
+                base.updated_at = watermark + timedelta(seconds=2)
+                await db.commit()
+                await main.reconcile_translation_memory(db)
+                return watermark
+
+        watermark = client.portal.call(scenario)
+
+        memory = main.translation_memory
+        assert memory.get(f"지연{tag}", "ko", "en") == f"[EN] 지연{tag}"
+        assert [memory.get(f"신규{i}{tag}", "ko", "en") for i in range(3)] == [f"[EN] 신규{i}{tag}" for i in range(3)]
+        assert memory.get(f"기준{tag}", "ko", "en") == f"reviewed {tag}"
+        assert memory.watermark == watermark + timedelta(seconds=2)
@@ -0,0 +1,329 @@
+"""
+Pluggable async translation backend
+
+TranslationBackend sits between perform_translation and the providers:
+  - coalescing: identical segments already in flight share one result
+  - batching: segments for the same (source, target, context) arriving within
+    batch_window seconds go to the provider in one call (up to its
+    max_batch_size)
+  - per-provider semaphores bound concurrent provider calls
+  - retries move on to the next provider (fallbacks) with backoff; a call
+    that is still outstanding after hedge_after seconds gets a hedged
+    duplicate, and the first success wins
+
+Providers:
+  - MockProvider: the original placeholder output ("[EN] text")
+  - FakeLatencyProvider: MockProvider output after a configurable latency
+    (with jitter, a slow tail and injected failures) for offline load tests
+  - HttpTranslationProvider: JSON over a pooled httpx.AsyncClient
+"""
+
+import abc
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+BatchKey = Tuple[str, str, Optional[str]]
+SegmentKey = Tuple[str, str, str, Optional[str]]
+
+
+class TranslationProviderError(Exception):
+    pass
+
+
+class TranslationProvider(abc.ABC):
+    """Base class; subclasses implement translate_batch"""
+
+    name = "provider"
+
+    def __init__(self, max_concurrency: int = 8, max_batch_size: int = 32):
+        self.max_concurrency = max_concurrency
+        self.max_batch_size = max_batch_size
+
+    @abc.abstractmethod
+    async def translate_batch(
+        self, texts: Sequence[str], source_language: str, target_language: str, context: Optional[str] = None
+    ) -> List[str]:
+        """Translate texts in order; raise TranslationProviderError on failure"""
+
+    async def aclose(self) -> None:
+        pass
+
+
+class MockProvider(TranslationProvider):
+    name = "mock"
+
+    TAGS = {("ko", "en"): "EN", ("en", "ko"): "KO", ("ko", "ja"): "JA", ("ko", "zh"): "ZH"}
+
+    async def translate_batch(self, texts, source_language, target_language, context=None):
+        tag = self.TAGS.get((source_language, target_language))
+        return [f"[{tag}] {text}" if tag else text for text in texts]
+
+
+class FakeLatencyProvider(MockProvider):
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        per_segment: float = 0.0,
+        tail_probability: float = 0.0,
+        tail_latency: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.jitter = jitter
+        self.per_segment = per_segment
+        self.tail_probability = tail_probability
+        self.tail_latency = tail_latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.segments = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._rng = random.Random(seed)
+
+    async def translate_batch(self, texts, source_language, target_language, context=None):
+        self.calls += 1
+        self.segments += len(texts)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            delay = self.latency + self.per_segment * len(texts) + self._rng.uniform(0, self.jitter)
+            if self._rng.random() < self.tail_probability:
+                delay += self.tail_latency
+            await asyncio.sleep(delay)
+            if self._rng.random() < self.failure_rate:
+                raise TranslationProviderError("injected provider failure")
+            return await super().translate_batch(texts, source_language, target_language, context)
+        finally:
+            self.in_flight -= 1
+
+
+class HttpTranslationProvider(TranslationProvider):
+    """
+    POST {url} {"q": [...], "source": .., "target": .., "context": ..}
+    -> {"translations": [...]} over a shared, pooled client
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        api_key: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = 10.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.name = name
+        self.url = url
+        self.api_key = api_key
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+
+    async def translate_batch(self, texts, source_language, target_language, context=None):
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        response = await self.client.post(
+            self.url,
+            json={"q": list(texts), "source": source_language, "target": target_language, "context": context},
+            headers=headers,
+        )
+        response.raise_for_status()
+        translations = response.json().get("translations")
+        if not isinstance(translations, list):
+            raise TranslationProviderError(f"{self.name}: response has no translations list")
+        return [item["text"] if isinstance(item, dict) else item for item in translations]
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+@dataclass
+class BackendStats:
+    segments: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    provider_calls: int = 0
+    provider_seconds: float = 0.0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    failures: int = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "segments_total": self.segments,
+            "coalesced_total": self.coalesced,
+            "batches_total": self.batches,
+            "provider_calls_total": self.provider_calls,
+            "provider_seconds_total": round(self.provider_seconds, 6),
+            "retries_total": self.retries,
+            "hedges_total": self.hedges,
+            "hedge_wins_total": self.hedge_wins,
+            "failures_total": self.failures,
+        }
+
+
+class TranslationBackend:
+    def __init__(
+        self,
+        provider: TranslationProvider,
+        fallbacks: Sequence[TranslationProvider] = (),
+        batch_window: float = 0.005,
+        hedge_after: Optional[float] = None,
+        max_attempts: int = 2,
+        retry_backoff: float = 0.05,
+    ):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.providers = [provider, *fallbacks]
+        self.batch_window = batch_window
+        self.hedge_after = hedge_after
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.stats = BackendStats()
+        self._semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+        self._in_flight: Dict[SegmentKey, asyncio.Future] = {}
+        self._pending: Dict[BatchKey, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self._tasks = set()
+
+    @property
+    def provider(self) -> TranslationProvider:
+        return self.providers[0]
+
+    def _semaphore(self, provider: TranslationProvider) -> asyncio.Semaphore:
+        # created lazily (and per event loop) so they bind to the loop that uses them
+        loop = asyncio.get_running_loop()
+        entry = self._semaphores.get(provider.name)
+        if entry is None or entry[0] is not loop:
+            entry = self._semaphores[provider.name] = (loop, asyncio.Semaphore(provider.max_concurrency))
+        return entry[1]
+
+    async def translate(
+        self, text: str, source_language: str, target_language: str, context: Optional[str] = None
+    ) -> str:
+        if source_language == target_language:
+            return text
+        self.stats.segments += 1
+        key = (text, source_language, target_language, context)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[key] = future
+        group = (source_language, target_language, context)
+        pending = self._pending.setdefault(group, [])
+        pending.append((text, future))
+        if len(pending) >= self.provider.max_batch_size or self.batch_window <= 0:
+            self._flush(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.batch_window, self._flush, group)
+        return await asyncio.shield(future)
+
+    def _flush(self, group: BatchKey) -> None:
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(group, None)
+        if not pending:
+            return
+        task = asyncio.get_running_loop().create_task(self._dispatch(group, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, group: BatchKey, pending: List[Tuple[str, asyncio.Future]]) -> None:
+        source_language, target_language, context = group
+        texts = [text for text, _ in pending]
+        self.stats.batches += 1
+        try:
+            results = await self._call(texts, source_language, target_language, context)
+        except Exception as err:
+            self.stats.failures += 1
+            for text, future in pending:
+                self._in_flight.pop((text, *group), None)
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for (text, future), translated in zip(pending, results):
+            self._in_flight.pop((text, *group), None)
+            if not future.done():
+                future.set_result(translated)
+
+    async def _call(self, texts, source_language, target_language, context) -> List[str]:
+        last_error = None
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self.stats.retries += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            provider = self.providers[attempt % len(self.providers)]
+            try:
+                return await self._hedged(provider, attempt, texts, source_language, target_language, context)
+            except Exception as err:
+                last_error = err
+        raise last_error
+
+    async def _hedged(self, provider, attempt, texts, source_language, target_language, context) -> List[str]:
+        primary = asyncio.ensure_future(self._invoke(provider, texts, source_language, target_language, context))
+        if self.hedge_after is None:
+            return await primary
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        self.stats.hedges += 1
+        hedge_provider = self.providers[(attempt + 1) % len(self.providers)]
+        hedge = asyncio.ensure_future(self._invoke(hedge_provider, texts, source_language, target_language, context))
+        outstanding = {primary, hedge}
+        error = None
+        try:
+            while outstanding:
+                done, outstanding = await asyncio.wait(outstanding, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in outstanding:
+                task.cancel()
+
+    async def _invoke(self, provider, texts, source_language, target_language, context) -> List[str]:
+        async with self._semaphore(provider):
+            self.stats.provider_calls += 1
+            start = time.perf_counter()
+            try:
+                results = await provider.translate_batch(texts, source_language, target_language, context)
+            finally:
+                self.stats.provider_seconds += time.perf_counter() - start
+        if len(results) != len(texts):
+            raise TranslationProviderError(
+                f"{provider.name} returned {len(results)} translations for {len(texts)} segments"
+            )
+        return results
+
+    async def aclose(self) -> None:
+        for provider in self.providers:
+            await provider.aclose()
+
+    def metrics(self) -> Dict[str, float]:
+        return self.stats.to_dict()
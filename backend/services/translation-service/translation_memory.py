@@ -0,0 +1,374 @@
+"""
+Translation memory for the translation service
+
+Completed translations are cached by
+(normalized source text, source language, target language, context hash,
+glossary version) so repeated segments skip perform_translation. The glossary
+version is a digest of the glossary terms applied to the language pair, so
+changing the glossary makes earlier renderings unreachable instead of stale.
+
+Tiers:
+  1. In-process LRU
+  2. Optional shared SQLite store (TRANSLATION_MEMORY_PATH), visible to every
+     worker on the host. Reads run in the default executor and writes go
+     through a write-behind thread, so the event loop never waits on SQLite.
+  3. The translations table, used to warm the memory on startup and reconciled
+     incrementally by a coalesce(updated_at, created_at) watermark with an
+     overlap window, so rows approved later also arrive (approved rows win)
+"""
+
+import asyncio
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+MemoryKey = Tuple[str, str, str, str, str]
+Backend = Callable[[str, str, str, Optional[str]], Awaitable[str]]
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different segments share an entry"""
+    return " ".join(text.split())
+
+
+def context_hash(context: Optional[str]) -> str:
+    if not context:
+        return ""
+    return hashlib.sha1(context.encode("utf-8")).hexdigest()[:16]
+
+
+def memory_key(
+    text: str,
+    source_language: str,
+    target_language: str,
+    context: Optional[str] = None,
+    glossary_version: Optional[str] = "",
+) -> MemoryKey:
+    return (normalize_text(text), source_language, target_language, context_hash(context), glossary_version or "")
+
+
+@dataclass
+class TranslationMemoryStats:
+    lookups: int = 0
+    lru_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    backend_calls: int = 0
+    evictions: int = 0
+    reconciled_rows: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.lru_hits + self.store_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "lookups_total": self.lookups,
+            "lru_hits_total": self.lru_hits,
+            "store_hits_total": self.store_hits,
+            "misses_total": self.misses,
+            "backend_calls_total": self.backend_calls,
+            # every hit is a perform_translation call that did not happen
+            "saved_backend_calls_total": self.hits,
+            "evictions_total": self.evictions,
+            "reconciled_rows_total": self.reconciled_rows,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class SqliteMemoryStore:
+    """
+    Shared on-disk tier (one SQLite file per host, WAL mode)
+
+    get() is a blocking read meant for an executor thread. put()/put_many()
+    only enqueue; a writer thread commits whatever is queued in one
+    transaction, so entries become visible to readers shortly after (flush()
+    waits for them).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.write_errors = 0
+        self._write_conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._write_conn.execute("PRAGMA journal_mode=WAL")
+        self._write_conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self._write_conn.execute("PRAGMA table_info(translation_memory)")}
+        if columns and "glossary_version" not in columns:
+            # keyed without glossary version; it is only a cache, so start over
+            self._write_conn.execute("DROP TABLE translation_memory")
+        self._write_conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translation_memory (
+                source_text TEXT NOT NULL,
+                source_language TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                context_hash TEXT NOT NULL,
+                glossary_version TEXT NOT NULL DEFAULT '',
+                translated_text TEXT NOT NULL,
+                is_approved INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source_text, source_language, target_language, context_hash, glossary_version)
+            )
+            """
+        )
+        # WAL readers do not block on the writer, so reads get their own connection
+        self._read_lock = threading.Lock()
+        self._read_conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._pending: "queue.Queue[Optional[List[Tuple]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_behind, name="translation-memory-writer", daemon=True)
+        self._writer.start()
+
+    def get(self, key: MemoryKey) -> Optional[Tuple[str, bool]]:
+        """(translated_text, is_approved) or None; blocking"""
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT translated_text, is_approved FROM translation_memory "
+                "WHERE source_text = ? AND source_language = ? AND target_language = ? AND context_hash = ? "
+                "AND glossary_version = ?",
+                key,
+            ).fetchone()
+        return (row[0], bool(row[1])) if row else None
+
+    def put_many(self, entries: Iterable[Tuple[MemoryKey, str, bool]]) -> None:
+        """Queue upserts of (key, translated_text, is_approved); approved text is never replaced by machine output"""
+        now = time.time()
+        rows = [(*key, text, int(approved), now) for key, text, approved in entries]
+        if rows:
+            self._pending.put(rows)
+
+    def put(self, key: MemoryKey, translated_text: str, is_approved: bool = False) -> None:
+        self.put_many([(key, translated_text, is_approved)])
+
+    def flush(self) -> None:
+        """Block until every queued write is committed"""
+        self._pending.join()
+
+    def _write_behind(self) -> None:
+        while True:
+            batches = [self._pending.get()]
+            # coalesce everything already queued into one transaction
+            while batches[-1] is not None:
+                try:
+                    batches.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for batch in batches if batch is not None for row in batch]
+            try:
+                if rows:
+                    self._write(rows)
+            except sqlite3.Error:
+                self.write_errors += 1
+            finally:
+                for _ in batches:
+                    self._pending.task_done()
+            if batches[-1] is None:
+                return
+
+    def _write(self, rows: List[Tuple]) -> None:
+        self._write_conn.execute("BEGIN")
+        try:
+            self._write_conn.executemany(
+                """
+                INSERT INTO translation_memory
+                    (source_text, source_language, target_language, context_hash, glossary_version,
+                     translated_text, is_approved, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source_text, source_language, target_language, context_hash, glossary_version)
+                DO UPDATE SET
+                    translated_text = excluded.translated_text,
+                    is_approved = excluded.is_approved,
+                    updated_at = excluded.updated_at
+                WHERE excluded.is_approved >= translation_memory.is_approved
+                """,
+                rows,
+            )
+        except sqlite3.Error:
+            self._write_conn.execute("ROLLBACK")
+            raise
+        self._write_conn.execute("COMMIT")
+
+    def __len__(self) -> int:
+        with self._read_lock:
+            return self._read_conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+
+    def close(self) -> None:
+        """Commit queued writes and close both connections"""
+        self._pending.put(None)
+        self._writer.join()
+        self._write_conn.close()
+        with self._read_lock:
+            self._read_conn.close()
+
+
+class TranslationMemory:
+    """
+    LRU translation memory with an optional shared SQLite tier
+
+    Approved translations (is_approved rows from the translations table) are
+    pinned against replacement by later machine translations.
+    """
+
+    def __init__(self, max_entries: int = 10_000, store: Optional[SqliteMemoryStore] = None):
+        self.max_entries = max_entries
+        self.store = store
+        self.stats = TranslationMemoryStats()
+        # coalesce(updated_at, created_at) of the newest translations row reconciled;
+        # moved only by rows read from the database, never by this worker's own puts
+        self.watermark: Optional[datetime] = None
+        self._entries: "OrderedDict[MemoryKey, Tuple[str, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: MemoryKey, translated_text: str, is_approved: bool) -> None:
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current[1] and not is_approved:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (translated_text, is_approved)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _get_lru(self, key: MemoryKey) -> Optional[str]:
+        self.stats.lookups += 1
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            return None
+        self.stats.lru_hits += 1
+        return entry[0]
+
+    def _got_stored(self, key: MemoryKey, stored: Optional[Tuple[str, bool]]) -> Optional[str]:
+        if stored is None:
+            self.stats.misses += 1
+            return None
+        self.stats.store_hits += 1
+        # keep the stored approval so a promoted entry stays pinned
+        self._remember(key, *stored)
+        return stored[0]
+
+    def get(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        context: Optional[str] = None,
+        glossary_version: str = "",
+    ) -> Optional[str]:
+        """Blocking lookup; async callers use get_async"""
+        key = memory_key(text, source_language, target_language, context, glossary_version)
+        translated = self._get_lru(key)
+        if translated is not None:
+            return translated
+        return self._got_stored(key, self.store.get(key) if self.store is not None else None)
+
+    async def get_async(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        context: Optional[str] = None,
+        glossary_version: str = "",
+    ) -> Optional[str]:
+        """Like get, but the shared store is read in the default executor"""
+        key = memory_key(text, source_language, target_language, context, glossary_version)
+        translated = self._get_lru(key)
+        if translated is not None:
+            return translated
+        stored = None
+        if self.store is not None:
+            stored = await asyncio.get_running_loop().run_in_executor(None, self.store.get, key)
+        return self._got_stored(key, stored)
+
+    def put(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        context: Optional[str],
+        translated_text: str,
+        is_approved: bool = False,
+        glossary_version: str = "",
+    ) -> None:
+        key = memory_key(text, source_language, target_language, context, glossary_version)
+        self._remember(key, translated_text, is_approved)
+        if self.store is not None:
+            self.store.put(key, translated_text, is_approved)
+
+    async def translate(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        context: Optional[str],
+        backend: Backend,
+        glossary_version: str = "",
+    ) -> str:
+        """
+        Return the remembered translation, or call backend and remember its result;
+        glossary_version must identify the glossary backend applies
+        """
+        translated = await self.get_async(text, source_language, target_language, context, glossary_version)
+        if translated is not None:
+            return translated
+        self.stats.backend_calls += 1
+        translated = await backend(text, source_language, target_language, context)
+        self.put(text, source_language, target_language, context, translated, glossary_version=glossary_version)
+        return translated
+
+    def reconcile(self, rows: Iterable[Tuple]) -> int:
+        """
+        Merge rows from the translations table; returns the number of rows merged
+
+        rows: (source_text, source_language, target_language, context, glossary_version,
+               translated_text, is_approved, changed_at, ...) in changed_at order; extra
+               trailing columns (e.g. the paging id) are ignored. Rows the memory already
+               holds unchanged (overlap window re-reads) are skipped.
+        """
+        count = 0
+        shared = []
+        for row in rows:
+            source_text, source_language, target_language, context, glossary_version = row[:5]
+            translated, approved, changed_at = row[5:8]
+            if changed_at is not None and (self.watermark is None or changed_at > self.watermark):
+                self.watermark = changed_at
+            if not source_text or translated is None:
+                continue
+            key = memory_key(source_text, source_language, target_language, context, glossary_version)
+            entry = (translated, bool(approved))
+            with self._lock:
+                unchanged = self._entries.get(key) == entry
+            if unchanged:
+                continue
+            self._remember(key, *entry)
+            shared.append((key, *entry))
+            count += 1
+        if self.store is not None:
+            self.store.put_many(shared)
+        self.stats.reconciled_rows += count
+        return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, float]:
+        data = self.stats.to_dict()
+        data["entries"] = len(self._entries)
+        return data
@@ -0,0 +1,312 @@
+"""
+MPS Mock API - Unit Tests
+테스트 실행: pytest test_mock_server.py -v
+"""
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import mock_server
+from mock_server import TokenStore
+from mock_series import IndexedSeries, decode_cursor, encode_cursor, lttb, minmax_buckets
+from mock_simulation import Simulator, load_simulation_config, parse_simulation_config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def client():
+    with TestClient(mock_server.app) as test_client:
+        yield test_client
+
+
+def login(client) -> str:
+    response = client.post("/auth/login", json={"email": "user@example.com", "password": "password123"})
+    return response.json()["access_token"]
+
+
+class TestTokenStore:
+    """토큰 저장소 테스트"""
+
+    def test_validate_rejects_expired_tokens(self):
+        """만료된 토큰은 조회 시 거부되고 저장소에서 제거"""
+        clock = FakeClock()
+        store = TokenStore(ttl=10, clock=clock)
+        token = store.issue("user1")
+
+        assert store.validate(token) == "user1"
+        clock.now = 10
+        assert store.validate(token) is None
+        assert len(store) == 0
+
+    def test_issue_purges_expired_tokens_in_batches(self):
+        """발급할 때마다 만료 토큰을 purge_batch 개씩 정리"""
+        clock = FakeClock()
+        store = TokenStore(ttl=10, purge_batch=4, clock=clock)
+        for i in range(10):
+            store.issue(f"user{i}")
+        clock.now = 11
+
+        store.issue("late")
+        assert len(store) == 7
+        store.issue("later")
+        store.issue("latest")
+        assert len(store) == 3
+        assert store.metrics()["expired"] == 10
+
+    def test_reissued_token_keeps_new_expiry(self):
+        """재등록된 토큰의 오래된 힙 항목은 정리 대상이 아님"""
+        clock = FakeClock()
+        store = TokenStore(ttl=10, clock=clock)
+        token = store.issue("user1")
+        clock.now = 5
+        store.issue("user1", token)
+        clock.now = 12
+
+        assert store.purge() == 0
+        assert store.validate(token) == "user1"
+        clock.now = 15
+        assert store.purge() == 1
+
+    def test_expiry_index_is_compacted(self):
+        """재발급이 반복돼도 힙 크기가 제한됨"""
+        store = TokenStore(ttl=3600)
+        token = store.issue("user1")
+        for _ in range(5000):
+            store.issue("user1", token)
+
+        assert store.metrics()["expiry_index"] <= 2 * len(store) + 1024
+
+
+class TestAuthDependency:
+    """인증 의존성 테스트"""
+
+    def test_header_and_query_tokens(self, client):
+        token = login(client)
+
+        assert client.get("/auth/me", headers={"Authorization": f"Bearer {token}"}).json()["id"] == "user1"
+        assert client.get("/home/health-score", params={"authorization": f"Bearer {token}"}).status_code == 200
+
+    def test_rejects_missing_unknown_and_revoked_tokens(self, client):
+        token = login(client)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        assert client.get("/home/environment").status_code == 401
+        assert client.get("/home/environment", headers={"Authorization": "Bearer access_user1"}).status_code == 401
+        client.post("/auth/logout", headers=headers)
+        assert client.get("/home/environment", headers=headers).status_code == 401
+
+    def test_sessions_are_independent(self, client):
+        """로그인마다 별도 토큰 (한 세션 로그아웃이 다른 세션에 영향 없음)"""
+        first, second = login(client), login(client)
+        client.post("/auth/logout", headers={"Authorization": f"Bearer {first}"})
+
+        assert first != second
+        assert client.get("/auth/me", headers={"Authorization": f"Bearer {second}"}).status_code == 200
+
+
+class TestSimulation:
+    """시뮬레이션 모드 테스트"""
+
+    def test_datasets_are_seeded_and_sliceable(self):
+        """같은 시드 = 같은 데이터, 임의 구간을 전체 생성 없이 계산"""
+        config = {"seed": 7, "datasets": {"history_size": 1_000_000, "history_interval_minutes": 1, "anchor": "2026-01-01T00:00:00"}}
+        first = Simulator(parse_simulation_config(config)).datasets
+        second = Simulator(parse_simulation_config(config)).datasets
+
+        assert list(first.history(999_990)) == list(second.history(999_990))
+        assert len(list(first.history(999_990))) == 10
+        assert first.history_record(3)["timestamp"] == "2025-12-31T23:57:00"
+        assert list(first.trends("health", 0, 5)) != list(first.trends("water", 0, 5))
+
+    def test_rate_limit_per_client(self):
+        clock = FakeClock()
+        simulator = Simulator(
+            parse_simulation_config({"rate_limit": {"requests_per_second": 2, "burst": 2}}), clock=clock
+        )
+
+        assert [simulator.decide("/home/environment", "a").status for _ in range(3)] == [None, None, 429]
+        assert simulator.decide("/home/environment", "b").status is None
+        assert simulator.decide("/home/environment", "a").retry_after == pytest.approx(0.5)
+        clock.now = 0.5
+        assert simulator.decide("/home/environment", "a").status is None
+        assert simulator.decide("/health", "a") is None
+
+    def test_idle_buckets_are_evicted(self):
+        """가득 찬 (한동안 요청 없는) 버킷은 정리되어 클라이언트 수만큼 계속 늘지 않음"""
+        clock = FakeClock()
+        simulator = Simulator(
+            parse_simulation_config({"rate_limit": {"requests_per_second": 10, "burst": 10}}), clock=clock
+        )
+        for i in range(Simulator.MIN_SWEEP_SIZE):
+            simulator.decide("/home/environment", f"ip:{i}")
+        clock.now = 1.0
+        simulator.decide("/home/environment", "ip:new")
+
+        assert simulator.metrics()["rate_limit_buckets"] == 1
+
+    def test_rate_limit_keys_on_validated_user(self, client, monkeypatch):
+        """Authorization 값을 매번 바꿔도 같은 IP 의 제한을 우회할 수 없음"""
+        config = parse_simulation_config({"rate_limit": {"requests_per_second": 1, "burst": 2}})
+        monkeypatch.setattr(mock_server, "simulator", Simulator(config))
+
+        statuses = [
+            client.get("/home/environment", headers={"Authorization": f"Bearer forged-{i}"}).status_code
+            for i in range(3)
+        ]
+
+        assert statuses[-1] == 429
+
+    def test_route_overrides_use_longest_prefix(self):
+        simulator = Simulator(parse_simulation_config({
+            "routes": {
+                "default": {"latency": {"distribution": "fixed", "value_ms": 10}},
+                "/measurement": {"error_rate": 1, "error_statuses": [503]},
+                "/measurement/history": {"latency": {"distribution": "uniform", "min_ms": 100, "max_ms": 200}},
+            }
+        }))
+
+        assert simulator.decide("/home/environment", "a").delay == pytest.approx(0.01)
+        assert simulator.decide("/measurement/start", "a").status == 503
+        history = simulator.decide("/measurement/history", "a")
+        assert history.status is None and 0.1 <= history.delay <= 0.2
+        assert simulator.decide("/measurementx", "a").route == "default"
+
+    def test_rejects_invalid_config(self):
+        with pytest.raises(ValueError):
+            parse_simulation_config({"routes": {"default": {"latency": {"distribution": "pareto"}}}})
+        with pytest.raises(ValueError):
+            parse_simulation_config({"rate_limits": {}})
+        with pytest.raises(ValueError):
+            parse_simulation_config({"datasets": {"history_size": 1_000_000}})
+        with pytest.raises(ValueError):
+            parse_simulation_config({"routes": {"default": {"error_rate": 0.5, "error_statuses": []}}})
+
+    def test_example_config_drives_endpoints(self, client, monkeypatch):
+        """예시 설정 파일로 합성 데이터, 오류 주입, 429 응답"""
+        config = load_simulation_config(os.path.join(os.path.dirname(__file__), "mock_simulation.example.json"))
+        config.routes = {"/auth": config.routes["/auth"]}
+        config.routes["/auth"].latency.distribution = "none"
+        config.routes["/data-hub"] = parse_simulation_config({"routes": {"x": {"error_rate": 1}}}).routes["x"]
+        monkeypatch.setattr(mock_server, "simulator", Simulator(config))
+        headers = {"Authorization": f"Bearer {login(client)}"}
+
+        history = client.get("/measurement/history", params={"limit": 10000}, headers=headers).json()
+        assert len(history["measurements"]) == 10000 and history["next_cursor"]
+        assert client.get("/data-hub/trends", params={"measurement_type": "health"}, headers=headers).status_code in (500, 503)
+        statuses = [client.post("/auth/refresh-token", params={"refresh_token": "x"}).status_code for _ in range(12)]
+        assert 429 in statuses
+        assert client.get("/health").json()["simulation"]["routes"]["/auth"]["rate_limited"] >= 1
+
+
+@pytest.fixture
+def simulated(client, monkeypatch):
+    """1분 간격 추세 10,000개, 1시간 간격 측정 기록 500개 (기준 시각 2026-01-01 00:00)"""
+    config = parse_simulation_config({
+        "seed": 3,
+        "datasets": {
+            "history_size": 500,
+            "history_interval_minutes": 60,
+            "trend_points": 10000,
+            "trend_interval_minutes": 1,
+            "anchor": "2026-01-01T00:00:00",
+        },
+    })
+    monkeypatch.setattr(mock_server, "simulator", Simulator(config))
+    return {"Authorization": f"Bearer {login(client)}"}
+
+
+class TestPaging:
+    """페이지네이션 / 시간 범위 / 다운샘플링 테스트"""
+
+    def test_cursor_walks_every_record_once(self, client, simulated):
+        ids, cursor = [], None
+        while True:
+            params = {"limit": 120, **({"cursor": cursor} if cursor else {})}
+            body = client.get("/measurement/history", params=params, headers=simulated).json()
+            ids += [m["id"] for m in body["measurements"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert ids == [f"m{i}" for i in range(500)]
+        assert decode_cursor(encode_cursor(120)) == 120
+
+    def test_time_range_is_inclusive(self, client, simulated):
+        params = {"from": "2025-12-31T20:00:00", "to": "2025-12-31T23:30:00"}
+        body = client.get("/measurement/history", params=params, headers=simulated).json()
+
+        assert [m["timestamp"] for m in body["measurements"]] == [
+            "2025-12-31T23:00:00", "2025-12-31T22:00:00", "2025-12-31T21:00:00", "2025-12-31T20:00:00",
+        ]
+        params = {"from": "2025-12-31T23:00:00+09:00", "to": "2025-12-31T14:00:00Z"}
+        assert client.get("/measurement/history", params=params, headers=simulated).status_code == 200
+
+    def test_rejects_invalid_cursor_and_method(self, client, simulated):
+        assert client.get("/measurement/history", params={"cursor": "bogus"}, headers=simulated).status_code == 400
+        params = {"measurement_type": "health", "points": 100, "downsample": "median"}
+        assert client.get("/data-hub/trends", params=params, headers=simulated).status_code == 400
+
+    def test_trends_downsampled_to_screen_size(self, client, simulated):
+        params = {"measurement_type": "health", "from": "2025-12-31T00:00:00", "points": 300}
+        lttb_body = client.get("/data-hub/trends", params=params, headers=simulated).json()
+        minmax_body = client.get(
+            "/data-hub/trends", params={**params, "downsample": "minmax"}, headers=simulated
+        ).json()
+
+        assert lttb_body["source_points"] == 1441
+        assert len(lttb_body["data"]) == 300
+        assert lttb_body["data"][0]["date"] == "2026-01-01T00:00:00"
+        assert lttb_body["data"][-1]["date"] == "2025-12-31T00:00:00"
+        assert len(minmax_body["data"]) == 300
+        assert sum(bucket["count"] for bucket in minmax_body["data"]) == 1441
+        assert all(b["min"] <= b["value"] <= b["max"] for b in minmax_body["data"])
+
+    def test_large_ranges_are_strided(self, client, simulated, monkeypatch):
+        """원본 점이 상한을 넘으면 솎은 점으로 다운샘플링 (비용 상한)"""
+        monkeypatch.setattr(mock_server, "MAX_DOWNSAMPLE_SOURCE", 1000)
+        params = {"measurement_type": "health", "points": 100}
+        body = client.get("/data-hub/trends", params=params, headers=simulated).json()
+
+        assert (body["source_points"], body["source_stride"]) == (10000, 10)
+        assert len(body["data"]) == 100
+        assert body["data"][-1]["date"] == "2025-12-25T01:30:00"
+
+    def test_indexed_series_is_lazy(self):
+        calls = []
+        series = IndexedSeries(lambda i: calls.append(i) or float(i), 10, 1_000_000_010, stride=1000)
+
+        assert len(series) == 1_000_000
+        assert series[2] == 2010.0 and series[-1] == 999_999_010.0
+        assert series[3:5] == [3010.0, 4010.0]
+        assert len(calls) == 4
+
+    def test_disabled_simulation_keeps_legacy_values(self, client, monkeypatch):
+        monkeypatch.setattr(mock_server, "simulator", Simulator(load_simulation_config(None)))
+        headers = {"Authorization": f"Bearer {login(client)}"}
+
+        history = client.get("/measurement/history", headers=headers).json()["measurements"]
+        trends = client.get("/data-hub/trends", params={"measurement_type": "health"}, headers=headers).json()["data"]
+
+        assert [(m["type"], m["value"]) for m in history[:4]] == [
+            ("health", 70), ("environment", 71), ("water", 72), ("health", 73),
+        ]
+        assert len(history) == 10
+        assert [point["value"] for point in trends] == [70 + i for i in range(30)]
+
+    def test_lttb_keeps_spikes_and_endpoints(self):
+        values = [0.0] * 1000
+        values[637] = 50.0
+        selected = lttb(values, 20)
+
+        assert len(selected) == 20 and selected[0] == 0 and selected[-1] == 999
+        assert 637 in selected
+        assert minmax_buckets(values, 10)[6][3] == 50.0
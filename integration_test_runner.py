@@ -10,9 +10,14 @@ Created: 2026-01-02
 import sys
 import json
 import time
+import logging
+import argparse
 import subprocess
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent / "backend/services/ai-service"))
 
@@ -317,6 +322,315 @@ class ComprehensiveAssessmentTestSuite(TestResult):
         return self.summary()
 
 
+# ==================== 데이터셋 샤딩 검증 ====================
+
+DEFAULT_CASES_PATH = Path(__file__).parent / "medical_test_cases_100.json"
+
+# (case_id, 생리 신호 6개, 기대 응급 여부, 기대 심각도)
+CaseRow = Tuple[int, Tuple[float, ...], bool, int]
+
+VITAL_KEYS = (
+    "glucose_mg_dl",
+    "systolic_bp",
+    "diastolic_bp",
+    "heart_rate_bpm",
+    "temperature_celsius",
+    "spo2_percent",
+)
+MAX_REPORTED_ERRORS = 50
+
+
+class TimingHistogram:
+    """
+    케이스별 처리 시간 히스토그램
+
+    구간 i 는 [2^(i-1), 2^i) 마이크로초. 샤드별 결과를 merge 로 합산한다.
+    """
+
+    BUCKETS = 24
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed_ns: int):
+        bucket = min((elapsed_ns // 1000).bit_length(), self.BUCKETS - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def merge(self, other: "TimingHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, p: float) -> float:
+        """p 백분위 상한 (마이크로초)"""
+        if self.count == 0:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return float(1 << bucket)
+        return self.max_ns / 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000, 1) if self.count else 0.0,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "max_us": round(self.max_ns / 1000, 1),
+            "buckets_us": {str(1 << i): n for i, n in enumerate(self.counts) if n},
+        }
+
+    def render(self, width: int = 40) -> List[str]:
+        peak = max(self.counts) or 1
+        lines = []
+        for bucket, n in enumerate(self.counts):
+            if n:
+                low = (1 << (bucket - 1)) if bucket else 0
+                lines.append(f"  {low:>8}-{1 << bucket:<8}us {n:>10,} {'#' * max(1, n * width // peak)}")
+        return lines
+
+
+def load_cases(paths: Sequence[Path]) -> List[CaseRow]:
+    """
+    테스트 케이스 로드
+
+    .json 은 {"test_cases": [...]} 형식, .ndjson 은 한 줄에 케이스 하나,
+    .mvd 는 컬럼형 데이터셋 (vitals_dataset)
+    """
+    cases = []
+    for path in paths:
+        path = Path(path)
+        if path.suffix == ".mvd":
+            cases.extend(_dataset_cases(path))
+            continue
+        with open(path, encoding="utf-8") as f:
+            if path.suffix == ".ndjson":
+                records: Iterable[dict] = (json.loads(line) for line in f if line.strip())
+            else:
+                records = json.load(f)["test_cases"]
+            for case in records:
+                vitals = case["vitals"]
+                expected = case["expected_results"]
+                cases.append((
+                    case["case_id"],
+                    tuple(vitals[key] for key in VITAL_KEYS),
+                    bool(expected["is_emergency"]),
+                    int(expected["severity_level"]),
+                ))
+    return cases
+
+
+def _dataset_cases(path: Path) -> List[CaseRow]:
+    """컬럼형 데이터셋에서 케이스 로드 (JSON 파싱 없이 컬럼 단위 변환)"""
+    from vitals_dataset import load_dataset
+
+    dataset = load_dataset(path)
+    vitals = zip(*(dataset[f"vitals.{key}"].tolist() for key in VITAL_KEYS))
+    return list(zip(
+        dataset["case_id"].tolist(),
+        vitals,
+        dataset["expected_results.is_emergency"].astype(bool).tolist(),
+        dataset["expected_results.severity_level"].tolist(),
+    ))
+
+
+def iter_shards(cases: Sequence[CaseRow], shard_size: int) -> Iterator[Sequence[CaseRow]]:
+    for start in range(0, len(cases), shard_size):
+        yield cases[start:start + shard_size]
+
+
+_worker_coach: Optional[MedicalExpertBackedCoach] = None
+_worker_stop = None
+
+# 작업 프로세스가 fail-fast 중단 신호를 확인하는 간격 (케이스 수)
+STOP_CHECK_INTERVAL = 64
+
+
+def _init_validation_worker(stop_event):
+    """작업 프로세스 초기화 (코치는 프로세스당 하나)"""
+    global _worker_coach, _worker_stop
+    # 응급 케이스마다 남는 CRITICAL 로그는 검증 결과로 대신 보고
+    logging.disable(logging.CRITICAL)
+    _worker_coach = MedicalExpertBackedCoach("sharded_validation")
+    _worker_stop = stop_event
+
+
+def _validate_shard(shard: Sequence[CaseRow], fail_fast: bool) -> Dict:
+    """
+    샤드 검증 (작업 프로세스에서 실행)
+
+    응급 케이스를 응급으로 판정하지 못하면 실패(누락)로 기록한다.
+    심각도 일치율과 오경보는 통계로만 집계한다.
+    """
+    coach = _worker_coach
+    histogram = TimingHistogram()
+    passed = failed = severity_matches = false_alarms = 0
+    misses: List[int] = []
+    errors: List[str] = []
+    stopped = False
+    clock = time.perf_counter_ns
+
+    for i, (case_id, vitals, expected_emergency, expected_severity) in enumerate(shard):
+        if fail_fast and i % STOP_CHECK_INTERVAL == 0 and _worker_stop.is_set():
+            stopped = True
+            break
+        start = clock()
+        result = coach.comprehensive_assessment(VitalSigns(*vitals))
+        histogram.add(clock() - start)
+        is_valid = result.get("is_valid", True)
+
+        if not is_valid:
+            detected = False
+            error = f"case {case_id}: invalid vitals {result['errors']}"
+        else:
+            detected = result["is_emergency"]
+            error = f"case {case_id}: emergency not detected (severity {result['overall_severity']})"
+            if result["overall_severity"] == expected_severity:
+                severity_matches += 1
+            if detected and not expected_emergency:
+                false_alarms += 1
+
+        if expected_emergency and not detected:
+            failed += 1
+            misses.append(case_id)
+            errors.append(error)
+            if fail_fast:
+                _worker_stop.set()
+                break
+        elif not is_valid:
+            failed += 1
+            errors.append(error)
+        else:
+            passed += 1
+
+    return {
+        "passed": passed,
+        "failed": failed,
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "emergency_misses": misses,
+        "severity_matches": severity_matches,
+        "false_alarms": false_alarms,
+        "histogram": histogram,
+        "stopped": stopped,
+    }
+
+
+class ShardedValidationSuite(TestResult):
+    """
+    데이터셋 샤딩 검증 스위트
+
+    케이스를 shard_size 단위로 나눠 프로세스 풀에서 병렬 검증하고
+    결과와 케이스별 처리 시간 히스토그램을 합산한다.
+    fail_fast 이면 첫 응급 감지 누락에서 남은 샤드를 취소하고 중단한다.
+    """
+
+    def __init__(
+        self,
+        cases: Sequence[CaseRow],
+        workers: Optional[int] = None,
+        shard_size: int = 2000,
+        fail_fast: bool = True,
+    ):
+        if shard_size < 1:
+            raise ValueError(f"shard_size must be at least 1, got {shard_size}")
+        super().__init__("Sharded Dataset Validation")
+        self.cases = cases
+        self.workers = workers or multiprocessing.cpu_count()
+        self.shard_size = shard_size
+        self.fail_fast = fail_fast
+        self.histogram = TimingHistogram()
+        self.emergency_misses: List[int] = []
+        self.severity_matches = 0
+        self.false_alarms = 0
+        self.shards_done = 0
+        self.stopped_early = False
+
+    def _merge(self, shard_result: Dict):
+        self.passed += shard_result["passed"]
+        self.failed += shard_result["failed"]
+        room = MAX_REPORTED_ERRORS - len(self.errors)
+        if room > 0:
+            self.errors.extend(shard_result["errors"][:room])
+        self.emergency_misses.extend(shard_result["emergency_misses"])
+        self.severity_matches += shard_result["severity_matches"]
+        self.false_alarms += shard_result["false_alarms"]
+        self.histogram.merge(shard_result["histogram"])
+        self.stopped_early = self.stopped_early or shard_result["stopped"]
+        self.shards_done += 1
+
+    def run_all(self):
+        """모든 샤드 검증 실행"""
+        self.start()
+        print("\n" + "=" * 60)
+        print(f"데이터셋 샤딩 검증 시작 ({len(self.cases):,}개 케이스, {self.workers} workers)")
+        print("=" * 60)
+
+        context = multiprocessing.get_context()
+        stop_event = context.Event()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_validation_worker,
+            initargs=(stop_event,),
+        ) as pool:
+            pending = {
+                pool.submit(_validate_shard, shard, self.fail_fast)
+                for shard in iter_shards(self.cases, self.shard_size)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._merge(future.result())
+                if self.fail_fast and self.emergency_misses and pending:
+                    # 대기 중인 샤드는 취소하고, 이미 넘어간 샤드는 중단 신호를 보고 곧 반환
+                    stop_event.set()
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    for future in pending:
+                        if not future.cancelled():
+                            self._merge(future.result())
+                    break
+
+        if self.fail_fast and self.emergency_misses and self.histogram.count < len(self.cases):
+            # 샤드가 하나뿐이어도 남은 케이스를 건너뛰었으면 중단으로 표시
+            self.stopped_early = True
+        self.end()
+        for line in self.histogram.render():
+            print(line)
+        status = "✗ FAIL" if self.emergency_misses else "✓ PASS"
+        print(f"{status}: 응급 감지 누락 {len(self.emergency_misses)}건"
+              + (" (fail-fast 중단)" if self.stopped_early else ""))
+        return self.summary()
+
+    def summary(self) -> dict:
+        data = super().summary()
+        checked = self.histogram.count
+        data.update({
+            "cases": len(self.cases),
+            "checked": checked,
+            "workers": self.workers,
+            "shards": self.shards_done,
+            "stopped_early": self.stopped_early,
+            "emergency_misses": self.emergency_misses[:MAX_REPORTED_ERRORS],
+            "false_alarms": self.false_alarms,
+            "severity_agreement": round(self.severity_matches / checked, 3) if checked else None,
+            "cases_per_second": round(checked / self.duration()) if self.duration() else None,
+            "timing": self.histogram.to_dict(),
+        })
+        return data
+
+
 class IntegrationTestRunner:
     """통합 테스트 러너"""
 
@@ -324,8 +638,14 @@ class IntegrationTestRunner:
         self.results = []
         self.start_time = datetime.now()
 
-    def run_all_tests(self):
-        """모든 테스트 스위트 실행"""
+    def run_all_tests(self, case_paths: Sequence[Path] = (), **validation_options):
+        """
+        모든 테스트 스위트 실행
+
+        Args:
+            case_paths: 샤딩 검증할 테스트 케이스 파일 (.json / .ndjson)
+            validation_options: ShardedValidationSuite 옵션 (workers, shard_size, fail_fast)
+        """
         print("\n" + "=" * 80)
         print("MPS Healthcare System - Phase 1 Week 1 통합 테스트")
         print("=" * 80)
@@ -339,6 +659,11 @@ class IntegrationTestRunner:
         comprehensive_tests = ComprehensiveAssessmentTestSuite()
         self.results.append(comprehensive_tests.run_all())
 
+        # 데이터셋 샤딩 검증
+        if case_paths:
+            dataset_tests = ShardedValidationSuite(load_cases(case_paths), **validation_options)
+            self.results.append(dataset_tests.run_all())
+
         # 결과 출력
         self.print_summary()
 
@@ -407,10 +732,40 @@ class IntegrationTestRunner:
             return 1
 
 
-def main():
+def _positive_int(text: str) -> int:
+    """argparse type: 1 이상의 정수 (아니면 사용법 오류)"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"정수가 아님: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"1 이상이어야 함: {value}")
+    return value
+
+
+def main(argv: Optional[Sequence[str]] = None):
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="MPS Healthcare 통합 테스트")
+    parser.add_argument(
+        "--cases", nargs="*", type=Path,
+        help=f"샤딩 검증할 테스트 케이스 파일 (.json/.ndjson/.mvd, 값 없이 지정하면 {DEFAULT_CASES_PATH.name})",
+    )
+    parser.add_argument("--workers", type=_positive_int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--shard-size", type=_positive_int, default=2000, help="샤드당 케이스 수")
+    parser.add_argument("--no-fail-fast", action="store_true", help="응급 감지 누락이 있어도 끝까지 검증")
+    args = parser.parse_args(argv)
+
+    case_paths = args.cases
+    if case_paths is not None and not case_paths:
+        case_paths = [DEFAULT_CASES_PATH]
+
     runner = IntegrationTestRunner()
-    runner.run_all_tests()
+    runner.run_all_tests(
+        case_paths or (),
+        workers=args.workers,
+        shard_size=args.shard_size,
+        fail_fast=not args.no_fail_fast,
+    )
     
     # Exit code 반환
     return 0 if all(r["failed"] == 0 for r in runner.results) else 1
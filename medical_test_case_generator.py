@@ -5,9 +5,23 @@ Version: 1.0
 Created: 2026-01-02
 """
 
+import argparse
 import json
+import sys
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 합성 케이스 경로만 NumPy / ai-service 모듈을 사용 (100개 케이스 생성은 표준 라이브러리만 필요)
+sys.path.insert(0, str(Path(__file__).parent / "backend/services/ai-service"))
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from vitals_dataset import ColumnSpec
 
 
 class ClinicalScenario(Enum):
@@ -564,8 +578,283 @@ class MedicalTestCaseGenerator:
         print("=" * 80)
 
 
+# ==================== 대용량 합성 케이스 생성 ====================
+
+# 생리 신호 간 상관관계 (VITAL_COLUMNS 순서: 혈당, 수축기, 이완기, 심박수, 체온, SpO2)
+VITALS_CORRELATION = (
+    (1.00, 0.05, 0.05, 0.15, 0.05, 0.00),
+    (0.05, 1.00, 0.70, 0.20, 0.00, 0.00),
+    (0.05, 0.70, 1.00, 0.15, 0.00, 0.00),
+    (0.15, 0.20, 0.15, 1.00, 0.45, -0.35),
+    (0.05, 0.00, 0.00, 0.45, 1.00, -0.20),
+    (0.00, 0.00, 0.00, -0.35, -0.20, 1.00),
+)
+
+# VitalSigns.validate 허용 범위 (생성 값은 항상 유효)
+VITAL_BOUNDS = (
+    (40, 500),
+    (40, 200),
+    (30, 130),
+    (0, 200),
+    (25.0, 45.0),
+    (0, 100),
+)
+
+DEFAULT_SCENARIO_WEIGHTS = {
+    ClinicalScenario.NORMAL: 0.6,
+    ClinicalScenario.WARNING: 0.3,
+    ClinicalScenario.CRITICAL: 0.1,
+}
+
+
+@dataclass(frozen=True)
+class VitalsProfile:
+    """임상 양상별 생리 신호 분포 (평균/표준편차는 VITAL_COLUMNS 순서)"""
+    name: str
+    scenario: ClinicalScenario
+    weight: float
+    mean: Tuple[float, ...]
+    std: Tuple[float, ...]
+    medical_context: str
+
+
+VITALS_PROFILES: Tuple[VitalsProfile, ...] = (
+    VitalsProfile("정상 성인", ClinicalScenario.NORMAL, 1.0,
+                  (98, 110, 70, 72, 36.8, 98), (10, 6, 5, 8, 0.25, 1.0),
+                  "ADA/ACC-AHA/WHO 정상 범위"),
+    VitalsProfile("고혈당", ClinicalScenario.WARNING, 0.3,
+                  (200, 125, 80, 85, 36.9, 97), (35, 10, 7, 10, 0.3, 1.2),
+                  "ADA 고혈당 범위"),
+    VitalsProfile("고혈압 2단계", ClinicalScenario.WARNING, 0.3,
+                  (120, 152, 96, 80, 36.9, 97), (20, 8, 6, 9, 0.3, 1.0),
+                  "ACC/AHA 고혈압 2단계"),
+    VitalsProfile("발열", ClinicalScenario.WARNING, 0.2,
+                  (115, 122, 78, 100, 38.3, 96), (18, 10, 7, 10, 0.35, 1.5),
+                  "WHO 발열 기준 (>38°C)"),
+    VitalsProfile("경도 저혈당", ClinicalScenario.WARNING, 0.2,
+                  (62, 118, 76, 88, 36.7, 98), (5, 9, 7, 9, 0.25, 1.0),
+                  "ADA 저혈당 Level 1 (54-70 mg/dL)"),
+    VitalsProfile("심각한 저혈당", ClinicalScenario.CRITICAL, 0.2,
+                  (45, 120, 78, 105, 36.6, 97), (4, 12, 8, 12, 0.3, 1.2),
+                  "ADA 저혈당 Level 2-3 (<54 mg/dL)"),
+    VitalsProfile("당뇨병성 케톤산증", ClinicalScenario.CRITICAL, 0.2,
+                  (380, 118, 74, 115, 37.2, 96), (50, 14, 9, 12, 0.4, 1.5),
+                  "ADA 응급 범위 (>300 mg/dL) - DKA 위험"),
+    VitalsProfile("고혈압 위기", ClinicalScenario.CRITICAL, 0.2,
+                  (130, 188, 122, 95, 36.9, 97), (25, 8, 5, 10, 0.3, 1.0),
+                  "ACC/AHA 고혈압 위기 (>180/>120)"),
+    VitalsProfile("패혈증", ClinicalScenario.CRITICAL, 0.2,
+                  (150, 96, 58, 135, 39.8, 92), (35, 12, 8, 12, 0.5, 2.5),
+                  "SIRS 기준 (발열 + 빈맥 + 저산소)"),
+    VitalsProfile("저산소증", ClinicalScenario.CRITICAL, 0.2,
+                  (115, 128, 82, 118, 37.1, 85), (20, 12, 8, 12, 0.4, 3.0),
+                  "WHO 저산소증 (SpO2 < 90%)"),
+)
+
+
+class SyntheticVitalsGenerator:
+    """
+    대용량 합성 테스트 케이스 생성기
+
+    - 임상 양상별 다변량 정규분포에서 상관된 생리 신호를 NumPy 로 샘플링
+    - 기대 결과는 MedicalExpertBackedCoach 와 같은 규칙(assess_vitals_batch)으로 산출
+    - NDJSON 또는 컬럼형 바이너리(vitals_dataset)로 스트리밍 기록
+    - chunk_size 단위로 생성/기록하므로 전체 케이스 수와 무관하게 메모리 일정
+    - 같은 seed 와 chunk_size 면 항상 같은 케이스 생성
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        scenario_weights: Optional[Dict[ClinicalScenario, float]] = None,
+        profiles: Sequence[VitalsProfile] = VITALS_PROFILES,
+    ):
+        import numpy as np
+
+        self.seed = seed
+        self.profiles = tuple(profiles)
+        weights = scenario_weights or DEFAULT_SCENARIO_WEIGHTS
+        scenario_totals: Dict[ClinicalScenario, float] = {}
+        for profile in self.profiles:
+            scenario_totals[profile.scenario] = scenario_totals.get(profile.scenario, 0.0) + profile.weight
+        probabilities = np.array([
+            weights.get(p.scenario, 0.0) * p.weight / scenario_totals[p.scenario]
+            for p in self.profiles
+        ])
+        self._probabilities = probabilities / probabilities.sum()
+        self._mean = np.array([p.mean for p in self.profiles], dtype=np.float64)
+        self._std = np.array([p.std for p in self.profiles], dtype=np.float64)
+        self._cholesky = np.linalg.cholesky(np.array(VITALS_CORRELATION))
+
+    def generate_chunk(self, start: int, size: int, chunk_index: int) -> Dict[str, "np.ndarray"]:
+        """
+        케이스 묶음 생성
+
+        Returns:
+            case_id, profile(VITALS_PROFILES 인덱스), 생리 신호 6개,
+            severity_level, is_emergency 컬럼
+        """
+        import numpy as np
+
+        from batch_assessment import VITAL_COLUMNS, assess_vitals_batch
+
+        rng = np.random.default_rng([self.seed, chunk_index])
+        profile = rng.choice(len(self.profiles), size=size, p=self._probabilities).astype(np.int8)
+        z = rng.standard_normal((size, len(VITAL_COLUMNS))) @ self._cholesky.T
+        raw = self._mean[profile] + z * self._std[profile]
+
+        columns: Dict[str, "np.ndarray"] = {
+            "case_id": np.arange(start + 1, start + size + 1, dtype=np.int64),
+            "profile": profile,
+        }
+        for i, (name, (low, high)) in enumerate(zip(VITAL_COLUMNS, VITAL_BOUNDS)):
+            if name == "temperature_celsius":
+                columns[name] = np.clip(raw[:, i], low, high).round(1)
+            else:
+                columns[name] = np.clip(raw[:, i].round(), low, high).astype(np.int64)
+        # 수축기 > 이완기 보장
+        columns["diastolic_bp"] = np.minimum(columns["diastolic_bp"], columns["systolic_bp"] - 10)
+
+        labels = assess_vitals_batch(**{name: columns[name] for name in VITAL_COLUMNS})
+        columns["severity_level"] = labels.overall_severity
+        columns["is_emergency"] = labels.is_emergency
+        return columns
+
+    def iter_chunks(self, total: int, chunk_size: int = 100_000) -> Iterator[Dict[str, "np.ndarray"]]:
+        for chunk_index, start in enumerate(range(0, total, chunk_size)):
+            yield self.generate_chunk(start, min(chunk_size, total - start), chunk_index)
+
+    def _ndjson_lines(self, chunk: Dict[str, "np.ndarray"]) -> List[str]:
+        from batch_assessment import VITAL_COLUMNS
+
+        dumps = json.dumps
+        prefixes = [
+            (
+                f', "description": {dumps(f"합성 케이스: {p.name}", ensure_ascii=False)}'
+                f', "scenario": {dumps(p.scenario.value, ensure_ascii=False)}, "vitals": '
+            )
+            for p in self.profiles
+        ]
+        contexts = [
+            f', "medical_context": {dumps(p.medical_context, ensure_ascii=False)}}}\n'
+            for p in self.profiles
+        ]
+        rows = zip(
+            chunk["case_id"].tolist(), chunk["profile"].tolist(),
+            *(chunk[name].tolist() for name in VITAL_COLUMNS),
+            chunk["severity_level"].tolist(), chunk["is_emergency"].tolist(),
+        )
+        return [
+            f'{{"case_id": {case_id}{prefixes[profile]}'
+            f'{{"glucose_mg_dl": {glucose}, "systolic_bp": {systolic}, "diastolic_bp": {diastolic}, '
+            f'"heart_rate_bpm": {heart_rate}, "temperature_celsius": {temperature}, "spo2_percent": {spo2}}}'
+            f', "expected_results": {{"severity_level": {severity}, "is_emergency": {"true" if emergency else "false"}}}'
+            f'{contexts[profile]}'
+            for case_id, profile, glucose, systolic, diastolic, heart_rate, temperature, spo2, severity, emergency
+            in rows
+        ]
+
+    def columnar_schema(self) -> List["ColumnSpec"]:
+        """컬럼형 데이터셋 스키마 (문자열 사전 코드 = VITALS_PROFILES 인덱스)"""
+        from batch_assessment import VITAL_COLUMNS
+        from vitals_dataset import KIND_BOOL, KIND_FLOAT, KIND_INT, KIND_STR, ColumnSpec
+
+        return [
+            ColumnSpec("case_id", KIND_INT, "<i8"),
+            ColumnSpec("description", KIND_STR, "<u1", tuple(f"합성 케이스: {p.name}" for p in self.profiles)),
+            ColumnSpec("scenario", KIND_STR, "<u1", tuple(p.scenario.value for p in self.profiles)),
+        ] + [
+            ColumnSpec(f"vitals.{name}", KIND_FLOAT, "<f8") if name == "temperature_celsius"
+            else ColumnSpec(f"vitals.{name}", KIND_INT, "<i2")
+            for name in VITAL_COLUMNS
+        ] + [
+            ColumnSpec("expected_results.severity_level", KIND_INT, "<i1"),
+            ColumnSpec("expected_results.is_emergency", KIND_BOOL, "<u1"),
+            ColumnSpec("medical_context", KIND_STR, "<u1", tuple(p.medical_context for p in self.profiles)),
+        ]
+
+    def export_columnar(self, filename: str, total: int, chunk_size: int = 100_000) -> Dict:
+        """
+        컬럼형 바이너리 데이터셋으로 스트리밍 기록 (vitals_dataset 포맷)
+
+        Returns:
+            export_ndjson 과 같은 생성 요약
+        """
+        import numpy as np
+
+        from batch_assessment import VITAL_COLUMNS
+        from vitals_dataset import DatasetWriter
+
+        started = time.perf_counter()
+        severity_counts = np.zeros(5, dtype=np.int64)
+        emergencies = 0
+        metadata = {"total_cases": total, "generator": "SyntheticVitalsGenerator", "seed": self.seed}
+        with DatasetWriter(filename, total, self.columnar_schema(), metadata) as writer:
+            for chunk in self.iter_chunks(total, chunk_size):
+                values = {f"vitals.{name}": chunk[name] for name in VITAL_COLUMNS}
+                values.update({
+                    "case_id": chunk["case_id"],
+                    "description": chunk["profile"],
+                    "scenario": chunk["profile"],
+                    "medical_context": chunk["profile"],
+                    "expected_results.severity_level": chunk["severity_level"],
+                    "expected_results.is_emergency": chunk["is_emergency"],
+                })
+                writer.write(int(chunk["case_id"][0]) - 1, values)
+                severity_counts += np.bincount(chunk["severity_level"], minlength=5)
+                emergencies += int(chunk["is_emergency"].sum())
+        return {
+            "total_cases": total,
+            "severity_counts": {level: int(severity_counts[level]) for level in range(1, 5)},
+            "emergencies": emergencies,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+
+    def export_ndjson(self, filename: str, total: int, chunk_size: int = 100_000) -> Dict:
+        """
+        NDJSON 으로 스트리밍 기록 (한 줄에 케이스 하나, export_json 의 test_cases 항목과 같은 형식)
+
+        Returns:
+            생성 요약 (케이스 수, 심각도별 수, 응급 수, 소요 시간)
+        """
+        import numpy as np
+
+        started = time.perf_counter()
+        severity_counts = np.zeros(5, dtype=np.int64)
+        emergencies = 0
+        with open(filename, "w", encoding="utf-8") as f:
+            for chunk in self.iter_chunks(total, chunk_size):
+                f.writelines(self._ndjson_lines(chunk))
+                severity_counts += np.bincount(chunk["severity_level"], minlength=5)
+                emergencies += int(chunk["is_emergency"].sum())
+        return {
+            "total_cases": total,
+            "severity_counts": {level: int(severity_counts[level]) for level in range(1, 5)},
+            "emergencies": emergencies,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+
+
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="MPS Healthcare 의료 테스트 케이스 생성")
+    parser.add_argument("--synthetic", type=int, default=0, help="합성 케이스 수 (지정 시 NDJSON 생성)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--output", default="synthetic_test_cases.ndjson",
+                        help="출력 파일 (.mvd 이면 컬럼형 바이너리, 그 외 NDJSON)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        generator = SyntheticVitalsGenerator(seed=args.seed)
+        export = generator.export_columnar if args.output.endswith(".mvd") else generator.export_ndjson
+        summary = export(args.output, args.synthetic, args.chunk_size)
+        print(f"✓ {summary['total_cases']:,} 합성 케이스가 {args.output}으로 저장되었습니다. "
+              f"({summary['seconds']}초)")
+        print(f"  - 심각도별: {summary['severity_counts']}")
+        print(f"  - 응급 상황: {summary['emergencies']:,}")
+        return
+
     generator = MedicalTestCaseGenerator()
     generator.generate_all_tests()
     generator.print_summary()
@@ -0,0 +1,143 @@
+"""
+Integration Test Runner - 데이터셋 샤딩 검증 테스트
+테스트 실행: pytest test_integration_test_runner.py -v
+"""
+
+import json
+
+import pytest
+
+from integration_test_runner import (
+    DEFAULT_CASES_PATH,
+    ShardedValidationSuite,
+    TimingHistogram,
+    load_cases,
+    main,
+)
+
+NORMAL = (100, 120, 80, 72, 36.8, 98)
+HYPOGLYCEMIA = (35, 120, 80, 72, 36.8, 98)
+
+
+def case(case_id, vitals, is_emergency, severity):
+    return (case_id, vitals, is_emergency, severity)
+
+
+def missed_emergency(case_id):
+    """정상 신호인데 응급으로 기대 (항상 누락으로 집계)"""
+    return case(case_id, NORMAL, True, 4)
+
+
+class TestTimingHistogram:
+    """처리 시간 히스토그램"""
+
+    def test_percentiles_use_bucket_upper_bounds(self):
+        histogram = TimingHistogram()
+        for _ in range(90):
+            histogram.add(3_000)  # 3us -> [2, 4)
+        for _ in range(10):
+            histogram.add(100_000)  # 100us -> [64, 128)
+
+        assert histogram.percentile(50) == 4.0
+        assert histogram.percentile(90) == 4.0
+        assert histogram.percentile(99) == 128.0
+        assert histogram.to_dict()["max_us"] == 100.0
+
+    def test_merge_adds_counts(self):
+        first, second = TimingHistogram(), TimingHistogram()
+        first.add(1_000)
+        second.add(1_000)
+        second.add(5_000_000)
+
+        first.merge(second)
+
+        assert first.count == 3
+        assert first.max_ns == 5_000_000
+        assert sum(first.counts) == 3
+        assert TimingHistogram().percentile(99) == 0.0
+
+
+class TestLoadCases:
+    """테스트 케이스 로드"""
+
+    def test_json_and_ndjson(self, tmp_path):
+        with open(DEFAULT_CASES_PATH, encoding="utf-8") as f:
+            records = json.load(f)["test_cases"]
+        ndjson = tmp_path / "cases.ndjson"
+        ndjson.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n\n" for r in records[:5]), encoding="utf-8")
+
+        cases = load_cases([DEFAULT_CASES_PATH, ndjson])
+
+        assert len(cases) == len(records) + 5
+        assert cases[0] == (1, (70, 120, 80, 72, 37.0, 98), False, 1)
+        assert cases[len(records):] == cases[:5]
+
+
+class TestShardedValidationSuite:
+    """샤딩 검증 스위트"""
+
+    def test_shards_merge_to_single_run_totals(self):
+        cases = load_cases([DEFAULT_CASES_PATH])
+
+        single = ShardedValidationSuite(cases, workers=1, shard_size=len(cases), fail_fast=False)
+        sharded = ShardedValidationSuite(cases, workers=2, shard_size=7, fail_fast=False)
+        single.run_all()
+        sharded.run_all()
+
+        assert sharded.shards_done == -(-len(cases) // 7)
+        assert sharded.histogram.count == single.histogram.count == len(cases)
+        for key in ("passed", "failed", "emergency_misses", "false_alarms", "severity_matches"):
+            assert sorted_value(sharded, key) == sorted_value(single, key)
+
+    def test_fail_fast_with_single_shard(self, capsys):
+        cases = [case(1, NORMAL, False, 1), missed_emergency(2)] + [case(i, NORMAL, False, 1) for i in range(3, 50)]
+
+        suite = ShardedValidationSuite(cases, workers=1, shard_size=1000)
+        summary = suite.run_all()
+
+        assert summary["stopped_early"] is True
+        assert summary["checked"] == 2
+        assert summary["emergency_misses"] == [2]
+        assert "(fail-fast 중단)" in capsys.readouterr().out
+
+    def test_fail_fast_cancels_pending_shards(self):
+        cases = [missed_emergency(0)] + [case(i, HYPOGLYCEMIA, True, 4) for i in range(1, 400)]
+
+        suite = ShardedValidationSuite(cases, workers=1, shard_size=10)
+        summary = suite.run_all()
+
+        assert summary["stopped_early"] is True
+        assert summary["emergency_misses"] == [0]
+        assert summary["shards"] < 40
+        assert summary["checked"] < len(cases)
+
+    def test_without_fail_fast_checks_everything(self):
+        cases = [missed_emergency(0), missed_emergency(1)] + [case(i, NORMAL, False, 1) for i in range(2, 20)]
+
+        summary = ShardedValidationSuite(cases, workers=2, shard_size=5, fail_fast=False).run_all()
+
+        assert summary["stopped_early"] is False
+        assert summary["checked"] == 20
+        assert sorted(summary["emergency_misses"]) == [0, 1]
+
+    def test_rejects_non_positive_shard_size(self):
+        with pytest.raises(ValueError):
+            ShardedValidationSuite([], shard_size=0)
+
+
+class TestMain:
+    """명령행 인자 검증"""
+
+    @pytest.mark.parametrize("option", ["--shard-size", "--workers"])
+    @pytest.mark.parametrize("value", ["0", "-3", "many"])
+    def test_rejects_non_positive_counts(self, option, value, capsys):
+        with pytest.raises(SystemExit) as exc:
+            main(["--cases", option, value])
+
+        assert exc.value.code == 2
+        assert option in capsys.readouterr().err
+
+
+def sorted_value(suite, key):
+    value = getattr(suite, key)
+    return sorted(value) if isinstance(value, list) else value
@@ -0,0 +1,84 @@
+"""
+Medical Test Case Generator - 합성 케이스 생성 테스트
+테스트 실행: pytest test_medical_test_case_generator.py -v
+"""
+
+import json
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+from medical_test_case_generator import VITALS_PROFILES, SyntheticVitalsGenerator
+from integration_test_runner import load_cases
+
+VITAL_KEYS = ("glucose_mg_dl", "systolic_bp", "diastolic_bp", "heart_rate_bpm", "temperature_celsius", "spo2_percent")
+
+
+def peak_bytes(generator, path, total, chunk_size):
+    tracemalloc.start()
+    try:
+        generator.export_ndjson(str(path), total, chunk_size)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestSyntheticVitalsGenerator:
+    """대용량 합성 케이스 생성기"""
+
+    def test_same_seed_same_cases(self, tmp_path):
+        first, second, other = tmp_path / "a.ndjson", tmp_path / "b.ndjson", tmp_path / "c.ndjson"
+
+        SyntheticVitalsGenerator(seed=7).export_ndjson(str(first), 2500, chunk_size=1000)
+        SyntheticVitalsGenerator(seed=7).export_ndjson(str(second), 2500, chunk_size=1000)
+        SyntheticVitalsGenerator(seed=8).export_ndjson(str(other), 2500, chunk_size=1000)
+
+        assert first.read_bytes() == second.read_bytes()
+        assert first.read_bytes() != other.read_bytes()
+
+    def test_ndjson_record_shape(self, tmp_path):
+        path = tmp_path / "cases.ndjson"
+        summary = SyntheticVitalsGenerator(seed=1).export_ndjson(str(path), 500, chunk_size=128)
+
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+        assert [r["case_id"] for r in records] == list(range(1, 501))
+        record = records[0]
+        assert list(record) == [
+            "case_id", "description", "scenario", "vitals", "expected_results", "medical_context",
+        ]
+        assert list(record["vitals"]) == list(VITAL_KEYS)
+        assert record["scenario"] in {p.scenario.value for p in VITALS_PROFILES}
+        assert set(record["expected_results"]) == {"severity_level", "is_emergency"}
+        assert isinstance(record["expected_results"]["is_emergency"], bool)
+        assert sum(r["expected_results"]["is_emergency"] for r in records) == summary["emergencies"]
+        assert sum(summary["severity_counts"].values()) == 500
+        # 통합 테스트 러너가 그대로 읽을 수 있는 형식
+        assert len(load_cases([path])) == 500
+
+    def test_memory_is_flat_in_total_cases(self, tmp_path):
+        """chunk_size 단위 생성: 최대 메모리는 전체 케이스 수와 무관"""
+        generator = SyntheticVitalsGenerator(seed=3)
+
+        small = peak_bytes(generator, tmp_path / "small.ndjson", 5_000, chunk_size=5_000)
+        large = peak_bytes(generator, tmp_path / "large.ndjson", 100_000, chunk_size=5_000)
+
+        assert large < small * 1.5
+
+    def test_chunks_do_not_depend_on_total(self):
+        generator = SyntheticVitalsGenerator(seed=5)
+        short = list(generator.iter_chunks(1500, chunk_size=1000))
+        long = list(generator.iter_chunks(3000, chunk_size=1000))
+
+        assert (short[0]["glucose_mg_dl"] == long[0]["glucose_mg_dl"]).all()
+        assert len(short[1]["case_id"]) == 500
+
+    def test_fixed_cases_do_not_import_numpy(self):
+        """100개 고정 케이스 경로는 NumPy 없이 동작"""
+        code = "import sys, medical_test_case_generator; print('numpy' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False"